@@ -73,6 +73,17 @@ def cli() -> None:
     default="2",
     help="Optimization level (0=none, 3=aggressive)",
 )
+@click.option(
+    "--trace-out",
+    type=click.Path(),
+    help="Write a Chrome trace of compilation phases and passes to a JSON file",
+)
+@click.option(
+    "--memoize",
+    multiple=True,
+    metavar="UTILITY",
+    help="Cache the results of a pure utility (repeatable)",
+)
 def compile(
     source_file: str,
     output: str | None,
@@ -84,6 +95,8 @@ def compile(
     opt_report: bool,
     mir_phase: bool,
     opt_level: str,
+    trace_out: str | None,
+    memoize: tuple[str, ...],
 ) -> None:
     """Compile a Machine Dialect™ source file to bytecode."""
     # Create compiler configuration from CLI options
@@ -96,6 +109,8 @@ def compile(
         mir_phase=mir_phase,
         output=output,
         module_name=module_name,
+        trace_out=trace_out,
+        memoize=memoize,
     )
 
     # Create compiler instance
@@ -294,28 +309,51 @@ def shell(tokens: bool, ast: bool) -> None:
 
 @cli.command()
 @click.argument("bytecode_file", type=click.Path(exists=True))
-def disasm(bytecode_file: str) -> None:
+@click.option(
+    "-p",
+    "--profile",
+    is_flag=True,
+    help="Run the bytecode on the Rust VM and annotate instructions with execution counts",
+)
+@click.option(
+    "--hot-threshold",
+    type=float,
+    default=0.05,
+    show_default=True,
+    help="Share of executed instructions at which an instruction or loop is marked hot",
+)
+def disasm(bytecode_file: str, profile: bool, hot_threshold: float) -> None:
     """Disassemble a compiled bytecode file."""
-    # TODO: Implement disassembly for new register-based bytecode
-    # The code below will be re-enabled once bytecode generation is implemented
-    # try:
-    #     with open(bytecode_file, "rb") as f:
-    #         module = deserialize_module(f)
-    # except FileNotFoundError:
-    #     click.echo(f"Error: File '{bytecode_file}' not found", err=True)
-    #     sys.exit(1)
-    # except InvalidMagicError as e:
-    #     click.echo(f"Error: {e}", err=True)
-    #     sys.exit(1)
-    # except SerializationError as e:
-    #     click.echo(f"Error loading file: {e}", err=True)
-    #     sys.exit(1)
-    # except Exception as e:
-    #     click.echo(f"Error loading file: {e}", err=True)
-    #     sys.exit(1)
-
-    click.echo("Disassembly not yet implemented for register-based bytecode", err=True)
-    sys.exit(1)
+    from machine_dialect.codegen.disassembler import DisassemblyError, disassemble
+
+    with open(bytecode_file, "rb") as f:
+        data = f.read()
+
+    vm_profile = None
+    if profile:
+        try:
+            import machine_dialect_vm
+
+            vm = machine_dialect_vm.RustVM()
+        except (ImportError, AttributeError) as e:
+            click.echo("Error: Rust VM module not found (required for --profile)", err=True)
+            click.echo(f"Details: {e}", err=True)
+            sys.exit(1)
+
+        try:
+            vm.enable_profiling(track_pcs=True)
+            vm.load_bytecode(bytecode_file)
+            vm.execute()
+        except Exception as e:
+            click.echo(f"Runtime error: {e}", err=True)
+            sys.exit(1)
+        vm_profile = vm.get_profile()
+
+    try:
+        click.echo(disassemble(data, vm_profile, hot_threshold), nl=False)
+    except DisassemblyError as e:
+        click.echo(f"Error: {e}", err=True)
+        sys.exit(1)
 
 
 @cli.command()
@@ -9,6 +9,7 @@ from typing import Any
 from machine_dialect.cfg.openai_generation import generate_with_openai
 from machine_dialect.compiler import Compiler, CompilerConfig
 from machine_dialect.compiler.config import OptimizationLevel
+from machine_dialect.compiler.vm_runner import VMPool
 
 
 @dataclass
@@ -46,6 +47,7 @@ class Agent:
         self.verbose = verbose
         self.iterations: list[dict[str, Any]] = []
         self.total_tokens_used = 0
+        self._vm_pool: VMPool | None = None
 
     def solve(self, task: str, max_iterations: int = 5) -> AgentResult:
         """Solve a task through iterative code generation.
@@ -295,14 +297,17 @@ class Agent:
             if self.verbose:
                 print("   Executing bytecode...")
 
-            import machine_dialect_vm
+            if self._vm_pool is None:
+                import machine_dialect_vm
 
-            vm = machine_dialect_vm.RustVM()
-            vm.load_bytecode(temp_path)
-            output = vm.execute()
+                self._vm_pool = VMPool(machine_dialect_vm.RustVM)
 
-            # Get instruction count
-            instructions = vm.instruction_count()
+            with self._vm_pool.checkout() as vm:
+                vm.load_bytecode(temp_path)
+                output = vm.execute()
+
+                # Get instruction count (cleared when the VM returns to the pool)
+                instructions = vm.instruction_count()
 
             return {
                 "success": True,
@@ -0,0 +1,31 @@
+"""In-process benchmarks for the Machine Dialect™ compiler and VM.
+
+Run the suite with ``python -m machine_dialect.benchmarks`` and the scaling
+benchmark with ``python -m machine_dialect.benchmarks.scaling``.
+"""
+
+from machine_dialect.benchmarks.generator import SHAPES, generate_program, write_corpus
+from machine_dialect.benchmarks.harness import (
+    BenchmarkResult,
+    Regression,
+    compare_to_baseline,
+    load_baseline,
+    measure,
+    write_results,
+)
+from machine_dialect.benchmarks.suite import GROUPS, SuiteConfig, run_suite
+
+__all__ = [
+    "GROUPS",
+    "SHAPES",
+    "BenchmarkResult",
+    "Regression",
+    "SuiteConfig",
+    "compare_to_baseline",
+    "generate_program",
+    "load_baseline",
+    "measure",
+    "run_suite",
+    "write_corpus",
+    "write_results",
+]
@@ -0,0 +1,68 @@
+"""Command-line entry point for the benchmark suite.
+
+Examples:
+    python -m machine_dialect.benchmarks --output results.json
+    python -m machine_dialect.benchmarks --group lexer --group parser --quick
+    python -m machine_dialect.benchmarks --baseline baseline.json --threshold 0.15
+"""
+
+import sys
+
+import click
+
+from machine_dialect.benchmarks.harness import compare_to_baseline, load_baseline, write_results
+from machine_dialect.benchmarks.suite import GROUPS, SuiteConfig, run_suite
+
+
+@click.command()
+@click.option("-g", "--group", "groups", multiple=True, type=click.Choice(GROUPS), help="Benchmark group to run")
+@click.option("-o", "--output", type=click.Path(), help="Write results as JSON to this file")
+@click.option("-b", "--baseline", type=click.Path(exists=True), help="Baseline JSON to compare against")
+@click.option("--threshold", type=float, default=0.10, show_default=True, help="Allowed slowdown vs. the baseline")
+@click.option("--warmup", type=int, default=2, show_default=True, help="Warmup runs per benchmark")
+@click.option("--repeat", type=int, default=10, show_default=True, help="Timed runs per benchmark")
+@click.option("--scale", type=int, default=10, show_default=True, help="Workload size multiplier")
+@click.option("--quick", is_flag=True, help="Small workloads and few runs (smoke test)")
+def main(
+    groups: tuple[str, ...],
+    output: str | None,
+    baseline: str | None,
+    threshold: float,
+    warmup: int,
+    repeat: int,
+    scale: int,
+    quick: bool,
+) -> None:
+    """Run the compiler and VM benchmark suite."""
+    config = SuiteConfig(warmup=1, repeat=3, scale=1) if quick else SuiteConfig(warmup, repeat, scale)
+    results = run_suite(config, list(groups) or None)
+
+    click.echo(f"{'Benchmark':<40} {'Median (ms)':>12} {'Stdev':>10} {'Throughput':>22}")
+    click.echo("-" * 87)
+    for result in results:
+        if result.skipped:
+            click.echo(f"{result.name:<40} skipped ({result.skipped})")
+            continue
+        throughput = f"{result.throughput:,.0f} {result.unit}/s" if result.items else ""
+        click.echo(f"{result.name:<40} {result.median_ms:>12.3f} {result.stdev_ms:>10.3f} {throughput:>22}")
+
+    if output:
+        write_results(results, output)
+        click.echo(f"\nResults written to {output}")
+
+    if baseline:
+        regressions = compare_to_baseline(results, load_baseline(baseline), threshold)
+        if regressions:
+            click.echo(f"\n{len(regressions)} regression(s) beyond {threshold:.0%}:", err=True)
+            for regression in regressions:
+                click.echo(
+                    f"  {regression.name}: {regression.baseline_ms:.3f} ms -> {regression.current_ms:.3f} ms "
+                    f"({regression.ratio:.2f}x)",
+                    err=True,
+                )
+            sys.exit(1)
+        click.echo(f"\nNo regressions beyond {threshold:.0%}")
+
+
+if __name__ == "__main__":
+    main()
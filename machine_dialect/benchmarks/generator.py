@@ -0,0 +1,147 @@
+"""Deterministic generator for large Machine Dialect™ programs.
+
+The generated programs are meant to stress the compiler with inputs that are
+orders of magnitude larger than the examples and tests. Each shape exercises a
+different part of the pipeline:
+
+- ``utilities``: many small utilities (function table, call lowering)
+- ``nested``: deeply nested if/while blocks (block parsing, CFG construction)
+- ``named_list``: one huge named list literal (collection lowering, constants)
+- ``straight_line``: a long block of arithmetic statements (expressions, SSA)
+
+Programs are a pure function of ``(shape, size, seed)``.
+"""
+
+from __future__ import annotations
+
+import random
+from collections.abc import Callable
+from pathlib import Path
+
+_OPERATORS = ("+", "-", "*")
+
+
+def _utilities(size: int, rng: random.Random) -> str:
+    sections = []
+    for i in range(size):
+        offset = rng.randint(1, 100)
+        threshold = rng.randint(1, 100)
+        sections.append(
+            f"""### **Utility**: `u{i}`
+
+<details>
+<summary>Generated utility {i}.</summary>
+
+> Define `a{i}` as Whole Number. \\
+> Set `a{i}` to `n{i}` {rng.choice(_OPERATORS)} _{offset}_. \\
+> If `a{i}` > _{threshold}_:
+> > Set `a{i}` to `a{i}` - _{threshold}_.
+>
+> Give back `a{i}`.
+
+</details>
+
+#### Inputs:
+
+- `n{i}` **as** Whole Number (required)
+
+#### Outputs:
+
+- `a{i}`
+"""
+        )
+
+    calls = min(size, 8)
+    lines = [f"Define `r{i}` as Whole Number." for i in range(calls)]
+    lines.extend(f"Set `r{i}` using `u{i}` with _{rng.randint(0, 50)}_." for i in range(calls))
+    lines.append("Give back `r0`." if calls else "Give back _0_.")
+    sections.append("\n".join(lines) + "\n")
+    return "\n".join(sections)
+
+
+def _nested(size: int, rng: random.Random, depth: int = 12) -> str:
+    lines = ["Define `x` as Whole Number.", "Set `x` to _0_.", ""]
+    for _ in range(size):
+        for level in range(depth):
+            prefix = "> " * level
+            bound = rng.randint(1, 1000)
+            if level % 2:
+                lines.append(f"{prefix}While `x` < _{bound}_:")
+            else:
+                lines.append(f"{prefix}If `x` < _{bound}_:")
+            lines.append(f"{'> ' * (level + 1)}Set `x` to `x` + _{rng.randint(1, 9)}_.")
+        lines.append("")
+    lines.append("Give back `x`.")
+    return "\n".join(lines) + "\n"
+
+
+def _named_list(size: int, rng: random.Random) -> str:
+    lines = ["Define `table` as Named List.", "Set `table` to:"]
+    for i in range(size):
+        if rng.random() < 0.5:
+            lines.append(f'- _"key{i}"_: _{rng.randint(0, 10_000)}_.')
+        else:
+            lines.append(f'- _"key{i}"_: _"value {rng.randint(0, 10_000)}"_.')
+    lines.append("Give back `table`.")
+    return "\n".join(lines) + "\n"
+
+
+def _straight_line(size: int, rng: random.Random, variables: int = 8) -> str:
+    lines = [f"Define `v{i}` as Whole Number." for i in range(variables)]
+    lines.extend(f"Set `v{i}` to _{i}_." for i in range(variables))
+    for _ in range(size):
+        target, source = rng.randrange(variables), rng.randrange(variables)
+        lines.append(f"Set `v{target}` to `v{source}` {rng.choice(_OPERATORS)} _{rng.randint(1, 99)}_.")
+    lines.append("Give back `v0`.")
+    return "\n".join(lines) + "\n"
+
+
+SHAPES: dict[str, Callable[[int, random.Random], str]] = {
+    "utilities": _utilities,
+    "nested": _nested,
+    "named_list": _named_list,
+    "straight_line": _straight_line,
+}
+
+
+def generate_program(shape: str, size: int, seed: int = 0) -> str:
+    """Generate a program of the given shape.
+
+    Args:
+        shape: One of ``SHAPES``.
+        size: Number of repeated units (utilities, nested sections, list
+            entries or statements).
+        seed: Random seed; the same arguments always produce the same source.
+
+    Returns:
+        Machine Dialect™ source.
+
+    Raises:
+        ValueError: If the shape is unknown.
+    """
+    if shape not in SHAPES:
+        raise ValueError(f"Unknown program shape: {shape} (expected one of {', '.join(SHAPES)})")
+    return SHAPES[shape](size, random.Random(f"{shape}:{size}:{seed}"))
+
+
+def write_corpus(directory: Path | str, sizes: list[int], shapes: list[str] | None = None, seed: int = 0) -> list[Path]:
+    """Write generated programs to disk.
+
+    Args:
+        directory: Output directory (created if missing).
+        sizes: Sizes to generate for each shape.
+        shapes: Shapes to generate, or None for all.
+        seed: Random seed.
+
+    Returns:
+        Paths of the written files.
+    """
+    out = Path(directory)
+    out.mkdir(parents=True, exist_ok=True)
+    paths = []
+    for shape in shapes or list(SHAPES):
+        for size in sizes:
+            path = out / f"{shape}_{size}.md"
+            path.write_text(generate_program(shape, size, seed), encoding="utf-8")
+            paths.append(path)
+    return paths
@@ -0,0 +1,217 @@
+"""Benchmark harness.
+
+This module provides the timing, statistics and baseline-comparison
+primitives used by the in-process benchmark suite. Timings are taken with
+``time.perf_counter_ns`` after a configurable number of warmup runs, and
+results are stored as JSON so they can be compared against a baseline in CI.
+"""
+
+from __future__ import annotations
+
+import json
+import platform
+import statistics
+import time
+from collections.abc import Callable
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any
+
+RESULTS_FORMAT_VERSION = 1
+
+
+@dataclass
+class BenchmarkResult:
+    """Result of a single benchmark.
+
+    Attributes:
+        name: Unique benchmark name (e.g. "lexer.tokens").
+        group: Benchmark group (e.g. "lexer", "mir", "vm").
+        samples_ns: Measured run times in nanoseconds.
+        items: Units of work performed by one run (tokens, statements, ...).
+        unit: Name of the work unit.
+        skipped: Reason the benchmark was skipped, if it was.
+    """
+
+    name: str
+    group: str
+    samples_ns: list[int] = field(default_factory=list)
+    items: int = 0
+    unit: str = ""
+    skipped: str | None = None
+
+    @property
+    def median_ms(self) -> float:
+        """Median run time in milliseconds."""
+        return statistics.median(self.samples_ns) / 1_000_000 if self.samples_ns else 0.0
+
+    @property
+    def mean_ms(self) -> float:
+        """Mean run time in milliseconds."""
+        return statistics.fmean(self.samples_ns) / 1_000_000 if self.samples_ns else 0.0
+
+    @property
+    def min_ms(self) -> float:
+        """Fastest run time in milliseconds."""
+        return min(self.samples_ns) / 1_000_000 if self.samples_ns else 0.0
+
+    @property
+    def stdev_ms(self) -> float:
+        """Standard deviation of the run time in milliseconds."""
+        if len(self.samples_ns) < 2:
+            return 0.0
+        return statistics.stdev(self.samples_ns) / 1_000_000
+
+    @property
+    def throughput(self) -> float:
+        """Work units per second, based on the median run time."""
+        if not self.items or not self.samples_ns:
+            return 0.0
+        return self.items / (statistics.median(self.samples_ns) / 1_000_000_000)
+
+    def to_dict(self) -> dict[str, Any]:
+        """Convert the result to a JSON-serializable dictionary.
+
+        Returns:
+            Dictionary with summary statistics and raw samples.
+        """
+        return {
+            "group": self.group,
+            "median_ms": self.median_ms,
+            "mean_ms": self.mean_ms,
+            "min_ms": self.min_ms,
+            "stdev_ms": self.stdev_ms,
+            "items": self.items,
+            "unit": self.unit,
+            "throughput": self.throughput,
+            "samples_ns": self.samples_ns,
+            "skipped": self.skipped,
+        }
+
+
+@dataclass
+class Regression:
+    """A benchmark that got slower than its baseline.
+
+    Attributes:
+        name: Benchmark name.
+        baseline_ms: Baseline median time in milliseconds.
+        current_ms: Current median time in milliseconds.
+    """
+
+    name: str
+    baseline_ms: float
+    current_ms: float
+
+    @property
+    def ratio(self) -> float:
+        """Current time relative to the baseline."""
+        return self.current_ms / self.baseline_ms if self.baseline_ms else float("inf")
+
+
+def measure(
+    run: Callable[[Any], object],
+    setup: Callable[[], Any] | None = None,
+    warmup: int = 2,
+    repeat: int = 10,
+) -> list[int]:
+    """Time a callable repeatedly.
+
+    Args:
+        run: Callable to time. It receives the value returned by ``setup``.
+        setup: Optional untimed callable run before every iteration, e.g. to
+            build a fresh copy of a structure the benchmark mutates.
+        warmup: Number of untimed warmup runs.
+        repeat: Number of timed runs.
+
+    Returns:
+        Run times in nanoseconds.
+    """
+    for _ in range(warmup):
+        run(setup() if setup else None)
+
+    samples = []
+    for _ in range(repeat):
+        arg = setup() if setup else None
+        start = time.perf_counter_ns()
+        run(arg)
+        samples.append(time.perf_counter_ns() - start)
+    return samples
+
+
+def results_to_json(results: list[BenchmarkResult]) -> dict[str, Any]:
+    """Build the JSON document for a benchmark run.
+
+    Args:
+        results: Benchmark results.
+
+    Returns:
+        JSON-serializable dictionary.
+    """
+    return {
+        "version": RESULTS_FORMAT_VERSION,
+        "timestamp": datetime.now(timezone.utc).isoformat(),  # noqa: UP017
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "results": {result.name: result.to_dict() for result in results},
+    }
+
+
+def write_results(results: list[BenchmarkResult], path: Path | str) -> None:
+    """Write benchmark results as JSON.
+
+    Args:
+        results: Benchmark results.
+        path: Output file path.
+    """
+    with open(path, "w") as f:
+        json.dump(results_to_json(results), f, indent=2)
+
+
+def load_baseline(path: Path | str) -> dict[str, Any]:
+    """Load a baseline written by ``write_results``.
+
+    Args:
+        path: Baseline file path.
+
+    Returns:
+        Mapping of benchmark name to its stored summary.
+
+    Raises:
+        ValueError: If the file is not a benchmark results document.
+    """
+    with open(path) as f:
+        data = json.load(f)
+    if not isinstance(data, dict) or "results" not in data:
+        raise ValueError(f"Not a benchmark results file: {path}")
+    results: dict[str, Any] = data["results"]
+    return results
+
+
+def compare_to_baseline(
+    results: list[BenchmarkResult],
+    baseline: dict[str, Any],
+    threshold: float = 0.10,
+) -> list[Regression]:
+    """Find benchmarks whose median time regressed beyond a threshold.
+
+    Benchmarks missing from the baseline or skipped in either run are ignored.
+
+    Args:
+        results: Current benchmark results.
+        baseline: Baseline results as returned by ``load_baseline``.
+        threshold: Allowed slowdown as a fraction (0.10 means 10%).
+
+    Returns:
+        Regressions, slowest first.
+    """
+    regressions = []
+    for result in results:
+        base = baseline.get(result.name)
+        if result.skipped or not result.samples_ns or not base or base.get("skipped"):
+            continue
+        baseline_ms = float(base.get("median_ms", 0.0))
+        if baseline_ms > 0 and result.median_ms > baseline_ms * (1 + threshold):
+            regressions.append(Regression(result.name, baseline_ms, result.median_ms))
+    return sorted(regressions, key=lambda r: r.ratio, reverse=True)
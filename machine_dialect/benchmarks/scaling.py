@@ -0,0 +1,246 @@
+"""Scaling benchmark for the compilation pipeline.
+
+Each program shape from ``machine_dialect.benchmarks.generator`` is compiled
+at increasing sizes and every pipeline phase is timed separately. The growth
+exponent of each phase is estimated with a least-squares fit of
+``log(time)`` against ``log(size)``; an exponent well above 1 points at
+quadratic behavior (e.g. linear scans inside a loop over the input).
+
+Run with::
+
+    python -m machine_dialect.benchmarks.scaling --scales 1,10,100,1000
+"""
+
+from __future__ import annotations
+
+import copy
+import math
+import statistics
+import sys
+from collections.abc import Callable
+from dataclasses import dataclass, field
+from typing import Any
+
+import click
+
+from machine_dialect.benchmarks.generator import SHAPES, generate_program, write_corpus
+from machine_dialect.benchmarks.harness import measure
+from machine_dialect.codegen.register_codegen import RegisterBytecodeGenerator
+from machine_dialect.codegen.vm_serializer import VMBytecodeSerializer
+from machine_dialect.lexer.lexer import Lexer
+from machine_dialect.lexer.tokens import TokenType
+from machine_dialect.mir.hir_to_mir import lower_to_mir
+from machine_dialect.parser.parser import Parser
+
+PHASES = ("lexer", "parser", "hir", "mir", "codegen", "serialize")
+
+# Units of work per size step for each shape, chosen so that 1x compiles in about a millisecond
+BASE_SIZES = {"utilities": 4, "nested": 1, "named_list": 20, "straight_line": 25}
+
+
+@dataclass
+class ScalingResult:
+    """Timings of one phase of one shape across sizes.
+
+    Attributes:
+        shape: Program shape.
+        phase: Pipeline phase.
+        sizes: Generator sizes that were measured.
+        times_ms: Median time per size in milliseconds.
+        error: Failure that stopped the measurement at a larger size, if any.
+    """
+
+    shape: str
+    phase: str
+    sizes: list[int] = field(default_factory=list)
+    times_ms: list[float] = field(default_factory=list)
+    error: str | None = None
+
+    @property
+    def exponent(self) -> float | None:
+        """Growth exponent from a log-log least-squares fit, or None with fewer than two sizes."""
+        points = [(math.log(s), math.log(t)) for s, t in zip(self.sizes, self.times_ms, strict=True) if t > 0]
+        if len(points) < 2:
+            return None
+        mean_x = statistics.fmean(x for x, _ in points)
+        mean_y = statistics.fmean(y for _, y in points)
+        denominator = sum((x - mean_x) ** 2 for x, _ in points)
+        if denominator == 0:
+            return None
+        return sum((x - mean_x) * (y - mean_y) for x, y in points) / denominator
+
+    def is_superlinear(self, tolerance: float = 0.25) -> bool:
+        """Check whether the phase grows faster than linearly.
+
+        Args:
+            tolerance: Allowed excess over an exponent of 1.
+
+        Returns:
+            True if the fitted exponent exceeds ``1 + tolerance``.
+        """
+        exponent = self.exponent
+        return exponent is not None and exponent > 1 + tolerance
+
+
+def _count_tokens(source: str) -> int:
+    lexer = Lexer(source)
+    count = 0
+    while lexer.next_token().type != TokenType.MISC_EOF:
+        count += 1
+    return count
+
+
+def _parse(source: str) -> Any:
+    parser = Parser()
+    program = parser.parse(source)
+    if parser.has_errors():
+        raise ValueError(f"Generated source failed to parse: {parser.errors[0]}")
+    return program
+
+
+def _time_phases(source: str, repeat: int) -> dict[str, float | Exception]:
+    """Time each pipeline phase on one source.
+
+    Each phase is timed on a fresh copy of the previous phase's output. A
+    failing phase ends the pipeline and later phases are not measured.
+
+    Args:
+        source: Program source.
+        repeat: Timed runs per phase.
+
+    Returns:
+        Median time in milliseconds (or the raised exception) per phase.
+    """
+    program = _parse(source)
+    hir = program.to_hir()
+    steps: list[tuple[str, Callable[[Any], Any], Callable[[], Any] | None]] = [
+        ("lexer", lambda _: _count_tokens(source), None),
+        ("parser", lambda _: _parse(source), None),
+        ("hir", lambda target: target.to_hir(), lambda: copy.deepcopy(program)),
+        ("mir", lambda target: lower_to_mir(target, "scaling"), lambda: copy.deepcopy(hir)),
+    ]
+    timings: dict[str, float | Exception] = {}
+    for phase, run, setup in steps:
+        timings[phase] = statistics.median(measure(run, setup, warmup=1, repeat=repeat)) / 1_000_000
+
+    mir_module = lower_to_mir(copy.deepcopy(hir), "scaling")
+    try:
+        bytecode_module = RegisterBytecodeGenerator().generate(copy.deepcopy(mir_module))
+        samples = measure(
+            lambda target: RegisterBytecodeGenerator().generate(target),
+            lambda: copy.deepcopy(mir_module),
+            warmup=1,
+            repeat=repeat,
+        )
+        timings["codegen"] = statistics.median(samples) / 1_000_000
+    except Exception as e:
+        timings["codegen"] = e
+        return timings
+
+    try:
+        samples = measure(lambda _: VMBytecodeSerializer.serialize(bytecode_module), warmup=1, repeat=repeat)
+        timings["serialize"] = statistics.median(samples) / 1_000_000
+    except Exception as e:
+        timings["serialize"] = e
+    return timings
+
+
+def run_scaling(
+    scales: list[int],
+    shapes: list[str] | None = None,
+    repeat: int = 3,
+    time_budget_ms: float = 5_000.0,
+    seed: int = 0,
+) -> list[ScalingResult]:
+    """Run the scaling benchmark.
+
+    Args:
+        scales: Size multipliers, applied to ``BASE_SIZES``.
+        shapes: Shapes to run, or None for all.
+        repeat: Timed runs per phase and size.
+        time_budget_ms: Larger sizes of a shape are skipped once any phase
+            exceeds this median time.
+        seed: Generator seed.
+
+    Returns:
+        One result per shape and phase.
+    """
+    results: list[ScalingResult] = []
+    for shape in shapes or list(SHAPES):
+        by_phase = {phase: ScalingResult(shape, phase) for phase in PHASES}
+        for scale in sorted(scales):
+            size = BASE_SIZES[shape] * scale
+            try:
+                timings = _time_phases(generate_program(shape, size, seed), repeat)
+            except Exception as e:
+                for result in by_phase.values():
+                    result.error = result.error or f"size {size}: front end failed: {type(e).__name__}: {e}"
+                break
+
+            for phase, result in by_phase.items():
+                if result.error is not None:
+                    continue
+                value = timings.get(phase)
+                if value is None:
+                    result.error = f"size {size}: not measured (an earlier phase failed)"
+                elif isinstance(value, Exception):
+                    result.error = f"size {size}: {type(value).__name__}: {value}"
+                else:
+                    result.sizes.append(size)
+                    result.times_ms.append(value)
+
+            measured = [value for value in timings.values() if isinstance(value, float)]
+            if measured and max(measured) > time_budget_ms:
+                break
+        results.extend(by_phase.values())
+    return results
+
+
+@click.command()
+@click.option("--scales", default="1,10,100", show_default=True, help="Comma-separated size multipliers")
+@click.option("-s", "--shape", "shapes", multiple=True, type=click.Choice(list(SHAPES)), help="Shape to run")
+@click.option("--repeat", type=int, default=3, show_default=True, help="Timed runs per phase and size")
+@click.option("--tolerance", type=float, default=0.25, show_default=True, help="Allowed growth exponent above 1")
+@click.option("--time-budget", type=float, default=5_000.0, show_default=True, help="Stop growing a shape (ms)")
+@click.option("--seed", type=int, default=0, show_default=True, help="Generator seed")
+@click.option("--emit-corpus", type=click.Path(file_okay=False), help="Also write the generated sources here")
+def main(
+    scales: str,
+    shapes: tuple[str, ...],
+    repeat: int,
+    tolerance: float,
+    time_budget: float,
+    seed: int,
+    emit_corpus: str | None,
+) -> None:
+    """Measure how each compilation phase scales with program size."""
+    scale_list = [int(scale) for scale in scales.split(",") if scale.strip()]
+    if emit_corpus:
+        for shape in shapes or list(SHAPES):
+            write_corpus(emit_corpus, [BASE_SIZES[shape] * scale for scale in scale_list], [shape], seed)
+
+    results = run_scaling(scale_list, list(shapes) or None, repeat, time_budget, seed)
+
+    flagged = []
+    click.echo(f"{'Shape':<15} {'Phase':<10} {'Exponent':>8}  Median ms per size")
+    click.echo("-" * 80)
+    for result in results:
+        exponent = result.exponent
+        timings = ", ".join(f"{size}: {ms:.2f}" for size, ms in zip(result.sizes, result.times_ms, strict=True))
+        mark = ""
+        if result.is_superlinear(tolerance):
+            flagged.append(result)
+            mark = "  <-- super-linear"
+        exponent_text = f"{exponent:8.2f}" if exponent is not None else f"{'-':>8}"
+        click.echo(f"{result.shape:<15} {result.phase:<10} {exponent_text}  {timings}{mark}")
+        if result.error:
+            click.echo(f"{'':<36}failed at {result.error}")
+
+    if flagged:
+        click.echo(f"\n{len(flagged)} phase(s) grow faster than n^{1 + tolerance:.2f}", err=True)
+        sys.exit(1)
+    click.echo(f"\nAll phases scale within n^{1 + tolerance:.2f}")
+
+
+if __name__ == "__main__":
+    main()
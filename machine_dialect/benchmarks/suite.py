@@ -0,0 +1,628 @@
+"""In-process compiler and VM benchmark suite.
+
+This module defines the benchmarks run by ``python -m machine_dialect.benchmarks``:
+
+- lexer throughput (tokens/sec)
+- parser throughput (statements/sec)
+- every registered MIR optimization pass on a large synthetic CFG
+- SSA construction on a function with thousands of variables in nested loops
+- register bytecode generation and serialization
+- VM workloads (loops, string concatenation, report generation, list
+  mutation, filling and updating a large list, dictionary operations and deep
+  recursion), when the Rust VM is available
+- VM throughput with programs running on 1, 2, 4 and 8 threads
+"""
+
+from __future__ import annotations
+
+import copy
+import tempfile
+from collections.abc import Callable
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any
+
+from machine_dialect.benchmarks.harness import BenchmarkResult, measure
+from machine_dialect.codegen.register_codegen import RegisterBytecodeGenerator
+from machine_dialect.compiler.vm_runner import VMPool
+from machine_dialect.lexer.lexer import Lexer
+from machine_dialect.lexer.tokens import TokenType
+from machine_dialect.mir.basic_block import BasicBlock
+from machine_dialect.mir.hir_to_mir import lower_to_mir
+from machine_dialect.mir.mir_function import MIRFunction
+from machine_dialect.mir.mir_instructions import BinaryOp, ConditionalJump, Jump, LoadConst, Return, StoreVar
+from machine_dialect.mir.mir_module import MIRModule
+from machine_dialect.mir.mir_types import MIRType
+from machine_dialect.mir.mir_values import Constant, Temp, Variable
+from machine_dialect.mir.optimization_pass import PassType
+from machine_dialect.mir.optimizations import register_all_passes
+from machine_dialect.mir.pass_manager import PassManager
+from machine_dialect.mir.ssa_construction import construct_ssa
+from machine_dialect.parser.parser import Parser
+
+GROUPS = ("lexer", "parser", "mir", "ssa", "codegen", "vm", "vm_threads")
+
+THREAD_COUNTS = (1, 2, 4, 8)
+
+
+@dataclass
+class SuiteConfig:
+    """Benchmark suite configuration.
+
+    Attributes:
+        warmup: Untimed warmup runs per benchmark.
+        repeat: Timed runs per benchmark.
+        scale: Multiplier for workload sizes.
+    """
+
+    warmup: int = 2
+    repeat: int = 10
+    scale: int = 10
+
+
+def straight_line_source(count: int) -> str:
+    """Build a program made of a long chain of definitions and assignments.
+
+    Args:
+        count: Number of variables to define.
+
+    Returns:
+        Machine Dialect™ source with ``2 * count + 1`` statements.
+    """
+    lines = ["Define `v0` as Whole Number.", "Set `v0` to _0_."]
+    for i in range(1, count):
+        lines.append(f"Define `v{i}` as Whole Number.")
+        lines.append(f"Set `v{i}` to `v{i - 1}` + _{i}_.")
+    lines.append(f"Give back `v{count - 1}`.")
+    return "\n".join(lines) + "\n"
+
+
+def branchy_source(count: int) -> str:
+    """Build a program whose main function has a large CFG.
+
+    Each section contributes an if/else with a nested while loop.
+
+    Args:
+        count: Number of if/else sections.
+
+    Returns:
+        Machine Dialect™ source.
+    """
+    lines = [
+        "Define `x` as Whole Number.",
+        "Define `y` as Whole Number.",
+        "Set `x` to _3_.",
+        "Set `y` to _0_.",
+        "",
+    ]
+    for k in range(count):
+        lines.extend(
+            [
+                f"If `x` > _{k}_:",
+                f"> Set `y` to `y` + _{k}_.",
+                "> While `y` < _10_:",
+                ">> Set `y` to `y` + _1_.",
+                "Else:",
+                f"> Set `y` to `y` - _{k}_.",
+                "",
+            ]
+        )
+    lines.append("Give back `y`.")
+    return "\n".join(lines) + "\n"
+
+
+def utilities_source(count: int) -> str:
+    """Build a program made of many small utilities.
+
+    The register allocator gives every function its own 256-register file,
+    so spreading code over many functions is how large programs reach
+    codegen.
+
+    Args:
+        count: Number of utilities.
+
+    Returns:
+        Machine Dialect™ source.
+    """
+    sections = []
+    for i in range(count):
+        sections.append(
+            f"""### **Utility**: `f{i}`
+
+<details>
+<summary>Generated utility {i}.</summary>
+
+> Define `a{i}` as Whole Number. \\
+> Set `a{i}` to `n{i}` + _{i}_. \\
+> If `a{i}` > _{i * 2}_:
+> > Set `a{i}` to `a{i}` - _1_.
+>
+> Give back `a{i}` * _2_.
+
+</details>
+
+#### Inputs:
+
+- `n{i}` **as** Whole Number (required)
+
+#### Outputs:
+
+- `a{i}`
+"""
+        )
+    sections.append("Define `total` as Whole Number.\nSet `total` using `f0` with _1_.\nGive back `total`.\n")
+    return "\n".join(sections)
+
+
+def loop_nest_function(variables: int, depth: int) -> MIRFunction:
+    """Build a MIR function, not yet in SSA form, with many variables in nested loops.
+
+    Each of the ``depth`` nested loops counts to ten and owns an equal share
+    of the variables. Half of a loop's variables are accumulators, read and
+    updated on every iteration; the other half are scratch values assigned
+    right before they are read, so they are never live at a loop header.
+
+    Args:
+        variables: Number of accumulator and scratch variables.
+        depth: Number of nested loops.
+
+    Returns:
+        The function.
+    """
+    function = MIRFunction("loop_nest", [], MIRType.INT)
+    cfg = function.cfg
+    location = (1, 1)
+
+    def assign(block: BasicBlock, var: Variable, value: int) -> None:
+        temp = Temp(MIRType.INT)
+        block.add_instruction(LoadConst(temp, Constant(value, MIRType.INT), location))
+        block.add_instruction(StoreVar(var, temp, location))
+
+    counters = [Variable(f"i{level}", MIRType.INT) for level in range(depth)]
+    share = max(variables // (2 * depth), 1)
+    levels = [
+        (
+            [Variable(f"acc{level}_{j}", MIRType.INT) for j in range(share)],
+            [Variable(f"tmp{level}_{j}", MIRType.INT) for j in range(share)],
+        )
+        for level in range(depth)
+    ]
+
+    entry = cfg.get_or_create_block("entry")
+    cfg.set_entry_block(entry)
+    for var in counters + [var for accumulators, scratch in levels for var in accumulators + scratch]:
+        function.add_local(var)
+        assign(entry, var, 0)
+
+    headers = [cfg.get_or_create_block(f"header{level}") for level in range(depth)]
+    bodies = [cfg.get_or_create_block(f"body{level}") for level in range(depth)]
+    latches = [cfg.get_or_create_block(f"latch{level}") for level in range(depth)]
+    exit_block = cfg.get_or_create_block("exit")
+    entry.add_instruction(Jump(headers[0].label, location))
+    cfg.connect(entry, headers[0])
+
+    for level, (header, body, latch) in enumerate(zip(headers, bodies, latches, strict=True)):
+        # Leaving an inner loop continues with the next iteration of the outer one
+        leave = latches[level - 1] if level else exit_block
+        condition = Temp(MIRType.BOOL)
+        header.add_instruction(BinaryOp(condition, "<", counters[level], Constant(10, MIRType.INT), location))
+        header.add_instruction(ConditionalJump(condition, body.label, location, leave.label))
+        cfg.connect(header, body)
+        cfg.connect(header, leave)
+
+        for j, (accumulator, scratch) in enumerate(zip(*levels[level], strict=True)):
+            product, total = Temp(MIRType.INT), Temp(MIRType.INT)
+            body.add_instruction(BinaryOp(product, "*", counters[level], Constant(j + 1, MIRType.INT), location))
+            body.add_instruction(StoreVar(scratch, product, location))
+            body.add_instruction(BinaryOp(total, "+", accumulator, scratch, location))
+            body.add_instruction(StoreVar(accumulator, total, location))
+        inner = headers[level + 1] if level + 1 < depth else latch
+        if level + 1 < depth:
+            assign(body, counters[level + 1], 0)
+        body.add_instruction(Jump(inner.label, location))
+        cfg.connect(body, inner)
+
+        step = Temp(MIRType.INT)
+        latch.add_instruction(BinaryOp(step, "+", counters[level], Constant(1, MIRType.INT), location))
+        latch.add_instruction(StoreVar(counters[level], step, location))
+        latch.add_instruction(Jump(header.label, location))
+        cfg.connect(latch, header)
+
+    exit_block.add_instruction(Return(location, levels[0][0][0]))
+    return function
+
+
+VM_WORKLOADS: dict[str, str] = {
+    "loop": """Define `i` as Whole Number.
+Define `total` as Whole Number.
+Set `i` to _0_.
+Set `total` to _0_.
+While `i` < _{n}_:
+> Set `total` to `total` + `i`.
+> Set `i` to `i` + _1_.
+Give back `total`.
+""",
+    "string_concat": """Define `i` as Whole Number.
+Define `text` as Text.
+Set `i` to _0_.
+Set `text` to _""_.
+While `i` < _{n}_:
+> Set `text` to `text` + _"ab"_.
+> Set `i` to `i` + _1_.
+Give back `text`.
+""",
+    "report_lines": """Define `i` as Whole Number.
+Define `report` as Text.
+Define `line` as Text.
+Set `i` to _0_.
+Set `report` to _"Inventory report"_.
+While `i` < _{n}_:
+> Set `line` to _" | widget | in stock"_.
+> Set `report` to `report` + `line`.
+> Set `report` to `report` + _" | ok"_.
+> Set `i` to `i` + _1_.
+Give back `report`.
+""",
+    "report_fields": """Define `i` as Whole Number.
+Define `row` as Named List.
+Define `report` as Text.
+Set `row` to:
+- _"name"_: _"widget"_.
+- _"status"_: _"ok"_.
+Set `report` to _""_.
+Set `i` to _0_.
+While `i` < _{n}_:
+> Add _"name"_ to `row` with value _"gadget"_.
+> Set `report` to `report` + `row`'s _"name"_.
+> Set `report` to `report` + `row`'s _"status"_.
+> Set `i` to `i` + _1_.
+Give back `report`.
+""",
+    "list_mutation": """Define `i` as Whole Number.
+Define `items` as Unordered List.
+Set `items` to blank.
+Set `i` to _0_.
+While `i` < _{n}_:
+> Add `i` to `items`.
+> Insert `i` at position _1_ in `items`.
+> Remove `i` from `items`.
+> Set `i` to `i` + _1_.
+Give back `items`.
+""",
+    "list_fill_update": """Define `i` as Whole Number.
+Define `items` as Unordered List.
+Set `items` to blank.
+Set `i` to _0_.
+While `i` < _{n}_:
+> Add `i` to `items`.
+> Set `i` to `i` + _1_.
+Set `i` to _1_.
+While `i` <= _{n}_:
+> Set item `i` of `items` to `i` * _2_.
+> Set `i` to `i` + _1_.
+Give back `items`.
+""",
+    "dict_ops": """Define `i` as Whole Number.
+Define `table` as Named List.
+Set `table` to:
+- _"seed"_: _0_.
+Set `i` to _0_.
+While `i` < _{n}_:
+> Add _"key"_ to `table` with value `i`.
+> Remove _"key"_ from `table`.
+> Set `i` to `i` + _1_.
+Give back `table`.
+""",
+    "deep_recursion": """### **Utility**: `depth`
+
+<details>
+<summary>Recurse down to zero.</summary>
+
+> If `n` is less than or equal to _0_:
+> > Give back _0_.
+> Else:
+> > Define `next` as Whole Number. \\
+> > Set `next` to `n` - _1_. \\
+> > Define `result` as Whole Number. \\
+> > Set `result` using `depth` with `next`. \\
+> > Give back `result` + _1_.
+
+</details>
+
+#### Inputs:
+
+- `n` **as** Whole Number (required)
+
+#### Outputs:
+
+- `result`
+
+Define `total` as Whole Number.
+Set `total` using `depth` with _{n}_.
+Give back `total`.
+""",
+}
+
+
+def compile_to_mir(source: str, name: str = "bench") -> MIRModule:
+    """Parse and lower a source string to MIR.
+
+    Args:
+        source: Machine Dialect™ source.
+        name: Module name.
+
+    Returns:
+        The unoptimized MIR module.
+
+    Raises:
+        ValueError: If the source does not parse.
+    """
+    parser = Parser()
+    program = parser.parse(source)
+    if parser.has_errors():
+        raise ValueError(f"Benchmark source failed to parse: {parser.errors[0]}")
+    return lower_to_mir(program.to_hir(), name)
+
+
+def _count_tokens(source: str) -> int:
+    lexer = Lexer(source)
+    count = 0
+    while lexer.next_token().type != TokenType.MISC_EOF:
+        count += 1
+    return count
+
+
+def bench_lexer(config: SuiteConfig) -> list[BenchmarkResult]:
+    """Benchmark lexer throughput.
+
+    Args:
+        config: Suite configuration.
+
+    Returns:
+        Benchmark results.
+    """
+    source = straight_line_source(100 * config.scale) + branchy_source(10 * config.scale)
+    samples = measure(lambda _: _count_tokens(source), warmup=config.warmup, repeat=config.repeat)
+    return [BenchmarkResult("lexer.tokens", "lexer", samples, _count_tokens(source), "tokens")]
+
+
+def bench_parser(config: SuiteConfig) -> list[BenchmarkResult]:
+    """Benchmark parser throughput.
+
+    Args:
+        config: Suite configuration.
+
+    Returns:
+        Benchmark results.
+    """
+    source = straight_line_source(100 * config.scale)
+    statements = len(Parser().parse(source).statements)
+    samples = measure(lambda _: Parser().parse(source), warmup=config.warmup, repeat=config.repeat)
+    return [BenchmarkResult("parser.statements", "parser", samples, statements, "statements")]
+
+
+def _optimization_pass_names(manager: PassManager) -> list[str]:
+    names = []
+    for name in manager.registry.list_passes():
+        info = manager.registry.get_info(name)
+        if info is None:
+            continue
+        pass_types = info.pass_type if isinstance(info.pass_type, list) else [info.pass_type]
+        if PassType.ANALYSIS not in pass_types:
+            names.append(name)
+    return sorted(names)
+
+
+def bench_mir_passes(config: SuiteConfig) -> list[BenchmarkResult]:
+    """Benchmark every registered optimization pass on a large synthetic CFG.
+
+    Each timed run operates on a fresh copy of the module and includes the
+    analyses the pass requires.
+
+    Args:
+        config: Suite configuration.
+
+    Returns:
+        One result per pass.
+    """
+    module = compile_to_mir(branchy_source(5 * config.scale))
+    instructions = sum(
+        len(block.instructions) for function in module.functions.values() for block in function.cfg.blocks.values()
+    )
+
+    registry_manager = PassManager()
+    register_all_passes(registry_manager)
+
+    results = []
+    for pass_name in _optimization_pass_names(registry_manager):
+
+        def run(target: MIRModule, pass_name: str = pass_name) -> None:
+            manager = PassManager()
+            register_all_passes(manager)
+            manager.run_passes(target, [pass_name], optimization_level=3)
+
+        result = BenchmarkResult(f"mir.{pass_name}", "mir", items=instructions, unit="instructions")
+        try:
+            result.samples_ns = measure(
+                run, setup=lambda: copy.deepcopy(module), warmup=config.warmup, repeat=config.repeat
+            )
+        except Exception as e:
+            result.skipped = f"failed: {type(e).__name__}: {e}"
+        results.append(result)
+    return results
+
+
+def bench_ssa(config: SuiteConfig) -> list[BenchmarkResult]:
+    """Benchmark SSA construction on a function with many variables in nested loops.
+
+    Args:
+        config: Suite configuration.
+
+    Returns:
+        Benchmark results.
+    """
+    variables = 200 * config.scale
+    function = loop_nest_function(variables, 4 * config.scale)
+    samples = measure(construct_ssa, setup=lambda: copy.deepcopy(function), warmup=config.warmup, repeat=config.repeat)
+    return [BenchmarkResult("ssa.loop_nest", "ssa", samples, variables, "variables")]
+
+
+def bench_codegen(config: SuiteConfig) -> list[BenchmarkResult]:
+    """Benchmark register bytecode generation and serialization.
+
+    Args:
+        config: Suite configuration.
+
+    Returns:
+        Benchmark results.
+    """
+    module = compile_to_mir(utilities_source(10 * config.scale))
+    bytecode_module = RegisterBytecodeGenerator().generate(copy.deepcopy(module))
+    functions = len(module.functions)
+    size = len(bytecode_module.serialize())
+
+    codegen_samples = measure(
+        lambda target: RegisterBytecodeGenerator().generate(target),
+        setup=lambda: copy.deepcopy(module),
+        warmup=config.warmup,
+        repeat=config.repeat,
+    )
+    serialize_samples = measure(lambda _: bytecode_module.serialize(), warmup=config.warmup, repeat=config.repeat)
+    return [
+        BenchmarkResult("codegen.generate", "codegen", codegen_samples, functions, "functions"),
+        BenchmarkResult("codegen.serialize", "codegen", serialize_samples, size, "bytes"),
+    ]
+
+
+def _load_rust_vm() -> Any:
+    try:
+        import machine_dialect_vm
+    except ImportError:
+        return None
+    return getattr(machine_dialect_vm, "RustVM", None)
+
+
+def bench_vm(config: SuiteConfig) -> list[BenchmarkResult]:
+    """Benchmark VM workloads on the Rust VM.
+
+    Args:
+        config: Suite configuration.
+
+    Returns:
+        One result per workload; all are skipped if the VM is not built.
+    """
+    rust_vm = _load_rust_vm()
+    sizes = {"deep_recursion": min(50 * config.scale, 900), "list_fill_update": 10_000 * config.scale}
+
+    results = []
+    with tempfile.TemporaryDirectory() as tmpdir:
+        for name, template in VM_WORKLOADS.items():
+            n = sizes.get(name, 100 * config.scale)
+            result = BenchmarkResult(f"vm.{name}", "vm", items=n, unit="iterations")
+            results.append(result)
+            if rust_vm is None:
+                result.skipped = "Rust VM module not available"
+                continue
+
+            path = Path(tmpdir) / f"{name}.mdbc"
+            try:
+                module = compile_to_mir(template.replace("{n}", str(n)), name)
+                path.write_bytes(RegisterBytecodeGenerator().generate(module).serialize())
+                vm = rust_vm()
+
+                def run(_: object, vm: Any = vm, path: Path = path) -> None:
+                    vm.load_bytecode(str(path))
+                    vm.execute()
+
+                result.samples_ns = measure(run, warmup=config.warmup, repeat=config.repeat)
+            except Exception as e:
+                result.skipped = f"failed: {type(e).__name__}: {e}"
+    return results
+
+
+def bench_vm_threads(config: SuiteConfig) -> list[BenchmarkResult]:
+    """Benchmark VM throughput with programs running on several threads.
+
+    A fixed batch of ``loop`` programs is spread over a thread pool, each
+    thread running on its own pooled VM. ``RustVM.execute`` releases the GIL,
+    so throughput should grow almost linearly with the thread count, up to
+    the number of cores.
+
+    Args:
+        config: Suite configuration.
+
+    Returns:
+        One result per thread count; all are skipped if the VM is not built.
+    """
+    rust_vm = _load_rust_vm()
+    programs = 32
+    source = VM_WORKLOADS["loop"].replace("{n}", str(1000 * config.scale))
+
+    results = [
+        BenchmarkResult(f"vm_threads.{threads}", "vm_threads", items=programs, unit="programs")
+        for threads in THREAD_COUNTS
+    ]
+    if rust_vm is None:
+        for result in results:
+            result.skipped = "Rust VM module not available"
+        return results
+
+    with tempfile.TemporaryDirectory() as tmpdir:
+        path = Path(tmpdir) / "loop.mdbc"
+        path.write_bytes(RegisterBytecodeGenerator().generate(compile_to_mir(source, "loop")).serialize())
+
+        for threads, result in zip(THREAD_COUNTS, results, strict=True):
+            pool = VMPool(rust_vm, max_idle=threads)
+
+            def run_program(_: int, pool: VMPool = pool) -> None:
+                with pool.checkout() as vm:
+                    vm.load_bytecode(str(path))
+                    vm.execute()
+
+            try:
+                with ThreadPoolExecutor(max_workers=threads) as executor:
+
+                    def run(_: object, executor: ThreadPoolExecutor = executor) -> None:
+                        list(executor.map(run_program, range(programs)))
+
+                    result.samples_ns = measure(run, warmup=config.warmup, repeat=config.repeat)
+            except Exception as e:
+                result.skipped = f"failed: {type(e).__name__}: {e}"
+    return results
+
+
+BENCHMARKS: dict[str, Callable[[SuiteConfig], list[BenchmarkResult]]] = {
+    "lexer": bench_lexer,
+    "parser": bench_parser,
+    "mir": bench_mir_passes,
+    "ssa": bench_ssa,
+    "codegen": bench_codegen,
+    "vm": bench_vm,
+    "vm_threads": bench_vm_threads,
+}
+
+
+def run_suite(config: SuiteConfig | None = None, groups: list[str] | None = None) -> list[BenchmarkResult]:
+    """Run the benchmark suite.
+
+    Args:
+        config: Suite configuration.
+        groups: Groups to run, or None for all.
+
+    Returns:
+        Benchmark results in group order.
+
+    Raises:
+        ValueError: If an unknown group is requested.
+    """
+    config = config or SuiteConfig()
+    selected = groups or list(GROUPS)
+    unknown = [group for group in selected if group not in BENCHMARKS]
+    if unknown:
+        raise ValueError(f"Unknown benchmark group(s): {', '.join(unknown)}")
+
+    results = []
+    for group in selected:
+        results.extend(BENCHMARKS[group](config))
+    return results
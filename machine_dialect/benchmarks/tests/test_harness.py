@@ -0,0 +1,135 @@
+"""Tests for the benchmark harness and suite."""
+
+import tempfile
+from pathlib import Path
+
+import pytest
+
+from machine_dialect.benchmarks.harness import (
+    BenchmarkResult,
+    compare_to_baseline,
+    load_baseline,
+    measure,
+    write_results,
+)
+from machine_dialect.benchmarks.suite import (
+    VM_WORKLOADS,
+    SuiteConfig,
+    branchy_source,
+    compile_to_mir,
+    loop_nest_function,
+    run_suite,
+    straight_line_source,
+    utilities_source,
+)
+from machine_dialect.codegen.register_codegen import RegisterBytecodeGenerator
+from machine_dialect.mir.mir_values import Variable
+from machine_dialect.mir.ssa_construction import construct_ssa
+
+
+class TestHarness:
+    """Test timing, statistics and baseline comparison."""
+
+    def test_measure_runs_setup_before_each_iteration(self) -> None:
+        """Test that setup runs once per warmup and timed run."""
+        calls: list[int] = []
+
+        samples = measure(lambda value: calls.append(value), setup=lambda: len(calls), warmup=2, repeat=3)
+
+        assert len(samples) == 3
+        assert calls == [0, 1, 2, 3, 4]
+
+    def test_result_statistics(self) -> None:
+        """Test the summary statistics of a result."""
+        result = BenchmarkResult("x", "g", [1_000_000, 2_000_000, 3_000_000], items=10, unit="items")
+
+        assert result.median_ms == 2.0
+        assert result.min_ms == 1.0
+        assert result.mean_ms == 2.0
+        assert result.stdev_ms == 1.0
+        assert result.throughput == pytest.approx(5000.0)
+
+    def test_compare_to_baseline(self) -> None:
+        """Test that only slowdowns beyond the threshold are reported."""
+        results = [
+            BenchmarkResult("fast", "g", [1_000_000]),
+            BenchmarkResult("slow", "g", [2_000_000]),
+            BenchmarkResult("noisy", "g", [1_050_000]),
+            BenchmarkResult("new", "g", [5_000_000]),
+            BenchmarkResult("skipped", "g", skipped="no VM"),
+        ]
+        baseline = {
+            "fast": {"median_ms": 2.0},
+            "slow": {"median_ms": 1.0},
+            "noisy": {"median_ms": 1.0},
+            "skipped": {"median_ms": 1.0},
+        }
+
+        regressions = compare_to_baseline(results, baseline, threshold=0.10)
+
+        assert [r.name for r in regressions] == ["slow"]
+        assert regressions[0].ratio == 2.0
+
+    def test_results_round_trip(self) -> None:
+        """Test that written results can be used as a baseline."""
+        results = [BenchmarkResult("x", "g", [1_000_000, 3_000_000], items=4, unit="items")]
+
+        with tempfile.TemporaryDirectory() as tmpdir:
+            path = Path(tmpdir) / "results.json"
+            write_results(results, path)
+            baseline = load_baseline(path)
+
+        assert baseline["x"]["median_ms"] == 2.0
+        assert baseline["x"]["samples_ns"] == [1_000_000, 3_000_000]
+        assert compare_to_baseline(results, baseline) == []
+
+    def test_load_baseline_rejects_other_json(self) -> None:
+        """Test that a non-results JSON document is rejected."""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            path = Path(tmpdir) / "other.json"
+            path.write_text("[1, 2, 3]")
+
+            with pytest.raises(ValueError, match="Not a benchmark results file"):
+                load_baseline(path)
+
+
+class TestSuite:
+    """Test the benchmark workloads."""
+
+    @pytest.mark.parametrize("source", [straight_line_source(20), branchy_source(3), utilities_source(3)])
+    def test_generated_sources_compile(self, source: str) -> None:
+        """Test that the synthetic programs parse and lower to MIR."""
+        module = compile_to_mir(source)
+
+        assert module.get_function("__main__") is not None
+
+    @pytest.mark.parametrize("name", list(VM_WORKLOADS))
+    def test_vm_workloads_generate_bytecode(self, name: str) -> None:
+        """Test that every VM workload compiles down to register bytecode."""
+        module = compile_to_mir(VM_WORKLOADS[name].replace("{n}", "10"), name)
+
+        assert RegisterBytecodeGenerator().generate(module).serialize()
+
+    def test_quick_run(self) -> None:
+        """Test a minimal run of the compiler benchmark groups."""
+        results = run_suite(SuiteConfig(warmup=0, repeat=1, scale=1), ["lexer", "parser", "ssa", "codegen"])
+
+        names = [result.name for result in results]
+        assert names == ["lexer.tokens", "parser.statements", "ssa.loop_nest", "codegen.generate", "codegen.serialize"]
+        assert all(len(result.samples_ns) == 1 and result.items > 0 for result in results)
+
+    def test_loop_nest_phis(self) -> None:
+        """Test that only values live at loop headers get phi nodes in the SSA benchmark function."""
+        function = loop_nest_function(8, 2)
+
+        construct_ssa(function)
+
+        phis = {
+            block.label: sorted(phi.dest.name for phi in block.phi_nodes if isinstance(phi.dest, Variable))
+            for block in function.cfg.blocks.values()
+            if block.phi_nodes
+        }
+        assert phis == {
+            "header0": ["acc0_0", "acc0_1", "acc1_0", "acc1_1", "i0"],
+            "header1": ["acc1_0", "acc1_1", "i1"],
+        }
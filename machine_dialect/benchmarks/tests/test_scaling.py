@@ -0,0 +1,76 @@
+"""Tests for the program generator and scaling benchmark."""
+
+from pathlib import Path
+
+import pytest
+
+from machine_dialect.benchmarks.generator import SHAPES, generate_program, write_corpus
+from machine_dialect.benchmarks.scaling import ScalingResult, run_scaling
+from machine_dialect.benchmarks.suite import compile_to_mir
+
+
+class TestGenerator:
+    """Test the deterministic program generator."""
+
+    @pytest.mark.parametrize("shape", list(SHAPES))
+    def test_shapes_compile(self, shape: str) -> None:
+        """Test that every shape produces a valid program."""
+        module = compile_to_mir(generate_program(shape, 3))
+
+        assert module.get_function("__main__") is not None
+
+    def test_deterministic(self) -> None:
+        """Test that the same arguments produce the same source."""
+        assert generate_program("straight_line", 50, seed=1) == generate_program("straight_line", 50, seed=1)
+        assert generate_program("straight_line", 50, seed=1) != generate_program("straight_line", 50, seed=2)
+
+    def test_size_controls_program_length(self) -> None:
+        """Test that the source grows with the requested size."""
+        assert generate_program("utilities", 20).count("### **Utility**") == 20
+        assert generate_program("named_list", 30).count('- _"key') == 30
+
+    def test_unknown_shape(self) -> None:
+        """Test that an unknown shape is rejected."""
+        with pytest.raises(ValueError, match="Unknown program shape"):
+            generate_program("spiral", 1)
+
+    def test_write_corpus(self, tmp_path: Path) -> None:
+        """Test writing generated programs to disk."""
+        paths = write_corpus(tmp_path, [1, 2], ["nested"])
+
+        assert [path.name for path in paths] == ["nested_1.md", "nested_2.md"]
+        assert paths[1].read_text(encoding="utf-8") == generate_program("nested", 2)
+
+
+class TestScaling:
+    """Test growth estimation and the scaling run."""
+
+    def test_exponent(self) -> None:
+        """Test the fitted growth exponent."""
+        linear = ScalingResult("s", "p", [1, 10, 100], [2.0, 20.0, 200.0])
+        quadratic = ScalingResult("s", "p", [1, 10, 100], [1.0, 100.0, 10_000.0])
+
+        assert linear.exponent == pytest.approx(1.0)
+        assert not linear.is_superlinear()
+        assert quadratic.exponent == pytest.approx(2.0)
+        assert quadratic.is_superlinear()
+        assert ScalingResult("s", "p", [1], [1.0]).exponent is None
+
+    def test_run_scaling(self) -> None:
+        """Test a minimal scaling run."""
+        results = run_scaling([1, 2], ["utilities"], repeat=1)
+
+        assert [result.phase for result in results] == ["lexer", "parser", "hir", "mir", "codegen", "serialize"]
+        for result in results:
+            assert result.error is None
+            assert result.sizes == [4, 8]
+            assert result.exponent is not None
+
+    def test_run_scaling_records_phase_failures(self) -> None:
+        """Test that a failing phase stops that phase and the ones after it."""
+        results = {result.phase: result for result in run_scaling([1, 100], ["straight_line"], repeat=1)}
+
+        assert results["mir"].sizes == [25, 2500]
+        assert results["codegen"].error is not None
+        assert "Out of registers" in results["codegen"].error
+        assert results["serialize"].error is not None
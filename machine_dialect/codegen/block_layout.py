@@ -0,0 +1,311 @@
+"""Basic block layout for register bytecode generation.
+
+The bytecode generator emits blocks one after another, and every jump whose
+target is the next block can be left out. This module picks an order that
+makes as many jumps as possible fall through:
+
+1. Blocks are chained along their preferred successor: the target of a
+   jump, or the likely target of a conditional jump. Without a profile the
+   false target is preferred, which keeps the ``JUMP_IF_R`` the peephole
+   optimizer fuses with its comparison.
+2. The blocks of a loop are kept together, and a loop whose header tests
+   the condition is rotated: the body comes first and the header follows
+   its latch, so each iteration runs one jump instead of two.
+3. Cold blocks, which always fail an assertion or are only reached over
+   branches that ``BranchPredictionOptimization`` found rarely taken, are
+   moved after all other blocks.
+"""
+
+from machine_dialect.mir.analyses.loop_analysis import Loop, LoopAnalysis
+from machine_dialect.mir.basic_block import BasicBlock
+from machine_dialect.mir.mir_function import MIRFunction
+from machine_dialect.mir.mir_instructions import Assert, ConditionalJump, Jump, LoadConst
+from machine_dialect.mir.mir_values import Constant, MIRValue
+
+# Branches taken with at most this probability lead to cold code
+COLD_PROBABILITY = 0.05
+
+
+def fallthrough_successor(block: BasicBlock) -> BasicBlock | None:
+    """Get the successor a block continues with when it does not jump.
+
+    A block without a terminator continues with its successor, and a
+    conditional jump without a false label continues with its other
+    successor. These must be laid out next or given an explicit jump.
+
+    Args:
+        block: The block.
+
+    Returns:
+        The successor reached without a jump, or None.
+    """
+    terminator = block.get_terminator()
+    if terminator is None:
+        return block.successors[0] if block.successors else None
+    if isinstance(terminator, ConditionalJump) and terminator.false_label is None:
+        for succ in block.successors:
+            if succ.label != terminator.true_label:
+                return succ
+    return None
+
+
+def _is_cold_edge(block: BasicBlock, succ: BasicBlock) -> bool:
+    """Check if the profile says an edge is rarely taken.
+
+    Args:
+        block: Source of the edge.
+        succ: Target of the edge.
+
+    Returns:
+        True if the branch to the target is taken with low probability.
+    """
+    terminator = block.get_terminator()
+    probability = getattr(terminator, "taken_probability", None)
+    if not isinstance(terminator, ConditionalJump) or probability is None:
+        return False
+    if succ.label == terminator.true_label:
+        return bool(probability <= COLD_PROBABILITY)
+    return bool(probability >= 1 - COLD_PROBABILITY)
+
+
+def _always_fails(block: BasicBlock) -> bool:
+    """Check if a block asserts a false constant, as error statements do.
+
+    Args:
+        block: The block.
+
+    Returns:
+        True if the block always stops with an assertion failure.
+    """
+    false_values: set[MIRValue] = set()
+    for inst in block.instructions:
+        if isinstance(inst, LoadConst) and isinstance(inst.constant, Constant) and inst.constant.value is False:
+            false_values.add(inst.dest)
+        elif isinstance(inst, Assert):
+            condition = inst.condition
+            if (isinstance(condition, Constant) and condition.value is False) or condition in false_values:
+                return True
+    return False
+
+
+class BlockLayout:
+    """Orders the blocks of a function for bytecode generation.
+
+    Attributes:
+        order: Blocks reachable from the entry in reverse postorder.
+        cold_blocks: Blocks moved after all others.
+    """
+
+    def __init__(self, function: MIRFunction) -> None:
+        """Initialize block layout.
+
+        Args:
+            function: The function to lay out.
+        """
+        self.function = function
+        entry = function.cfg.entry_block
+        self.order = self._reverse_postorder(entry) if entry else []
+        self._rank = {block: position for position, block in enumerate(self.order)}
+        self.cold_blocks = self._find_cold_blocks()
+
+        # Loops around each block, innermost first, and their blocks still to place
+        self._loops: dict[BasicBlock, list[Loop]] = {block: [] for block in self.order}
+        self._unplaced: dict[int, int] = {}
+        if self.order:
+            loop_info = LoopAnalysis().run_on_function(function)
+            for loop in sorted(loop_info.loops, key=lambda loop: len(loop.blocks)):
+                members = [block for block in loop.blocks if block in self._rank and block not in self.cold_blocks]
+                for block in members:
+                    self._loops[block].append(loop)
+                self._unplaced[id(loop)] = len(members)
+        self._placed: set[BasicBlock] = set()
+        self._cursor = 0
+
+    def layout(self) -> list[BasicBlock]:
+        """Compute the block order.
+
+        Returns:
+            Reachable blocks in emission order, starting with the entry.
+        """
+        blocks: list[BasicBlock] = []
+        chain: BasicBlock | None = self.order[0] if self.order else None
+        while chain is not None:
+            block: BasicBlock | None = chain
+            while block is not None:
+                self._place(block)
+                blocks.append(block)
+                block = self._next_in_chain(block)
+                if block is not None:
+                    block = self._rotate(block)
+
+            start = self._next_chain_start(blocks[-1])
+            chain = self._rotate(start) if start is not None else None
+        return blocks
+
+    def _reverse_postorder(self, entry: BasicBlock) -> list[BasicBlock]:
+        """Order the blocks reachable from the entry depth-first.
+
+        Args:
+            entry: The entry block.
+
+        Returns:
+            Reachable blocks in reverse postorder.
+        """
+        postorder: list[BasicBlock] = []
+        visited = {entry}
+        stack = [(entry, iter(entry.successors))]
+        while stack:
+            block, successors = stack[-1]
+            for succ in successors:
+                if succ not in visited:
+                    visited.add(succ)
+                    stack.append((succ, iter(succ.successors)))
+                    break
+            else:
+                stack.pop()
+                postorder.append(block)
+        postorder.reverse()
+        return postorder
+
+    def _find_cold_blocks(self) -> set[BasicBlock]:
+        """Find blocks that always fail or are only reached over cold edges.
+
+        Returns:
+            The cold blocks; the entry is never cold.
+        """
+        cold = {block for block in self.order[1:] if _always_fails(block)}
+        changed = True
+        while changed:
+            changed = False
+            for block in self.order[1:]:
+                if block in cold:
+                    continue
+                preds = [pred for pred in block.predecessors if pred in self._rank]
+                if preds and all(pred in cold or _is_cold_edge(pred, block) for pred in preds):
+                    cold.add(block)
+                    changed = True
+        return cold
+
+    def _place(self, block: BasicBlock) -> None:
+        """Mark a block as placed.
+
+        Args:
+            block: The block.
+        """
+        self._placed.add(block)
+        for loop in self._loops.get(block, []):
+            self._unplaced[id(loop)] -= 1
+
+    def _preferred_successors(self, block: BasicBlock) -> list[BasicBlock]:
+        """Get the successors worth placing after a block, best first.
+
+        Args:
+            block: The block.
+
+        Returns:
+            Successors in order of preference.
+        """
+        implicit = fallthrough_successor(block)
+        if implicit is not None:
+            return [implicit]
+
+        terminator = block.get_terminator()
+        labels: list[str] = []
+        if isinstance(terminator, Jump):
+            labels = [terminator.label]
+        elif isinstance(terminator, ConditionalJump):
+            labels = [terminator.true_label]
+            if terminator.false_label is not None:
+                if getattr(terminator, "taken_probability", 0.0) >= 0.5:
+                    labels.append(terminator.false_label)
+                else:
+                    labels.insert(0, terminator.false_label)
+        blocks = self.function.cfg.blocks
+        return [blocks[label] for label in labels if label in blocks]
+
+    def _next_in_chain(self, block: BasicBlock) -> BasicBlock | None:
+        """Pick the block to place right after another.
+
+        Args:
+            block: The block placed last.
+
+        Returns:
+            An unplaced successor, or None to start a new chain.
+        """
+        for succ in self._preferred_successors(block):
+            if succ in self._placed or succ not in self._rank:
+                continue
+            if succ in self.cold_blocks and block not in self.cold_blocks:
+                continue
+            # Finish a loop before laying out the code after it
+            if any(succ not in loop.blocks and self._unplaced[id(loop)] for loop in self._loops[block]):
+                continue
+            return succ
+        return None
+
+    def _next_chain_start(self, last: BasicBlock) -> BasicBlock | None:
+        """Pick the block to start a new chain with.
+
+        Args:
+            last: The block placed last.
+
+        Returns:
+            The first unplaced block of the innermost unfinished loop around
+            the last block, else the first unplaced block in reverse
+            postorder, with cold blocks last.
+        """
+        for loop in self._loops.get(last, []):
+            if self._unplaced[id(loop)]:
+                members = [block for block in loop.blocks if block in self._rank and block not in self._placed]
+                return min((block for block in members if block not in self.cold_blocks), key=self._rank.__getitem__)
+
+        while self._cursor < len(self.order) and self.order[self._cursor] in self._placed:
+            self._cursor += 1
+        remaining = self.order[self._cursor :]
+        for block in remaining:
+            if block not in self._placed and block not in self.cold_blocks:
+                return block
+        for block in remaining:
+            if block not in self._placed:
+                return block
+        return None
+
+    def _rotate(self, block: BasicBlock) -> BasicBlock:
+        """Start a loop entered at its header with the body instead.
+
+        The header is then placed after the latch that jumps back to it,
+        and falls through to the loop exit.
+
+        Args:
+            block: The block about to be placed.
+
+        Returns:
+            The first block of the loop body, or the block itself.
+        """
+        terminator = block.get_terminator()
+        loops = self._loops.get(block, [])
+        if not isinstance(terminator, ConditionalJump) or not loops or loops[0].header is not block:
+            return block
+        loop = loops[0]
+        if any(member in self._placed for member in loop.blocks):
+            return block
+
+        inside = [succ for succ in block.successors if succ in loop.blocks]
+        if len(inside) != 1 or len(block.successors) != 2:
+            return block
+        body = inside[0]
+        if body is block or body in self.cold_blocks or fallthrough_successor(block) is not None:
+            return block
+        return body
+
+
+def layout_blocks(function: MIRFunction) -> list[BasicBlock]:
+    """Order the blocks of a function for bytecode generation.
+
+    Args:
+        function: The function.
+
+    Returns:
+        Blocks reachable from the entry in emission order.
+    """
+    return BlockLayout(function).layout()
@@ -18,6 +18,7 @@ BYTECODE_VERSION = 1
 
 # Flags
 FLAG_LITTLE_ENDIAN = 0x0001
+FLAG_FUNCTION_REGISTERS = 0x0002  # Function table entries carry a u16 register count
 
 
 class BytecodeWriter:
@@ -0,0 +1,461 @@
+"""Disassembler for register-based bytecode.
+
+This module decodes ``.mdbc`` files (as written by ``VMBytecodeSerializer``)
+back into a human-readable listing of the module's constants, function table
+and register instructions, with jump targets resolved to instruction indices.
+
+When a VM profile with per-instruction hit counts is supplied (see
+``RustVM.enable_profiling(track_pcs=True)``), every instruction is annotated
+with its execution count and share of the total, and the hottest loops are
+summarized per function, in the spirit of ``perf annotate``.
+"""
+
+from __future__ import annotations
+
+import struct
+from collections.abc import Mapping
+from dataclasses import dataclass, field
+from typing import Any
+
+from machine_dialect.codegen.bytecode_module import BytecodeModule, ConstantTag
+from machine_dialect.codegen.bytecode_serializer import FLAG_FUNCTION_REGISTERS, MAGIC_NUMBER
+from machine_dialect.codegen.opcodes import Opcode, TypeId
+from machine_dialect.codegen.vm_serializer import INSTRUCTION_FORMATS, VMBytecodeSerializer
+
+# Byte operands that are immediates rather than registers, by operand position
+_IMMEDIATE_BYTE_OPERANDS: dict[int, set[int]] = {
+    Opcode.NEW_ARRAY_R: {1},
+    Opcode.ASSERT_R: {1},
+    Opcode.MEMO_LOOKUP_R: {1},
+    Opcode.MEMO_STORE_R: {1},
+}
+
+# Opcodes whose u16 operand is a type id
+_TYPE_OPERAND_OPCODES = {Opcode.DEFINE_R, Opcode.CHECK_TYPE_R, Opcode.CAST_R}
+
+# Opcodes with a relative jump offset
+_JUMP_OPCODES = {Opcode.JUMP_R, Opcode.JUMP_IF_R, Opcode.JUMP_IF_NOT_R, Opcode.CMP_JUMP_R, Opcode.CMP_CONST_JUMP_R}
+
+# Fused compare instructions, whose first operand is a comparison opcode
+_COMPARE_OPCODES = {Opcode.CMP_JUMP_R, Opcode.CMP_CONST_R, Opcode.CMP_CONST_JUMP_R}
+_COMPARE_SYMBOLS = {
+    Opcode.EQ_R: "==",
+    Opcode.NEQ_R: "!=",
+    Opcode.LT_R: "<",
+    Opcode.GT_R: ">",
+    Opcode.LTE_R: "<=",
+    Opcode.GTE_R: ">=",
+}
+
+
+class DisassemblyError(Exception):
+    """Raised when bytecode cannot be decoded."""
+
+
+@dataclass
+class DecodedInstruction:
+    """A single decoded instruction.
+
+    Attributes:
+        index: Instruction index (the VM program counter).
+        opcode: Raw opcode byte.
+        name: Opcode mnemonic.
+        operands: Formatted operand list.
+        comment: Extra information (constant values, jump targets, callees).
+        target: Absolute jump target for jump instructions.
+        raw: Encoded instruction bytes.
+    """
+
+    index: int
+    opcode: int
+    name: str
+    operands: str = ""
+    comment: str = ""
+    target: int | None = None
+    raw: bytes = b""
+
+
+@dataclass
+class BytecodeImage:
+    """Decoded contents of a ``.mdbc`` file.
+
+    Attributes:
+        name: Module name.
+        constants: Global constant pool.
+        functions: Function name to entry instruction index.
+        registers: Function name to register count (empty for bytecode
+            written without register counts).
+        instructions: Decoded instructions.
+    """
+
+    name: str
+    constants: list[tuple[ConstantTag, Any]] = field(default_factory=list)
+    functions: dict[str, int] = field(default_factory=dict)
+    registers: dict[str, int] = field(default_factory=dict)
+    instructions: list[DecodedInstruction] = field(default_factory=list)
+
+    def function_ranges(self) -> list[tuple[str, int, int]]:
+        """Split the instruction stream into functions.
+
+        Instructions before the first function entry belong to ``main``.
+
+        Returns:
+            ``(name, start, end)`` tuples with ``end`` exclusive, in address order.
+        """
+        entries = sorted((offset, name) for name, offset in self.functions.items())
+        if not entries or entries[0][0] > 0:
+            entries.insert(0, (0, "main"))
+
+        ranges = []
+        for i, (start, name) in enumerate(entries):
+            end = entries[i + 1][0] if i + 1 < len(entries) else len(self.instructions)
+            ranges.append((name, start, end))
+        return ranges
+
+
+class _Reader:
+    """Little-endian reader over a byte buffer."""
+
+    def __init__(self, data: bytes) -> None:
+        self.data = data
+        self.pos = 0
+
+    def read(self, fmt: str) -> Any:
+        size = struct.calcsize(fmt)
+        if self.pos + size > len(self.data):
+            raise DisassemblyError(f"Unexpected end of bytecode at offset {self.pos}")
+        value = struct.unpack_from(fmt, self.data, self.pos)[0]
+        self.pos += size
+        return value
+
+    def read_bytes(self, size: int) -> bytes:
+        if self.pos + size > len(self.data):
+            raise DisassemblyError(f"Unexpected end of bytecode at offset {self.pos}")
+        value = self.data[self.pos : self.pos + size]
+        self.pos += size
+        return value
+
+    def read_string(self) -> str:
+        return self.read_bytes(self.read("<I")).decode("utf-8")
+
+
+def read_bytecode(data: bytes) -> BytecodeImage:
+    """Decode a serialized ``.mdbc`` module.
+
+    Args:
+        data: File contents.
+
+    Returns:
+        The decoded module.
+
+    Raises:
+        DisassemblyError: If the data is not valid bytecode.
+    """
+    if data[:4] != MAGIC_NUMBER:
+        raise DisassemblyError("Invalid magic number (not a Machine Dialect™ bytecode file)")
+
+    reader = _Reader(data)
+    reader.pos = 8  # magic + version
+    flags = reader.read("<I")
+    name_offset = reader.read("<I")
+    const_offset = reader.read("<I")
+    func_offset = reader.read("<I")
+    inst_offset = reader.read("<I")
+
+    reader.pos = name_offset
+    image = BytecodeImage(name=reader.read_string())
+
+    reader.pos = const_offset
+    for _ in range(reader.read("<I")):
+        raw_tag = reader.read("<B")
+        try:
+            tag = ConstantTag(raw_tag)
+        except ValueError as e:
+            raise DisassemblyError(f"Invalid constant tag {raw_tag:#04x}") from e
+        value: Any
+        if tag == ConstantTag.INT:
+            value = reader.read("<q")
+        elif tag == ConstantTag.FLOAT:
+            value = reader.read("<d")
+        elif tag == ConstantTag.STRING:
+            value = reader.read_string()
+        elif tag == ConstantTag.BOOL:
+            value = reader.read("<B") != 0
+        else:
+            value = None
+        image.constants.append((tag, value))
+
+    reader.pos = func_offset
+    for _ in range(reader.read("<I")):
+        func_name = reader.read_string()
+        image.functions[func_name] = reader.read("<I")
+        if flags & FLAG_FUNCTION_REGISTERS:
+            image.registers[func_name] = reader.read("<H")
+
+    reader.pos = inst_offset
+    count = reader.read("<I")
+    image.instructions = decode_instructions(data[reader.pos :], image.constants)
+    if len(image.instructions) != count:
+        raise DisassemblyError(f"Expected {count} instructions, decoded {len(image.instructions)}")
+    return image
+
+
+def decode_instructions(
+    bytecode: bytes, constants: list[tuple[ConstantTag, Any]] | None = None
+) -> list[DecodedInstruction]:
+    """Decode raw register bytecode.
+
+    Args:
+        bytecode: Instruction bytes.
+        constants: Constant pool used to annotate constant operands.
+
+    Returns:
+        Decoded instructions.
+
+    Raises:
+        DisassemblyError: If an instruction is truncated.
+    """
+    decoded = []
+    for index, raw in enumerate(VMBytecodeSerializer.parse_instructions(bytecode)):
+        try:
+            decoded.append(_decode(index, raw, constants or []))
+        except (struct.error, IndexError) as e:
+            raise DisassemblyError(f"Truncated instruction at index {index}: {raw.hex()}") from e
+
+    _annotate_callees(decoded, constants or [])
+    return decoded
+
+
+def _decode(index: int, raw: bytes, constants: list[tuple[ConstantTag, Any]]) -> DecodedInstruction:
+    """Decode a single instruction.
+
+    Args:
+        index: Instruction index.
+        raw: Encoded instruction.
+        constants: Constant pool.
+
+    Returns:
+        The decoded instruction.
+    """
+    opcode = raw[0]
+    fmt = INSTRUCTION_FORMATS.get(opcode)
+    if fmt is None:
+        return DecodedInstruction(index, opcode, f"UNKNOWN_{opcode:#04x}", raw=raw)
+
+    inst = DecodedInstruction(index, opcode, fmt.name, raw=raw)
+
+    if opcode == Opcode.CALL_R:
+        func, dst, num_args = raw[1], raw[2], raw[3]
+        args = ", ".join(f"r{r}" for r in raw[4 : 4 + num_args])
+        inst.operands = f"r{dst}, r{func}({args})"
+    elif opcode == Opcode.TAIL_CALL_R:
+        func, num_args = raw[1], raw[2]
+        args = ", ".join(f"r{r}" for r in raw[3 : 3 + num_args])
+        inst.operands = f"r{func}({args})"
+    elif opcode == Opcode.RETURN_R:
+        inst.operands = f"r{raw[2]}" if raw[1] else ""
+    elif opcode == Opcode.PHI_R:
+        dst, num_sources = raw[1], raw[2]
+        sources = [struct.unpack_from("<BH", raw, 3 + i * 3) for i in range(num_sources)]
+        inst.operands = f"r{dst}, [" + ", ".join(f"r{src} from {block}" for src, block in sources) + "]"
+    else:
+        values = struct.unpack("<" + fmt.operand_format, raw[1:])
+        operands = []
+        for position, (kind, value) in enumerate(zip(fmt.operand_format, values, strict=True)):
+            if kind == "B" and position == 0 and opcode in _COMPARE_OPCODES:
+                operands.append(_COMPARE_SYMBOLS.get(value, f"cmp({value})"))
+            elif kind == "B":
+                is_immediate = position in _IMMEDIATE_BYTE_OPERANDS.get(opcode, set())
+                operands.append(str(value) if is_immediate else f"r{value}")
+            elif kind == "H" and opcode in _TYPE_OPERAND_OPCODES:
+                operands.append(_type_name(value))
+            elif kind == "H" and fmt.has_const_operand:
+                operands.append(f"#{value}")
+                inst.comment = _format_constant(constants, value)
+            elif kind == "i":
+                inst.target = index + 1 + value
+                operands.append(f"{value:+d}")
+                inst.comment = f"{inst.comment}, -> {inst.target}" if inst.comment else f"-> {inst.target}"
+            else:
+                operands.append(str(value))
+        inst.operands = ", ".join(operands)
+
+    return inst
+
+
+def _type_name(type_id: int) -> str:
+    try:
+        return TypeId(type_id).name
+    except ValueError:
+        return f"type({type_id})"
+
+
+def _format_constant(constants: list[tuple[ConstantTag, Any]], idx: int) -> str:
+    if idx >= len(constants):
+        return "<out of range>" if constants else ""
+    tag, value = constants[idx]
+    if tag == ConstantTag.STRING:
+        return repr(value)
+    if tag == ConstantTag.EMPTY:
+        return "empty"
+    return str(value)
+
+
+def _annotate_callees(instructions: list[DecodedInstruction], constants: list[tuple[ConstantTag, Any]]) -> None:
+    """Name the callee of calls whose function register holds a string constant.
+
+    Args:
+        instructions: Decoded instructions, annotated in place.
+        constants: Constant pool.
+    """
+    loaded: dict[int, int] = {}
+    for inst in instructions:
+        if inst.opcode == Opcode.LOAD_CONST_R:
+            dst, idx = struct.unpack("<BH", inst.raw[1:4])
+            loaded[dst] = idx
+        elif inst.opcode in (Opcode.CALL_R, Opcode.TAIL_CALL_R):
+            idx_or_none = loaded.get(inst.raw[1])
+            if idx_or_none is not None and idx_or_none < len(constants):
+                tag, value = constants[idx_or_none]
+                if tag == ConstantTag.STRING:
+                    inst.comment = f"call {value}" if inst.opcode == Opcode.CALL_R else f"tail call {value}"
+        elif inst.opcode in _JUMP_OPCODES or inst.opcode == Opcode.RETURN_R:
+            # Register contents are unknown past control flow
+            loaded.clear()
+
+
+def find_loops(instructions: list[DecodedInstruction], start: int = 0, end: int | None = None) -> list[tuple[int, int]]:
+    """Find loops as backward jumps within an instruction range.
+
+    Args:
+        instructions: Decoded instructions.
+        start: First instruction index to consider.
+        end: End of the range (exclusive); defaults to the end of the stream.
+
+    Returns:
+        ``(header, latch)`` pairs where ``latch`` is the backward jump.
+    """
+    end = len(instructions) if end is None else end
+    loops = []
+    for inst in instructions[start:end]:
+        if inst.target is not None and start <= inst.target <= inst.index:
+            loops.append((inst.target, inst.index))
+    return loops
+
+
+def disassemble(
+    data: bytes,
+    profile: Mapping[str, Any] | None = None,
+    hot_threshold: float = 0.05,
+) -> str:
+    """Produce a textual disassembly of a ``.mdbc`` module.
+
+    Args:
+        data: Serialized module.
+        profile: VM profile as returned by ``RustVM.get_profile()``, collected
+            with ``track_pcs=True``.
+        hot_threshold: Fraction of all executed instructions at which an
+            instruction or loop is reported as hot.
+
+    Returns:
+        The disassembly listing.
+
+    Raises:
+        DisassemblyError: If the data is not valid bytecode.
+        ValueError: If the profile has no per-instruction hit counts.
+    """
+    image = read_bytecode(data)
+
+    hits: dict[int, int] | None = None
+    if profile is not None:
+        pc_hits = profile.get("pc_hits")
+        if pc_hits is None:
+            raise ValueError("Profile has no per-instruction counts; enable profiling with track_pcs=True")
+        hits = {int(pc): int(count) for pc, count in pc_hits.items()}
+    total = sum(hits.values()) if hits else 0
+
+    lines = [f"Module: {image.name}", "", f"Constants ({len(image.constants)}):"]
+    for idx, (tag, _) in enumerate(image.constants):
+        lines.append(f"  [{idx:>3}] {tag.name:<6} {_format_constant(image.constants, idx)}")
+
+    lines.extend(["", f"Functions ({len(image.functions)}):"])
+    for func_name, offset in image.functions.items():
+        registers = f" ({image.registers[func_name]} registers)" if func_name in image.registers else ""
+        lines.append(f"  {func_name} @ {offset}{registers}")
+
+    for func_name, start, end in image.function_ranges():
+        lines.extend(["", f"{func_name}:"])
+        loop_headers = {header for header, _ in find_loops(image.instructions, start, end)}
+        for inst in image.instructions[start:end]:
+            prefix = ""
+            if hits is not None:
+                count = hits.get(inst.index, 0)
+                share = count / total if total else 0.0
+                marker = "*" if share >= hot_threshold else " "
+                prefix = f"{count:>10} {share:>6.1%} {marker} "
+            label = ">" if inst.index in loop_headers else " "
+            text = f"{inst.name:<16} {inst.operands}".rstrip()
+            comment = f"  ; {inst.comment}" if inst.comment else ""
+            lines.append(f"  {prefix}{label}{inst.index:>5}  {text:<40}{comment}".rstrip())
+
+        if hits is not None:
+            lines.extend(_hot_loop_summary(image.instructions, start, end, hits, total, hot_threshold))
+
+    return "\n".join(lines) + "\n"
+
+
+def _hot_loop_summary(
+    instructions: list[DecodedInstruction],
+    start: int,
+    end: int,
+    hits: dict[int, int],
+    total: int,
+    hot_threshold: float,
+) -> list[str]:
+    """Summarize the loops of a function whose share of execution is above the threshold.
+
+    Args:
+        instructions: Decoded instructions.
+        start: First instruction of the function.
+        end: End of the function (exclusive).
+        hits: Per-instruction hit counts.
+        total: Total executed instructions.
+        hot_threshold: Minimum share to report.
+
+    Returns:
+        Summary lines (empty if no loop is hot).
+    """
+    loops = []
+    for header, latch in set(find_loops(instructions, start, end)):
+        count = sum(hits.get(pc, 0) for pc in range(header, latch + 1))
+        if total and count / total >= hot_threshold:
+            loops.append((count, header, latch))
+
+    if not loops:
+        return []
+
+    lines = ["  Hot loops:"]
+    for count, header, latch in sorted(loops, reverse=True):
+        lines.append(
+            f"    {header}..{latch}: {count} instructions ({count / total:.1%}), header hit {hits.get(header, 0)}x"
+        )
+    return lines
+
+
+def disassemble_module(
+    module: BytecodeModule, profile: Mapping[str, Any] | None = None, hot_threshold: float = 0.05
+) -> str:
+    """Disassemble a bytecode module as it will be loaded by the VM.
+
+    The module is serialized first, so the listing shows the remapped global
+    constant pool and final instruction indices.
+
+    Args:
+        module: Bytecode module.
+        profile: Optional VM profile (see ``disassemble``).
+        hot_threshold: Hot instruction/loop threshold (see ``disassemble``).
+
+    Returns:
+        The disassembly listing.
+    """
+    return disassemble(VMBytecodeSerializer.serialize(module), profile, hot_threshold)
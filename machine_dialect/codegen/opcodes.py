@@ -84,6 +84,28 @@ class Opcode(IntEnum):
     DICT_CLEAR_R = 48  # DictClearR { dict: u8 }
     DICT_LEN_R = 49  # DictLenR { dst: u8, dict: u8 }
 
+    # Array mutation (50-54)
+    ARRAY_PUSH_R = 50  # ArrayPushR { array: u8, value: u8 }
+    ARRAY_INSERT_R = 51  # ArrayInsertR { array: u8, index: u8, value: u8 }
+    ARRAY_REMOVE_AT_R = 52  # ArrayRemoveAtR { array: u8, index: u8 }
+    ARRAY_FIND_R = 53  # ArrayFindR { dst: u8, array: u8, value: u8 }
+    ARRAY_CLEAR_R = 54  # ArrayClearR { array: u8 }
+
+    # Superinstructions (55-59), selected by the bytecode peephole optimizer
+    # The op operand is the opcode of the equivalent comparison (EQ_R..GTE_R)
+    CMP_JUMP_R = 55  # CmpJumpR { op: u8, left: u8, right: u8, offset: i32 }
+    CMP_CONST_R = 56  # CmpConstR { op: u8, dst: u8, left: u8, const_idx: u16 }
+    CMP_CONST_JUMP_R = 57  # CmpConstJumpR { op: u8, left: u8, const_idx: u16, offset: i32 }
+    ADD_IMM_R = 58  # AddImmR { dst: u8, src: u8, imm: i16 }
+    INC_R = 59  # IncR { reg: u8 }
+
+    # Tail calls (60)
+    TAIL_CALL_R = 60  # TailCallR { func: u8, args: Vec<u8> }
+
+    # Memoization (61-62)
+    MEMO_LOOKUP_R = 61  # MemoLookupR { func_idx: u16, arg_count: u8 }
+    MEMO_STORE_R = 62  # MemoStoreR { func_idx: u16, arg_count: u8, src: u8 }
+
 
 # Type IDs for type operations
 class TypeId(IntEnum):
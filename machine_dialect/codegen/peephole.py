@@ -0,0 +1,473 @@
+"""Peephole fusion of register bytecode into superinstructions.
+
+The register code generator emits one VM instruction per MIR operation, so a
+loop condition such as ``i < 10`` becomes::
+
+    LOAD_CONST_R r3, #0       ; 10
+    LT_R         r4, r0, r3
+    JUMP_IF_R    r4, +2
+
+Each instruction pays a full dispatch, and ``r3`` and ``r4`` are written only
+to be read once. The optimizer replaces such sequences with the fused
+instructions understood by the Rust VM:
+
+- ``compare_jump``: ``CMP t, a, b; JUMP_IF_R t`` -> ``CMP_JUMP_R``, and
+  ``JUMP_IF_NOT_R t`` with the inverse comparison (``<`` becomes ``>=``)
+- ``compare_const``: ``LOAD_CONST_R k; CMP t, a, k`` -> ``CMP_CONST_R``,
+  or ``CMP_CONST_JUMP_R`` when followed by a fusible jump
+- ``add_immediate``: ``LOAD_CONST_R k; ADD_R d, a, k`` -> ``ADD_IMM_R`` for
+  integer constants that fit in 16 bits
+- ``increment``: ``ADD_IMM_R d, d, 1`` -> ``INC_R``
+
+A sequence is only fused when no jump lands inside it and the temporary it
+drops is dead afterwards, which is checked with a register liveness analysis
+over the chunk. Jump offsets are re-resolved after fusion.
+
+Inverting an ordering comparison assumes that its operands are ordered, which
+holds for every pair of values the VM compares except a NaN float.
+"""
+
+from __future__ import annotations
+
+import struct
+from collections.abc import Iterable, Mapping
+from dataclasses import dataclass, field
+from typing import Any
+
+from machine_dialect.codegen.bytecode_module import Chunk, ConstantTag
+from machine_dialect.codegen.opcodes import Opcode
+from machine_dialect.codegen.vm_serializer import INSTRUCTION_FORMATS, VMBytecodeSerializer
+
+FUSIONS = ("compare_jump", "compare_const", "add_immediate", "increment")
+
+_COMPARISONS: set[int] = {Opcode.EQ_R, Opcode.NEQ_R, Opcode.LT_R, Opcode.GT_R, Opcode.LTE_R, Opcode.GTE_R}
+
+# Comparison taken by a fused jump on a false condition
+_INVERSE_COMPARISONS: dict[int, int] = {
+    Opcode.EQ_R: Opcode.NEQ_R,
+    Opcode.NEQ_R: Opcode.EQ_R,
+    Opcode.LT_R: Opcode.GTE_R,
+    Opcode.GTE_R: Opcode.LT_R,
+    Opcode.GT_R: Opcode.LTE_R,
+    Opcode.LTE_R: Opcode.GT_R,
+}
+
+# Opcodes executed by the unfused form of each fusion
+_FUSION_OPCODES: dict[str, tuple[set[int], ...]] = {
+    "compare_jump": (_COMPARISONS, {Opcode.JUMP_IF_R, Opcode.JUMP_IF_NOT_R}),
+    "compare_const": ({Opcode.LOAD_CONST_R}, _COMPARISONS),
+    "add_immediate": ({Opcode.LOAD_CONST_R}, {Opcode.ADD_R}),
+    "increment": ({Opcode.LOAD_CONST_R}, {Opcode.ADD_R}),
+}
+
+# Opcodes emitted by each fusion, counted as evidence when profiling already-fused code
+_FUSED_OPCODES: dict[str, set[int]] = {
+    "compare_jump": {Opcode.CMP_JUMP_R, Opcode.CMP_CONST_JUMP_R},
+    "compare_const": {Opcode.CMP_CONST_R, Opcode.CMP_CONST_JUMP_R},
+    "add_immediate": {Opcode.ADD_IMM_R},
+    "increment": {Opcode.INC_R},
+}
+
+# Register role of each operand of fixed-size instructions: "w" written, "r" read, "-" not a register.
+# Operands that are mutated in place (ARRAY_SET_R's array) count as reads.
+_REGISTER_ROLES: dict[int, str] = {
+    Opcode.LOAD_CONST_R: "w-",
+    Opcode.MOVE_R: "wr",
+    Opcode.LOAD_GLOBAL_R: "w-",
+    Opcode.STORE_GLOBAL_R: "r-",
+    Opcode.DEFINE_R: "w-",
+    Opcode.CHECK_TYPE_R: "wr-",
+    Opcode.CAST_R: "wr-",
+    **dict.fromkeys((Opcode.ADD_R, Opcode.SUB_R, Opcode.MUL_R, Opcode.DIV_R, Opcode.MOD_R), "wrr"),
+    Opcode.NEG_R: "wr",
+    Opcode.NOT_R: "wr",
+    Opcode.AND_R: "wrr",
+    Opcode.OR_R: "wrr",
+    **dict.fromkeys(_COMPARISONS, "wrr"),
+    Opcode.JUMP_R: "-",
+    Opcode.JUMP_IF_R: "r-",
+    Opcode.JUMP_IF_NOT_R: "r-",
+    Opcode.ASSERT_R: "r--",
+    Opcode.SCOPE_ENTER_R: "-",
+    Opcode.SCOPE_EXIT_R: "-",
+    Opcode.CONCAT_STR_R: "wrr",
+    Opcode.STR_LEN_R: "wr",
+    Opcode.NEW_ARRAY_R: "wr",
+    Opcode.ARRAY_GET_R: "wrr",
+    Opcode.ARRAY_SET_R: "rrr",
+    Opcode.ARRAY_LEN_R: "wr",
+    Opcode.DEBUG_PRINT: "r",
+    Opcode.BREAKPOINT: "",
+    Opcode.HALT: "",
+    Opcode.NOP: "",
+    Opcode.DICT_NEW_R: "w",
+    Opcode.DICT_GET_R: "wrr",
+    Opcode.DICT_SET_R: "rrr",
+    Opcode.DICT_REMOVE_R: "rr",
+    Opcode.DICT_CONTAINS_R: "wrr",
+    Opcode.DICT_KEYS_R: "wr",
+    Opcode.DICT_VALUES_R: "wr",
+    Opcode.DICT_CLEAR_R: "r",
+    Opcode.DICT_LEN_R: "wr",
+    Opcode.ARRAY_PUSH_R: "rr",
+    Opcode.ARRAY_INSERT_R: "rrr",
+    Opcode.ARRAY_REMOVE_AT_R: "rr",
+    Opcode.ARRAY_FIND_R: "wrr",
+    Opcode.ARRAY_CLEAR_R: "r",
+    Opcode.CMP_JUMP_R: "-rr-",
+    Opcode.CMP_CONST_R: "-wr-",
+    Opcode.CMP_CONST_JUMP_R: "-r--",
+    Opcode.ADD_IMM_R: "wr-",
+    Opcode.INC_R: "r",
+}
+
+_TERMINATORS = {Opcode.RETURN_R, Opcode.TAIL_CALL_R, Opcode.HALT}
+
+_I16_MIN, _I16_MAX = -(2**15), 2**15 - 1
+
+
+class _UnsupportedBytecodeError(Exception):
+    """Raised when a chunk contains code the optimizer cannot analyze."""
+
+
+@dataclass
+class _Instruction:
+    """A decoded instruction.
+
+    Attributes:
+        opcode: Opcode byte.
+        operands: Fixed-format operands (empty for variable-size instructions).
+        raw: Encoded bytes, re-emitted as-is for instructions without a jump.
+        reads: Registers read.
+        writes: Register written, if any.
+        target: Absolute jump target.
+    """
+
+    opcode: int
+    operands: list[int]
+    raw: bytes
+    reads: set[int] = field(default_factory=set)
+    writes: int | None = None
+    target: int | None = None
+
+    def encode(self, offset: int | None = None) -> bytes:
+        """Encode the instruction, replacing its jump offset if given.
+
+        Args:
+            offset: New relative jump offset.
+
+        Returns:
+            Encoded bytes.
+        """
+        if offset is None and self.raw:
+            return self.raw
+        fmt = INSTRUCTION_FORMATS[self.opcode].operand_format
+        operands = [
+            offset if kind == "i" and offset is not None else value
+            for kind, value in zip(fmt, self.operands, strict=True)
+        ]
+        return struct.pack("<B" + fmt, self.opcode, *operands)
+
+
+def _fused(opcode: int, operands: list[int]) -> _Instruction:
+    return _Instruction(opcode, operands, b"")
+
+
+def _decode(index: int, raw: bytes) -> _Instruction:
+    """Decode one instruction with its register reads/writes and jump target.
+
+    Args:
+        index: Instruction index.
+        raw: Encoded instruction.
+
+    Returns:
+        The decoded instruction.
+
+    Raises:
+        _UnsupportedBytecodeError: If the opcode is unknown or truncated.
+    """
+    opcode = raw[0]
+    fmt = INSTRUCTION_FORMATS.get(opcode)
+    if fmt is None:
+        raise _UnsupportedBytecodeError(f"unknown opcode {opcode:#04x}")
+
+    if opcode == Opcode.CALL_R:
+        args = set(raw[4 : 4 + raw[3]])
+        return _Instruction(opcode, [], raw, reads={raw[1], *args}, writes=raw[2])
+    if opcode == Opcode.TAIL_CALL_R:
+        return _Instruction(opcode, [], raw, reads={raw[1], *raw[3 : 3 + raw[2]]})
+    if opcode in (Opcode.MEMO_LOOKUP_R, Opcode.MEMO_STORE_R):
+        # The memo key is the parameter registers; a lookup hit returns from the function
+        reads = set(range(raw[3])) | ({raw[4]} if opcode == Opcode.MEMO_STORE_R else set())
+        return _Instruction(opcode, [], raw, reads=reads)
+    if opcode == Opcode.RETURN_R:
+        return _Instruction(opcode, [], raw, reads={raw[2]} if raw[1] else set())
+    if opcode == Opcode.PHI_R:
+        sources = {raw[3 + i * 3] for i in range(raw[2])}
+        return _Instruction(opcode, [], raw, reads=sources, writes=raw[1])
+
+    try:
+        operands = list(struct.unpack("<" + fmt.operand_format, raw[1:]))
+    except struct.error as e:
+        raise _UnsupportedBytecodeError(f"truncated instruction at index {index}") from e
+
+    roles = _REGISTER_ROLES.get(opcode)
+    if roles is None:
+        raise _UnsupportedBytecodeError(f"no register roles for {fmt.name}")
+    inst = _Instruction(opcode, operands, raw)
+    for kind, role, value in zip(fmt.operand_format, roles, operands, strict=True):
+        if role == "r":
+            inst.reads.add(value)
+        elif role == "w":
+            inst.writes = value
+        elif kind == "i":
+            inst.target = index + 1 + value
+    return inst
+
+
+def select_fusions(opcode_counts: Mapping[int, int] | Mapping[str, int], min_share: float = 0.01) -> set[str]:
+    """Choose the fusions worth applying from a VM opcode profile.
+
+    A fusion can only save dispatches if every opcode it replaces is executed
+    often, so it is kept when the least frequent of its opcodes (or the fused
+    opcode itself, for a profile of already-optimized code) makes up at least
+    ``min_share`` of the executed instructions.
+
+    Args:
+        opcode_counts: Executed instructions per opcode, as in
+            ``ProfileData.metadata["opcode_counts"]``.
+        min_share: Minimum share of executed instructions.
+
+    Returns:
+        Names of the fusions to apply (a subset of ``FUSIONS``).
+    """
+    counts: dict[int, int] = {}
+    for opcode, count in opcode_counts.items():
+        counts[int(opcode)] = counts.get(int(opcode), 0) + int(count)
+    total = sum(counts.values())
+    if total == 0:
+        return set(FUSIONS)
+
+    selected = set()
+    for fusion in FUSIONS:
+        unfused = min(sum(counts.get(opcode, 0) for opcode in group) for group in _FUSION_OPCODES[fusion])
+        fused = sum(counts.get(opcode, 0) for opcode in _FUSED_OPCODES[fusion])
+        if max(unfused, fused) / total >= min_share:
+            selected.add(fusion)
+    return selected
+
+
+class PeepholeOptimizer:
+    """Fuses common instruction sequences into superinstructions."""
+
+    def __init__(self, fusions: Iterable[str] | None = None) -> None:
+        """Initialize the optimizer.
+
+        Args:
+            fusions: Fusions to apply (see ``FUSIONS``); all of them if None.
+
+        Raises:
+            ValueError: If a fusion name is unknown.
+        """
+        self.fusions = set(FUSIONS if fusions is None else fusions)
+        unknown = self.fusions - set(FUSIONS)
+        if unknown:
+            raise ValueError(f"Unknown fusion(s): {', '.join(sorted(unknown))}")
+        self.stats = dict.fromkeys(FUSIONS, 0)
+
+    def optimize(self, chunk: Chunk) -> Chunk:
+        """Fuse instruction sequences in a chunk.
+
+        Chunks containing instructions the optimizer cannot analyze are
+        returned unchanged.
+
+        Args:
+            chunk: The chunk to optimize.
+
+        Returns:
+            Optimized chunk.
+        """
+        try:
+            instructions = [
+                _decode(index, raw)
+                for index, raw in enumerate(VMBytecodeSerializer.parse_instructions(bytes(chunk.bytecode)))
+            ]
+        except (_UnsupportedBytecodeError, IndexError):
+            return chunk
+        if any(inst.target is not None and not 0 <= inst.target <= len(instructions) for inst in instructions):
+            return chunk
+
+        live_out = self._liveness(instructions)
+        jump_targets = {inst.target for inst in instructions if inst.target is not None}
+
+        # Fused instructions, each with the index of the first original instruction it replaces
+        fused: list[tuple[int, _Instruction]] = []
+        index = 0
+        while index < len(instructions):
+            replacement, length = self._match(instructions, index, live_out, jump_targets, chunk.constants)
+            fused.append((index, replacement))
+            index += length
+
+        if len(fused) == len(instructions):
+            return chunk
+
+        new_index = {old: new for new, (old, _) in enumerate(fused)}
+        new_index[len(instructions)] = len(fused)
+        bytecode = bytearray()
+        for position, (_, inst) in enumerate(fused):
+            offset = None if inst.target is None else new_index[inst.target] - (position + 1)
+            bytecode.extend(inst.encode(offset))
+
+        return Chunk(
+            name=chunk.name,
+            chunk_type=chunk.chunk_type,
+            bytecode=bytecode,
+            constants=chunk.constants,
+            num_locals=chunk.num_locals,
+            num_params=chunk.num_params,
+        )
+
+    def get_stats(self) -> dict[str, int]:
+        """Get optimization statistics.
+
+        Returns:
+            Number of fused sequences per fusion.
+        """
+        return self.stats
+
+    @staticmethod
+    def _liveness(instructions: list[_Instruction]) -> list[int]:
+        """Compute the registers live after each instruction.
+
+        Args:
+            instructions: Decoded instructions.
+
+        Returns:
+            Bit set of live registers after each instruction.
+        """
+        successors = []
+        for index, inst in enumerate(instructions):
+            succ = []
+            if inst.opcode not in _TERMINATORS and inst.opcode != Opcode.JUMP_R and index + 1 < len(instructions):
+                succ.append(index + 1)
+            if inst.target is not None and inst.target < len(instructions):
+                succ.append(inst.target)
+            successors.append(succ)
+
+        uses = [sum(1 << reg for reg in inst.reads) for inst in instructions]
+        kills = [~(1 << inst.writes) if inst.writes is not None else -1 for inst in instructions]
+        live_in = [0] * len(instructions)
+        live_out = [0] * len(instructions)
+
+        changed = True
+        while changed:
+            changed = False
+            for index in reversed(range(len(instructions))):
+                out = 0
+                for successor in successors[index]:
+                    out |= live_in[successor]
+                live_out[index] = out
+                new_in = uses[index] | (out & kills[index])
+                if new_in != live_in[index]:
+                    live_in[index] = new_in
+                    changed = True
+        return live_out
+
+    def _match(
+        self,
+        instructions: list[_Instruction],
+        index: int,
+        live_out: list[int],
+        jump_targets: set[int],
+        constants: list[tuple[ConstantTag, Any]],
+    ) -> tuple[_Instruction, int]:
+        """Find the longest fusible sequence starting at an instruction.
+
+        Args:
+            instructions: Decoded instructions.
+            index: Start of the sequence.
+            live_out: Registers live after each instruction.
+            jump_targets: Instruction indices that are jump targets.
+            constants: Chunk constant pool.
+
+        Returns:
+            The replacement instruction and the number of instructions it replaces.
+        """
+        first = instructions[index]
+        second = instructions[index + 1] if index + 1 < len(instructions) else None
+        third = instructions[index + 2] if index + 2 < len(instructions) else None
+        if second is None or index + 1 in jump_targets:
+            return first, 1
+
+        def dead_after(reg: int, position: int) -> bool:
+            return not live_out[position] >> reg & 1
+
+        def branch_comparison(inst: _Instruction | None, reg: int, comparison: int) -> int | None:
+            # The comparison a fused jump takes in place of a conditional jump on reg
+            if inst is None or inst.operands[0] != reg:
+                return None
+            if inst.opcode == Opcode.JUMP_IF_R:
+                return comparison
+            if inst.opcode == Opcode.JUMP_IF_NOT_R:
+                return _INVERSE_COMPARISONS[comparison]
+            return None
+
+        # LOAD_CONST_R k, #c followed by an instruction using k as its right operand
+        if first.opcode == Opcode.LOAD_CONST_R:
+            const_reg, const_idx = first.operands
+            if second.opcode in _COMPARISONS and "compare_const" in self.fusions:
+                dst, left, right = second.operands
+                if right == const_reg and left != const_reg:
+                    comparison = branch_comparison(third, dst, second.opcode)
+                    if (
+                        "compare_jump" in self.fusions
+                        and index + 2 not in jump_targets
+                        and comparison is not None
+                        and third is not None
+                        and dead_after(dst, index + 2)
+                        and dead_after(const_reg, index + 2)
+                    ):
+                        self.stats["compare_const"] += 1
+                        self.stats["compare_jump"] += 1
+                        fused = _fused(Opcode.CMP_CONST_JUMP_R, [comparison, left, const_idx, third.operands[1]])
+                        fused.target = third.target
+                        return fused, 3
+                    if dst == const_reg or dead_after(const_reg, index + 1):
+                        self.stats["compare_const"] += 1
+                        return _fused(Opcode.CMP_CONST_R, [second.opcode, dst, left, const_idx]), 2
+
+            if second.opcode == Opcode.ADD_R:
+                dst, left, right = second.operands
+                value = self._int_constant(constants, const_idx)
+                if (
+                    right == const_reg
+                    and left != const_reg
+                    and value is not None
+                    and _I16_MIN <= value <= _I16_MAX
+                    and (dst == const_reg or dead_after(const_reg, index + 1))
+                ):
+                    if value == 1 and dst == left and "increment" in self.fusions:
+                        self.stats["increment"] += 1
+                        return _fused(Opcode.INC_R, [dst]), 2
+                    if "add_immediate" in self.fusions:
+                        self.stats["add_immediate"] += 1
+                        return _fused(Opcode.ADD_IMM_R, [dst, left, value]), 2
+
+        # CMP t, a, b followed by JUMP_IF_R t or JUMP_IF_NOT_R t
+        if first.opcode in _COMPARISONS and "compare_jump" in self.fusions:
+            comparison = branch_comparison(second, first.operands[0], first.opcode)
+            if comparison is not None and dead_after(first.operands[0], index + 1):
+                _, left, right = first.operands
+                self.stats["compare_jump"] += 1
+                fused = _fused(Opcode.CMP_JUMP_R, [comparison, left, right, second.operands[1]])
+                fused.target = second.target
+                return fused, 2
+
+        return first, 1
+
+    @staticmethod
+    def _int_constant(constants: list[tuple[ConstantTag, Any]], idx: int) -> int | None:
+        if idx >= len(constants):
+            return None
+        tag, value = constants[idx]
+        return value if tag == ConstantTag.INT and isinstance(value, int) else None
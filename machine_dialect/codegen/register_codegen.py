@@ -9,6 +9,7 @@ import struct
 from dataclasses import dataclass, field
 from typing import Any
 
+from machine_dialect.codegen.block_layout import fallthrough_successor, layout_blocks
 from machine_dialect.codegen.bytecode_module import BytecodeModule, Chunk, ChunkType, ConstantTag
 from machine_dialect.codegen.opcodes import Opcode
 
@@ -51,6 +52,7 @@ from machine_dialect.mir.mir_instructions import (
 )
 from machine_dialect.mir.mir_module import MIRModule
 from machine_dialect.mir.mir_values import Constant, MIRValue, Variable
+from machine_dialect.mir.ssa_destruction import destruct_ssa
 
 
 @dataclass
@@ -180,6 +182,8 @@ class RegisterBytecodeGenerator:
         self.instruction_offsets: list[int] = []
         # Pending jumps to resolve: (byte_pos, target_label, source_inst_idx)
         self.pending_jumps: list[tuple[int, str, int]] = []
+        # Label of the block laid out next while generating a block's terminator
+        self.fallthrough_label: str | None = None
         self.debug = debug
         self.current_function: MIRFunction | None = None
         # Label counter for generating unique labels
@@ -275,6 +279,9 @@ class RegisterBytecodeGenerator:
         self.pending_jumps = []
         self.current_function = func
 
+        # Replace phi nodes with copies on their incoming edges
+        destruct_ssa(func)
+
         # Allocate registers
         self.allocation = self.allocator.allocate_function(func)
 
@@ -288,16 +295,32 @@ class RegisterBytecodeGenerator:
                 else:
                     print(f"    {param.name} -> NOT ALLOCATED!")
 
-        # Generate code for each block in topological order
-        blocks_in_order = func.cfg.topological_sort()
-        for block in blocks_in_order:
+        # Return a cached result before the body runs for arguments seen before
+        if func.memoize:
+            self.track_vm_instruction()
+            self.emit_opcode(Opcode.MEMO_LOOKUP_R)
+            self.emit_u16(self.add_constant(func.name))
+            self.emit_u8(len(func.params))
+
+        # Generate code for each block, ordered so most jumps fall through
+        blocks_in_order = layout_blocks(func)
+        for index, block in enumerate(blocks_in_order):
             # Record block offset in instruction count
             self.block_offsets[block.label] = len(self.instruction_offsets)
+            next_label = blocks_in_order[index + 1].label if index + 1 < len(blocks_in_order) else None
             # Generate instructions
-            for inst in block.instructions:
+            for position, inst in enumerate(block.instructions):
                 # Note: Each generate_* method is responsible for tracking
                 # the VM instructions it generates using track_vm_instruction()
+                # Jumps to the next block are left out
+                self.fallthrough_label = next_label if position == len(block.instructions) - 1 else None
                 self.generate_instruction(inst)
+            self.fallthrough_label = None
+
+            # A block that continues without a jump needs one if its successor is elsewhere
+            successor = fallthrough_successor(block)
+            if successor is not None and successor.label != next_label:
+                self.generate_jump(Jump(successor.label, (0, 0)))
 
         # Resolve pending jumps
         self.resolve_jumps()
@@ -340,8 +363,6 @@ class RegisterBytecodeGenerator:
             self.generate_call(inst)
         elif isinstance(inst, Return):
             self.generate_return(inst)
-        elif isinstance(inst, Phi):
-            self.generate_phi(inst)
         elif isinstance(inst, Assert):
             self.generate_assert(inst)
         elif isinstance(inst, ArrayCreate):
@@ -409,6 +430,18 @@ class RegisterBytecodeGenerator:
         """
         dst = self.get_register(inst.dest)
 
+        # Constants are not kept in registers, so load it straight into the destination
+        if isinstance(inst.source, Constant):
+            const_value = inst.source.value if hasattr(inst.source, "value") else inst.source
+            const_idx = self.add_constant(const_value)
+            self.track_vm_instruction()
+            self.emit_opcode(Opcode.LOAD_CONST_R)
+            self.emit_u8(dst)
+            self.emit_u16(const_idx)
+            if self.debug:
+                print(f"DEBUG Copy: loaded constant {const_value} into r{dst}")
+            return
+
         # Debug output
         if self.debug:
             print(f"DEBUG Copy: source={inst.source}, dest={inst.dest}")
@@ -577,6 +610,13 @@ class RegisterBytecodeGenerator:
         if self.debug:
             print(f"DEBUG StoreVar: var={inst.var}, source={inst.source}")
         src = self.get_register(inst.source)
+        if isinstance(inst.source, Constant):
+            const_val = inst.source.value if hasattr(inst.source, "value") else inst.source
+            const_idx = self.add_constant(const_val)
+            self.track_vm_instruction()
+            self.emit_opcode(Opcode.LOAD_CONST_R)
+            self.emit_u8(src)
+            self.emit_u16(const_idx)
 
         # Check if the destination variable is allocated to a register (SSA or local)
         if self.allocation and inst.var in self.allocation.value_to_register:
@@ -684,7 +724,9 @@ class RegisterBytecodeGenerator:
         self.emit_u8(src)
 
     def generate_jump(self, inst: Jump) -> None:
-        """Generate JumpR instruction."""
+        """Generate JumpR instruction, unless the target is the next block."""
+        if inst.label == self.fallthrough_label:
+            return
         self.track_vm_instruction()
         self.emit_opcode(Opcode.JUMP_R)
         # Record position for later resolution (byte pos, target, current instruction index)
@@ -692,9 +734,21 @@ class RegisterBytecodeGenerator:
         self.emit_i32(0)  # Placeholder offset
 
     def generate_conditional_jump(self, inst: ConditionalJump) -> None:
-        """Generate JumpIfR instruction with true and false targets."""
+        """Generate JumpIfR instruction with true and false targets.
+
+        A target that is the next block falls through. When only the true
+        target does, the branch is inverted to a single JumpIfNotR.
+        """
         cond = self.get_register(inst.condition)
 
+        if inst.false_label and inst.true_label == self.fallthrough_label != inst.false_label:
+            self.track_vm_instruction()
+            self.emit_opcode(Opcode.JUMP_IF_NOT_R)
+            self.emit_u8(cond)
+            self.pending_jumps.append((len(self.bytecode), inst.false_label, len(self.instruction_offsets) - 1))
+            self.emit_i32(0)  # Placeholder offset
+            return
+
         # Generate jump to true target
         self.track_vm_instruction()
         self.emit_opcode(Opcode.JUMP_IF_R)
@@ -706,7 +760,7 @@ class RegisterBytecodeGenerator:
 
         # If there's a false label, generate unconditional jump to it
         # (this executes if the condition was false)
-        if inst.false_label:
+        if inst.false_label and inst.false_label != self.fallthrough_label:
             # This will be a new instruction
             self.track_vm_instruction()
             self.emit_opcode(Opcode.JUMP_R)
@@ -715,7 +769,13 @@ class RegisterBytecodeGenerator:
             self.emit_i32(0)  # Placeholder offset
 
     def generate_call(self, inst: Call) -> None:
-        """Generate CallR instruction."""
+        """Generate CallR instruction, or TailCallR for a call in tail position.
+
+        A tail call reuses the caller's frame, so the callee returns straight
+        to the caller's caller. The MIR that forwards the result to the
+        caller's return is still emitted but never reached. Memoized functions
+        never tail call, since their result must reach the MemoStoreR.
+        """
         if self.debug:
             print(f"DEBUG Call: func={inst.func}, args={inst.args}, dest={inst.dest}")
         dst = self.get_register(inst.dest) if inst.dest else 0
@@ -782,10 +842,15 @@ class RegisterBytecodeGenerator:
             print(f"  Function register: r{func}, dest register: r{dst}")
             print(f"  Argument registers: {[f'r{a}' for a in args]}")
 
+        memoized = self.current_function is not None and self.current_function.memoize
         self.track_vm_instruction()
-        self.emit_opcode(Opcode.CALL_R)
-        self.emit_u8(func)
-        self.emit_u8(dst)
+        if inst.is_tail_call and not memoized:
+            self.emit_opcode(Opcode.TAIL_CALL_R)
+            self.emit_u8(func)
+        else:
+            self.emit_opcode(Opcode.CALL_R)
+            self.emit_u8(func)
+            self.emit_u8(dst)
         self.emit_u8(len(args))
         for arg_reg in args:
             self.emit_u8(arg_reg)
@@ -807,7 +872,9 @@ class RegisterBytecodeGenerator:
                         if hasattr(val, "name"):
                             print(f"    {val.name} (v{getattr(val, 'version', '?')}) -> r{reg}")
 
-        if inst.value:
+        if inst.value and self.current_function is not None and self.current_function.memoize:
+            self.generate_memoized_return(inst.value)
+        elif inst.value:
             # If the value is a constant, we need to load it first
             if isinstance(inst.value, Constant):
                 # Load constant into register 0 (return register)
@@ -841,23 +908,34 @@ class RegisterBytecodeGenerator:
             self.emit_opcode(Opcode.RETURN_R)
             self.emit_u8(0)  # No return value
 
-    def generate_phi(self, inst: Phi) -> None:
-        """Generate PhiR instruction."""
-        dst = self.get_register(inst.dest)
-        sources = []
-        for value, _ in inst.sources:  # type: ignore[attr-defined]
-            src = self.get_register(value)
-            # TODO: Map label to block ID
-            block_id = 0
-            sources.append((src, block_id))
+    def generate_memoized_return(self, value: MIRValue) -> None:
+        """Generate MemoStoreR and ReturnR for a memoized function.
+
+        The parameters still hold the memo key, so a constant result is loaded
+        into its own register rather than r0.
+
+        Args:
+            value: The returned value.
+        """
+        func = self.current_function
+        assert func is not None
+        reg = self.get_register(value)
+        if isinstance(value, Constant):
+            self.track_vm_instruction()
+            self.emit_opcode(Opcode.LOAD_CONST_R)
+            self.emit_u8(reg)
+            self.emit_u16(self.add_constant(value.value))
 
         self.track_vm_instruction()
-        self.emit_opcode(Opcode.PHI_R)
-        self.emit_u8(dst)
-        self.emit_u8(len(sources))
-        for src, block_id in sources:
-            self.emit_u8(src)
-            self.emit_u16(block_id)
+        self.emit_opcode(Opcode.MEMO_STORE_R)
+        self.emit_u16(self.add_constant(func.name))
+        self.emit_u8(len(func.params))
+        self.emit_u8(reg)
+
+        self.track_vm_instruction()
+        self.emit_opcode(Opcode.RETURN_R)
+        self.emit_u8(1)  # Has return value
+        self.emit_u8(reg)
 
     def generate_assert(self, inst: Assert) -> None:
         """Generate AssertR instruction."""
@@ -1159,28 +1237,17 @@ class RegisterBytecodeGenerator:
             print(f"  -> Generated ArrayLenR: r{dst} = len(r{array})")
 
     def generate_array_append(self, inst: ArrayAppend) -> None:
-        """Generate array append as set at length position."""
+        """Generate ArrayPushR instruction from MIR ArrayAppend."""
         array = self.get_register(inst.array)
         value = self.get_register(inst.value)
 
-        # First get the current length into a temp register
-        # We need to allocate a temp register for the length
-        length_reg = 255  # Use highest register as temp
-
         self.track_vm_instruction()
-        self.emit_opcode(Opcode.ARRAY_LEN_R)
-        self.emit_u8(length_reg)
+        self.emit_opcode(Opcode.ARRAY_PUSH_R)
         self.emit_u8(array)
-
-        # Then set array[length] = value
-        self.track_vm_instruction()
-        self.emit_opcode(Opcode.ARRAY_SET_R)
-        self.emit_u8(array)
-        self.emit_u8(length_reg)
         self.emit_u8(value)
 
         if self.debug:
-            print(f"  -> Generated ArrayAppend: r{array}.append(r{value})")
+            print(f"  -> Generated ArrayPushR: r{array}.append(r{value})")
 
     def generate_dict_create(self, inst: DictCreate) -> None:
         """Generate DictNewR instruction from MIR DictCreate."""
@@ -1252,347 +1319,32 @@ class RegisterBytecodeGenerator:
             print(f"  -> Generated DictContainsR: r{dst} = r{key_reg} in r{dict_reg}")
 
     def generate_array_remove(self, inst: ArrayRemove) -> None:
-        """Generate array remove at index using copy emulation.
-
-        Emulates array.remove_at(index) by:
-        1. Get original array length
-        2. Create new array with length - 1
-        3. Copy elements [0:index] to new array
-        4. Copy elements [index+1:] to new[index:]
-        5. Replace original array with new array
-        """
+        """Generate ArrayRemoveAtR instruction from MIR ArrayRemove."""
         array = self.get_register(inst.array)
         index = self.get_register(inst.index)
 
-        # Allocate temporary registers
-        old_len_reg = 247  # Original length
-        new_len_reg = 248  # New length (old - 1)
-        new_array_reg = 249  # New array
-        i_reg = 250  # Loop counter for source
-        j_reg = 251  # Loop counter for destination
-        element_reg = 252  # Temporary for element
-        cmp_reg = 253  # Comparison result
-        const_one_reg = 254  # Constant 1
-
-        # Get original array length
         self.track_vm_instruction()
-        self.emit_opcode(Opcode.ARRAY_LEN_R)
-        self.emit_u8(old_len_reg)
+        self.emit_opcode(Opcode.ARRAY_REMOVE_AT_R)
         self.emit_u8(array)
-
-        # Calculate new length (old - 1)
-        const_one = self.add_constant(1)
-        self.track_vm_instruction()
-        self.emit_opcode(Opcode.LOAD_CONST_R)
-        self.emit_u8(const_one_reg)
-        self.emit_u16(const_one)
-
-        self.track_vm_instruction()
-        self.emit_opcode(Opcode.SUB_R)
-        self.emit_u8(new_len_reg)
-        self.emit_u8(old_len_reg)
-        self.emit_u8(const_one_reg)
-
-        # Create new array with new length
-        self.track_vm_instruction()
-        self.emit_opcode(Opcode.NEW_ARRAY_R)
-        self.emit_u8(new_array_reg)
-        self.emit_u8(new_len_reg)
-
-        # Initialize loop counters to 0
-        const_zero = self.add_constant(0)
-        self.track_vm_instruction()
-        self.emit_opcode(Opcode.LOAD_CONST_R)
-        self.emit_u8(i_reg)
-        self.emit_u16(const_zero)
-
-        self.track_vm_instruction()
-        self.emit_opcode(Opcode.LOAD_CONST_R)
-        self.emit_u8(j_reg)
-        self.emit_u16(const_zero)
-
-        # Generate unique labels
-        copy_loop_label = f"remove_copy_{self.label_counter}"
-        skip_removed_label = f"remove_skip_{self.label_counter}"
-        copy_element_label = f"remove_element_{self.label_counter}"
-        remove_done_label = f"remove_done_{self.label_counter}"
-        self.label_counter += 1
-
-        # --- Main copy loop ---
-        self.add_label(copy_loop_label)
-
-        # Check if i < old_len
-        self.track_vm_instruction()
-        self.emit_opcode(Opcode.LT_R)
-        self.emit_u8(cmp_reg)
-        self.emit_u8(i_reg)
-        self.emit_u8(old_len_reg)
-
-        # If not (i >= old_len), we're done
-        self.track_vm_instruction()
-        self.emit_opcode(Opcode.JUMP_IF_NOT_R)
-        self.emit_u8(cmp_reg)
-        self.pending_jumps.append((len(self.bytecode), remove_done_label, len(self.instruction_offsets) - 1))
-        self.emit_i32(0)  # Placeholder
-
-        # Check if i == index (skip this element)
-        self.track_vm_instruction()
-        self.emit_opcode(Opcode.EQ_R)
-        self.emit_u8(cmp_reg)
-        self.emit_u8(i_reg)
         self.emit_u8(index)
 
-        # If i == index, skip copying this element
-        self.track_vm_instruction()
-        self.emit_opcode(Opcode.JUMP_IF_R)
-        self.emit_u8(cmp_reg)
-        self.pending_jumps.append((len(self.bytecode), skip_removed_label, len(self.instruction_offsets) - 1))
-        self.emit_i32(0)  # Placeholder
-
-        # --- Copy element from old[i] to new[j] ---
-        self.add_label(copy_element_label)
-
-        # Get element from original array[i]
-        self.track_vm_instruction()
-        self.emit_opcode(Opcode.ARRAY_GET_R)
-        self.emit_u8(element_reg)
-        self.emit_u8(array)
-        self.emit_u8(i_reg)
-
-        # Set new[j] = element
-        self.track_vm_instruction()
-        self.emit_opcode(Opcode.ARRAY_SET_R)
-        self.emit_u8(new_array_reg)
-        self.emit_u8(j_reg)
-        self.emit_u8(element_reg)
-
-        # Increment j (destination index)
-        self.track_vm_instruction()
-        self.emit_opcode(Opcode.ADD_R)
-        self.emit_u8(j_reg)
-        self.emit_u8(j_reg)
-        self.emit_u8(const_one_reg)
-
-        # --- Skip removed element (just increment i) ---
-        self.add_label(skip_removed_label)
-
-        # Increment i (source index)
-        self.track_vm_instruction()
-        self.emit_opcode(Opcode.ADD_R)
-        self.emit_u8(i_reg)
-        self.emit_u8(i_reg)
-        self.emit_u8(const_one_reg)
-
-        # Jump back to loop start
-        self.track_vm_instruction()
-        self.emit_opcode(Opcode.JUMP_R)
-        self.pending_jumps.append((len(self.bytecode), copy_loop_label, len(self.instruction_offsets) - 1))
-        self.emit_i32(0)  # Placeholder
-
-        # --- Replace original array with new array ---
-        self.add_label(remove_done_label)
-
-        # Move new array to original array register
-        self.track_vm_instruction()
-        self.emit_opcode(Opcode.MOVE_R)
-        self.emit_u8(array)
-        self.emit_u8(new_array_reg)
-
         if self.debug:
-            print(f"  -> Generated ArrayRemove: r{array}.remove_at(r{index}) using copy emulation")
+            print(f"  -> Generated ArrayRemoveAtR: r{array}.remove_at(r{index})")
 
     def generate_array_insert(self, inst: ArrayInsert) -> None:
-        """Generate array insert at index using copy emulation.
-
-        Emulates array.insert(index, value) by:
-        1. Get original array length
-        2. Create new array with length + 1
-        3. Copy elements [0:index] to new array
-        4. Set new[index] = value
-        5. Copy elements [index:] to new[index+1:]
-        6. Replace original array with new array
-        """
+        """Generate ArrayInsertR instruction from MIR ArrayInsert."""
         array = self.get_register(inst.array)
         index = self.get_register(inst.index)
         value = self.get_register(inst.value)
 
-        # Allocate temporary registers
-        old_len_reg = 248  # Original length
-        new_len_reg = 249  # New length (old + 1)
-        new_array_reg = 250  # New array
-        i_reg = 251  # Loop counter
-        element_reg = 252  # Temporary for element
-        cmp_reg = 253  # Comparison result
-        const_one_reg = 254  # Constant 1
-
-        # Get original array length
         self.track_vm_instruction()
-        self.emit_opcode(Opcode.ARRAY_LEN_R)
-        self.emit_u8(old_len_reg)
+        self.emit_opcode(Opcode.ARRAY_INSERT_R)
         self.emit_u8(array)
-
-        # Calculate new length (old + 1)
-        const_one = self.add_constant(1)
-        self.track_vm_instruction()
-        self.emit_opcode(Opcode.LOAD_CONST_R)
-        self.emit_u8(const_one_reg)
-        self.emit_u16(const_one)
-
-        self.track_vm_instruction()
-        self.emit_opcode(Opcode.ADD_R)
-        self.emit_u8(new_len_reg)
-        self.emit_u8(old_len_reg)
-        self.emit_u8(const_one_reg)
-
-        # Create new array with new length
-        self.track_vm_instruction()
-        self.emit_opcode(Opcode.NEW_ARRAY_R)
-        self.emit_u8(new_array_reg)
-        self.emit_u8(new_len_reg)
-
-        # Initialize loop counter to 0
-        const_zero = self.add_constant(0)
-        self.track_vm_instruction()
-        self.emit_opcode(Opcode.LOAD_CONST_R)
-        self.emit_u8(i_reg)
-        self.emit_u16(const_zero)
-
-        # Generate unique labels
-        copy_before_label = f"insert_copy_before_{self.label_counter}"
-        copy_after_label = f"insert_copy_after_{self.label_counter}"
-        insert_done_label = f"insert_done_{self.label_counter}"
-        self.label_counter += 1
-
-        # --- Copy elements before insertion point ---
-        self.add_label(copy_before_label)
-
-        # Check if i < index
-        self.track_vm_instruction()
-        self.emit_opcode(Opcode.LT_R)
-        self.emit_u8(cmp_reg)
-        self.emit_u8(i_reg)
-        self.emit_u8(index)
-
-        # If not (i >= index), skip to insert value
-        self.track_vm_instruction()
-        self.emit_opcode(Opcode.JUMP_IF_NOT_R)
-        self.emit_u8(cmp_reg)
-        self.pending_jumps.append((len(self.bytecode), copy_after_label, len(self.instruction_offsets) - 1))
-        self.emit_i32(0)  # Placeholder
-
-        # Get element from original array
-        self.track_vm_instruction()
-        self.emit_opcode(Opcode.ARRAY_GET_R)
-        self.emit_u8(element_reg)
-        self.emit_u8(array)
-        self.emit_u8(i_reg)
-
-        # Set element in new array at same position
-        self.track_vm_instruction()
-        self.emit_opcode(Opcode.ARRAY_SET_R)
-        self.emit_u8(new_array_reg)
-        self.emit_u8(i_reg)
-        self.emit_u8(element_reg)
-
-        # Increment i
-        self.track_vm_instruction()
-        self.emit_opcode(Opcode.ADD_R)
-        self.emit_u8(i_reg)
-        self.emit_u8(i_reg)
-        self.emit_u8(const_one_reg)
-
-        # Jump back to loop start
-        self.track_vm_instruction()
-        self.emit_opcode(Opcode.JUMP_R)
-        self.pending_jumps.append((len(self.bytecode), copy_before_label, len(self.instruction_offsets) - 1))
-        self.emit_i32(0)  # Placeholder
-
-        # --- Insert the value at index ---
-        self.add_label(copy_after_label)
-
-        # Set new[index] = value
-        self.track_vm_instruction()
-        self.emit_opcode(Opcode.ARRAY_SET_R)
-        self.emit_u8(new_array_reg)
         self.emit_u8(index)
         self.emit_u8(value)
 
-        # Reset i to index for copying remaining elements
-        self.track_vm_instruction()
-        self.emit_opcode(Opcode.MOVE_R)
-        self.emit_u8(i_reg)
-        self.emit_u8(index)
-
-        # --- Copy elements after insertion point ---
-        copy_rest_label = f"insert_copy_rest_{self.label_counter - 1}"
-        self.add_label(copy_rest_label)
-
-        # Check if i < old_len
-        self.track_vm_instruction()
-        self.emit_opcode(Opcode.LT_R)
-        self.emit_u8(cmp_reg)
-        self.emit_u8(i_reg)
-        self.emit_u8(old_len_reg)
-
-        # If not (i >= old_len), we're done
-        self.track_vm_instruction()
-        self.emit_opcode(Opcode.JUMP_IF_NOT_R)
-        self.emit_u8(cmp_reg)
-        self.pending_jumps.append((len(self.bytecode), insert_done_label, len(self.instruction_offsets) - 1))
-        self.emit_i32(0)  # Placeholder
-
-        # Get element from original array[i]
-        self.track_vm_instruction()
-        self.emit_opcode(Opcode.ARRAY_GET_R)
-        self.emit_u8(element_reg)
-        self.emit_u8(array)
-        self.emit_u8(i_reg)
-
-        # Calculate destination index (i + 1) using element_reg temporarily
-        self.track_vm_instruction()
-        self.emit_opcode(Opcode.ADD_R)
-        self.emit_u8(element_reg)
-        self.emit_u8(i_reg)
-        self.emit_u8(const_one_reg)
-
-        # Get element from original array[i] again (since we overwrote element_reg)
-        self.track_vm_instruction()
-        self.emit_opcode(Opcode.ARRAY_GET_R)
-        self.emit_u8(cmp_reg)  # Use cmp_reg temporarily for the element
-        self.emit_u8(array)
-        self.emit_u8(i_reg)
-
-        # Set new[i+1] = element
-        self.track_vm_instruction()
-        self.emit_opcode(Opcode.ARRAY_SET_R)
-        self.emit_u8(new_array_reg)
-        self.emit_u8(element_reg)  # This is i+1
-        self.emit_u8(cmp_reg)  # This is the element
-
-        # Increment i
-        self.track_vm_instruction()
-        self.emit_opcode(Opcode.ADD_R)
-        self.emit_u8(i_reg)
-        self.emit_u8(i_reg)
-        self.emit_u8(const_one_reg)
-
-        # Jump back to copy rest loop
-        self.track_vm_instruction()
-        self.emit_opcode(Opcode.JUMP_R)
-        self.pending_jumps.append((len(self.bytecode), copy_rest_label, len(self.instruction_offsets) - 1))
-        self.emit_i32(0)  # Placeholder
-
-        # --- Replace original array with new array ---
-        self.add_label(insert_done_label)
-
-        # Move new array to original array register
-        self.track_vm_instruction()
-        self.emit_opcode(Opcode.MOVE_R)
-        self.emit_u8(array)
-        self.emit_u8(new_array_reg)
-
         if self.debug:
-            print(f"  -> Generated ArrayInsert: r{array}.insert(r{index}, r{value}) using copy emulation")
+            print(f"  -> Generated ArrayInsertR: r{array}.insert(r{index}, r{value})")
 
     def generate_dict_keys(self, inst: DictKeys) -> None:
         """Generate dictionary keys extraction.
@@ -1648,157 +1400,33 @@ class RegisterBytecodeGenerator:
             print(f"  -> Generated DictClearR: r{dict_reg}.clear()")
 
     def generate_array_clear(self, inst: ArrayClear) -> None:
-        """Generate array clear.
-
-        This can be implemented as creating a new empty array.
-        """
+        """Generate ArrayClearR instruction from MIR ArrayClear."""
         array = self.get_register(inst.array)
 
-        # Create a new empty array (size 0) and assign to the array register
-        zero_reg = 254  # Use a temp register for constant 0
-
-        # Load constant 0
-        const_idx = self.add_constant(0)
-        self.track_vm_instruction()
-        self.emit_opcode(Opcode.LOAD_CONST_R)
-        self.emit_u8(zero_reg)
-        self.emit_u16(const_idx)
-
-        # Create new empty array
         self.track_vm_instruction()
-        self.emit_opcode(Opcode.NEW_ARRAY_R)
+        self.emit_opcode(Opcode.ARRAY_CLEAR_R)
         self.emit_u8(array)
-        self.emit_u8(zero_reg)
 
         if self.debug:
-            print(f"  -> Generated ArrayClear: r{array}.clear() as new_array(0)")
+            print(f"  -> Generated ArrayClearR: r{array}.clear()")
 
     def generate_array_find_index(self, inst: ArrayFindIndex) -> None:
-        """Generate array find index by value using loop emulation.
-
-        Emulates array.find(value) by iterating through the array:
-        1. Get array length
-        2. Initialize index to 0
-        3. Loop through array:
-           - Get element at current index
-           - Compare with target value
-           - If equal, store index and exit
-           - Otherwise increment index and continue
-        4. If not found, store -1
+        """Generate ArrayFindR instruction from MIR ArrayFindIndex.
+
+        The destination receives the index of the first equal element, or -1.
         """
         dest = self.get_register(inst.dest)
         array = self.get_register(inst.array)
         value = self.get_register(inst.value)
 
-        # Allocate temporary registers
-        length_reg = 250  # Array length
-        index_reg = 251  # Current index
-        element_reg = 252  # Current element
-        cmp_reg = 253  # Comparison result
-
-        # Generate unique labels for this loop
-        loop_start_label = f"find_loop_{self.label_counter}"
-        loop_end_label = f"find_end_{self.label_counter}"
-        found_label = f"find_found_{self.label_counter}"
-        self.label_counter += 1
-
-        # Get array length
-        self.track_vm_instruction()
-        self.emit_opcode(Opcode.ARRAY_LEN_R)
-        self.emit_u8(length_reg)
-        self.emit_u8(array)
-
-        # Initialize index to 0
-        const_idx = self.add_constant(0)
-        self.track_vm_instruction()
-        self.emit_opcode(Opcode.LOAD_CONST_R)
-        self.emit_u8(index_reg)
-        self.emit_u16(const_idx)
-
-        # Loop start
-        self.add_label(loop_start_label)
-
-        # Check if index < length
-        self.track_vm_instruction()
-        self.emit_opcode(Opcode.LT_R)
-        self.emit_u8(cmp_reg)
-        self.emit_u8(index_reg)
-        self.emit_u8(length_reg)
-
-        # If not (index >= length), jump to end (not found)
-        self.track_vm_instruction()
-        self.emit_opcode(Opcode.JUMP_IF_NOT_R)
-        self.emit_u8(cmp_reg)
-        self.pending_jumps.append((len(self.bytecode), loop_end_label, len(self.instruction_offsets) - 1))
-        self.emit_i32(0)  # Placeholder
-
-        # Get element at current index
         self.track_vm_instruction()
-        self.emit_opcode(Opcode.ARRAY_GET_R)
-        self.emit_u8(element_reg)
+        self.emit_opcode(Opcode.ARRAY_FIND_R)
+        self.emit_u8(dest)
         self.emit_u8(array)
-        self.emit_u8(index_reg)
-
-        # Compare element with target value
-        self.track_vm_instruction()
-        self.emit_opcode(Opcode.EQ_R)
-        self.emit_u8(cmp_reg)
-        self.emit_u8(element_reg)
         self.emit_u8(value)
 
-        # If equal, jump to found
-        self.track_vm_instruction()
-        self.emit_opcode(Opcode.JUMP_IF_R)
-        self.emit_u8(cmp_reg)
-        self.pending_jumps.append((len(self.bytecode), found_label, len(self.instruction_offsets) - 1))
-        self.emit_i32(0)  # Placeholder
-
-        # Increment index
-        const_one = self.add_constant(1)
-        self.track_vm_instruction()
-        self.emit_opcode(Opcode.LOAD_CONST_R)
-        self.emit_u8(element_reg)  # Reuse element_reg for constant 1
-        self.emit_u16(const_one)
-
-        self.track_vm_instruction()
-        self.emit_opcode(Opcode.ADD_R)
-        self.emit_u8(index_reg)
-        self.emit_u8(index_reg)
-        self.emit_u8(element_reg)
-
-        # Jump back to loop start
-        self.track_vm_instruction()
-        self.emit_opcode(Opcode.JUMP_R)
-        self.pending_jumps.append((len(self.bytecode), loop_start_label, len(self.instruction_offsets) - 1))
-        self.emit_i32(0)  # Placeholder
-
-        # Found label - copy index to dest
-        self.add_label(found_label)
-        self.track_vm_instruction()
-        self.emit_opcode(Opcode.MOVE_R)
-        self.emit_u8(dest)
-        self.emit_u8(index_reg)
-
-        # Jump to end (skip not found case)
-        end_jump_label = f"find_exit_{self.label_counter - 1}"
-        self.track_vm_instruction()
-        self.emit_opcode(Opcode.JUMP_R)
-        self.pending_jumps.append((len(self.bytecode), end_jump_label, len(self.instruction_offsets) - 1))
-        self.emit_i32(0)  # Placeholder
-
-        # Not found - set dest to -1
-        self.add_label(loop_end_label)
-        const_neg_one = self.add_constant(-1)
-        self.track_vm_instruction()
-        self.emit_opcode(Opcode.LOAD_CONST_R)
-        self.emit_u8(dest)
-        self.emit_u16(const_neg_one)
-
-        # Exit label
-        self.add_label(end_jump_label)
-
         if self.debug:
-            print(f"  -> Generated ArrayFindIndex: r{dest} = find_index(r{array}, r{value}) using loop emulation")
+            print(f"  -> Generated ArrayFindR: r{dest} = r{array}.find(r{value})")
 
 
 class MetadataCollector:
@@ -0,0 +1,202 @@
+"""Tests for basic block layout."""
+
+from machine_dialect.codegen.block_layout import BlockLayout, layout_blocks
+from machine_dialect.codegen.disassembler import DecodedInstruction, decode_instructions
+from machine_dialect.codegen.register_codegen import RegisterBytecodeGenerator
+from machine_dialect.mir.basic_block import BasicBlock
+from machine_dialect.mir.mir_function import MIRFunction
+from machine_dialect.mir.mir_instructions import (
+    Assert,
+    BinaryOp,
+    ConditionalJump,
+    Jump,
+    LoadConst,
+    Return,
+    StoreVar,
+)
+from machine_dialect.mir.mir_types import MIRType
+from machine_dialect.mir.mir_values import Constant, ScopedVariable, Temp, Variable, VariableScope
+
+N = ScopedVariable("n", VariableScope.PARAMETER, MIRType.INT)
+
+
+def create_function(*labels: str) -> tuple[MIRFunction, list[BasicBlock]]:
+    """Create a function of parameter `n` with empty blocks.
+
+    Args:
+        labels: Block labels; the first block is the entry.
+
+    Returns:
+        The function and its blocks.
+    """
+    function = MIRFunction("f", [N], MIRType.INT)
+    blocks = [function.cfg.get_or_create_block(label) for label in labels]
+    function.cfg.set_entry_block(blocks[0])
+    return function, blocks
+
+
+def create_counting_loop() -> tuple[MIRFunction, list[BasicBlock]]:
+    """Create `i = 0; while i < n: i = i + 1; return i` as lowered from source.
+
+    Returns:
+        The function and its blocks.
+    """
+    function, blocks = create_function("entry", "header", "body", "exit")
+    entry, header, body, exit_block = blocks
+    function.cfg.connect(entry, header)
+    function.cfg.connect(header, body)
+    function.cfg.connect(header, exit_block)
+    function.cfg.connect(body, header)
+
+    i = Variable("i", MIRType.INT)
+    function.add_local(i)
+    zero, condition, step = Temp(MIRType.INT), Temp(MIRType.BOOL), Temp(MIRType.INT)
+    entry.instructions = [
+        LoadConst(zero, Constant(0, MIRType.INT), (1, 1)),
+        StoreVar(i, zero, (1, 1)),
+        Jump("header", (1, 1)),
+    ]
+    header.instructions = [BinaryOp(condition, "<", i, N, (2, 1)), ConditionalJump(condition, "body", (2, 1), "exit")]
+    body.instructions = [
+        BinaryOp(step, "+", i, Constant(1, MIRType.INT), (3, 1)),
+        StoreVar(i, step, (3, 1)),
+        Jump("header", (3, 1)),
+    ]
+    exit_block.instructions = [Return((4, 1), i)]
+    return function, blocks
+
+
+def create_branch(taken_probability: float | None = None) -> tuple[MIRFunction, list[BasicBlock]]:
+    """Create `if n > 0 goto ok else error` where the error block always fails.
+
+    Args:
+        taken_probability: Profiled probability of branching to `ok`.
+
+    Returns:
+        The function and its blocks.
+    """
+    function, blocks = create_function("entry", "ok", "error")
+    entry, ok, error = blocks
+    function.cfg.connect(entry, ok)
+    function.cfg.connect(entry, error)
+
+    condition, failed = Temp(MIRType.BOOL), Temp(MIRType.BOOL)
+    branch = ConditionalJump(condition, "ok", (1, 1), "error")
+    if taken_probability is not None:
+        branch.taken_probability = taken_probability  # type: ignore[attr-defined]
+    entry.instructions = [BinaryOp(condition, ">", N, Constant(0, MIRType.INT), (1, 1)), branch]
+    ok.instructions = [Return((2, 1), N)]
+    error.instructions = [LoadConst(failed, Constant(False, MIRType.BOOL), (3, 1)), Assert(failed, (3, 1), "boom")]
+    return function, blocks
+
+
+def generate(function: MIRFunction) -> list[DecodedInstruction]:
+    """Compile a function and decode its bytecode.
+
+    Args:
+        function: The function.
+
+    Returns:
+        The decoded instructions.
+    """
+    chunk = RegisterBytecodeGenerator().generate_function(function)
+    return decode_instructions(bytes(chunk.bytecode), chunk.constants)
+
+
+class TestBlockLayout:
+    """Tests for ordering blocks."""
+
+    def test_loop_is_rotated(self) -> None:
+        """Test that the loop test is placed after the body and falls through to the exit."""
+        function, (entry, header, body, exit_block) = create_counting_loop()
+
+        assert layout_blocks(function) == [entry, body, header, exit_block]
+
+    def test_rotated_loop_runs_one_jump_per_iteration(self) -> None:
+        """Test that the loop body and test contain only the backward branch."""
+        function, _ = create_counting_loop()
+
+        instructions = generate(function)
+
+        jumps = [inst for inst in instructions if inst.target is not None]
+        assert [inst.name for inst in jumps] == ["JUMP_R", "JUMP_IF_R"]
+        entry_jump, back_edge = jumps
+        assert back_edge.target is not None and back_edge.target < back_edge.index
+        # The loop is entered at its compare, and nothing inside the loop jumps
+        assert entry_jump.target == back_edge.index - 1 and instructions[entry_jump.target].name == "LT_R"
+        assert not any(inst.target is not None for inst in instructions[back_edge.target : back_edge.index])
+
+    def test_jump_to_next_block_is_left_out(self) -> None:
+        """Test that both arms of an if fall through or jump to the join point once."""
+        function, (entry, then, otherwise, merge) = create_function("entry", "then", "else", "merge")
+        function.cfg.connect(entry, then)
+        function.cfg.connect(entry, otherwise)
+        function.cfg.connect(then, merge)
+        function.cfg.connect(otherwise, merge)
+        entry.instructions = [ConditionalJump(N, "then", (1, 1), "else")]
+        then.instructions = [Jump("merge", (2, 1))]
+        otherwise.instructions = [Jump("merge", (3, 1))]
+        merge.instructions = [Return((4, 1), N)]
+
+        assert layout_blocks(function) == [entry, otherwise, merge, then]
+        assert [inst.name for inst in generate(function)] == ["JUMP_IF_R", "RETURN_R", "JUMP_R"]
+
+    def test_failing_block_is_moved_last(self) -> None:
+        """Test that a block that always fails is placed after the others."""
+        function, (entry, ok, error) = create_branch()
+
+        layout = BlockLayout(function)
+
+        assert layout.cold_blocks == {error}
+        assert layout.layout() == [entry, ok, error]
+
+    def test_branch_is_inverted_when_true_target_falls_through(self) -> None:
+        """Test that a single JumpIfNotR reaches the false target out of line."""
+        function, _ = create_branch()
+
+        names = [inst.name for inst in generate(function)]
+
+        assert "JUMP_IF_NOT_R" in names
+        assert "JUMP_IF_R" not in names
+        assert "JUMP_R" not in names
+
+    def test_profile_moves_rarely_taken_branch_out_of_line(self) -> None:
+        """Test that a branch profiled as nearly always taken has its target next."""
+        function, (entry, ok, error) = create_branch(taken_probability=0.99)
+        error.instructions = [Return((3, 1), N)]
+
+        layout = BlockLayout(function)
+
+        assert layout.cold_blocks == {error}
+        assert layout.layout() == [entry, ok, error]
+
+    def test_self_loop_keeps_entry_first(self) -> None:
+        """Test that a block branching to itself is a loop of its own."""
+        function, (entry, spin, exit_block) = create_function("entry", "spin", "exit")
+        function.cfg.connect(entry, spin)
+        function.cfg.connect(spin, spin)
+        function.cfg.connect(spin, exit_block)
+        entry.instructions = [Jump("spin", (1, 1))]
+        spin.instructions = [ConditionalJump(N, "spin", (2, 1), "exit")]
+        exit_block.instructions = [Return((3, 1), N)]
+
+        assert layout_blocks(function) == [entry, spin, exit_block]
+        assert [inst.name for inst in generate(function)] == ["JUMP_IF_R", "RETURN_R"]
+
+    def test_block_without_terminator_jumps_to_successor_elsewhere(self) -> None:
+        """Test that a block that falls through gets a jump when its successor is not next."""
+        function, (entry, left, right, merge) = create_function("entry", "left", "right", "merge")
+        function.cfg.connect(entry, left)
+        function.cfg.connect(entry, right)
+        function.cfg.connect(left, merge)
+        function.cfg.connect(right, merge)
+        entry.instructions = [ConditionalJump(N, "left", (1, 1), "right")]
+        left.instructions = [LoadConst(Temp(MIRType.INT), Constant(1, MIRType.INT), (2, 1))]
+        right.instructions = [LoadConst(Temp(MIRType.INT), Constant(2, MIRType.INT), (3, 1))]
+        merge.instructions = [Return((4, 1), N)]
+
+        instructions = generate(function)
+
+        merge_index = next(inst.index for inst in instructions if inst.name == "RETURN_R")
+        jumps = [inst for inst in instructions if inst.name == "JUMP_R"]
+        assert [inst.target for inst in jumps] == [merge_index]
@@ -0,0 +1,183 @@
+"""Tests for the register bytecode disassembler."""
+
+from __future__ import annotations
+
+import pytest
+
+from machine_dialect.codegen.bytecode_module import BytecodeModule, Chunk, ChunkType, ConstantTag
+from machine_dialect.codegen.disassembler import (
+    DisassemblyError,
+    decode_instructions,
+    disassemble,
+    disassemble_module,
+    find_loops,
+    read_bytecode,
+)
+from machine_dialect.codegen.vm_serializer import VMBytecodeSerializer
+
+# i = 0; while i < 3: i = i + 1; return i
+LOOP_BYTECODE = bytes(
+    [
+        0x00, 0x00, 0x00, 0x00,  # 0: LOAD_CONST_R r0, #0
+        0x00, 0x01, 0x01, 0x00,  # 1: LOAD_CONST_R r1, #1
+        0x12, 0x02, 0x00, 0x01,  # 2: LT_R r2, r0, r1
+        0x18, 0x02, 0x03, 0x00, 0x00, 0x00,  # 3: JUMP_IF_NOT_R r2, +3
+        0x00, 0x03, 0x02, 0x00,  # 4: LOAD_CONST_R r3, #2
+        0x07, 0x00, 0x00, 0x03,  # 5: ADD_R r0, r0, r3
+        0x16, 0xFB, 0xFF, 0xFF, 0xFF,  # 6: JUMP_R -5
+        0x1A, 0x01, 0x00,  # 7: RETURN_R r0
+    ]
+)  # fmt: skip
+
+
+def _loop_module() -> BytecodeModule:
+    chunk = Chunk(
+        name="main",
+        chunk_type=ChunkType.MAIN,
+        bytecode=bytearray(LOOP_BYTECODE),
+        constants=[(ConstantTag.INT, 0), (ConstantTag.INT, 3), (ConstantTag.INT, 1)],
+        num_locals=4,
+        num_params=0,
+    )
+    return BytecodeModule(name="loop", chunks=[chunk])
+
+
+class TestDecoding:
+    """Test instruction decoding."""
+
+    def test_decode_operands_and_jump_targets(self) -> None:
+        """Test that operands, constants and jump targets are decoded."""
+        constants = [(ConstantTag.INT, 0), (ConstantTag.INT, 3), (ConstantTag.INT, 1)]
+
+        instructions = decode_instructions(LOOP_BYTECODE, constants)
+
+        assert [inst.name for inst in instructions] == [
+            "LOAD_CONST_R",
+            "LOAD_CONST_R",
+            "LT_R",
+            "JUMP_IF_NOT_R",
+            "LOAD_CONST_R",
+            "ADD_R",
+            "JUMP_R",
+            "RETURN_R",
+        ]
+        assert instructions[1].operands == "r1, #1"
+        assert instructions[1].comment == "3"
+        assert instructions[2].operands == "r2, r0, r1"
+        assert instructions[3].target == 7
+        assert instructions[6].operands == "-5"
+        assert instructions[6].target == 2
+        assert instructions[7].operands == "r0"
+        assert find_loops(instructions) == [(2, 6)]
+
+    def test_decode_call_names_callee(self) -> None:
+        """Test that calls through a string constant are annotated with the callee."""
+        bytecode = bytes([0x00, 0x01, 0x00, 0x00, 0x19, 0x01, 0x02, 0x01, 0x00, 0x1A, 0x00])
+
+        instructions = decode_instructions(bytecode, [(ConstantTag.STRING, "fib")])
+
+        assert instructions[1].operands == "r2, r1(r0)"
+        assert instructions[1].comment == "call fib"
+        assert instructions[2].operands == ""
+
+    def test_decode_tail_call(self) -> None:
+        """Test that tail calls have no destination register and name the callee."""
+        bytecode = bytes([0x00, 0x02, 0x00, 0x00, 0x3C, 0x02, 0x02, 0x01, 0x00, 0x1A, 0x00])
+
+        instructions = decode_instructions(bytecode, [(ConstantTag.STRING, "loop")])
+
+        assert instructions[1].name == "TAIL_CALL_R"
+        assert instructions[1].operands == "r2(r1, r0)"
+        assert instructions[1].comment == "tail call loop"
+        assert instructions[2].name == "RETURN_R"
+
+    def test_decode_memo_opcodes(self) -> None:
+        """Test that memo instructions name the memoized function."""
+        bytecode = bytes([0x3D, 0x00, 0x00, 0x01, 0x3E, 0x00, 0x00, 0x01, 0x02, 0x1A, 0x01, 0x02])
+
+        instructions = decode_instructions(bytecode, [(ConstantTag.STRING, "fib")])
+
+        assert [(inst.name, inst.operands) for inst in instructions] == [
+            ("MEMO_LOOKUP_R", "#0, 1"),
+            ("MEMO_STORE_R", "#0, 1, r2"),
+            ("RETURN_R", "r2"),
+        ]
+        assert instructions[0].comment == "'fib'"
+        assert VMBytecodeSerializer.count_instructions(bytecode) == 3
+
+    def test_decode_dictionary_and_type_opcodes(self) -> None:
+        """Test opcodes whose sizes were previously unknown to the serializer."""
+        bytecode = bytes([0x29, 0x00, 0x2C, 0x00, 0x01, 0x04, 0x02, 0x02, 0x00, 0x31, 0x03, 0x00])
+
+        instructions = decode_instructions(bytecode)
+
+        assert [(inst.name, inst.operands) for inst in instructions] == [
+            ("DICT_NEW_R", "r0"),
+            ("DICT_REMOVE_R", "r0, r1"),
+            ("DEFINE_R", "r2, INT"),
+            ("DICT_LEN_R", "r3, r0"),
+        ]
+        assert VMBytecodeSerializer.count_instructions(bytecode) == 4
+
+    def test_truncated_instruction(self) -> None:
+        """Test that a truncated instruction is reported."""
+        with pytest.raises(DisassemblyError, match="Truncated instruction"):
+            decode_instructions(bytes([0x07, 0x00]))
+
+
+class TestDisassemble:
+    """Test the disassembly listing."""
+
+    def test_read_bytecode_round_trip(self) -> None:
+        """Test decoding a serialized module with functions."""
+        module = _loop_module()
+        module.add_chunk(
+            Chunk(
+                name="helper",
+                chunk_type=ChunkType.FUNCTION,
+                bytecode=bytearray([0x00, 0x00, 0x00, 0x00, 0x1A, 0x01, 0x00]),
+                constants=[(ConstantTag.STRING, "hi")],
+                num_locals=1,
+                num_params=0,
+            )
+        )
+
+        image = read_bytecode(module.serialize())
+
+        assert image.name == "loop"
+        assert image.constants[-1] == (ConstantTag.STRING, "hi")
+        assert image.functions == {"helper": 8}
+        assert image.registers == {"helper": 1}
+        assert image.function_ranges() == [("main", 0, 8), ("helper", 8, 10)]
+        assert image.instructions[8].comment == "'hi'"
+
+    def test_listing(self) -> None:
+        """Test the listing without a profile."""
+        listing = disassemble_module(_loop_module())
+
+        assert "Module: loop" in listing
+        assert "[  1] INT    3" in listing
+        assert ">    2  LT_R             r2, r0, r1" in listing
+        assert "JUMP_R           -5" in listing
+        assert "; -> 2" in listing
+        assert "Hot loops" not in listing
+
+    def test_profile_annotation(self) -> None:
+        """Test that a profile marks hot instructions and loops."""
+        hits = {0: 1, 1: 1, 2: 4, 3: 4, 4: 3, 5: 3, 6: 3, 7: 1}
+
+        listing = disassemble(_loop_module().serialize(), {"pc_hits": hits}, hot_threshold=0.1)
+
+        assert "         4  20.0% * >    2  LT_R" in listing
+        assert "         1   5.0%        7  RETURN_R" in listing
+        assert "2..6: 17 instructions (85.0%), header hit 4x" in listing
+
+    def test_profile_without_pc_hits(self) -> None:
+        """Test that a profile without per-instruction counts is rejected."""
+        with pytest.raises(ValueError, match="track_pcs"):
+            disassemble(_loop_module().serialize(), {"pc_hits": None})
+
+    def test_invalid_magic(self) -> None:
+        """Test that non-bytecode input is rejected."""
+        with pytest.raises(DisassemblyError, match="magic"):
+            disassemble(b"# Not bytecode")
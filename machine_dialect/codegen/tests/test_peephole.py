@@ -0,0 +1,234 @@
+"""Tests for the superinstruction peephole optimizer."""
+
+from __future__ import annotations
+
+from pathlib import Path
+
+import pytest
+
+from machine_dialect.codegen.bytecode_module import BytecodeModule, Chunk, ChunkType, ConstantTag
+from machine_dialect.codegen.disassembler import decode_instructions
+from machine_dialect.codegen.opcodes import Opcode
+from machine_dialect.codegen.peephole import FUSIONS, PeepholeOptimizer, select_fusions
+from machine_dialect.compiler.config import CompilerConfig
+from machine_dialect.compiler.context import CompilationContext
+from machine_dialect.compiler.phases.bytecode_optimization import BytecodeOptimizationPhase
+from machine_dialect.mir.profiling.profile_data import ProfileData
+
+CONSTANTS = [(ConstantTag.INT, 0), (ConstantTag.INT, 3), (ConstantTag.INT, 1)]
+
+# i = 0; while i < 3: i = i + 1; return i (the loop header is the compare)
+COUNTING_LOOP = bytes(
+    [
+        0x00, 0x00, 0x00, 0x00,  # 0: LOAD_CONST_R r0, #0
+        0x00, 0x01, 0x01, 0x00,  # 1: LOAD_CONST_R r1, #1
+        0x12, 0x02, 0x00, 0x01,  # 2: LT_R r2, r0, r1
+        0x17, 0x02, 0x01, 0x00, 0x00, 0x00,  # 3: JUMP_IF_R r2, +1
+        0x1A, 0x01, 0x00,  # 4: RETURN_R r0
+        0x00, 0x03, 0x02, 0x00,  # 5: LOAD_CONST_R r3, #2
+        0x07, 0x00, 0x00, 0x03,  # 6: ADD_R r0, r0, r3
+        0x16, 0xFA, 0xFF, 0xFF, 0xFF,  # 7: JUMP_R -6
+    ]
+)  # fmt: skip
+
+# Same loop, with the bound reloaded at the loop header and i + 1 computed into r4
+RELOADING_LOOP = bytes(
+    [
+        0x00, 0x00, 0x00, 0x00,  # 0: LOAD_CONST_R r0, #0
+        0x00, 0x01, 0x01, 0x00,  # 1: LOAD_CONST_R r1, #1
+        0x12, 0x02, 0x00, 0x01,  # 2: LT_R r2, r0, r1
+        0x17, 0x02, 0x01, 0x00, 0x00, 0x00,  # 3: JUMP_IF_R r2, +1
+        0x1A, 0x01, 0x00,  # 4: RETURN_R r0
+        0x00, 0x03, 0x02, 0x00,  # 5: LOAD_CONST_R r3, #2
+        0x07, 0x04, 0x00, 0x03,  # 6: ADD_R r4, r0, r3
+        0x01, 0x00, 0x04,  # 7: MOVE_R r0, r4
+        0x16, 0xF8, 0xFF, 0xFF, 0xFF,  # 8: JUMP_R -8
+    ]
+)  # fmt: skip
+
+# The counting loop after rotation: the loop body is the fallthrough of the header
+ROTATED_LOOP = bytes(
+    [
+        0x00, 0x00, 0x00, 0x00,  # 0: LOAD_CONST_R r0, #0
+        0x00, 0x01, 0x01, 0x00,  # 1: LOAD_CONST_R r1, #1
+        0x12, 0x02, 0x00, 0x01,  # 2: LT_R r2, r0, r1
+        0x18, 0x02, 0x03, 0x00, 0x00, 0x00,  # 3: JUMP_IF_NOT_R r2, +3
+        0x00, 0x03, 0x02, 0x00,  # 4: LOAD_CONST_R r3, #2
+        0x07, 0x00, 0x00, 0x03,  # 5: ADD_R r0, r0, r3
+        0x16, 0xFB, 0xFF, 0xFF, 0xFF,  # 6: JUMP_R -5
+        0x1A, 0x01, 0x00,  # 7: RETURN_R r0
+    ]
+)  # fmt: skip
+
+
+def _chunk(bytecode: bytes) -> Chunk:
+    return Chunk(
+        name="main",
+        chunk_type=ChunkType.MAIN,
+        bytecode=bytearray(bytecode),
+        constants=list(CONSTANTS),
+        num_locals=5,
+        num_params=0,
+    )
+
+
+def _listing(chunk: Chunk) -> list[tuple[str, str]]:
+    return [(inst.name, inst.operands) for inst in decode_instructions(bytes(chunk.bytecode), chunk.constants)]
+
+
+class TestPeepholeOptimizer:
+    """Test instruction fusion."""
+
+    def test_compare_jump_and_increment(self) -> None:
+        """Test fusion around a loop header that is the target of a backward jump."""
+        optimizer = PeepholeOptimizer()
+
+        chunk = optimizer.optimize(_chunk(COUNTING_LOOP))
+
+        assert _listing(chunk) == [
+            ("LOAD_CONST_R", "r0, #0"),
+            ("LOAD_CONST_R", "r1, #1"),
+            ("CMP_JUMP_R", "<, r0, r1, +1"),
+            ("RETURN_R", "r0"),
+            ("INC_R", "r0"),
+            ("JUMP_R", "-4"),
+        ]
+        assert optimizer.get_stats() == {"compare_jump": 1, "compare_const": 0, "add_immediate": 0, "increment": 1}
+
+    def test_compare_const_jump_and_add_immediate(self) -> None:
+        """Test the three-instruction fusion and jump offset re-resolution."""
+        chunk = PeepholeOptimizer().optimize(_chunk(RELOADING_LOOP))
+
+        instructions = decode_instructions(bytes(chunk.bytecode), chunk.constants)
+        assert [(inst.name, inst.operands) for inst in instructions] == [
+            ("LOAD_CONST_R", "r0, #0"),
+            ("CMP_CONST_JUMP_R", "<, r0, #1, +1"),
+            ("RETURN_R", "r0"),
+            ("ADD_IMM_R", "r4, r0, 1"),
+            ("MOVE_R", "r0, r4"),
+            ("JUMP_R", "-5"),
+        ]
+        assert instructions[1].target == 3
+        assert instructions[5].target == 1
+
+    def test_jump_if_not_fuses_inverse_comparison(self) -> None:
+        """Test that a branch on a false condition fuses with the inverse comparison."""
+        optimizer = PeepholeOptimizer()
+
+        chunk = optimizer.optimize(_chunk(ROTATED_LOOP))
+
+        instructions = decode_instructions(bytes(chunk.bytecode), chunk.constants)
+        assert [(inst.name, inst.operands) for inst in instructions] == [
+            ("LOAD_CONST_R", "r0, #0"),
+            ("LOAD_CONST_R", "r1, #1"),
+            ("CMP_JUMP_R", ">=, r0, r1, +2"),
+            ("INC_R", "r0"),
+            ("JUMP_R", "-3"),
+            ("RETURN_R", "r0"),
+        ]
+        assert instructions[2].target == 5
+        assert optimizer.get_stats()["compare_jump"] == 1
+
+    def test_jump_if_not_fuses_constant_comparison(self) -> None:
+        """Test the three-instruction fusion with a branch on a false condition."""
+        bytecode = bytes(
+            [
+                0x00, 0x01, 0x01, 0x00,  # 0: LOAD_CONST_R r1, #1
+                0x13, 0x02, 0x00, 0x01,  # 1: GT_R r2, r0, r1
+                0x18, 0x02, 0x00, 0x00, 0x00, 0x00,  # 2: JUMP_IF_NOT_R r2, +0
+                0x1A, 0x01, 0x00,  # 3: RETURN_R r0
+            ]
+        )  # fmt: skip
+
+        chunk = PeepholeOptimizer().optimize(_chunk(bytecode))
+
+        assert _listing(chunk) == [("CMP_CONST_JUMP_R", "<=, r0, #1, +0"), ("RETURN_R", "r0")]
+
+    def test_live_temporaries_are_kept(self) -> None:
+        """Test that a temporary read later is not dropped."""
+        bytecode = bytes(
+            [
+                0x00, 0x01, 0x01, 0x00,  # 0: LOAD_CONST_R r1, #1
+                0x12, 0x02, 0x00, 0x01,  # 1: LT_R r2, r0, r1
+                0x17, 0x02, 0x00, 0x00, 0x00, 0x00,  # 2: JUMP_IF_R r2, +0
+                0x07, 0x03, 0x00, 0x01,  # 3: ADD_R r3, r0, r1
+                0x1A, 0x01, 0x02,  # 4: RETURN_R r2
+            ]
+        )  # fmt: skip
+
+        chunk = PeepholeOptimizer().optimize(_chunk(bytecode))
+
+        # r1 is read again by the addition and r2 by the return
+        assert _listing(chunk) == [
+            ("LOAD_CONST_R", "r1, #1"),
+            ("LT_R", "r2, r0, r1"),
+            ("JUMP_IF_R", "r2, +0"),
+            ("ADD_R", "r3, r0, r1"),
+            ("RETURN_R", "r2"),
+        ]
+
+    def test_selected_fusions_only(self) -> None:
+        """Test that disabled fusions are not applied."""
+        chunk = PeepholeOptimizer(["compare_jump"]).optimize(_chunk(RELOADING_LOOP))
+
+        assert [name for name, _ in _listing(chunk)] == [
+            "LOAD_CONST_R",
+            "LOAD_CONST_R",
+            "CMP_JUMP_R",
+            "RETURN_R",
+            "LOAD_CONST_R",
+            "ADD_R",
+            "MOVE_R",
+            "JUMP_R",
+        ]
+
+    def test_unknown_fusion(self) -> None:
+        """Test that unknown fusion names are rejected."""
+        with pytest.raises(ValueError, match="Unknown fusion"):
+            PeepholeOptimizer(["jump_table"])
+
+    def test_unanalyzable_chunk_is_unchanged(self) -> None:
+        """Test that chunks with unknown opcodes are left alone."""
+        chunk = _chunk(bytes([0xFE]) + COUNTING_LOOP)
+
+        assert PeepholeOptimizer().optimize(chunk) is chunk
+
+
+class TestFusionSelection:
+    """Test profile-guided fusion selection."""
+
+    def test_select_from_opcode_counts(self) -> None:
+        """Test that fusions of rarely executed opcodes are dropped."""
+        counts = {
+            int(Opcode.LOAD_CONST_R): 300,
+            int(Opcode.LT_R): 300,
+            int(Opcode.JUMP_IF_R): 300,
+            int(Opcode.ADD_R): 1,
+            int(Opcode.RETURN_R): 99,
+        }
+
+        assert select_fusions(counts) == {"compare_jump", "compare_const"}
+
+    def test_fused_profile_keeps_fusions(self) -> None:
+        """Test that a profile of fused code keeps the fusions it used."""
+        counts = {str(int(Opcode.INC_R)): 50, str(int(Opcode.CMP_JUMP_R)): 50}
+
+        assert select_fusions(counts) == {"compare_jump", "increment"}
+
+    def test_empty_profile_selects_everything(self) -> None:
+        """Test that an empty profile does not disable fusion."""
+        assert select_fusions({}) == set(FUSIONS)
+
+    def test_phase_uses_profile(self) -> None:
+        """Test that the bytecode optimization phase applies the profiled fusions."""
+        context = CompilationContext(source_path=Path("loop.md"), config=CompilerConfig())
+        context.profile_data = ProfileData(
+            module_name="loop", metadata={"opcode_counts": {int(Opcode.LT_R): 10, int(Opcode.JUMP_IF_R): 10}}
+        )
+        module = BytecodeModule("loop", chunks=[_chunk(RELOADING_LOOP)])
+
+        optimized = BytecodeOptimizationPhase().run(context, module)
+
+        names = [name for name, _ in _listing(optimized.chunks[0])]
+        assert "CMP_JUMP_R" in names
+        assert "ADD_R" in names
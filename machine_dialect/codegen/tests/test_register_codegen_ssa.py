@@ -8,6 +8,7 @@ from __future__ import annotations
 
 import pytest
 
+from machine_dialect.codegen.disassembler import decode_instructions
 from machine_dialect.codegen.register_codegen import RegisterBytecodeGenerator
 from machine_dialect.mir.basic_block import CFG, BasicBlock
 from machine_dialect.mir.mir_function import MIRFunction
@@ -103,6 +104,29 @@ class TestSSAVariableHandling:
         if generator.allocation:
             assert x_1 in generator.allocation.value_to_register
 
+    def test_copy_from_constant_loads_it(self) -> None:
+        """Test that copying or storing a constant loads it instead of moving an unset register."""
+        func = MIRFunction("test_copy_constant", [], MIRType.INT)
+        entry = func.cfg.get_or_create_block("entry")
+        func.cfg.set_entry_block(entry)
+
+        x_1 = Variable("x", MIRType.INT, version=1)
+        y_1 = Variable("y", MIRType.INT, version=1)
+        func.add_local(y_1)
+        total = func.new_temp(MIRType.INT)
+        entry.add_instruction(Copy(x_1, Constant(2, MIRType.INT), (0, 0)))
+        entry.add_instruction(StoreVar(y_1, Constant(3, MIRType.INT), (0, 0)))
+        entry.add_instruction(BinaryOp(total, "+", x_1, y_1, (0, 0)))
+        entry.add_instruction(Return((0, 0), total))
+
+        module = MIRModule("test")
+        module.add_function(func)
+
+        chunk = RegisterBytecodeGenerator(debug=False).generate(module).chunks[0]
+        names = [inst.name for inst in decode_instructions(bytes(chunk.bytecode), chunk.constants)]
+        assert names[:3] == ["LOAD_CONST_R", "LOAD_CONST_R", "MOVE_R"]
+        assert "ADD_R" in names
+
     def test_ssa_variable_not_allocated_error(self) -> None:
         """Test that using an unallocated SSA variable raises an error."""
         func = MIRFunction("test_error", [], MIRType.INT)
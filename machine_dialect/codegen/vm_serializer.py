@@ -12,6 +12,7 @@ from io import BytesIO
 from typing import Any, BinaryIO
 
 from machine_dialect.codegen.bytecode_module import BytecodeModule, ConstantTag
+from machine_dialect.codegen.bytecode_serializer import FLAG_FUNCTION_REGISTERS, FLAG_LITTLE_ENDIAN
 from machine_dialect.codegen.opcodes import Opcode
 
 # =============================================================================
@@ -104,6 +105,10 @@ INSTRUCTION_FORMATS = {
     0x01: InstructionFormat(0x01, "MOVE_R", 3, False, "BB"),
     0x02: InstructionFormat(0x02, "LOAD_GLOBAL_R", 4, True, "BH"),
     0x03: InstructionFormat(0x03, "STORE_GLOBAL_R", 4, True, "BH"),
+    # Type operations
+    0x04: InstructionFormat(0x04, "DEFINE_R", 4, False, "BH"),
+    0x05: InstructionFormat(0x05, "CHECK_TYPE_R", 5, False, "BBH"),
+    0x06: InstructionFormat(0x06, "CAST_R", 5, False, "BBH"),
     # Arithmetic
     0x07: InstructionFormat(0x07, "ADD_R", 4, False, "BBB"),
     0x08: InstructionFormat(0x08, "SUB_R", 4, False, "BBB"),
@@ -144,6 +149,35 @@ INSTRUCTION_FORMATS = {
     # Debug
     0x25: InstructionFormat(0x25, "DEBUG_PRINT", 2, False, "B"),
     0x26: InstructionFormat(0x26, "BREAKPOINT", 1, False, ""),
+    0x27: InstructionFormat(0x27, "HALT", 1, False, ""),
+    0x28: InstructionFormat(0x28, "NOP", 1, False, ""),
+    # Dictionaries
+    0x29: InstructionFormat(0x29, "DICT_NEW_R", 2, False, "B"),
+    0x2A: InstructionFormat(0x2A, "DICT_GET_R", 4, False, "BBB"),
+    0x2B: InstructionFormat(0x2B, "DICT_SET_R", 4, False, "BBB"),
+    0x2C: InstructionFormat(0x2C, "DICT_REMOVE_R", 3, False, "BB"),
+    0x2D: InstructionFormat(0x2D, "DICT_CONTAINS_R", 4, False, "BBB"),
+    0x2E: InstructionFormat(0x2E, "DICT_KEYS_R", 3, False, "BB"),
+    0x2F: InstructionFormat(0x2F, "DICT_VALUES_R", 3, False, "BB"),
+    0x30: InstructionFormat(0x30, "DICT_CLEAR_R", 2, False, "B"),
+    0x31: InstructionFormat(0x31, "DICT_LEN_R", 3, False, "BB"),
+    # Array mutation
+    0x32: InstructionFormat(0x32, "ARRAY_PUSH_R", 3, False, "BB"),
+    0x33: InstructionFormat(0x33, "ARRAY_INSERT_R", 4, False, "BBB"),
+    0x34: InstructionFormat(0x34, "ARRAY_REMOVE_AT_R", 3, False, "BB"),
+    0x35: InstructionFormat(0x35, "ARRAY_FIND_R", 4, False, "BBB"),
+    0x36: InstructionFormat(0x36, "ARRAY_CLEAR_R", 2, False, "B"),
+    # Superinstructions
+    0x37: InstructionFormat(0x37, "CMP_JUMP_R", 8, False, "BBBi"),
+    0x38: InstructionFormat(0x38, "CMP_CONST_R", 6, True, "BBBH"),
+    0x39: InstructionFormat(0x39, "CMP_CONST_JUMP_R", 9, True, "BBHi"),
+    0x3A: InstructionFormat(0x3A, "ADD_IMM_R", 5, False, "BBh"),
+    0x3B: InstructionFormat(0x3B, "INC_R", 2, False, "B"),
+    # Tail calls
+    0x3C: InstructionFormat(0x3C, "TAIL_CALL_R", -1, False, ""),  # Variable size
+    # Memoization
+    0x3D: InstructionFormat(0x3D, "MEMO_LOOKUP_R", 4, True, "HB"),
+    0x3E: InstructionFormat(0x3E, "MEMO_STORE_R", 5, True, "HBB"),
 }
 
 
@@ -250,6 +284,13 @@ def get_instruction_size(opcode: int, bytecode: bytes, offset: int) -> int:
             return 4 + num_args
         return 1
 
+    elif opcode == Opcode.TAIL_CALL_R:
+        # Format: opcode + func + num_args + args...
+        if offset + 2 < len(bytecode):
+            num_args = bytecode[offset + 2]
+            return 3 + num_args
+        return 1
+
     elif opcode == Opcode.PHI_R:
         # Format: opcode + dst + num_sources + (src + block_id) * num_sources
         if offset + 2 < len(bytecode):
@@ -376,6 +417,17 @@ class BytecodeRemapper:
 
             return bytes([cond_reg, assert_type]) + struct.pack("<H", new_idx)
 
+        elif opcode in [Opcode.CMP_CONST_R, Opcode.CMP_CONST_JUMP_R, Opcode.MEMO_LOOKUP_R, Opcode.MEMO_STORE_R]:
+            # Format: registers + const_idx(u16) [+ registers or offset(i32)]
+            fmt = INSTRUCTION_FORMATS[opcode]
+            if len(operands) < fmt.size - 1:
+                raise InvalidBytecodeError(f"{fmt.name} operands too short", offset=offset, chunk_idx=chunk_idx)
+            values = list(struct.unpack("<" + fmt.operand_format, operands[: fmt.size - 1]))
+            const_pos = fmt.operand_format.index("H")
+            values[const_pos] = chunk_map.get(values[const_pos], values[const_pos])
+
+            return struct.pack("<" + fmt.operand_format, *values)
+
         # Other opcodes don't reference constants
         return operands
 
@@ -502,7 +554,7 @@ class VMBytecodeSerializer:
         func_section_size = 4  # count
         for func_name in module.function_table:
             func_name_bytes = func_name.encode("utf-8")
-            func_section_size += 4 + len(func_name_bytes) + 4  # name length + name + offset
+            func_section_size += 4 + len(func_name_bytes) + 4 + 2  # name length + name + offset + registers
 
         # Calculate offsets
         name_offset = header_size
@@ -513,7 +565,7 @@ class VMBytecodeSerializer:
         # Write header
         stream.write(b"MDBC")  # Magic
         stream.write(struct.pack("<I", 1))  # Version
-        stream.write(struct.pack("<I", 0x0001))  # Flags (little-endian)
+        stream.write(struct.pack("<I", FLAG_LITTLE_ENDIAN | FLAG_FUNCTION_REGISTERS))  # Flags
         stream.write(struct.pack("<I", name_offset))
         stream.write(struct.pack("<I", const_offset))
         stream.write(struct.pack("<I", func_offset))
@@ -550,6 +602,8 @@ class VMBytecodeSerializer:
             # Convert byte offset to instruction offset
             inst_offset = VMBytecodeSerializer.count_instructions(bytes(all_bytecode[:bytecode_offset]))
             stream.write(struct.pack("<I", inst_offset))
+            # Register window size, so the VM only reserves what the function uses
+            stream.write(struct.pack("<H", VMBytecodeSerializer.frame_size(module, chunk_idx)))
 
         # Write instructions
         # The Rust loader expects the number of instructions, not bytes
@@ -557,6 +611,22 @@ class VMBytecodeSerializer:
         stream.write(struct.pack("<I", instruction_count))
         stream.write(all_bytecode)
 
+    @staticmethod
+    def frame_size(module: BytecodeModule, chunk_idx: int) -> int:
+        """Get the number of registers a function uses.
+
+        Args:
+            module: Module containing the function.
+            chunk_idx: Index of the function's chunk.
+
+        Returns:
+            Register count of the chunk, or 256 (a full window) if unknown.
+        """
+        if not 0 <= chunk_idx < len(module.chunks):
+            return 256
+        chunk = module.chunks[chunk_idx]
+        return min(max(chunk.num_locals, chunk.num_params), 256)
+
     @staticmethod
     def count_instructions(bytecode: bytes) -> int:
         """Count the number of instructions in bytecode.
@@ -6,6 +6,7 @@ compilation process.
 
 from pathlib import Path
 
+from machine_dialect.codegen.disassembler import disassemble_module
 from machine_dialect.compiler.config import CompilerConfig
 from machine_dialect.compiler.context import CompilationContext
 from machine_dialect.compiler.pipeline import CompilationPipeline
@@ -60,6 +61,22 @@ class Compiler:
         # Run compilation pipeline
         context = self.pipeline.compile_file(source_path)
 
+        try:
+            return self._finish_compilation(context)
+        finally:
+            # Write the trace even for failed compilations
+            if self.config.trace_path:
+                self._write_trace(context)
+
+    def _finish_compilation(self, context: CompilationContext) -> bool:
+        """Report, save and summarize the result of a pipeline run.
+
+        Args:
+            context: Compilation context returned by the pipeline.
+
+        Returns:
+            True if compilation succeeded without errors.
+        """
         # Print errors and warnings
         context.print_errors_and_warnings()
 
@@ -133,7 +150,11 @@ class Compiler:
             context.bytecode_module.name = context.get_module_name()
 
             # Serialize and save using VM serializer
-            bytecode_data = context.bytecode_module.serialize()
+            if self.config.tracing_enabled:
+                with context.tracer.span("serialization"):
+                    bytecode_data = context.bytecode_module.serialize()
+            else:
+                bytecode_data = context.bytecode_module.serialize()
             with open(output_path, "wb") as f:
                 f.write(bytecode_data)
 
@@ -146,22 +167,40 @@ class Compiler:
             context.add_error(f"Failed to save module: {e}")
             return False
 
+    def _write_trace(self, context: CompilationContext) -> None:
+        """Write the Chrome trace of the compilation to the configured path.
+
+        Args:
+            context: Compilation context containing the recorded spans.
+
+        Note:
+            A failure to write the trace is reported as a warning and does
+            not fail the compilation.
+        """
+        if not self.config.trace_path:
+            return
+
+        try:
+            context.tracer.write_chrome_trace(self.config.trace_path)
+            if self.config.verbose:
+                print(f"Wrote compilation trace to {self.config.trace_path}")
+        except OSError as e:
+            print(f"Warning: Failed to write trace: {e}")
+
     def _show_disassembly(self, context: CompilationContext) -> None:
         """Display human-readable disassembly of compiled bytecode.
 
         Args:
             context: Compilation context containing bytecode module.
-
-        Note:
-            Currently placeholder - disassembly for register-based
-            bytecode is not yet implemented.
         """
         if not context.bytecode_module:
             return
 
         print("\n=== Disassembly ===")
-        # TODO: Implement disassembly for new register-based bytecode
-        print("Disassembly not yet implemented for register-based bytecode")
+        try:
+            print(disassemble_module(context.bytecode_module), end="")
+        except Exception as e:
+            print(f"Failed to disassemble module: {e}")
 
     def _print_success(self, context: CompilationContext) -> None:
         """Print detailed compilation success summary.
@@ -194,4 +233,8 @@ class Compiler:
         if "bytecode_chunks" in stats:
             print(f"Bytecode chunks: {stats['bytecode_chunks']}")
 
+        if "timings" in stats:
+            for phase, timing in stats["timings"].get("phase", {}).items():
+                print(f"  {phase}: {timing['total_ms']:.2f} ms")
+
         print("Compilation successful!")
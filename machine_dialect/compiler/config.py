@@ -32,6 +32,9 @@ class CompilerConfig:
         mir_phase_only: Stop after MIR generation.
         output_path: Output file path.
         module_name: Name for the compiled module.
+        trace: Record timing spans for phases and passes.
+        trace_path: Path to write a Chrome trace of the compilation.
+        memoize_functions: Functions to memoize if they are pure.
     """
 
     optimization_level: OptimizationLevel = OptimizationLevel.STANDARD
@@ -44,6 +47,8 @@ class CompilerConfig:
     mir_phase_only: bool = False
     output_path: Path | None = None
     module_name: str | None = None
+    trace: bool = False
+    trace_path: Path | None = None
 
     # MIR dumping options
     mir_dump_verbosity: str = "normal"
@@ -53,6 +58,7 @@ class CompilerConfig:
     enabled_passes: list[str] | None = None
     disabled_passes: list[str] | None = None
     pass_pipeline: str | None = None  # Custom pass pipeline
+    memoize_functions: list[str] = field(default_factory=list)
 
     @classmethod
     def from_cli_options(
@@ -66,6 +72,8 @@ class CompilerConfig:
         mir_phase: bool = False,
         output: str | None = None,
         module_name: str | None = None,
+        trace_out: str | None = None,
+        memoize: tuple[str, ...] = (),
         **kwargs: object,
     ) -> "CompilerConfig":
         """Create config from CLI options.
@@ -80,6 +88,8 @@ class CompilerConfig:
             mir_phase: Stop after MIR generation.
             output: Output file path.
             module_name: Module name.
+            trace_out: Path for Chrome trace output.
+            memoize: Names of functions to memoize.
             **kwargs: Additional options.
 
         Returns:
@@ -95,8 +105,20 @@ class CompilerConfig:
             mir_phase_only=mir_phase,
             output_path=Path(output) if output else None,
             module_name=module_name,
+            trace=trace_out is not None,
+            trace_path=Path(trace_out) if trace_out else None,
+            memoize_functions=list(memoize),
         )
 
+    @property
+    def tracing_enabled(self) -> bool:
+        """Check if phase and pass timing spans should be recorded.
+
+        Returns:
+            True if tracing or trace output is requested.
+        """
+        return self.trace or self.trace_path is not None
+
     def get_optimization_passes(self) -> list[str]:
         """Get list of optimization passes to run based on level.
 
@@ -108,6 +130,10 @@ class CompilerConfig:
 
         passes = []
 
+        if self.optimization_level >= OptimizationLevel.STANDARD:
+            # Run pure calls with constant arguments while the callees are unoptimized
+            passes.append("partial-evaluation")
+
         if self.optimization_level >= OptimizationLevel.BASIC:
             passes.extend(
                 [
@@ -121,12 +147,13 @@ class CompilerConfig:
         if self.optimization_level >= OptimizationLevel.STANDARD:
             passes.extend(
                 [
-                    "cse",
+                    "gvn",
                     "strength-reduction",
                     "algebraic-simplification",  # New pass
                     "licm",
                     "loop-unrolling",
                     "tail-call",
+                    "memoization",
                 ]
             )
 
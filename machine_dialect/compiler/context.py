@@ -13,6 +13,7 @@ from machine_dialect.compiler.config import CompilerConfig
 from machine_dialect.mir.mir_module import MIRModule
 from machine_dialect.mir.profiling.profile_data import ProfileData
 from machine_dialect.mir.reporting.optimization_reporter import OptimizationReporter
+from machine_dialect.mir.reporting.tracing import Tracer
 
 
 @dataclass
@@ -31,6 +32,7 @@ class CompilationContext:
         errors: List of compilation errors.
         warnings: List of compilation warnings.
         metadata: Additional compilation metadata.
+        tracer: Span tracer for phase and pass timings.
     """
 
     source_path: Path
@@ -44,6 +46,12 @@ class CompilationContext:
     errors: list[str] = field(default_factory=list)
     warnings: list[str] = field(default_factory=list)
     metadata: dict[str, Any] = field(default_factory=dict)
+    tracer: Tracer = field(default_factory=Tracer)
+
+    def __post_init__(self) -> None:
+        """Enable tracing when requested by the configuration."""
+        if self.config.tracing_enabled:
+            self.tracer.enabled = True
 
     def add_error(self, message: str) -> None:
         """Add a compilation error.
@@ -146,4 +154,7 @@ class CompilationContext:
         if self.bytecode_module:
             stats["bytecode_chunks"] = len(self.bytecode_module.chunks)
 
+        if self.tracer.enabled:
+            stats["timings"] = self.tracer.summary()
+
         return stats
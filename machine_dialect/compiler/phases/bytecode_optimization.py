@@ -8,6 +8,7 @@ from __future__ import annotations
 from typing import TYPE_CHECKING
 
 from machine_dialect.codegen.bytecode_module import BytecodeModule
+from machine_dialect.codegen.peephole import PeepholeOptimizer, select_fusions
 from machine_dialect.mir.optimizations.jump_threading import JumpThreadingOptimizer
 
 if TYPE_CHECKING:
@@ -17,8 +18,8 @@ if TYPE_CHECKING:
 class BytecodeOptimizationPhase:
     """Bytecode optimization phase.
 
-    Applies bytecode-level optimizations like jump threading,
-    peephole optimization, etc.
+    Applies bytecode-level optimizations like jump threading and
+    peephole fusion into superinstructions.
     """
 
     def __init__(self) -> None:
@@ -41,6 +42,14 @@ class BytecodeOptimizationPhase:
         if context.config.verbose:
             print("Running bytecode optimizations...")
 
+        # Fusions are chosen from the VM opcode profile when one was loaded
+        fusions = None
+        if context.profile_data is not None:
+            opcode_counts = context.profile_data.metadata.get("opcode_counts")
+            if opcode_counts:
+                fusions = select_fusions(opcode_counts)
+        peephole = PeepholeOptimizer(fusions)
+
         # Apply jump threading to each chunk
         optimized_chunks = []
         total_stats = {
@@ -54,8 +63,10 @@ class BytecodeOptimizationPhase:
             # Reset optimizer for each chunk
             self.jump_threading = JumpThreadingOptimizer()
 
-            # Optimize the chunk
+            # Optimize the chunk; fusion runs last since it introduces
+            # opcodes the jump threading optimizer does not decode
             optimized_chunk = self.jump_threading.optimize(chunk)
+            optimized_chunk = peephole.optimize(optimized_chunk)
             optimized_chunks.append(optimized_chunk)
 
             # Accumulate statistics
@@ -63,6 +74,9 @@ class BytecodeOptimizationPhase:
             for key, value in stats.items():
                 total_stats[key] += value
 
+        for fusion, count in peephole.get_stats().items():
+            total_stats[f"fused_{fusion}"] = count
+
         # Create new module with optimized chunks
         optimized_module = BytecodeModule(bytecode_module.name)
         optimized_module.chunks = optimized_chunks
@@ -81,6 +95,9 @@ class BytecodeOptimizationPhase:
                 print(f"  Conditional jumps simplified: {total_stats['jumps_simplified']}")
             if total_stats["blocks_merged"] > 0:
                 print(f"  Blocks merged: {total_stats['blocks_merged']}")
+            for fusion, count in peephole.get_stats().items():
+                if count > 0:
+                    print(f"  Fused {fusion.replace('_', ' ')}: {count}")
             print()
 
         # Store stats in context for reporting
@@ -68,6 +68,10 @@ class OptimizationPhase:
             config=opt_config,
             debug=context.config.debug,
             custom_passes=custom_passes,
+            tracer=context.tracer,
+            pass_options={
+                "memoization": {"functions": context.config.memoize_functions, "profile_data": profile_data},
+            },
         )
 
         # Store stats in reporter if provided
@@ -72,7 +72,8 @@ class CompilationPipeline:
 
         # Phase 1: Syntactic Analysis (includes lexical analysis)
         if not context.has_errors():
-            ast = self.parsing_phase.run(context)
+            with context.tracer.span("parsing"):
+                ast = self.parsing_phase.run(context)
             if ast:
                 context.ast = ast
             else:
@@ -82,13 +83,15 @@ class CompilationPipeline:
 
         # Phase 2: HIR Generation (Desugaring)
         if not context.has_errors():
-            hir = self.hir_phase.run(context, context.ast)
+            with context.tracer.span("hir_generation"):
+                hir = self.hir_phase.run(context, context.ast)
         else:
             return context
 
         # Phase 3: MIR Generation
         if not context.has_errors():
-            mir_module = self.mir_phase.run(context, hir)
+            with context.tracer.span("mir_generation"):
+                mir_module = self.mir_phase.run(context, hir)
             if mir_module:
                 context.mir_module = mir_module
             else:
@@ -104,7 +107,8 @@ class CompilationPipeline:
 
         # Phase 4: Optimization
         if not context.has_errors() and context.should_optimize():
-            optimized_mir = self.optimization_phase.run(context, context.mir_module)
+            with context.tracer.span("optimization"):
+                optimized_mir = self.optimization_phase.run(context, context.mir_module)
             context.mir_module = optimized_mir
         else:
             if context.has_errors():
@@ -112,7 +116,8 @@ class CompilationPipeline:
 
         # Phase 5: Code Generation
         if not context.has_errors() and context.should_generate_bytecode():
-            bytecode_module = self.codegen_phase.run(context, context.mir_module)
+            with context.tracer.span("codegen"):
+                bytecode_module = self.codegen_phase.run(context, context.mir_module)
             if bytecode_module:
                 context.bytecode_module = bytecode_module
             else:
@@ -122,7 +127,8 @@ class CompilationPipeline:
 
         # Phase 6: Bytecode Optimization (after code generation)
         if not context.has_errors() and context.bytecode_module and context.should_optimize():
-            optimized_bytecode = self.bytecode_optimization_phase.run(context, context.bytecode_module)
+            with context.tracer.span("bytecode_optimization"):
+                optimized_bytecode = self.bytecode_optimization_phase.run(context, context.bytecode_module)
             context.bytecode_module = optimized_bytecode
 
         return context
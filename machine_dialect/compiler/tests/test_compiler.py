@@ -10,7 +10,7 @@ from unittest.mock import Mock, mock_open, patch
 
 import pytest
 
-from machine_dialect.codegen.bytecode_module import BytecodeModule
+from machine_dialect.codegen.bytecode_module import BytecodeModule, Chunk, ChunkType, ConstantTag
 from machine_dialect.compiler.compiler import Compiler
 from machine_dialect.compiler.config import CompilerConfig, OptimizationLevel
 from machine_dialect.compiler.context import CompilationContext
@@ -395,15 +395,24 @@ class TestShowDisassembly:
         """Test disassembly with bytecode module."""
         compiler = Compiler()
         mock_context = Mock(spec=CompilationContext)
-        mock_context.bytecode_module = Mock(spec=BytecodeModule)
+        chunk = Chunk(
+            name="main",
+            chunk_type=ChunkType.MAIN,
+            bytecode=bytearray([0x00, 0x00, 0x00, 0x00, 0x1A, 0x01, 0x00]),
+            constants=[(ConstantTag.INT, 42)],
+            num_locals=1,
+            num_params=0,
+        )
+        mock_context.bytecode_module = BytecodeModule(chunks=[chunk])
 
         compiler._show_disassembly(mock_context)
 
-        # Should print disassembly header and placeholder message
+        # Should print disassembly header and the decoded instructions
         assert mock_print.call_count == 2
         print_calls = [call[0][0] for call in mock_print.call_args_list]
         assert any("Disassembly" in call for call in print_calls)
-        assert any("not yet implemented" in call for call in print_calls)
+        assert "LOAD_CONST_R     r0, #0" in print_calls[1]
+        assert "RETURN_R         r0" in print_calls[1]
 
 
 class TestPrintSuccess:
@@ -566,3 +575,46 @@ Give back `result`.
         # Test with non-existent source file - should raise error from pipeline
         with pytest.raises(FileNotFoundError):
             compiler.compile_file(Path("nonexistent.md"))
+
+
+class TestTracing:
+    """Test compilation tracing."""
+
+    @patch("builtins.print")
+    def test_trace_out_writes_chrome_trace(self, mock_print: Mock) -> None:
+        """Test that --trace-out records phases and writes a Chrome trace."""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            source_path = Path(tmpdir) / "program.md"
+            source_path.write_text("Define `result` as Whole Number.\nSet `result` to _42_.\nGive back `result`.\n")
+            trace_path = Path(tmpdir) / "trace.json"
+
+            config = CompilerConfig.from_cli_options(trace_out=str(trace_path))
+            compiler = Compiler(config)
+
+            assert compiler.compile_file(source_path, Path(tmpdir) / "program.mdbc") is True
+
+            import json
+
+            events = json.loads(trace_path.read_text())["traceEvents"]
+            names = {event["name"] for event in events if event["cat"] == "phase"}
+            assert {"parsing", "mir_generation", "optimization", "codegen", "serialization"} <= names
+            assert any(event["cat"] == "pass" and "function" in event["args"] for event in events)
+
+    def test_statistics_include_timings(self) -> None:
+        """Test that phase timings are aggregated into the statistics."""
+        compiler = Compiler(CompilerConfig(trace=True))
+
+        context = compiler.compile_string("Define `x` as Whole Number.\nSet `x` to _1_.\n")
+
+        stats = context.get_statistics()
+        assert "timings" in stats
+        assert stats["timings"]["phase"]["parsing"]["count"] == 1
+
+    def test_statistics_without_tracing(self) -> None:
+        """Test that no timings are collected when tracing is disabled."""
+        compiler = Compiler(CompilerConfig())
+
+        context = compiler.compile_string("Define `x` as Whole Number.\nSet `x` to _1_.\n")
+
+        assert "timings" not in context.get_statistics()
+        assert context.tracer.spans == []
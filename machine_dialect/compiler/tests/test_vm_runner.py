@@ -0,0 +1,112 @@
+"""Tests for the VM pool used by the VM runner."""
+
+from __future__ import annotations
+
+import threading
+
+import pytest
+
+from machine_dialect.compiler.vm_runner import VMPool, VMRunner
+
+
+class FakeVM:
+    """Stand-in for RustVM that records resets."""
+
+    def __init__(self) -> None:
+        self.resets = 0
+
+    def reset(self) -> None:
+        self.resets += 1
+
+    def load_bytecode(self, path: str) -> None:
+        with open(path, "rb") as f:
+            self.program = f.read()
+
+    def execute(self, lazy: bool = False) -> bytes:
+        return self.program
+
+
+class TestVMPool:
+    """Test VM checkout and reuse."""
+
+    def test_checkout_reuses_reset_vm(self) -> None:
+        """Test that a released VM is reset and handed out again."""
+        created: list[FakeVM] = []
+
+        def factory() -> FakeVM:
+            created.append(FakeVM())
+            return created[-1]
+
+        pool = VMPool(factory)
+
+        with pool.checkout() as first:
+            assert first.resets == 0
+        with pool.checkout() as second:
+            assert second is first
+            assert second.resets == 1
+
+        assert len(created) == 1
+        assert pool.idle_count() == 1
+
+    def test_release_on_error(self) -> None:
+        """Test that a VM is returned to the pool when the block raises."""
+        pool = VMPool(FakeVM)
+
+        with pytest.raises(RuntimeError), pool.checkout():
+            raise RuntimeError("program failed")
+
+        assert pool.idle_count() == 1
+
+    def test_max_idle(self) -> None:
+        """Test that only max_idle VMs are kept."""
+        pool = VMPool(FakeVM, max_idle=1)
+
+        vms = [pool.acquire() for _ in range(3)]
+        for vm in vms:
+            pool.release(vm)
+
+        assert pool.idle_count() == 1
+        assert all(vm.resets == 1 for vm in vms)
+
+    def test_concurrent_checkouts_get_distinct_vms(self) -> None:
+        """Test that threads never share a VM."""
+        pool = VMPool(FakeVM, max_idle=4)
+        barrier = threading.Barrier(4)
+        seen: list[FakeVM] = []
+
+        def worker() -> None:
+            with pool.checkout() as vm:
+                seen.append(vm)
+                barrier.wait()
+
+        threads = [threading.Thread(target=worker) for _ in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        assert len({id(vm) for vm in seen}) == 4
+        assert pool.idle_count() == 4
+
+    def test_reset_idle_vms(self) -> None:
+        """Test resetting the idle VMs."""
+        pool = VMPool(FakeVM)
+        vm = pool.acquire()
+        pool.release(vm)
+
+        pool.reset()
+
+        assert vm.resets == 2
+
+
+class TestVMRunner:
+    """Test running programs on pooled VMs."""
+
+    def test_execute_many(self, monkeypatch: pytest.MonkeyPatch) -> None:
+        """Test that parallel execution returns results in program order."""
+        monkeypatch.setattr(VMRunner, "_create_vm", lambda self: FakeVM())
+        runner = VMRunner(pool_size=2)
+        programs = [bytes([i]) for i in range(8)]
+
+        assert runner.execute_many(programs, max_workers=4) == programs
+        assert runner.pool.idle_count() <= 2
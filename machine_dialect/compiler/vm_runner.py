@@ -7,6 +7,10 @@ pipeline and the Rust VM for executing Machine Dialect™ programs.
 from __future__ import annotations
 
 import tempfile
+import threading
+from collections.abc import Callable, Iterable, Iterator
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
 from pathlib import Path
 from typing import Any
 
@@ -22,6 +26,78 @@ from machine_dialect.mir.optimize_mir import optimize_mir
 from machine_dialect.parser.parser import Parser
 
 
+class VMPool:
+    """A thread-safe pool of reusable Rust VM instances.
+
+    A VM that is checked back in is reset (``RustVM.reset``) instead of being
+    discarded, so executing many short programs does not pay for VM
+    construction and teardown each time. Checking out never blocks: when no
+    idle VM is available a new one is created.
+    """
+
+    def __init__(self, factory: Callable[[], Any], max_idle: int = 4) -> None:
+        """Initialize the pool.
+
+        Args:
+            factory: Creates a new VM.
+            max_idle: Maximum number of idle VMs kept for reuse.
+        """
+        self.factory = factory
+        self.max_idle = max_idle
+        self._idle: list[Any] = []
+        self._lock = threading.Lock()
+
+    def acquire(self) -> Any:
+        """Take an idle VM, or create one.
+
+        Returns:
+            A VM owned by the caller until it is released.
+        """
+        with self._lock:
+            if self._idle:
+                return self._idle.pop()
+        return self.factory()
+
+    def release(self, vm: Any) -> None:
+        """Reset a VM and return it to the pool.
+
+        Args:
+            vm: A VM obtained from ``acquire``.
+        """
+        vm.reset()
+        with self._lock:
+            if len(self._idle) < self.max_idle:
+                self._idle.append(vm)
+
+    @contextmanager
+    def checkout(self) -> Iterator[Any]:
+        """Borrow a VM for the duration of a ``with`` block.
+
+        Yields:
+            A VM, released back to the pool when the block exits.
+        """
+        vm = self.acquire()
+        try:
+            yield vm
+        finally:
+            self.release(vm)
+
+    def reset(self) -> None:
+        """Reset every idle VM."""
+        with self._lock:
+            for vm in self._idle:
+                vm.reset()
+
+    def idle_count(self) -> int:
+        """Get the number of idle VMs.
+
+        Returns:
+            VMs available for reuse.
+        """
+        with self._lock:
+            return len(self._idle)
+
+
 class VMRunner:
     """Manages compilation and execution of Machine Dialect™ code on the Rust VM.
 
@@ -31,26 +107,40 @@ class VMRunner:
     3. Executing programs and returning results
     """
 
-    def __init__(self, debug: bool = False, optimize: bool = False) -> None:
+    def __init__(self, debug: bool = False, optimize: bool = False, pool_size: int = 4) -> None:
         """Initialize the VM runner.
 
+        Programs run on VMs checked out of ``self.pool``, so one runner can
+        be shared by several threads. The VM releases the GIL while a program
+        runs, so programs on different threads execute in parallel.
+
         Args:
             debug: Enable debug output
             optimize: Enable MIR optimizations
+            pool_size: Maximum number of idle VMs kept for reuse
         """
         self.debug = debug
         self.optimize = optimize
-        self.vm: Any = None
-        self._init_vm()
+        self.pool = VMPool(self._create_vm, max_idle=pool_size)
+        # Create the first VM eagerly so a missing VM module is reported here
+        self.pool.release(self._create_vm())
+
+    def _create_vm(self) -> Any:
+        """Create a Rust VM instance.
+
+        Returns:
+            A new ``RustVM``.
 
-    def _init_vm(self) -> None:
-        """Initialize the Rust VM instance."""
+        Raises:
+            RuntimeError: If the Rust VM module is not built.
+        """
         try:
             import machine_dialect_vm
 
-            self.vm = machine_dialect_vm.RustVM()
+            vm = machine_dialect_vm.RustVM()
             if self.debug:
-                self.vm.set_debug(True)
+                vm.set_debug(True)
+            return vm
         except ImportError as e:
             raise RuntimeError(
                 "Rust VM module not available. Please build it first:\n"
@@ -118,11 +208,13 @@ class VMRunner:
         # Serialize to bytes
         return bytecode_module.serialize()
 
-    def execute(self, source: str) -> Any:
+    def execute(self, source: str, lazy: bool = False) -> Any:
         """Compile and execute Machine Dialect™ source code.
 
         Args:
             source: Machine Dialect™ source code
+            lazy: Return collections as read-only views over the VM's data
+                instead of copying them into lists and dicts
 
         Returns:
             The result of program execution
@@ -132,42 +224,44 @@ class VMRunner:
         """
         # Compile to bytecode
         bytecode = self.compile_to_bytecode(source)
+        return self.execute_bytecode(bytecode, lazy=lazy)
 
-        # Write to temporary file (VM loads from file)
-        with tempfile.NamedTemporaryFile(suffix=".mdbc", delete=False) as f:
-            f.write(bytecode)
-            bytecode_path = f.name
-
-        try:
-            # Load and execute in VM
-            self.vm.load_bytecode(bytecode_path)
-            result = self.vm.execute()
-            return result
-        finally:
-            # Clean up temporary file
-            Path(bytecode_path).unlink(missing_ok=True)
-
-    def execute_bytecode(self, bytecode: bytes) -> Any:
+    def execute_bytecode(self, bytecode: bytes, lazy: bool = False) -> Any:
         """Execute pre-compiled bytecode.
 
         Args:
             bytecode: Serialized bytecode
+            lazy: Return collections as read-only views (see ``execute``)
 
         Returns:
             The result of program execution
         """
-        # Write to temporary file
+        # Write to temporary file (VM loads from file)
         with tempfile.NamedTemporaryFile(suffix=".mdbc", delete=False) as f:
             f.write(bytecode)
             bytecode_path = f.name
 
         try:
-            self.vm.load_bytecode(bytecode_path)
-            result = self.vm.execute()
-            return result
+            with self.pool.checkout() as vm:
+                vm.load_bytecode(bytecode_path)
+                return vm.execute(lazy=lazy)
         finally:
             Path(bytecode_path).unlink(missing_ok=True)
 
+    def execute_many(self, bytecodes: Iterable[bytes], max_workers: int | None = None, lazy: bool = False) -> list[Any]:
+        """Execute pre-compiled programs in parallel on a thread pool.
+
+        Args:
+            bytecodes: Serialized programs
+            max_workers: Number of threads (see ``ThreadPoolExecutor``)
+            lazy: Return collections as read-only views (see ``execute``)
+
+        Returns:
+            The results, in the order of ``bytecodes``
+        """
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            return list(executor.map(lambda bytecode: self.execute_bytecode(bytecode, lazy=lazy), bytecodes))
+
     def reset(self) -> None:
-        """Reset the VM to initial state."""
-        self._init_vm()
+        """Reset the idle VMs to initial state, keeping them for reuse."""
+        self.pool.reset()
@@ -1,20 +1,31 @@
 """MIR analysis passes."""
 
 from machine_dialect.mir.analyses.alias_analysis import AliasAnalysis, AliasInfo
+from machine_dialect.mir.analyses.call_graph import CallGraph, CallGraphAnalysis, CallSite
 from machine_dialect.mir.analyses.dominance_analysis import DominanceAnalysis
 from machine_dialect.mir.analyses.escape_analysis import EscapeAnalysis, EscapeInfo
+from machine_dialect.mir.analyses.liveness import LivenessAnalysis, LivenessInfo
 from machine_dialect.mir.analyses.loop_analysis import Loop, LoopAnalysis, LoopInfo
+from machine_dialect.mir.analyses.purity_analysis import FunctionEffects, PurityAnalysis, PurityInfo
 from machine_dialect.mir.analyses.use_def_chains import UseDefChains, UseDefChainsAnalysis
 
 __all__ = [
     "AliasAnalysis",
     "AliasInfo",
+    "CallGraph",
+    "CallGraphAnalysis",
+    "CallSite",
     "DominanceAnalysis",
     "EscapeAnalysis",
     "EscapeInfo",
+    "FunctionEffects",
+    "LivenessAnalysis",
+    "LivenessInfo",
     "Loop",
     "LoopAnalysis",
     "LoopInfo",
+    "PurityAnalysis",
+    "PurityInfo",
     "UseDefChains",
     "UseDefChainsAnalysis",
 ]
@@ -0,0 +1,202 @@
+"""Call graph analysis for MIR.
+
+This module builds the call graph of a module and groups its functions into
+strongly connected components (SCCs), ordered bottom-up so that interprocedural
+passes like inlining can process callees before their callers.
+"""
+
+from dataclasses import dataclass
+
+from machine_dialect.mir.basic_block import BasicBlock
+from machine_dialect.mir.mir_instructions import Call
+from machine_dialect.mir.mir_module import MIRModule
+from machine_dialect.mir.mir_values import FunctionRef
+from machine_dialect.mir.optimization_pass import (
+    ModuleAnalysisPass,
+    PassInfo,
+    PassType,
+    PreservationLevel,
+)
+
+
+@dataclass
+class CallSite:
+    """A call from one function of the module to another.
+
+    Attributes:
+        caller: Name of the calling function.
+        callee: Name of the called function.
+        block: Block containing the call.
+        instruction: The call instruction.
+    """
+
+    caller: str
+    callee: str
+    block: BasicBlock
+    instruction: Call
+
+
+class CallGraph:
+    """Call graph of a module.
+
+    Only calls to functions defined in the module are recorded.
+
+    Attributes:
+        callees: Function name -> names of the functions it calls.
+        callers: Function name -> names of the functions calling it.
+        call_sites: Function name -> calls made by that function.
+        sccs: Strongly connected components, callees before callers.
+    """
+
+    def __init__(self) -> None:
+        """Initialize an empty call graph."""
+        self.callees: dict[str, set[str]] = {}
+        self.callers: dict[str, set[str]] = {}
+        self.call_sites: dict[str, list[CallSite]] = {}
+        self.sccs: list[list[str]] = []
+        self._scc_index: dict[str, int] = {}
+
+    @classmethod
+    def build(cls, module: MIRModule) -> "CallGraph":
+        """Build the call graph of a module.
+
+        Args:
+            module: The module to analyze.
+
+        Returns:
+            The call graph.
+        """
+        graph = cls()
+        for name in module.functions:
+            graph.callees[name] = set()
+            graph.callers[name] = set()
+            graph.call_sites[name] = []
+
+        for name, function in module.functions.items():
+            for block in function.cfg.blocks.values():
+                for inst in block.instructions:
+                    if not isinstance(inst, Call) or not isinstance(inst.func, FunctionRef):
+                        continue
+                    callee = inst.func.name
+                    if callee not in module.functions:
+                        continue
+                    graph.callees[name].add(callee)
+                    graph.callers[callee].add(name)
+                    graph.call_sites[name].append(CallSite(name, callee, block, inst))
+
+        graph._compute_sccs()
+        return graph
+
+    def _compute_sccs(self) -> None:
+        """Find the SCCs with Tarjan's algorithm.
+
+        The traversal uses an explicit stack so that long call chains do not
+        hit Python's recursion limit. Tarjan's algorithm emits each SCC after
+        all SCCs reachable from it, which is the bottom-up order.
+        """
+        index: dict[str, int] = {}
+        lowlink: dict[str, int] = {}
+        on_stack: set[str] = set()
+        stack: list[str] = []
+
+        for root in self.callees:
+            if root in index:
+                continue
+            work = [(root, iter(sorted(self.callees[root])))]
+            index[root] = lowlink[root] = len(index)
+            stack.append(root)
+            on_stack.add(root)
+
+            while work:
+                name, successors = work[-1]
+                for callee in successors:
+                    if callee not in index:
+                        index[callee] = lowlink[callee] = len(index)
+                        stack.append(callee)
+                        on_stack.add(callee)
+                        work.append((callee, iter(sorted(self.callees[callee]))))
+                        break
+                    if callee in on_stack:
+                        lowlink[name] = min(lowlink[name], index[callee])
+                else:
+                    work.pop()
+                    if work:
+                        parent = work[-1][0]
+                        lowlink[parent] = min(lowlink[parent], lowlink[name])
+                    if lowlink[name] == index[name]:
+                        component = []
+                        while True:
+                            member = stack.pop()
+                            on_stack.discard(member)
+                            self._scc_index[member] = len(self.sccs)
+                            component.append(member)
+                            if member == name:
+                                break
+                        self.sccs.append(component)
+
+    def get_scc(self, name: str) -> list[str]:
+        """Get the SCC containing a function.
+
+        Args:
+            name: Function name.
+
+        Returns:
+            Names of the functions in the same SCC.
+        """
+        return self.sccs[self._scc_index[name]]
+
+    def in_same_scc(self, first: str, second: str) -> bool:
+        """Check if two functions are mutually reachable.
+
+        Args:
+            first: Function name.
+            second: Function name.
+
+        Returns:
+            True if both functions are in the same SCC.
+        """
+        return self._scc_index.get(first, -1) == self._scc_index.get(second, -2)
+
+    def is_recursive(self, name: str) -> bool:
+        """Check if a function can call itself, directly or indirectly.
+
+        Args:
+            name: Function name.
+
+        Returns:
+            True if the function is part of a call cycle.
+        """
+        return len(self.get_scc(name)) > 1 or name in self.callees[name]
+
+
+class CallGraphAnalysis(ModuleAnalysisPass):
+    """Analysis pass that builds the module call graph."""
+
+    def get_info(self) -> PassInfo:
+        """Get pass information.
+
+        Returns:
+            Pass information.
+        """
+        return PassInfo(
+            name="call-graph",
+            description="Build the call graph and its SCCs",
+            pass_type=PassType.ANALYSIS,
+            requires=[],
+            preserves=PreservationLevel.ALL,
+        )
+
+    def run_on_module(self, module: MIRModule) -> CallGraph:
+        """Build the call graph of a module.
+
+        Args:
+            module: The module to analyze.
+
+        Returns:
+            The call graph.
+        """
+        return CallGraph.build(module)
+
+    def finalize(self) -> None:
+        """Finalize the pass."""
+        pass
@@ -0,0 +1,156 @@
+"""Liveness analysis for MIR.
+
+This module computes the values live on entry to and exit from each basic
+block. Phi nodes follow SSA conventions: a phi defines its destination at
+the top of its block, and reads each incoming value at the end of the
+corresponding predecessor.
+"""
+
+from collections import defaultdict
+
+from machine_dialect.mir.basic_block import BasicBlock
+from machine_dialect.mir.mir_function import MIRFunction
+from machine_dialect.mir.mir_values import MIRValue, Temp, Variable
+from machine_dialect.mir.optimization_pass import (
+    FunctionAnalysisPass,
+    PassInfo,
+    PassType,
+    PreservationLevel,
+)
+
+
+def _is_tracked(value: MIRValue) -> bool:
+    """Check if liveness is tracked for a value.
+
+    Args:
+        value: The value.
+
+    Returns:
+        True for temporaries and variables.
+    """
+    return isinstance(value, Temp | Variable)
+
+
+class LivenessInfo:
+    """Live values at the boundaries of basic blocks.
+
+    Attributes:
+        live_in: Values live on entry to each block, excluding its phi destinations.
+        live_out: Values live on exit from each block, including the values its
+            successors' phi nodes read from it.
+    """
+
+    def __init__(self, function: MIRFunction) -> None:
+        """Compute liveness for a function.
+
+        Args:
+            function: The function to analyze.
+        """
+        self.live_in: dict[BasicBlock, set[MIRValue]] = {}
+        self.live_out: dict[BasicBlock, set[MIRValue]] = {}
+        self._compute(function)
+
+    def is_live_in(self, value: MIRValue, block: BasicBlock) -> bool:
+        """Check if a value is live on entry to a block.
+
+        Args:
+            value: The value.
+            block: The block.
+
+        Returns:
+            True if the value is live on entry.
+        """
+        return value in self.live_in.get(block, ())
+
+    def is_live_out(self, value: MIRValue, block: BasicBlock) -> bool:
+        """Check if a value is live on exit from a block.
+
+        Args:
+            value: The value.
+            block: The block.
+
+        Returns:
+            True if the value is live on exit.
+        """
+        return value in self.live_out.get(block, ())
+
+    def _compute(self, function: MIRFunction) -> None:
+        """Solve the backward dataflow equations.
+
+        Args:
+            function: The function to analyze.
+        """
+        blocks = list(function.cfg.blocks.values())
+        upward_uses: dict[BasicBlock, set[MIRValue]] = {}
+        defs: dict[BasicBlock, set[MIRValue]] = {}
+        # Values read by phi nodes, keyed by the predecessor they are read from
+        phi_uses: dict[BasicBlock, set[MIRValue]] = defaultdict(set)
+
+        for block in blocks:
+            block_defs = {phi.dest for phi in block.phi_nodes if _is_tracked(phi.dest)}
+            block_uses: set[MIRValue] = set()
+            for inst in block.instructions:
+                block_uses.update(v for v in inst.get_uses() if _is_tracked(v) and v not in block_defs)
+                block_defs.update(v for v in inst.get_defs() if _is_tracked(v))
+            upward_uses[block] = block_uses
+            defs[block] = block_defs
+
+            for phi in block.phi_nodes:
+                for value, label in phi.incoming:
+                    predecessor = function.cfg.get_block(label)
+                    if predecessor is not None and _is_tracked(value):
+                        phi_uses[predecessor].add(value)
+
+        self.live_in = {block: set() for block in blocks}
+        self.live_out = {block: set() for block in blocks}
+
+        # Blocks are mostly created in program order, so visit them backwards
+        order = list(reversed(blocks))
+        changed = True
+        while changed:
+            changed = False
+            for block in order:
+                live_out = set(phi_uses[block])
+                for succ in block.successors:
+                    live_out |= self.live_in[succ]
+                live_in = upward_uses[block] | (live_out - defs[block])
+                if live_out != self.live_out[block] or live_in != self.live_in[block]:
+                    self.live_out[block] = live_out
+                    self.live_in[block] = live_in
+                    changed = True
+
+
+class LivenessAnalysis(FunctionAnalysisPass):
+    """Analysis pass that computes live values per block."""
+
+    def get_info(self) -> PassInfo:
+        """Get pass information.
+
+        Returns:
+            Pass information.
+        """
+        return PassInfo(
+            name="liveness",
+            description="Compute live values at block boundaries",
+            pass_type=PassType.ANALYSIS,
+            requires=[],
+            preserves=PreservationLevel.ALL,
+        )
+
+    def run_on_function(self, function: MIRFunction) -> LivenessInfo:
+        """Compute liveness for a function.
+
+        Args:
+            function: The function to analyze.
+
+        Returns:
+            Liveness information.
+        """
+        return LivenessInfo(function)
+
+    def finalize(self) -> None:
+        """Finalize the analysis pass.
+
+        Nothing to clean up for liveness analysis.
+        """
+        pass
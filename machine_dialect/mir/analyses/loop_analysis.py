@@ -209,7 +209,8 @@ class LoopAnalysis(FunctionAnalysisPass):
         # Natural loop consists of header and all blocks that can
         # reach latch without going through header
         loop_blocks = {header, latch}
-        worklist = [latch]
+        # A block looping to itself is the whole loop
+        worklist = [latch] if latch is not header else []
 
         while worklist:
             block = worklist.pop()
@@ -0,0 +1,254 @@
+"""Purity and effect analysis for MIR.
+
+This module computes, for every function of a module, which side effects it
+may have: printing, writing or reading module-level variables, mutating
+collections and calling functions outside the module. Effects of callees are
+propagated to their callers bottom-up over the call graph, so a function is
+pure only if nothing it can reach has an effect.
+"""
+
+from dataclasses import dataclass
+
+from machine_dialect.mir.analyses.call_graph import CallGraph
+from machine_dialect.mir.mir_function import MIRFunction
+from machine_dialect.mir.mir_instructions import (
+    ArrayAppend,
+    ArrayClear,
+    ArrayInsert,
+    ArrayRemove,
+    ArraySet,
+    Call,
+    DictClear,
+    DictRemove,
+    DictSet,
+    MIRInstruction,
+    Print,
+    SetAttr,
+)
+from machine_dialect.mir.mir_module import MIRModule
+from machine_dialect.mir.mir_values import FunctionRef, MIRValue, ScopedVariable, Variable, VariableScope
+from machine_dialect.mir.optimization_pass import (
+    ModuleAnalysisPass,
+    PassInfo,
+    PassType,
+    PreservationLevel,
+)
+
+# Instructions that modify a collection in place
+COLLECTION_MUTATIONS = (
+    ArraySet,
+    ArrayAppend,
+    ArrayRemove,
+    ArrayInsert,
+    ArrayClear,
+    DictSet,
+    DictRemove,
+    DictClear,
+    SetAttr,
+)
+
+
+@dataclass
+class FunctionEffects:
+    """Side effects a function may have, including through its callees.
+
+    Attributes:
+        prints: Output is written.
+        writes_globals: A module-level variable is assigned.
+        reads_globals: A module-level variable is read.
+        mutates_collections: An array or dictionary is modified in place.
+        calls_unknown: A function outside the module is called.
+    """
+
+    prints: bool = False
+    writes_globals: bool = False
+    reads_globals: bool = False
+    mutates_collections: bool = False
+    calls_unknown: bool = False
+
+    @property
+    def is_pure(self) -> bool:
+        """Check if the function has no observable side effects.
+
+        Returns:
+            True if calling the function only computes its result.
+        """
+        return not (self.prints or self.writes_globals or self.mutates_collections or self.calls_unknown)
+
+    @property
+    def is_deterministic(self) -> bool:
+        """Check if the result depends only on the arguments.
+
+        Returns:
+            True if the function is pure and reads no module-level state.
+        """
+        return self.is_pure and not self.reads_globals
+
+    def merge(self, other: "FunctionEffects") -> None:
+        """Add the effects of another function.
+
+        Args:
+            other: Effects to add.
+        """
+        self.prints |= other.prints
+        self.writes_globals |= other.writes_globals
+        self.reads_globals |= other.reads_globals
+        self.mutates_collections |= other.mutates_collections
+        self.calls_unknown |= other.calls_unknown
+
+
+class PurityInfo:
+    """Side effects of every function of a module.
+
+    Attributes:
+        effects: Function name -> effects of the function and its callees.
+    """
+
+    def __init__(self) -> None:
+        """Initialize empty purity information."""
+        self.effects: dict[str, FunctionEffects] = {}
+
+    @classmethod
+    def build(cls, module: MIRModule, call_graph: CallGraph | None = None) -> "PurityInfo":
+        """Compute the effects of every function of a module.
+
+        Args:
+            module: The module to analyze.
+            call_graph: Call graph of the module, built if not given.
+
+        Returns:
+            The purity information.
+        """
+        info = cls()
+        graph = call_graph or CallGraph.build(module)
+        local = {name: _local_effects(function, module) for name, function in module.functions.items()}
+
+        # Callees come first, and all functions of a cycle share their effects
+        for scc in graph.sccs:
+            effects = FunctionEffects()
+            for name in scc:
+                effects.merge(local[name])
+                for callee in graph.callees[name]:
+                    if callee not in scc:
+                        effects.merge(info.effects[callee])
+            for name in scc:
+                info.effects[name] = FunctionEffects(**vars(effects))
+        return info
+
+    def is_pure(self, name: str) -> bool:
+        """Check if a function has no observable side effects.
+
+        Args:
+            name: Function name.
+
+        Returns:
+            True if the function is known and pure.
+        """
+        effects = self.effects.get(name)
+        return effects is not None and effects.is_pure
+
+    def is_deterministic(self, name: str) -> bool:
+        """Check if a function's result depends only on its arguments.
+
+        Args:
+            name: Function name.
+
+        Returns:
+            True if the function is known, pure and reads no module-level state.
+        """
+        effects = self.effects.get(name)
+        return effects is not None and effects.is_deterministic
+
+
+def _local_effects(function: MIRFunction, module: MIRModule) -> FunctionEffects:
+    """Compute the effects of a function's own instructions.
+
+    Args:
+        function: The function to scan.
+        module: The module containing the function.
+
+    Returns:
+        The effects, not counting those of module functions it calls.
+    """
+    effects = FunctionEffects()
+    for block in function.cfg.blocks.values():
+        for inst in block.instructions:
+            _add_instruction_effects(effects, inst, function, module)
+    return effects
+
+
+def _add_instruction_effects(
+    effects: FunctionEffects, inst: MIRInstruction, function: MIRFunction, module: MIRModule
+) -> None:
+    """Add the effects of one instruction.
+
+    Args:
+        effects: Effects to update.
+        inst: The instruction.
+        function: The function containing the instruction.
+        module: The module containing the function.
+    """
+    if isinstance(inst, Print):
+        effects.prints = True
+    elif isinstance(inst, COLLECTION_MUTATIONS):
+        effects.mutates_collections = True
+    elif isinstance(inst, Call) and (not isinstance(inst.func, FunctionRef) or inst.func.name not in module.functions):
+        effects.calls_unknown = True
+
+    if any(is_global_variable(value, function) for value in inst.get_defs()):
+        effects.writes_globals = True
+    if any(is_global_variable(value, function) for value in inst.get_uses()):
+        effects.reads_globals = True
+
+
+def is_global_variable(value: MIRValue, function: MIRFunction) -> bool:
+    """Check if a value is a module-level variable.
+
+    This follows the bytecode generator: unversioned variables that are
+    neither parameters nor locals of the function are globals.
+
+    Args:
+        value: The value to check.
+        function: The function the value is used in.
+
+    Returns:
+        True if the value is a module-level variable.
+    """
+    if isinstance(value, ScopedVariable):
+        return value.scope == VariableScope.GLOBAL
+    if not isinstance(value, Variable) or value.version != 0:
+        return False
+    return value.name not in function.locals and all(param.name != value.name for param in function.params)
+
+
+class PurityAnalysis(ModuleAnalysisPass):
+    """Analysis pass that computes function side effects."""
+
+    def get_info(self) -> PassInfo:
+        """Get pass information.
+
+        Returns:
+            Pass information.
+        """
+        return PassInfo(
+            name="purity",
+            description="Compute function purity and side effects",
+            pass_type=PassType.ANALYSIS,
+            requires=[],
+            preserves=PreservationLevel.ALL,
+        )
+
+    def run_on_module(self, module: MIRModule) -> PurityInfo:
+        """Compute the effects of every function of a module.
+
+        Args:
+            module: The module to analyze.
+
+        Returns:
+            The purity information.
+        """
+        return PurityInfo.build(module)
+
+    def finalize(self) -> None:
+        """Finalize the pass."""
+        pass
@@ -0,0 +1,89 @@
+"""Unit tests for call graph analysis."""
+
+from machine_dialect.mir.analyses.call_graph import CallGraph, CallGraphAnalysis
+from machine_dialect.mir.mir_function import MIRFunction
+from machine_dialect.mir.mir_instructions import Call, Return
+from machine_dialect.mir.mir_module import MIRModule
+from machine_dialect.mir.mir_types import MIRType
+from machine_dialect.mir.mir_values import Temp
+
+
+def create_module(calls: dict[str, list[str]]) -> MIRModule:
+    """Create a module whose functions only call other functions.
+
+    Args:
+        calls: Function name -> names of the functions it calls.
+
+    Returns:
+        The module.
+    """
+    module = MIRModule("calls")
+    for name, callees in calls.items():
+        function = MIRFunction(name, [])
+        entry = function.cfg.get_or_create_block("entry")
+        entry.instructions = [Call(Temp(MIRType.INT), callee, [], (1, 1)) for callee in callees]
+        entry.instructions.append(Return((1, 1)))
+        module.add_function(function)
+    return module
+
+
+class TestCallGraph:
+    """Tests for building the call graph."""
+
+    def test_edges_and_call_sites(self) -> None:
+        """Test that calls to module functions are recorded and others ignored."""
+        module = create_module({"main": ["helper", "helper", "print_report"], "helper": []})
+
+        graph = CallGraph.build(module)
+
+        assert graph.callees == {"main": {"helper"}, "helper": set()}
+        assert graph.callers["helper"] == {"main"}
+        assert [site.callee for site in graph.call_sites["main"]] == ["helper", "helper"]
+        assert graph.call_sites["main"][0].block.label == "entry"
+
+    def test_sccs_are_bottom_up(self) -> None:
+        """Test that every SCC comes after the SCCs it calls into."""
+        module = create_module(
+            {
+                "main": ["is_even", "leaf"],
+                "is_even": ["is_odd"],
+                "is_odd": ["is_even", "leaf"],
+                "leaf": [],
+            }
+        )
+
+        graph = CallGraph.build(module)
+
+        assert [sorted(scc) for scc in graph.sccs] == [["leaf"], ["is_even", "is_odd"], ["main"]]
+        assert graph.in_same_scc("is_even", "is_odd")
+        assert not graph.in_same_scc("main", "is_even")
+
+    def test_recursion(self) -> None:
+        """Test direct and mutual recursion detection."""
+        module = create_module({"fact": ["fact"], "ping": ["pong"], "pong": ["ping"], "main": ["fact"]})
+
+        graph = CallGraph.build(module)
+
+        assert graph.is_recursive("fact")
+        assert graph.is_recursive("ping")
+        assert not graph.is_recursive("main")
+        assert graph.get_scc("fact") == ["fact"]
+
+    def test_long_call_chain(self) -> None:
+        """Test that deep call chains do not hit the recursion limit."""
+        module = create_module({f"f{i}": [f"f{i + 1}"] for i in range(5000)} | {"f5000": []})
+
+        graph = CallGraph.build(module)
+
+        assert graph.sccs[0] == ["f5000"]
+        assert graph.sccs[-1] == ["f0"]
+
+    def test_analysis_pass(self) -> None:
+        """Test the analysis pass wrapper."""
+        analysis = CallGraphAnalysis()
+        module = create_module({"main": ["main"]})
+
+        graph = analysis.get_analysis(module)
+
+        assert analysis.get_info().name == "call-graph"
+        assert graph.is_recursive("main")
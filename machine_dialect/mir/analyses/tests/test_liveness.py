@@ -0,0 +1,73 @@
+"""Unit tests for liveness analysis."""
+
+from machine_dialect.mir.analyses.liveness import LivenessAnalysis, LivenessInfo
+from machine_dialect.mir.basic_block import BasicBlock
+from machine_dialect.mir.mir_function import MIRFunction
+from machine_dialect.mir.mir_instructions import BinaryOp, ConditionalJump, Jump, LoadConst, Phi, Return
+from machine_dialect.mir.mir_types import MIRType
+from machine_dialect.mir.mir_values import Constant, ScopedVariable, Temp, VariableScope
+
+N = ScopedVariable("n", VariableScope.PARAMETER, MIRType.INT)
+
+
+def create_loop() -> tuple[MIRFunction, list[BasicBlock], list[Temp]]:
+    """Create `i = 0; while i < n: i = i + 1; return i` with a phi for `i`.
+
+    Returns:
+        The function, its blocks and the values zero, i, condition and step.
+    """
+    function = MIRFunction("f", [N], MIRType.INT)
+    blocks = [function.cfg.get_or_create_block(label) for label in ("entry", "header", "body", "exit")]
+    entry, header, body, exit_block = blocks
+    function.cfg.set_entry_block(entry)
+    function.cfg.connect(entry, header)
+    function.cfg.connect(header, body)
+    function.cfg.connect(header, exit_block)
+    function.cfg.connect(body, header)
+
+    zero, i, condition, step = Temp(MIRType.INT), Temp(MIRType.INT), Temp(MIRType.BOOL), Temp(MIRType.INT)
+    entry.instructions = [LoadConst(zero, Constant(0, MIRType.INT), (1, 1)), Jump("header", (1, 1))]
+    header.phi_nodes = [Phi(i, [(zero, "entry"), (step, "body")], (2, 1))]
+    header.instructions = [BinaryOp(condition, "<", i, N, (2, 1)), ConditionalJump(condition, "body", (2, 1), "exit")]
+    body.instructions = [BinaryOp(step, "+", i, Constant(1, MIRType.INT), (3, 1)), Jump("header", (3, 1))]
+    exit_block.instructions = [Return((4, 1), i)]
+    return function, blocks, [zero, i, condition, step]
+
+
+class TestLiveness:
+    """Tests for computing live values."""
+
+    def test_values_live_around_loop(self) -> None:
+        """Test that values read after the loop or on the next iteration stay live."""
+        function, (entry, header, body, exit_block), (_, i, condition, step) = create_loop()
+
+        info = LivenessInfo(function)
+
+        assert info.live_in[body] == {i, N}
+        assert info.live_out[body] == {step, N}
+        assert info.live_in[exit_block] == {i}
+        assert info.live_in[entry] == {N}
+        assert not info.is_live_out(condition, header)
+
+    def test_phi_operands_are_live_on_their_edge(self) -> None:
+        """Test that a phi operand is live out of its predecessor but not into the phi block."""
+        function, (entry, header, body, _), (zero, i, _, step) = create_loop()
+
+        info = LivenessInfo(function)
+
+        assert info.is_live_out(zero, entry)
+        assert not info.is_live_in(zero, header)
+        assert not info.is_live_out(zero, body)
+        assert not info.is_live_in(step, header)
+        # The phi destination is defined at the top of its block
+        assert not info.is_live_in(i, header)
+        assert not info.is_live_out(i, body)
+
+    def test_analysis_pass(self) -> None:
+        """Test that the analysis pass returns liveness information."""
+        function, (entry, *_), _ = create_loop()
+
+        info = LivenessAnalysis().run_on_function(function)
+
+        assert isinstance(info, LivenessInfo)
+        assert info.live_in[entry] == {N}
@@ -0,0 +1,122 @@
+"""Unit tests for purity analysis."""
+
+from machine_dialect.mir.analyses.purity_analysis import PurityAnalysis, PurityInfo
+from machine_dialect.mir.mir_function import MIRFunction
+from machine_dialect.mir.mir_instructions import ArrayAppend, BinaryOp, Call, MIRInstruction, Print, Return, StoreVar
+from machine_dialect.mir.mir_module import MIRModule
+from machine_dialect.mir.mir_types import MIRType
+from machine_dialect.mir.mir_values import Constant, ScopedVariable, Temp, Variable, VariableScope
+
+
+def create_function(name: str, body: list[MIRInstruction], callees: list[str] | None = None) -> MIRFunction:
+    """Create a function of one parameter `x` that returns `x + 1`.
+
+    Args:
+        name: Function name.
+        body: Instructions to run before computing the result.
+        callees: Functions called before computing the result.
+
+    Returns:
+        The function.
+    """
+    x = ScopedVariable("x", VariableScope.PARAMETER, MIRType.INT)
+    function = MIRFunction(name, [x], MIRType.INT)
+    entry = function.cfg.get_or_create_block("entry")
+    result = Temp(MIRType.INT)
+    entry.instructions = list(body)
+    entry.instructions += [Call(Temp(MIRType.INT), callee, [x], (1, 1)) for callee in callees or []]
+    entry.instructions += [BinaryOp(result, "+", x, Constant(1, MIRType.INT), (1, 1)), Return((1, 1), result)]
+    return function
+
+
+def create_module(*functions: MIRFunction) -> MIRModule:
+    """Create a module holding functions.
+
+    Args:
+        functions: The functions.
+
+    Returns:
+        The module.
+    """
+    module = MIRModule("purity")
+    for function in functions:
+        module.add_function(function)
+    return module
+
+
+class TestPurityInfo:
+    """Tests for computing function effects."""
+
+    def test_pure_function(self) -> None:
+        """Test that arithmetic on parameters is pure and deterministic."""
+        info = PurityInfo.build(create_module(create_function("inc", [])))
+
+        assert info.is_pure("inc")
+        assert info.is_deterministic("inc")
+        assert not info.is_pure("missing")
+
+    def test_local_effects(self) -> None:
+        """Test that each kind of side effect is detected."""
+        counter = ScopedVariable("counter", VariableScope.GLOBAL, MIRType.INT)
+        items = Variable("items", MIRType.ARRAY)
+        module = create_module(
+            create_function("shout", [Print(Constant("hi", MIRType.STRING), (1, 1))]),
+            create_function("count", [StoreVar(counter, Constant(1, MIRType.INT), (1, 1))]),
+            create_function("peek", [BinaryOp(Temp(MIRType.INT), "+", counter, counter, (1, 1))]),
+            create_function("collect", [ArrayAppend(items, Constant(1, MIRType.INT), (1, 1))]),
+            create_function("external", [], callees=["library_function"]),
+        )
+
+        info = PurityInfo.build(module)
+
+        assert info.effects["shout"].prints
+        assert info.effects["count"].writes_globals
+        assert info.effects["collect"].mutates_collections
+        assert info.effects["external"].calls_unknown
+        assert not any(info.is_pure(name) for name in ("shout", "count", "collect", "external"))
+        # Reading module-level state is pure but not deterministic
+        assert info.is_pure("peek")
+        assert not info.is_deterministic("peek")
+
+    def test_unversioned_variable_is_global(self) -> None:
+        """Test that unversioned variables that are not locals are treated as globals."""
+        local = Variable("total", MIRType.INT)
+        uses_local = create_function("uses_local", [StoreVar(local, Constant(1, MIRType.INT), (1, 1))])
+        uses_local.add_local(local)
+        global_total = Variable("total", MIRType.INT)
+        uses_global = create_function("uses_global", [StoreVar(global_total, Constant(1, MIRType.INT), (1, 1))])
+
+        info = PurityInfo.build(create_module(uses_local, uses_global))
+
+        assert info.is_deterministic("uses_local")
+        assert info.effects["uses_global"].writes_globals
+
+    def test_effects_propagate_to_callers(self) -> None:
+        """Test that callers and whole cycles inherit the effects of their callees."""
+        module = create_module(
+            create_function("main", [], callees=["ping", "inc"]),
+            create_function("ping", [], callees=["pong"]),
+            create_function("pong", [], callees=["ping", "log"]),
+            create_function("log", [Print(Constant("x", MIRType.STRING), (1, 1))]),
+            create_function("inc", []),
+        )
+
+        info = PurityInfo.build(module)
+
+        assert info.is_pure("inc")
+        assert all(info.effects[name].prints for name in ("main", "ping", "pong", "log"))
+
+    def test_recursive_function_can_be_pure(self) -> None:
+        """Test that recursion alone does not make a function impure."""
+        info = PurityInfo.build(create_module(create_function("fib", [], callees=["fib", "fib"])))
+
+        assert info.is_deterministic("fib")
+
+    def test_analysis_pass(self) -> None:
+        """Test the analysis pass wrapper."""
+        analysis = PurityAnalysis()
+
+        info = analysis.run_on_module(create_module(create_function("inc", [])))
+
+        assert analysis.get_info().name == "purity"
+        assert info.is_pure("inc")
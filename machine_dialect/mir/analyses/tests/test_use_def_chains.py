@@ -0,0 +1,116 @@
+"""Tests for keeping use-def chains up to date through MIRTransformer."""
+
+from machine_dialect.mir.analyses.use_def_chains import UseDefChains, UseDefChainsAnalysis
+from machine_dialect.mir.basic_block import BasicBlock
+from machine_dialect.mir.mir_function import MIRFunction
+from machine_dialect.mir.mir_instructions import BinaryOp, Copy, Jump, LoadConst, Return
+from machine_dialect.mir.mir_transformer import MIRTransformer
+from machine_dialect.mir.mir_types import MIRType
+from machine_dialect.mir.mir_values import Constant, Temp
+
+
+def create_function() -> tuple[MIRFunction, list[BasicBlock], list[Temp]]:
+    """Create `a = 1; b = a + a; goto next; next: return b`.
+
+    Returns:
+        The function, its blocks and the values a and b.
+    """
+    function = MIRFunction("f", [], MIRType.INT)
+    blocks = [function.cfg.get_or_create_block(label) for label in ("entry", "next")]
+    entry, next_block = blocks
+    function.cfg.set_entry_block(entry)
+    function.cfg.connect(entry, next_block)
+
+    a, b = Temp(MIRType.INT), Temp(MIRType.INT)
+    entry.instructions = [
+        LoadConst(a, Constant(1, MIRType.INT), (1, 1)),
+        BinaryOp(b, "+", a, a, (2, 1)),
+        Jump("next", (2, 1)),
+    ]
+    next_block.instructions = [Return((3, 1), b)]
+    return function, blocks, [a, b]
+
+
+def assert_matches_rebuild(chains: UseDefChains, function: MIRFunction) -> None:
+    """Assert that chains agree with chains built from scratch.
+
+    Args:
+        chains: Incrementally updated chains.
+        function: The function.
+    """
+    fresh = UseDefChainsAnalysis().run_on_function(function)
+    assert set(chains.use_def_map) == set(fresh.use_def_map)
+    for value, info in fresh.use_def_map.items():
+        updated = chains.use_def_map[value]
+        assert updated.definition is info.definition
+        assert updated.defining_block is info.defining_block
+        assert sorted(map(id, updated.uses)) == sorted(map(id, info.uses))
+        assert set(updated.use_blocks) == set(info.use_blocks)
+
+
+class TestIncrementalUseDefChains:
+    """Tests for transformer updates to use-def chains."""
+
+    def test_replace_instruction(self) -> None:
+        """Test that a replacement moves uses from the old to the new instruction."""
+        function, (entry, _), (a, b) = create_function()
+        chains = UseDefChainsAnalysis().run_on_function(function)
+        transformer = MIRTransformer(function, chains)
+
+        transformer.replace_instruction(entry, entry.instructions[1], Copy(b, a, (2, 1)))
+
+        assert chains.get_num_uses(a) == 1
+        assert isinstance(chains.get_definition(b), Copy)
+        assert_matches_rebuild(chains, function)
+
+    def test_remove_and_insert_instruction(self) -> None:
+        """Test that removed instructions are forgotten and inserted ones recorded."""
+        function, (entry, next_block), (a, b) = create_function()
+        chains = UseDefChainsAnalysis().run_on_function(function)
+        transformer = MIRTransformer(function, chains)
+        c = Temp(MIRType.INT)
+
+        transformer.remove_instruction(next_block, next_block.instructions[0])
+        transformer.insert_instruction(next_block, Return((3, 1), a))
+        transformer.insert_instruction(entry, BinaryOp(c, "*", a, a, (2, 1)))
+
+        assert chains.is_dead(b)
+        assert chains.get_num_uses(a) == 5
+        assert next_block in chains.use_def_map[a].use_blocks
+        assert_matches_rebuild(chains, function)
+
+    def test_replace_uses(self) -> None:
+        """Test that replacing a value updates the chains of both values."""
+        function, _, (a, b) = create_function()
+        chains = UseDefChainsAnalysis().run_on_function(function)
+        transformer = MIRTransformer(function, chains)
+
+        transformer.replace_uses(a, Constant(1, MIRType.INT))
+
+        assert chains.is_dead(a)
+        assert chains.has_single_use(b)
+        assert_matches_rebuild(chains, function)
+
+    def test_dead_instructions_use_chains(self) -> None:
+        """Test that removing dead code keeps the chains valid."""
+        function, (entry, next_block), (a, b) = create_function()
+        next_block.instructions = [Return((3, 1), Constant(0, MIRType.INT))]
+        chains = UseDefChainsAnalysis().run_on_function(function)
+        transformer = MIRTransformer(function, chains)
+
+        # The addition goes first, which leaves the constant load dead too
+        assert transformer.remove_dead_instructions(entry) == 1
+        assert transformer.remove_dead_instructions(entry) == 1
+        assert a not in chains.use_def_map and b not in chains.use_def_map
+        assert_matches_rebuild(chains, function)
+
+    def test_merge_blocks(self) -> None:
+        """Test that merging blocks moves the uses into the surviving block."""
+        function, (entry, next_block), (_, b) = create_function()
+        chains = UseDefChainsAnalysis().run_on_function(function)
+        transformer = MIRTransformer(function, chains)
+
+        assert transformer.merge_blocks(entry, next_block)
+
+        assert chains.use_def_map[b].use_blocks == [entry]
+        assert_matches_rebuild(chains, function)
@@ -1,7 +1,9 @@
 """Use-def and def-use chain analysis for MIR.
 
 This module builds explicit use-def and def-use chains from the SSA form,
-enabling efficient queries for optimization passes.
+enabling efficient queries for optimization passes. The chains can be
+updated one instruction at a time, which ``MIRTransformer`` does for passes
+that declare they maintain them.
 """
 
 from collections import defaultdict
@@ -49,6 +51,117 @@ class UseDefChains:
         self.inst_defs: dict[MIRInstruction, list[MIRValue]] = defaultdict(list)
         # Map from instruction to values it uses
         self.inst_uses: dict[MIRInstruction, list[MIRValue]] = defaultdict(list)
+        # Map from instruction to the block containing it
+        self.inst_blocks: dict[MIRInstruction, BasicBlock] = {}
+        # Map from value to every instruction defining it, in order
+        self._definitions: dict[MIRValue, list[MIRInstruction]] = defaultdict(list)
+
+    def add_instruction(self, inst: MIRInstruction, block: BasicBlock) -> None:
+        """Record the definitions and uses of an instruction.
+
+        Args:
+            inst: Instruction to record.
+            block: Containing block.
+        """
+        self.inst_blocks[inst] = block
+
+        # Process definitions
+        for def_val in inst.get_defs():
+            if isinstance(def_val, Variable | Temp):
+                # Create or update use-def info
+                if def_val not in self.use_def_map:
+                    self.use_def_map[def_val] = UseDefInfo(
+                        value=def_val,
+                        definition=inst,
+                        uses=[],
+                        defining_block=block,
+                        use_blocks=[],
+                    )
+                else:
+                    # Update definition (for variables that may be redefined)
+                    self.use_def_map[def_val].definition = inst
+                    self.use_def_map[def_val].defining_block = block
+
+                # Record instruction's definitions
+                self.inst_defs[inst].append(def_val)
+                self._definitions[def_val].append(inst)
+
+        # Process uses
+        for use_val in inst.get_uses():
+            if isinstance(use_val, Variable | Temp):
+                # Create use-def info if needed
+                if use_val not in self.use_def_map:
+                    self.use_def_map[use_val] = UseDefInfo(
+                        value=use_val,
+                        definition=None,  # No definition found yet
+                        uses=[],
+                        defining_block=None,
+                        use_blocks=[],
+                    )
+
+                # Add this instruction as a use
+                self.use_def_map[use_val].uses.append(inst)
+                if block not in self.use_def_map[use_val].use_blocks:
+                    self.use_def_map[use_val].use_blocks.append(block)
+
+                # Record instruction's uses
+                self.inst_uses[inst].append(use_val)
+
+    def remove_instruction(self, inst: MIRInstruction) -> None:
+        """Forget the definitions and uses of an instruction.
+
+        Values left without definitions and uses are dropped, as a rebuild
+        would not see them.
+
+        Args:
+            inst: Instruction to forget.
+        """
+        block = self.inst_blocks.pop(inst, None)
+        if block is None:
+            return
+
+        for def_val in self.inst_defs.pop(inst, []):
+            definitions = self._definitions[def_val]
+            definitions.remove(inst)
+            info = self.use_def_map.get(def_val)
+            if info is not None and info.definition is inst:
+                # Fall back to another definition of a redefined variable
+                info.definition = definitions[-1] if definitions else None
+                info.defining_block = self.inst_blocks[definitions[-1]] if definitions else None
+            self._drop_if_unused(def_val)
+
+        for use_val in self.inst_uses.pop(inst, []):
+            info = self.use_def_map.get(use_val)
+            if info is None:
+                continue
+            info.uses = [use for use in info.uses if use is not inst]
+            if not any(self.inst_blocks[use] is block for use in info.uses):
+                info.use_blocks = [use_block for use_block in info.use_blocks if use_block is not block]
+            self._drop_if_unused(use_val)
+
+    def update_instruction(self, inst: MIRInstruction, block: BasicBlock | None = None) -> None:
+        """Re-record an instruction whose operands changed or which moved.
+
+        Args:
+            inst: Instruction to update.
+            block: New containing block, or None if it did not move.
+        """
+        block = block or self.inst_blocks.get(inst)
+        if block is None:
+            return
+        self.remove_instruction(inst)
+        self.add_instruction(inst, block)
+
+    def _drop_if_unused(self, value: MIRValue) -> None:
+        """Drop a value that is no longer defined or used.
+
+        Args:
+            value: The value.
+        """
+        info = self.use_def_map.get(value)
+        if info is not None and info.definition is None and not info.uses:
+            del self.use_def_map[value]
+            self._definitions.pop(value, None)
 
     def get_definition(self, value: MIRValue) -> MIRInstruction | None:
         """Get the instruction that defines a value.
@@ -165,68 +278,14 @@ class UseDefChainsAnalysis(FunctionAnalysisPass):
         for block in function.cfg.blocks.values():
             # Process phi nodes
             for phi in block.phi_nodes:
-                self._process_instruction(phi, block, chains)
+                chains.add_instruction(phi, block)
 
             # Process regular instructions
             for inst in block.instructions:
-                self._process_instruction(inst, block, chains)
+                chains.add_instruction(inst, block)
 
         return chains
 
-    def _process_instruction(
-        self,
-        inst: MIRInstruction,
-        block: BasicBlock,
-        chains: UseDefChains,
-    ) -> None:
-        """Process a single instruction.
-
-        Args:
-            inst: Instruction to process.
-            block: Containing block.
-            chains: Chains to update.
-        """
-        # Process definitions
-        for def_val in inst.get_defs():
-            if isinstance(def_val, Variable | Temp):
-                # Create or update use-def info
-                if def_val not in chains.use_def_map:
-                    chains.use_def_map[def_val] = UseDefInfo(
-                        value=def_val,
-                        definition=inst,
-                        uses=[],
-                        defining_block=block,
-                        use_blocks=[],
-                    )
-                else:
-                    # Update definition (for variables that may be redefined)
-                    chains.use_def_map[def_val].definition = inst
-                    chains.use_def_map[def_val].defining_block = block
-
-                # Record instruction's definitions
-                chains.inst_defs[inst].append(def_val)
-
-        # Process uses
-        for use_val in inst.get_uses():
-            if isinstance(use_val, Variable | Temp):
-                # Create use-def info if needed
-                if use_val not in chains.use_def_map:
-                    chains.use_def_map[use_val] = UseDefInfo(
-                        value=use_val,
-                        definition=None,  # No definition found yet
-                        uses=[],
-                        defining_block=None,
-                        use_blocks=[],
-                    )
-
-                # Add this instruction as a use
-                chains.use_def_map[use_val].uses.append(inst)
-                if block not in chains.use_def_map[use_val].use_blocks:
-                    chains.use_def_map[use_val].use_blocks.append(block)
-
-                # Record instruction's uses
-                chains.inst_uses[inst].append(use_val)
-
     def finalize(self) -> None:
         """Finalize the pass."""
         pass
@@ -36,6 +36,7 @@ class MIRFunction:
         self.temporaries: list[Temp] = []
         self.cfg = CFG()
         self.is_ssa = False
+        self.memoize = False  # Results are cached by the VM, see FunctionMemoization
         self._next_temp_id = 0
         self._next_var_version: dict[str, int] = {}
 
@@ -5,6 +5,7 @@ instruction manipulation, block operations, and SSA preservation.
 """
 
 from collections.abc import Callable
+from typing import TYPE_CHECKING
 
 from machine_dialect.mir.basic_block import BasicBlock
 from machine_dialect.mir.mir_function import MIRFunction
@@ -18,17 +19,27 @@ from machine_dialect.mir.mir_instructions import (
 )
 from machine_dialect.mir.mir_values import MIRValue
 
+if TYPE_CHECKING:
+    from machine_dialect.mir.analyses.use_def_chains import UseDefChains
+
 
 class MIRTransformer:
-    """Utility class for transforming MIR code."""
+    """Utility class for transforming MIR code.
+
+    When given use-def chains, the transformer updates them as it inserts,
+    removes, replaces and moves instructions, so they stay valid without a
+    rebuild. Changes made to instructions directly are not tracked.
+    """
 
-    def __init__(self, function: MIRFunction) -> None:
+    def __init__(self, function: MIRFunction, use_def: "UseDefChains | None" = None) -> None:
         """Initialize the transformer.
 
         Args:
             function: Function to transform.
+            use_def: Optional use-def chains of the function to keep up to date.
         """
         self.function = function
+        self.use_def = use_def
         self.modified = False
 
     def replace_instruction(
@@ -50,7 +61,7 @@ class MIRTransformer:
         try:
             index = block.instructions.index(old_inst)
             block.instructions[index] = new_inst
-            self.modified = True
+            self._replaced(block, old_inst, new_inst)
             return True
         except ValueError:
             # Check phi nodes
@@ -58,12 +69,25 @@ class MIRTransformer:
                 index = block.phi_nodes.index(old_inst)  # type: ignore
                 if isinstance(new_inst, Phi):
                     block.phi_nodes[index] = new_inst
-                    self.modified = True
+                    self._replaced(block, old_inst, new_inst)
                     return True
             except (ValueError, TypeError):
                 pass
         return False
 
+    def _replaced(self, block: BasicBlock, old_inst: MIRInstruction, new_inst: MIRInstruction) -> None:
+        """Record that an instruction took the place of another.
+
+        Args:
+            block: The block containing the instructions.
+            old_inst: Replaced instruction.
+            new_inst: Replacement instruction.
+        """
+        if self.use_def is not None:
+            self.use_def.remove_instruction(old_inst)
+            self.use_def.add_instruction(new_inst, block)
+        self.modified = True
+
     def remove_instruction(
         self,
         block: BasicBlock,
@@ -80,12 +104,16 @@ class MIRTransformer:
         """
         try:
             block.instructions.remove(inst)
+            if self.use_def is not None:
+                self.use_def.remove_instruction(inst)
             self.modified = True
             return True
         except ValueError:
             # Check phi nodes
             try:
                 block.phi_nodes.remove(inst)  # type: ignore
+                if self.use_def is not None:
+                    self.use_def.remove_instruction(inst)
                 self.modified = True
                 return True
             except (ValueError, TypeError):
@@ -116,6 +144,8 @@ class MIRTransformer:
                     block.instructions.append(inst)
             else:
                 block.instructions.insert(position, inst)
+        if self.use_def is not None:
+            self.use_def.add_instruction(inst, block)
         self.modified = True
 
     def replace_uses(
@@ -140,19 +170,26 @@ class MIRTransformer:
         for b in blocks:
             # Process phi nodes
             for phi in b.phi_nodes:
+                replaced = False
                 for i, (val, label) in enumerate(phi.incoming):
                     if val == old_value:
                         phi.incoming[i] = (new_value, label)
                         count += 1
+                        replaced = True
                         self.modified = True
+                if replaced and self.use_def is not None:
+                    self.use_def.update_instruction(phi)
 
             # Process instructions
             for inst in b.instructions:
+                uses_old = self.use_def is not None and old_value in inst.get_uses()
                 inst.replace_use(old_value, new_value)
                 # Check if replacement occurred
                 if new_value in inst.get_uses():
                     count += 1
                     self.modified = True
+                if uses_old and self.use_def is not None:
+                    self.use_def.update_instruction(inst)
 
         return count
 
@@ -195,7 +232,9 @@ class MIRTransformer:
         Returns:
             True if the value is dead.
         """
-        # This is a simplified check - should use use-def chains
+        if self.use_def is not None:
+            return self.use_def.is_dead(value)
+
         for block in self.function.cfg.blocks.values():
             for phi in block.phi_nodes:
                 if value in [v for v, _ in phi.incoming]:
@@ -227,6 +266,9 @@ class MIRTransformer:
         # Move instructions after split point to new block
         new_block.instructions = block.instructions[split_point:]
         block.instructions = block.instructions[:split_point]
+        if self.use_def is not None:
+            for inst in new_block.instructions:
+                self.use_def.update_instruction(inst, new_block)
 
         # Update CFG edges
         # New block takes over original block's successors
@@ -242,7 +284,10 @@ class MIRTransformer:
 
         # Add jump instruction if needed
         if not block.get_terminator():
-            block.add_instruction(Jump(new_label, (0, 0)))
+            jump = Jump(new_label, (0, 0))
+            block.add_instruction(jump)
+            if self.use_def is not None:
+                self.use_def.add_instruction(jump, block)
 
         # Add new block to CFG
         self.function.cfg.add_block(new_block)
@@ -270,10 +315,15 @@ class MIRTransformer:
 
         # Remove jump from pred if it exists
         if pred.get_terminator() and isinstance(pred.get_terminator(), Jump):
-            pred.instructions.pop()
+            jump = pred.instructions.pop()
+            if self.use_def is not None:
+                self.use_def.remove_instruction(jump)
 
         # Move instructions from succ to pred
         pred.instructions.extend(succ.instructions)
+        if self.use_def is not None:
+            for inst in succ.instructions:
+                self.use_def.update_instruction(inst, pred)
 
         # Update CFG
         pred.successors = succ.successors
@@ -320,6 +370,10 @@ class MIRTransformer:
             for succ in block.successors:
                 succ.predecessors.remove(block)
 
+            if self.use_def is not None:
+                for inst in [*block.phi_nodes, *block.instructions]:
+                    self.use_def.remove_instruction(inst)
+
             # Remove from CFG
             del self.function.cfg.blocks[block.label]
             removed += 1
@@ -396,6 +450,11 @@ class MIRTransformer:
             new_instructions = []
             for inst in block.instructions:
                 result = transform(inst)
+                if self.use_def is not None:
+                    # The transform may also have changed the instruction in place
+                    self.use_def.remove_instruction(inst)
+                    if result is not None:
+                        self.use_def.add_instruction(result, block)
                 if result is not None:
                     new_instructions.append(result)
                     if result != inst:
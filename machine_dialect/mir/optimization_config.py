@@ -112,6 +112,11 @@ class OptimizationPipeline:
             ]
         )
 
+        if config.level >= 2:
+            # Run pure calls with constant arguments while the callees are
+            # unoptimized; the constant propagation below folds the results
+            passes.append("partial-evaluation")
+
         if config.level >= 1:
             # Basic optimizations
             passes.extend(
@@ -126,7 +131,7 @@ class OptimizationPipeline:
             # Standard optimizations
             passes.extend(
                 [
-                    "cse",  # Common subexpression elimination
+                    "gvn",  # Global value numbering
                 ]
             )
 
@@ -140,6 +145,11 @@ class OptimizationPipeline:
                     ]
                 )
 
+            # Turn tail self-recursion into loops before inlining sees it
+            passes.append("tail-call")
+            # Only affects functions requested by name or hot in the profile
+            passes.append("memoization")
+
             # Run another DCE pass after other optimizations
             passes.append("dce")
 
@@ -155,7 +165,7 @@ class OptimizationPipeline:
                 )
                 # More aggressive versions of passes
                 passes.append("constant-propagation")  # Run again
-                passes.append("cse")  # Run again
+                passes.append("gvn")  # Run again
 
             if config.enable_inlining:
                 passes.append("inline")  # Function inlining
@@ -6,12 +6,13 @@ in the MIR optimization framework.
 
 import abc
 from abc import ABC, abstractmethod
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from enum import Enum
 from typing import Any
 
 from machine_dialect.mir.mir_function import MIRFunction
 from machine_dialect.mir.mir_module import MIRModule
+from machine_dialect.mir.mir_transformer import MIRTransformer
 
 
 class PassType(Enum):
@@ -27,7 +28,7 @@ class PreservationLevel(Enum):
     """Level of preservation for analyses."""
 
     NONE = "none"  # Invalidates everything
-    CFG = "cfg"  # Preserves CFG structure
+    CFG = "cfg"  # Preserves CFG structure, and with it dominance and loops
     DOMINANCE = "dominance"  # Preserves dominance info
     ALL = "all"  # Preserves all analyses
 
@@ -42,6 +43,8 @@ class PassInfo:
         pass_type: Type(s) of pass - can be single type or list of types.
         requires: List of required analysis passes.
         preserves: What analyses this pass preserves.
+        maintains: Analyses the pass keeps up to date as it transforms code,
+            which stay valid whatever it preserves.
     """
 
     name: str
@@ -49,6 +52,7 @@ class PassInfo:
     pass_type: PassType | list[PassType]
     requires: list[str]
     preserves: PreservationLevel
+    maintains: list[str] = field(default_factory=list)
 
 
 class Pass(ABC):
@@ -106,6 +110,21 @@ class ModulePass(Pass):
         """
         pass
 
+    def modified_functions(self, module: MIRModule) -> list[MIRFunction]:
+        """Get the functions changed by the last run.
+
+        The pass manager invalidates analyses of these functions only. Passes
+        that track what they change override this; by default every function
+        of the module is assumed changed.
+
+        Args:
+            module: The module the pass ran on.
+
+        Returns:
+            The changed functions.
+        """
+        return list(module.functions.values())
+
 
 class FunctionPass(Pass):
     """Base class for function-level passes."""
@@ -249,3 +268,20 @@ class OptimizationPass(FunctionPass):
         if self.analysis_manager is None:
             raise RuntimeError("Analysis manager not set")
         return self.analysis_manager.get_analysis(analysis_name, function)
+
+    def create_transformer(self, function: MIRFunction) -> MIRTransformer:
+        """Create a transformer for a function.
+
+        If the pass maintains use-def chains and they are cached, the
+        transformer updates them along with the code.
+
+        Args:
+            function: The function to transform.
+
+        Returns:
+            The transformer.
+        """
+        use_def = None
+        if self.analysis_manager is not None and "use-def-chains" in self.get_info().maintains:
+            use_def = self.analysis_manager.get_cached_analysis("use-def-chains", function)
+        return MIRTransformer(function, use_def)
@@ -15,6 +15,7 @@ from machine_dialect.mir.optimization_pass import ModulePass, Pass
 from machine_dialect.mir.optimizations.constant_propagation import ConstantPropagation
 from machine_dialect.mir.optimizations.cse import CommonSubexpressionElimination
 from machine_dialect.mir.optimizations.dce import DeadCodeElimination
+from machine_dialect.mir.optimizations.gvn import GlobalValueNumbering
 from machine_dialect.mir.optimizations.inlining import FunctionInlining
 from machine_dialect.mir.optimizations.jump_threading import JumpThreadingPass
 from machine_dialect.mir.optimizations.licm import LoopInvariantCodeMotion
@@ -51,7 +52,7 @@ class OptimizationPipeline:
         """Register all available passes with the pass manager.
 
         Registers both analysis passes (dominance, loop, use-def chains)
-        and optimization passes (constant propagation, DCE, CSE, etc.).
+        and optimization passes (constant propagation, DCE, GVN, etc.).
         """
         # Register analysis passes
         self.pass_manager.register_pass(DominanceAnalysis)
@@ -62,6 +63,7 @@ class OptimizationPipeline:
         self.pass_manager.register_pass(ConstantPropagation)
         self.pass_manager.register_pass(DeadCodeElimination)
         self.pass_manager.register_pass(CommonSubexpressionElimination)
+        self.pass_manager.register_pass(GlobalValueNumbering)
         self.pass_manager.register_pass(StrengthReduction)
         self.pass_manager.register_pass(JumpThreadingPass)
         # self.pass_manager.register_pass(PeepholePass)  # Disabled
@@ -106,7 +108,7 @@ class OptimizationPipeline:
                 FunctionInlining(size_threshold=30),
                 # After inlining, more opportunities
                 self.pass_manager.registry.get_pass("constant-propagation"),
-                self.pass_manager.registry.get_pass("cse"),
+                self.pass_manager.registry.get_pass("gvn"),
                 self.pass_manager.registry.get_pass("licm"),
                 self.pass_manager.registry.get_pass("dce"),
                 # Final cleanup
@@ -124,12 +126,12 @@ class OptimizationPipeline:
                 # Full optimization suite
                 self.pass_manager.registry.get_pass("constant-propagation"),
                 self.pass_manager.registry.get_pass("strength-reduction"),
-                self.pass_manager.registry.get_pass("cse"),
+                self.pass_manager.registry.get_pass("gvn"),
                 self.pass_manager.registry.get_pass("licm"),
                 self.pass_manager.registry.get_pass("dce"),
                 # Second iteration after first round
                 self.pass_manager.registry.get_pass("constant-propagation"),
-                self.pass_manager.registry.get_pass("cse"),
+                self.pass_manager.registry.get_pass("gvn"),
                 self.pass_manager.registry.get_pass("dce"),
                 # Control flow optimization
                 self.pass_manager.registry.get_pass("jump-threading"),
@@ -145,7 +147,7 @@ class OptimizationPipeline:
             os_passes = [
                 # No inlining (increases size)
                 self.pass_manager.registry.get_pass("constant-propagation"),
-                self.pass_manager.registry.get_pass("cse"),  # Reduces duplicate code
+                self.pass_manager.registry.get_pass("gvn"),  # Reduces duplicate code
                 self.pass_manager.registry.get_pass("dce"),  # Removes dead code
                 self.pass_manager.registry.get_pass("jump-threading"),  # Simplifies control flow
                 self.pass_manager.registry.get_pass("peephole"),
@@ -269,7 +271,7 @@ class PipelineBuilder:
         Returns:
             Self for chaining.
         """
-        self.passes.extend(["constant-propagation", "strength-reduction", "cse"])
+        self.passes.extend(["constant-propagation", "strength-reduction", "gvn"])
         return self
 
     def add_loop_passes(self) -> "PipelineBuilder":
@@ -9,10 +9,13 @@ from machine_dialect.mir.optimizations.branch_prediction import BranchPrediction
 from machine_dialect.mir.optimizations.constant_propagation import ConstantPropagation
 from machine_dialect.mir.optimizations.cse import CommonSubexpressionElimination
 from machine_dialect.mir.optimizations.dce import DeadCodeElimination
+from machine_dialect.mir.optimizations.gvn import GlobalValueNumbering
 from machine_dialect.mir.optimizations.inlining import FunctionInlining
 from machine_dialect.mir.optimizations.jump_threading import JumpThreadingOptimizer, JumpThreadingPass
 from machine_dialect.mir.optimizations.licm import LoopInvariantCodeMotion
 from machine_dialect.mir.optimizations.loop_unrolling import LoopUnrolling
+from machine_dialect.mir.optimizations.memoization import FunctionMemoization
+from machine_dialect.mir.optimizations.partial_evaluation import PartialEvaluation
 
 # from machine_dialect.mir.optimizations.peephole_optimizer import PeepholeOptimizer  # Disabled - needs update
 from machine_dialect.mir.optimizations.strength_reduction import StrengthReduction
@@ -31,10 +34,13 @@ __all__ = [
     "ConstantPropagation",
     "DeadCodeElimination",
     "FunctionInlining",
+    "FunctionMemoization",
+    "GlobalValueNumbering",
     "JumpThreadingOptimizer",
     "JumpThreadingPass",
     "LoopInvariantCodeMotion",
     "LoopUnrolling",
+    "PartialEvaluation",
     # "PeepholeOptimizer",  # Disabled
     # "PeepholePass",  # Disabled
     "StrengthReduction",
@@ -52,9 +58,12 @@ def register_all_passes(pass_manager: PassManager) -> None:
         pass_manager: Pass manager to register with.
     """
     from machine_dialect.mir.analyses.alias_analysis import AliasAnalysis
+    from machine_dialect.mir.analyses.call_graph import CallGraphAnalysis
     from machine_dialect.mir.analyses.dominance_analysis import DominanceAnalysis
     from machine_dialect.mir.analyses.escape_analysis import EscapeAnalysis
+    from machine_dialect.mir.analyses.liveness import LivenessAnalysis
     from machine_dialect.mir.analyses.loop_analysis import LoopAnalysis
+    from machine_dialect.mir.analyses.purity_analysis import PurityAnalysis
     from machine_dialect.mir.analyses.type_analysis import TypeAnalysis
     from machine_dialect.mir.analyses.use_def_chains import UseDefChainsAnalysis
 
@@ -62,19 +71,25 @@ def register_all_passes(pass_manager: PassManager) -> None:
     pass_manager.register_pass(DominanceAnalysis)
     pass_manager.register_pass(UseDefChainsAnalysis)
     pass_manager.register_pass(LoopAnalysis)
+    pass_manager.register_pass(LivenessAnalysis)
     pass_manager.register_pass(AliasAnalysis)
     pass_manager.register_pass(EscapeAnalysis)
     pass_manager.register_pass(TypeAnalysis)
+    pass_manager.register_pass(CallGraphAnalysis)
+    pass_manager.register_pass(PurityAnalysis)
 
     # Register optimization passes
     pass_manager.register_pass(TypeSpecificOptimization)  # Run early to benefit other passes
     pass_manager.register_pass(TypeNarrowing)  # Run after type-specific to narrow union types
+    pass_manager.register_pass(PartialEvaluation)
     pass_manager.register_pass(ConstantPropagation)
     pass_manager.register_pass(CommonSubexpressionElimination)
+    pass_manager.register_pass(GlobalValueNumbering)
     pass_manager.register_pass(DeadCodeElimination)
     pass_manager.register_pass(StrengthReduction)
     pass_manager.register_pass(AlgebraicSimplification)
     pass_manager.register_pass(TailCallOptimization)
+    pass_manager.register_pass(FunctionMemoization)
     pass_manager.register_pass(TypeSpecialization)
     pass_manager.register_pass(FunctionInlining)
     pass_manager.register_pass(LoopInvariantCodeMotion)
@@ -39,6 +39,7 @@ class AlgebraicSimplification(OptimizationPass):
             pass_type=PassType.OPTIMIZATION,
             requires=[],
             preserves=PreservationLevel.CFG,
+            maintains=["use-def-chains"],
         )
 
     def run_on_function(self, function: MIRFunction) -> bool:
@@ -50,7 +51,7 @@ class AlgebraicSimplification(OptimizationPass):
         Returns:
             True if the function was modified.
         """
-        transformer = MIRTransformer(function)
+        transformer = self.create_transformer(function)
 
         for block in function.cfg.blocks.values():
             self._simplify_block(block, transformer)
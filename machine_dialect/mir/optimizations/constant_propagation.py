@@ -130,6 +130,7 @@ class ConstantPropagation(OptimizationPass):
             pass_type=PassType.OPTIMIZATION,
             requires=[],
             preserves=PreservationLevel.CFG,
+            maintains=["use-def-chains"],
         )
 
     def run_on_function(self, function: MIRFunction) -> bool:
@@ -145,7 +146,7 @@ class ConstantPropagation(OptimizationPass):
         lattice = self._analyze_constants(function)
 
         # Apply transformations based on analysis
-        transformer = MIRTransformer(function)
+        transformer = self.create_transformer(function)
 
         # Replace uses with constants
         for value, const_val in lattice.values.items():
@@ -42,7 +42,8 @@ class DeadCodeElimination(OptimizationPass):
             description="Eliminate dead code and unreachable blocks",
             pass_type=[PassType.OPTIMIZATION, PassType.CLEANUP],
             requires=["use-def-chains"],
-            preserves=PreservationLevel.CFG,
+            preserves=PreservationLevel.NONE,
+            maintains=["use-def-chains"],
         )
 
     def run_on_function(self, function: MIRFunction) -> bool:
@@ -54,10 +55,9 @@ class DeadCodeElimination(OptimizationPass):
         Returns:
             True if the function was modified.
         """
-        transformer = MIRTransformer(function)
-
-        # Get use-def chains
+        # Get use-def chains, which the transformer keeps up to date
         use_def_chains: UseDefChains = self.get_analysis("use-def-chains", function)
+        transformer = MIRTransformer(function, use_def_chains)
 
         # Phase 1: Remove dead instructions
         dead_instructions = self._find_dead_instructions(function, use_def_chains)
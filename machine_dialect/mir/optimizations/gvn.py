@@ -0,0 +1,292 @@
+"""Global Value Numbering (GVN) optimization pass.
+
+This module eliminates redundant computations by walking the dominator tree
+once with a scoped hash table of expressions. An expression computed in a
+block is available in every block the block dominates, and is forgotten
+again when the walk leaves the block's subtree.
+
+Only values that behave like SSA names take part: temporaries and local
+variables with a single definition that dominates all of their uses, and
+parameters that are never assigned. Any other value is opaque.
+"""
+
+from collections import defaultdict
+from collections.abc import Hashable
+from typing import Any
+
+from machine_dialect.mir.analyses.purity_analysis import COLLECTION_MUTATIONS, is_global_variable
+from machine_dialect.mir.basic_block import BasicBlock
+from machine_dialect.mir.mir_function import MIRFunction
+from machine_dialect.mir.mir_instructions import BinaryOp, Copy, LoadConst, MIRInstruction, Phi, UnaryOp
+from machine_dialect.mir.mir_types import MIRType
+from machine_dialect.mir.mir_values import Constant, MIRValue, Temp, Variable
+from machine_dialect.mir.optimization_pass import (
+    OptimizationPass,
+    PassInfo,
+    PassType,
+    PreservationLevel,
+)
+from machine_dialect.mir.ssa_construction import DominanceInfo
+
+# Operators whose operands can be swapped for any operand type
+_COMMUTATIVE = frozenset({"==", "!="})
+
+# Operators whose operands can be swapped when both are numbers
+_NUMERIC_COMMUTATIVE = frozenset({"+", "*"})
+
+_NUMERIC_TYPES = frozenset({MIRType.INT, MIRType.FLOAT})
+
+# Types whose values cannot be modified in place
+_SCALAR_TYPES = frozenset({MIRType.INT, MIRType.FLOAT, MIRType.STRING, MIRType.BOOL, MIRType.EMPTY, MIRType.URL})
+
+
+def _value_key(value: MIRValue) -> Hashable | None:
+    """Get the identity of a named value.
+
+    Parameters appear both as plain and as scoped variables, so variables
+    are identified by name and version only.
+
+    Args:
+        value: The value.
+
+    Returns:
+        A hashable key, or None for values that are not names.
+    """
+    if isinstance(value, Temp):
+        return ("temp", value.id)
+    if isinstance(value, Variable):
+        return ("var", value.name, value.version)
+    return None
+
+
+class GlobalValueNumbering(OptimizationPass):
+    """Dominator-scoped global value numbering pass."""
+
+    def get_info(self) -> PassInfo:
+        """Get pass information.
+
+        Returns:
+            Pass information.
+        """
+        return PassInfo(
+            name="gvn",
+            description="Eliminate redundant computations with global value numbering",
+            pass_type=PassType.OPTIMIZATION,
+            requires=[],
+            preserves=PreservationLevel.CFG,
+        )
+
+    def run_on_function(self, function: MIRFunction) -> bool:
+        """Run GVN on a function.
+
+        Args:
+            function: The function to optimize.
+
+        Returns:
+            True if the function was modified.
+        """
+        entry = function.cfg.entry_block
+        if entry is None:
+            return False
+
+        dominance = DominanceInfo(function.cfg)
+        self._names = self._find_ssa_names(function, dominance)
+        self._mutates_collections = any(
+            isinstance(inst, COLLECTION_MUTATIONS)
+            for block in function.cfg.blocks.values()
+            for inst in block.instructions
+        )
+        # Name -> equivalent value whose definition dominates the name's
+        self._leaders: dict[Hashable, MIRValue] = {}
+        self._table: dict[tuple[Any, ...], MIRValue] = {}
+        self._modified = False
+
+        # Preorder walk of the dominator tree; None marks leaving a block
+        stack: list[tuple[BasicBlock, list[tuple[Any, ...]] | None]] = [(entry, None)]
+        while stack:
+            block, inserted = stack.pop()
+            if inserted is not None:
+                for expr in inserted:
+                    del self._table[expr]
+                continue
+
+            stack.append((block, self._number_block(block)))
+            children = sorted(dominance.dominator_tree_children.get(block, ()), key=lambda b: b.label)
+            stack.extend((child, None) for child in reversed(children))
+
+        return self._modified
+
+    def _find_ssa_names(self, function: MIRFunction, dominance: DominanceInfo) -> set[Hashable]:
+        """Find the values that behave like SSA names.
+
+        Args:
+            function: The function.
+            dominance: Dominance information of the function.
+
+        Returns:
+            Keys of the values that can be numbered.
+        """
+        # (block, index) of every definition; phi nodes come before index 0
+        definitions: dict[Hashable, list[tuple[BasicBlock, int]]] = defaultdict(list)
+        uses: list[tuple[Hashable, BasicBlock, int]] = []
+        candidates: dict[Hashable, MIRValue] = {}
+
+        for block in function.cfg.blocks.values():
+            for index, inst in enumerate([*block.phi_nodes, *block.instructions]):
+                position = -1 if isinstance(inst, Phi) else index
+                for value in inst.get_defs():
+                    key = _value_key(value)
+                    if key is not None:
+                        definitions[key].append((block, position))
+                        candidates[key] = value
+                if isinstance(inst, Phi):
+                    # Phi operands are read at the end of the incoming block
+                    for value, label in inst.incoming:
+                        predecessor = function.cfg.get_block(label)
+                        key = _value_key(value)
+                        if key is not None and predecessor is not None:
+                            uses.append((key, predecessor, len(predecessor.instructions)))
+                            candidates[key] = value
+                else:
+                    for value in inst.get_uses():
+                        key = _value_key(value)
+                        if key is not None:
+                            uses.append((key, block, position))
+                            candidates[key] = value
+
+        names: set[Hashable] = set()
+        param_names = {param.name for param in function.params}
+        for key, value in candidates.items():
+            if is_global_variable(value, function):
+                continue
+            defs = definitions.get(key, [])
+            if not defs and isinstance(value, Variable) and value.name in param_names and value.version == 0:
+                names.add(key)
+            elif len(defs) == 1:
+                names.add(key)
+
+        # A single definition must dominate every use to act as an SSA name
+        for key, block, position in uses:
+            if key not in names or key not in definitions:
+                continue
+            def_block, def_position = definitions[key][0]
+            if not dominance.dominates(def_block, block) or (def_block is block and def_position >= position):
+                names.discard(key)
+        return names
+
+    def _number_block(self, block: BasicBlock) -> list[tuple[Any, ...]]:
+        """Number the instructions of a block.
+
+        Args:
+            block: The block to process.
+
+        Returns:
+            The expressions added to the table, to remove after the subtree.
+        """
+        inserted: list[tuple[Any, ...]] = []
+
+        for index, inst in enumerate(block.instructions):
+            self._rewrite_uses(inst)
+
+            if isinstance(inst, Copy):
+                # Fold copy chains: uses of the copy read its source directly
+                dest_key = _value_key(inst.dest)
+                source_key = _value_key(inst.source)
+                if dest_key in self._names and source_key in self._names:
+                    self._leaders[dest_key] = inst.source
+                continue
+
+            expr = self._get_expression(inst)
+            if expr is None:
+                continue
+            dest = inst.get_defs()[0]
+            existing = self._table.get(expr)
+            if existing is None:
+                self._table[expr] = dest
+                inserted.append(expr)
+            else:
+                block.instructions[index] = Copy(dest, existing, inst.source_location)
+                self._leaders[_value_key(dest)] = existing
+                self._modified = True
+                self.stats["expressions_eliminated"] = self.stats.get("expressions_eliminated", 0) + 1
+
+        return inserted
+
+    def _rewrite_uses(self, inst: MIRInstruction) -> None:
+        """Replace names used by an instruction with their leaders.
+
+        Args:
+            inst: The instruction.
+        """
+        for value in inst.get_uses():
+            leader = self._leaders.get(_value_key(value))
+            if leader is not None and leader is not value:
+                inst.replace_use(value, leader)
+                self._modified = True
+                self.stats["uses_rewritten"] = self.stats.get("uses_rewritten", 0) + 1
+
+    def _get_expression(self, inst: MIRInstruction) -> tuple[Any, ...] | None:
+        """Build the hash table key of an instruction.
+
+        Args:
+            inst: The instruction.
+
+        Returns:
+            The key, or None if the instruction cannot be numbered.
+        """
+        if isinstance(inst, LoadConst):
+            if _value_key(inst.dest) not in self._names:
+                return None
+            return ("const", inst.constant.value, inst.constant.type)
+
+        if isinstance(inst, BinaryOp):
+            operands = [inst.left, inst.right]
+        elif isinstance(inst, UnaryOp):
+            operands = [inst.operand]
+        else:
+            return None
+
+        if _value_key(inst.dest) not in self._names or not all(self._is_numberable(value) for value in operands):
+            return None
+        keys = [self._operand_key(value) for value in operands]
+
+        if isinstance(inst, UnaryOp):
+            return ("unary", inst.op, keys[0])
+        if inst.op in _COMMUTATIVE or (
+            inst.op in _NUMERIC_COMMUTATIVE and all(value.type in _NUMERIC_TYPES for value in operands)
+        ):
+            keys.sort(key=repr)
+        return ("binary", inst.op, *keys)
+
+    def _is_numberable(self, value: MIRValue) -> bool:
+        """Check if an operand can be part of a numbered expression.
+
+        Args:
+            value: The operand.
+
+        Returns:
+            True for constants, and for SSA names that cannot change in place.
+        """
+        if isinstance(value, Constant):
+            return True
+        if _value_key(value) not in self._names:
+            return False
+        # A collection modified in place gives a different result for the same name
+        return not self._mutates_collections or value.type in _SCALAR_TYPES
+
+    def _operand_key(self, value: MIRValue) -> Hashable:
+        """Get the key of an operand.
+
+        Args:
+            value: The operand.
+
+        Returns:
+            A hashable key.
+        """
+        if isinstance(value, Constant):
+            return ("const", value.value, value.type)
+        return _value_key(value)
+
+    def finalize(self) -> None:
+        """Finalize the pass."""
+        pass
@@ -4,10 +4,10 @@ This module implements function inlining to eliminate call overhead and
 enable further optimizations by exposing more code to analysis.
 """
 
-from collections import defaultdict
 from dataclasses import dataclass
 from typing import Any
 
+from machine_dialect.mir.analyses.call_graph import CallGraph
 from machine_dialect.mir.basic_block import BasicBlock
 from machine_dialect.mir.mir_function import MIRFunction
 from machine_dialect.mir.mir_instructions import (
@@ -75,7 +75,13 @@ class InliningCost:
 
 
 class FunctionInlining(ModulePass):
-    """Function inlining optimization pass."""
+    """Function inlining optimization pass.
+
+    Functions are visited bottom-up over the SCCs of the call graph, so every
+    callee is fully inlined into, and its final size known, before any caller
+    considers it. Calls between functions of the same SCC are recursive and
+    are never inlined.
+    """
 
     def __init__(self, size_threshold: int = 50) -> None:
         """Initialize inlining pass.
@@ -85,15 +91,16 @@ class FunctionInlining(ModulePass):
         """
         super().__init__()
         self.size_threshold = size_threshold
-        self.stats = {"inlined": 0, "call_sites_processed": 0}
-        self.inlining_depth: dict[str, int] = defaultdict(int)
+        self.stats = {"inlined": 0, "call_sites_processed": 0, "recursive_calls": 0}
+        self.function_sizes: dict[str, tuple[int, int]] = {}
+        self._modified_functions: list[MIRFunction] = []
 
     def initialize(self) -> None:
         """Initialize the pass before running."""
         super().initialize()
         # Re-initialize stats after base class clears them
-        self.stats = {"inlined": 0, "call_sites_processed": 0}
-        self.inlining_depth = defaultdict(int)
+        self.stats = {"inlined": 0, "call_sites_processed": 0, "recursive_calls": 0}
+        self.function_sizes = {}
 
     def get_info(self) -> PassInfo:
         """Get pass information.
@@ -118,91 +125,83 @@ class FunctionInlining(ModulePass):
         Returns:
             True if the module was modified.
         """
-        modified = False
+        self._modified_functions = []
+        call_graph = CallGraph.build(module)
 
-        # Process each function
-        for _, function in module.functions.items():
-            if self._inline_calls_in_function(function, module):
-                modified = True
+        for scc in call_graph.sccs:
+            for name in scc:
+                if self._inline_calls_in_function(module.functions[name], module, call_graph):
+                    self._modified_functions.append(module.functions[name])
 
-        return modified
+        return bool(self._modified_functions)
+
+    def modified_functions(self, module: MIRModule) -> list[MIRFunction]:
+        """Get the functions changed by the last run.
 
-    def _inline_calls_in_function(self, function: MIRFunction, module: MIRModule) -> bool:
+        Args:
+            module: The module the pass ran on.
+
+        Returns:
+            The changed functions.
+        """
+        return list(self._modified_functions)
+
+    def _inline_calls_in_function(self, function: MIRFunction, module: MIRModule, call_graph: CallGraph) -> bool:
         """Inline calls within a function.
 
+        Call sites are kept on a worklist. Inlining a call only adds the calls
+        of the inlined body, so the function is never rescanned.
+
         Args:
             function: The function to process.
             module: The containing module.
+            call_graph: Call graph of the module.
 
         Returns:
             True if modifications were made.
         """
         modified = False
         transformer = MIRTransformer(function)
-
-        # Keep inlining until no more opportunities
-        # This handles the case where inlining creates new opportunities
-        changed = True
-        while changed:
-            changed = False
-
-            # Find all call sites fresh each iteration
-            call_sites = self._find_call_sites(function)
-
-            for call_inst, block in call_sites:
-                self.stats["call_sites_processed"] += 1
-
-                # Get the called function
-                if not isinstance(call_inst.func, FunctionRef):
-                    continue
-
-                callee_name = call_inst.func.name
-                if callee_name not in module.functions:
-                    continue
-
-                callee = module.functions[callee_name]
-
-                # Check if we should inline
-                cost = self._calculate_inlining_cost(callee, call_inst, self.inlining_depth[callee_name])
-                if not cost.should_inline():
-                    continue
-
-                # Don't inline recursive functions directly
-                if callee_name == function.name:
-                    continue
-
-                # Verify the call is still in the block (it might have been removed by previous inlining)
-                if call_inst not in block.instructions:
-                    continue
-
-                # Perform inlining
-                self.inlining_depth[callee_name] += 1
-                if self._inline_call(call_inst, block, callee, function, transformer):
-                    modified = True
-                    changed = True
-                    self.stats["inlined"] += 1
-                    # Break inner loop to re-find call sites
-                    break
-                self.inlining_depth[callee_name] -= 1
+        # The function is about to change; its size is cached again once a caller asks
+        self.function_sizes.pop(function.name, None)
+
+        # Calls are popped last-first within a block, so splitting a block at a call
+        # never moves a call that is still pending into the continuation block
+        worklist = [(site.instruction, site.block, 0) for site in call_graph.call_sites[function.name]]
+
+        while worklist:
+            call_inst, block, depth = worklist.pop()
+            self.stats["call_sites_processed"] += 1
+
+            callee_name = call_inst.func.name
+            if call_graph.in_same_scc(callee_name, function.name):
+                self.stats["recursive_calls"] += 1
+                continue
+
+            callee = module.functions[callee_name]
+
+            # Check if we should inline
+            cost = self._calculate_inlining_cost(callee, call_inst, depth)
+            if not cost.should_inline():
+                continue
+
+            # Perform inlining
+            inlined_blocks = self._inline_call(call_inst, block, callee, function, transformer)
+            modified = True
+            self.stats["inlined"] += 1
+
+            # Calls the callee kept are new candidates, one level deeper
+            for inlined_block in inlined_blocks:
+                for inst in inlined_block.instructions:
+                    if (
+                        isinstance(inst, Call)
+                        and isinstance(inst.func, FunctionRef)
+                        and inst.func.name in module.functions
+                    ):
+                        worklist.append((inst, inlined_block, depth + 1))
 
         return modified
 
-    def _find_call_sites(self, function: MIRFunction) -> list[tuple[Call, BasicBlock]]:
-        """Find all call instructions in a function.
-
-        Args:
-            function: The function to search.
-
-        Returns:
-            List of (call instruction, containing block) pairs.
-        """
-        call_sites = []
-        for block in function.cfg.blocks.values():
-            for inst in block.instructions:
-                if isinstance(inst, Call):
-                    call_sites.append((inst, block))
-        return call_sites
-
     def _calculate_inlining_cost(self, callee: MIRFunction, call_inst: Call, depth: int) -> InliningCost:
         """Calculate the cost of inlining a function.
 
@@ -214,8 +213,7 @@ class FunctionInlining(ModulePass):
         Returns:
             Inlining cost information.
         """
-        # Count instructions in callee
-        instruction_count = sum(len(block.instructions) for block in callee.cfg.blocks.values())
+        instruction_count, return_count = self._function_size(callee)
 
         # Calculate call site benefit
         # Higher benefit if:
@@ -235,9 +233,6 @@ class FunctionInlining(ModulePass):
             benefit += 10.0
 
         # Penalty for multiple returns (complex CFG)
-        return_count = sum(
-            1 for block in callee.cfg.blocks.values() for inst in block.instructions if isinstance(inst, Return)
-        )
         if return_count > 1:
             benefit -= (return_count - 1) * 5.0
 
@@ -248,6 +243,24 @@ class FunctionInlining(ModulePass):
             depth=depth,
         )
 
+    def _function_size(self, function: MIRFunction) -> tuple[int, int]:
+        """Get the instruction and return counts of a function.
+
+        Callees are final by the time a caller asks, so the counts are cached.
+
+        Args:
+            function: The function to measure.
+
+        Returns:
+            Tuple of (instruction count, return count).
+        """
+        size = self.function_sizes.get(function.name)
+        if size is None:
+            instructions = [inst for block in function.cfg.blocks.values() for inst in block.instructions]
+            size = (len(instructions), sum(1 for inst in instructions if isinstance(inst, Return)))
+            self.function_sizes[function.name] = size
+        return size
+
     def _inline_call(
         self,
         call_inst: Call,
@@ -255,7 +268,7 @@ class FunctionInlining(ModulePass):
         callee: MIRFunction,
         caller: MIRFunction,
         transformer: MIRTransformer,
-    ) -> bool:
+    ) -> list[BasicBlock]:
         """Inline a function call.
 
         Args:
@@ -266,7 +279,7 @@ class FunctionInlining(ModulePass):
             transformer: MIR transformer.
 
         Returns:
-            True if inlining succeeded.
+            The blocks cloned from the callee.
         """
         # Create value mapping for parameters -> arguments
         value_map: dict[MIRValue, MIRValue] = {}
@@ -284,20 +297,38 @@ class FunctionInlining(ModulePass):
                     else:
                         param_names.append(str(p))
 
+        # Parameters the callee assigns (e.g. a tail-recursive loop) must not
+        # write to the caller's argument values, so they get a fresh copy
+        assigned = {
+            value.name
+            for block in callee.cfg.blocks.values()
+            for inst in block.instructions
+            for value in inst.get_defs()
+            if isinstance(value, Variable)
+        }
+        arg_copies: list[MIRInstruction] = []
         for param_name, arg in zip(param_names, call_inst.args, strict=True):
             param_var = Variable(param_name, MIRType.INT)  # Assume INT for now
+            if param_name in assigned:
+                temp = caller.new_temp(arg.type)
+                arg_copies.append(Copy(temp, arg, call_inst.source_location))
+                arg = temp
             value_map[param_var] = arg
+        # Parameters may also be referenced as scoped variables, which hash differently
+        for param in callee.params:
+            if isinstance(param, Variable):
+                value_map.setdefault(param, value_map[Variable(param.name, MIRType.INT)])
 
         # Clone the callee's CFG
-        _cloned_blocks, entry_block, return_blocks = self._clone_function_body(callee, caller, value_map, transformer)
+        cloned_blocks, entry_block, return_blocks = self._clone_function_body(callee, caller, value_map, transformer)
 
         # Split the call block at the call instruction
         call_idx = call_block.instructions.index(call_inst)
-        pre_call = call_block.instructions[:call_idx]
+        pre_call = [*call_block.instructions[:call_idx], *arg_copies]
         post_call = call_block.instructions[call_idx + 1 :]
 
         # Create continuation block for code after the call
-        cont_block = BasicBlock(f"{call_block.label}_cont")
+        cont_block = BasicBlock(self._unique_label(caller, f"{call_block.label}_cont"))
         caller.cfg.add_block(cont_block)
         cont_block.instructions = post_call
         cont_block.successors = call_block.successors.copy()
@@ -337,7 +368,23 @@ class FunctionInlining(ModulePass):
                 cont_block.predecessors.append(ret_block)
 
         transformer.modified = True
-        return True
+        return list(cloned_blocks.values())
+
+    def _unique_label(self, function: MIRFunction, label: str) -> str:
+        """Make a block label unique within a function.
+
+        The same callee can be inlined several times into one caller.
+
+        Args:
+            function: The function the block is added to.
+            label: The preferred label.
+
+        Returns:
+            The label, with a numeric suffix if it is already taken.
+        """
+        while label in function.cfg.blocks:
+            label = function.cfg.generate_label(f"{label}_")
+        return label
 
     def _clone_function_body(
         self,
@@ -363,7 +410,7 @@ class FunctionInlining(ModulePass):
 
         # First pass: create all blocks
         for old_block in callee.cfg.blocks.values():
-            new_label = f"inlined_{callee.name}_{old_block.label}"
+            new_label = self._unique_label(caller, f"inlined_{callee.name}_{old_block.label}")
             new_block = BasicBlock(new_label)
             caller.cfg.add_block(new_block)
             block_map[old_block] = new_block
@@ -540,7 +587,7 @@ class FunctionInlining(ModulePass):
 
         Cleans up any temporary state.
         """
-        self.inlining_depth.clear()
+        self.function_sizes.clear()
 
     def get_statistics(self) -> dict[str, int]:
         """Get optimization statistics.
@@ -379,6 +379,10 @@ class JumpThreadingOptimizer:
             Opcode.DEFINE_R,
         ]:
             return 4  # 1 opcode + 1 register + 2 bytes (u16)
+        if opcode == Opcode.MEMO_LOOKUP_R:
+            return 4  # 1 opcode + 2 bytes (u16) + argc
+        if opcode == Opcode.MEMO_STORE_R:
+            return 5  # 1 opcode + 2 bytes (u16) + argc + 1 register
 
         # Instructions with 3 registers
         if opcode in [
@@ -420,6 +424,10 @@ class JumpThreadingOptimizer:
         if opcode == Opcode.CALL_R:
             return 4  # 1 opcode + func + dst + argc (minimum)
 
+        # TAIL_CALL_R special case
+        if opcode == Opcode.TAIL_CALL_R:
+            return 3  # 1 opcode + func + argc (minimum)
+
         # Simple opcodes with no operands
         if opcode in [Opcode.NOP, Opcode.BREAKPOINT]:
             return 1
@@ -60,7 +60,7 @@ class LoopUnrolling(OptimizationPass):
             description="Unroll small loops to reduce overhead",
             pass_type=PassType.OPTIMIZATION,
             requires=["loop-analysis", "dominance"],
-            preserves=PreservationLevel.CFG,
+            preserves=PreservationLevel.NONE,
         )
 
     def run_on_function(self, function: MIRFunction) -> bool:
@@ -0,0 +1,157 @@
+"""Automatic memoization of pure functions.
+
+This module selects functions whose result depends only on their arguments
+and marks them for memoization. The bytecode generator then emits a
+MEMO_LOOKUP_R at the function entry, which returns a cached result for
+arguments seen before, and a MEMO_STORE_R before each return, which records
+the result in the VM's bounded memo table for the function.
+"""
+
+from collections.abc import Iterable
+
+from machine_dialect.mir.analyses.purity_analysis import PurityInfo
+from machine_dialect.mir.mir_function import MIRFunction
+from machine_dialect.mir.mir_instructions import Return
+from machine_dialect.mir.mir_module import MIRModule
+from machine_dialect.mir.mir_values import Variable
+from machine_dialect.mir.optimization_pass import (
+    ModulePass,
+    PassInfo,
+    PassType,
+    PreservationLevel,
+)
+from machine_dialect.mir.profiling.profile_data import ProfileData
+
+
+class FunctionMemoization(ModulePass):
+    """Memoization pass.
+
+    A function is memoized if it was requested by name, or if the profile
+    shows it is called at least `hot_threshold` times, and it is safe to
+    memoize:
+    1. It is pure and reads no module-level variables, directly or through
+       its callees
+    2. It takes at least one parameter and returns a value
+    3. It never assigns its parameters, so they still hold the memo key when
+       the function returns
+    """
+
+    def __init__(
+        self,
+        functions: Iterable[str] | None = None,
+        profile_data: ProfileData | None = None,
+        hot_threshold: int = 1000,
+    ) -> None:
+        """Initialize the memoization pass.
+
+        Args:
+            functions: Names of functions to memoize when safe.
+            profile_data: Optional profile used to find hot functions.
+            hot_threshold: Minimum profiled call count to memoize a function.
+        """
+        super().__init__()
+        self.functions = set(functions or ())
+        self.profile_data = profile_data
+        self.hot_threshold = hot_threshold
+        self.stats = self._empty_stats()
+
+    def initialize(self) -> None:
+        """Initialize the pass before running."""
+        super().initialize()
+        # Re-initialize stats after base class clears them
+        self.stats = self._empty_stats()
+
+    def _empty_stats(self) -> dict[str, int]:
+        """Create zeroed statistics.
+
+        Returns:
+            Dictionary of statistics.
+        """
+        return {"pure_functions": 0, "candidates": 0, "memoized": 0}
+
+    def get_info(self) -> PassInfo:
+        """Get pass information.
+
+        Returns:
+            Pass information.
+        """
+        return PassInfo(
+            name="memoization",
+            description="Memoize pure functions",
+            pass_type=PassType.OPTIMIZATION,
+            requires=[],
+            preserves=PreservationLevel.ALL,
+        )
+
+    def finalize(self) -> None:
+        """Finalize the pass after running.
+
+        Override from base class - no special finalization needed.
+        """
+        pass
+
+    def run_on_module(self, module: MIRModule) -> bool:
+        """Run memoization on a module.
+
+        Args:
+            module: The module to optimize.
+
+        Returns:
+            True if a function was marked for memoization.
+        """
+        candidates = self.functions | self._hot_functions()
+        purity = PurityInfo.build(module)
+        self.stats["pure_functions"] = sum(effects.is_pure for effects in purity.effects.values())
+
+        modified = False
+        for name, function in module.functions.items():
+            if name not in candidates or function.memoize:
+                continue
+            self.stats["candidates"] += 1
+            if purity.is_deterministic(name) and self._can_memoize(function):
+                function.memoize = True
+                self.stats["memoized"] += 1
+                modified = True
+
+        return modified
+
+    def _hot_functions(self) -> set[str]:
+        """Get the functions the profile shows as hot.
+
+        Returns:
+            Names of functions called at least `hot_threshold` times.
+        """
+        if self.profile_data is None:
+            return set()
+        return set(self.profile_data.get_hot_functions(self.hot_threshold))
+
+    def _can_memoize(self, function: MIRFunction) -> bool:
+        """Check if a function's entry and returns can use the memo table.
+
+        Args:
+            function: The function to check.
+
+        Returns:
+            True if the function has parameters, returns a value and never
+            assigns a parameter.
+        """
+        if not function.params:
+            return False
+
+        param_names = {param.name for param in function.params}
+        returns_value = False
+        for block in function.cfg.blocks.values():
+            for inst in block.instructions:
+                if isinstance(inst, Return) and inst.value is not None:
+                    returns_value = True
+                if any(isinstance(value, Variable) and value.name in param_names for value in inst.get_defs()):
+                    return False
+        return returns_value
+
+    def get_statistics(self) -> dict[str, int]:
+        """Get optimization statistics.
+
+        Returns:
+            Dictionary of statistics.
+        """
+        return self.stats
@@ -0,0 +1,343 @@
+"""Compile-time evaluation of pure calls.
+
+This module runs calls to pure functions whose arguments are all constants
+in the MIR interpreter while compiling, and replaces each call with the
+constant it returns. Every evaluation has a step budget, so a call that runs
+too long, fails or uses an instruction the interpreter does not support is
+simply left in place.
+
+The pass runs before the function-level passes, so callees are evaluated as
+written rather than as other passes rewrote them, and arguments loaded into
+temporaries or variables earlier in the block count as constants.
+"""
+
+import math
+from typing import Any
+
+from machine_dialect.errors.exceptions import MDRuntimeError
+from machine_dialect.mir.analyses.purity_analysis import PurityInfo
+from machine_dialect.mir.basic_block import BasicBlock
+from machine_dialect.mir.mir_function import MIRFunction
+from machine_dialect.mir.mir_instructions import Call, Copy, LoadConst, MIRInstruction, Phi, StoreVar
+from machine_dialect.mir.mir_interpreter import MIRInterpreter
+from machine_dialect.mir.mir_module import MIRModule
+from machine_dialect.mir.mir_values import Constant, FunctionRef, MIRValue, Variable
+from machine_dialect.mir.optimization_pass import (
+    ModulePass,
+    PassInfo,
+    PassType,
+    PreservationLevel,
+)
+
+# Range of the VM's integers
+_INT_MIN = -(2**63)
+_INT_MAX = 2**63 - 1
+
+# Cache entry for calls that could not be evaluated
+_FAILED = object()
+
+
+class _CompileTimeInterpreter(MIRInterpreter):
+    """Interpreter that refuses instructions it cannot evaluate exactly."""
+
+    def _execute_instruction(self, inst: MIRInstruction) -> None:
+        """Execute a single MIR instruction.
+
+        The interpreter resolves phi nodes approximately, which is fine for
+        debugging but not for folding, so they abort the evaluation.
+
+        Args:
+            inst: The instruction to execute.
+        """
+        if isinstance(inst, Phi):
+            raise RuntimeError("Phi nodes are not evaluated at compile time")
+        super()._execute_instruction(inst)
+
+    def _eval_binary_op(self, op: str, left: Any, right: Any) -> Any:
+        """Evaluate a binary operation as the VM does.
+
+        Integer division and remainder truncate toward zero, float remainder
+        takes the sign of the dividend, and integer results must fit in 64
+        bits.
+
+        Args:
+            op: The operation.
+            left: Left operand.
+            right: Right operand.
+
+        Returns:
+            The result.
+
+        Raises:
+            OverflowError: If an integer result does not fit in 64 bits.
+        """
+        if op in ("/", "%") and right != 0:
+            if _is_int(left) and _is_int(right):
+                quotient = abs(left) // abs(right)
+                if (left < 0) != (right < 0):
+                    quotient = -quotient
+                # The VM traps on the quotient overflowing, even for the remainder
+                _check_int(quotient)
+                return quotient if op == "/" else left - right * quotient
+            if op == "%" and (isinstance(left, float) or isinstance(right, float)):
+                return math.fmod(left, right)
+        return _check_int(super()._eval_binary_op(op, left, right))
+
+    def _eval_unary_op(self, op: str, operand: Any) -> Any:
+        """Evaluate a unary operation as the VM does.
+
+        Args:
+            op: The operation.
+            operand: The operand.
+
+        Returns:
+            The result.
+        """
+        return _check_int(super()._eval_unary_op(op, operand))
+
+
+class PartialEvaluation(ModulePass):
+    """Compile-time evaluation pass.
+
+    A call is evaluated if:
+    1. It calls a module function whose result depends only on its arguments
+    2. All of its arguments are constants
+    3. Its result is stored
+
+    Results are cached per function and arguments, including failures, so
+    each distinct call is evaluated at most once per run.
+    """
+
+    def __init__(self, step_budget: int = 100_000) -> None:
+        """Initialize the pass.
+
+        Args:
+            step_budget: Maximum interpreter steps for one evaluation.
+        """
+        super().__init__()
+        self.step_budget = step_budget
+        self._cache: dict[tuple[str, tuple[Constant, ...]], Any] = {}
+        self.stats = self._empty_stats()
+        self._modified_functions: list[MIRFunction] = []
+
+    def initialize(self) -> None:
+        """Initialize the pass before running."""
+        super().initialize()
+        # Re-initialize stats after base class clears them
+        self.stats = self._empty_stats()
+
+    def _empty_stats(self) -> dict[str, int]:
+        """Create zeroed statistics.
+
+        Returns:
+            Dictionary of statistics.
+        """
+        return {"calls_evaluated": 0, "cache_hits": 0, "failed": 0, "budget_exhausted": 0}
+
+    def get_info(self) -> PassInfo:
+        """Get pass information.
+
+        Returns:
+            Pass information.
+        """
+        return PassInfo(
+            name="partial-evaluation",
+            description="Evaluate pure calls with constant arguments at compile time",
+            pass_type=PassType.OPTIMIZATION,
+            requires=[],
+            preserves=PreservationLevel.CFG,
+        )
+
+    def finalize(self) -> None:
+        """Finalize the pass after running.
+
+        Override from base class - no special finalization needed.
+        """
+        pass
+
+    def run_on_module(self, module: MIRModule) -> bool:
+        """Run compile-time evaluation on a module.
+
+        Args:
+            module: The module to optimize.
+
+        Returns:
+            True if a call was replaced by its result.
+        """
+        self._cache.clear()
+        purity = PurityInfo.build(module)
+
+        self._modified_functions = []
+        for function in module.functions.values():
+            modified = False
+            for block in function.cfg.blocks.values():
+                known: dict[MIRValue, Constant] = {}
+                for index, inst in enumerate(block.instructions):
+                    if isinstance(inst, Call) and self._fold_call(module, purity, block, index, known):
+                        modified = True
+                    _track_constants(block.instructions[index], known)
+            if modified:
+                self._modified_functions.append(function)
+
+        return bool(self._modified_functions)
+
+    def modified_functions(self, module: MIRModule) -> list[MIRFunction]:
+        """Get the functions changed by the last run.
+
+        Args:
+            module: The module the pass ran on.
+
+        Returns:
+            The changed functions.
+        """
+        return list(self._modified_functions)
+
+    def _fold_call(
+        self, module: MIRModule, purity: PurityInfo, block: BasicBlock, index: int, known: dict[MIRValue, Constant]
+    ) -> bool:
+        """Replace a call by its result if it can be evaluated.
+
+        Args:
+            module: The module.
+            purity: Purity of the module's functions.
+            block: Block containing the call.
+            index: Position of the call in the block.
+            known: Constant values of temporaries and variables at the call.
+
+        Returns:
+            True if the call was replaced.
+        """
+        inst = block.instructions[index]
+        if not isinstance(inst, Call) or inst.dest is None or not isinstance(inst.func, FunctionRef):
+            return False
+        if not purity.is_deterministic(inst.func.name):
+            return False
+        args = [arg if isinstance(arg, Constant) else known.get(arg) for arg in inst.args]
+        constant_args = [arg for arg in args if arg is not None]
+        if len(constant_args) != len(inst.args):
+            return False
+
+        result = self._evaluate(module, inst.func.name, constant_args)
+        if result is _FAILED:
+            return False
+        block.instructions[index] = LoadConst(inst.dest, result, inst.source_location)
+        self.stats["calls_evaluated"] += 1
+        return True
+
+    def _evaluate(self, module: MIRModule, name: str, args: list[Constant]) -> Any:
+        """Evaluate a call, using the cache when possible.
+
+        Args:
+            module: The module containing the function.
+            name: Name of the called function.
+            args: Constant arguments.
+
+        Returns:
+            The result as a constant, or _FAILED.
+        """
+        key = (name, tuple(args))
+        if key in self._cache:
+            self.stats["cache_hits"] += 1
+            return self._cache[key]
+
+        interpreter = _CompileTimeInterpreter()
+        interpreter.module = module
+        interpreter.max_steps = self.step_budget
+        result: Any = _FAILED
+        try:
+            value = interpreter.call_function(module.functions[name], [arg.value for arg in args])
+        except (RuntimeError, MDRuntimeError, ArithmeticError, TypeError, ValueError, AssertionError):
+            if interpreter.step_count > interpreter.max_steps:
+                self.stats["budget_exhausted"] += 1
+            else:
+                self.stats["failed"] += 1
+        else:
+            if _is_foldable(value):
+                result = Constant(value)
+            else:
+                self.stats["failed"] += 1
+
+        self._cache[key] = result
+        return result
+
+    def get_statistics(self) -> dict[str, int]:
+        """Get optimization statistics.
+
+        Returns:
+            Dictionary of statistics.
+        """
+        return self.stats
+
+
+def _track_constants(inst: MIRInstruction, known: dict[MIRValue, Constant]) -> None:
+    """Record the constants an instruction stores, and forget what it overwrites.
+
+    The pass runs before constant propagation, while arguments are still
+    loaded into temporaries just before the call, so constants are tracked
+    within a block.
+
+    Args:
+        inst: The instruction.
+        known: Constant values of temporaries and variables, updated in place.
+    """
+    if isinstance(inst, Call):
+        # The callee may assign any variable
+        for variable in [value for value in known if isinstance(value, Variable)]:
+            del known[variable]
+
+    value: MIRValue | None = None
+    if isinstance(inst, LoadConst) and isinstance(inst.constant, Constant):
+        value = inst.constant
+    elif isinstance(inst, Copy | StoreVar):
+        value = inst.source
+    constant = value if isinstance(value, Constant) else known.get(value) if value is not None else None
+
+    for dest in inst.get_defs():
+        if constant is not None:
+            known[dest] = constant
+        else:
+            known.pop(dest, None)
+
+
+def _is_int(value: Any) -> bool:
+    """Check if a value is an integer and not a boolean.
+
+    Args:
+        value: Value computed by the interpreter.
+
+    Returns:
+        True for integers.
+    """
+    return isinstance(value, int) and not isinstance(value, bool)
+
+
+def _check_int(value: Any) -> Any:
+    """Check that an integer fits the VM's 64-bit range.
+
+    Args:
+        value: Value computed by the interpreter.
+
+    Returns:
+        The value.
+
+    Raises:
+        OverflowError: If the value is an integer out of range, where the VM
+            would trap.
+    """
+    if _is_int(value) and not _INT_MIN <= value <= _INT_MAX:
+        raise OverflowError("Integer overflow")
+    return value
+
+
+def _is_foldable(value: Any) -> bool:
+    """Check if a value can be emitted as a constant.
+
+    Args:
+        value: Value computed by the interpreter.
+
+    Returns:
+        True for scalars the VM can represent.
+    """
+    if isinstance(value, int) and not isinstance(value, bool):
+        return _INT_MIN <= value <= _INT_MAX
+    return value is None or isinstance(value, bool | float | str)
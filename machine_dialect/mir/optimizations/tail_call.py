@@ -1,13 +1,16 @@
 """Tail call optimization pass.
 
-This module implements tail call optimization to transform recursive calls
-in tail position into jumps, eliminating stack growth for tail-recursive functions.
+This module implements tail call optimization. Self-recursive calls in tail
+position are turned into loops, and all other calls in tail position are marked
+so that code generation emits a frame-reusing TAIL_CALL_R instead of CALL_R.
+Either way, tail-recursive functions run in constant stack space.
 """
 
 from machine_dialect.mir.basic_block import BasicBlock
 from machine_dialect.mir.mir_function import MIRFunction
-from machine_dialect.mir.mir_instructions import Call, Copy, Return
+from machine_dialect.mir.mir_instructions import Call, Copy, Jump, MIRInstruction, Return, StoreVar
 from machine_dialect.mir.mir_module import MIRModule
+from machine_dialect.mir.mir_values import MIRValue, ScopedVariable, Variable, VariableScope
 from machine_dialect.mir.optimization_pass import (
     ModulePass,
     PassInfo,
@@ -19,21 +22,40 @@ from machine_dialect.mir.optimization_pass import (
 class TailCallOptimization(ModulePass):
     """Tail call optimization pass.
 
-    This pass identifies function calls in tail position and marks them
-    for optimization. A call is in tail position if:
-    1. It's immediately followed by a return of its result
-    2. Or it's the last instruction before a return (for void calls)
+    This pass identifies function calls in tail position. A call is in tail
+    position if:
+    1. Its result is returned, either directly or through a chain of copies
+       and variable stores
+    2. Or it is a void call immediately followed by a void return
 
-    The actual transformation to jumps happens during bytecode generation.
+    Calls of a function to itself are replaced by copies of the arguments into
+    the parameters and a jump back to the start of the function body. Other
+    tail calls are marked, and the bytecode generator emits them as TAIL_CALL_R.
     """
 
     def __init__(self) -> None:
         """Initialize the tail call optimization pass."""
         super().__init__()
-        self.stats = {
+        self.stats = self._empty_stats()
+        self._modified_functions: list[MIRFunction] = []
+
+    def initialize(self) -> None:
+        """Initialize the pass before running."""
+        super().initialize()
+        # Re-initialize stats after base class clears them
+        self.stats = self._empty_stats()
+
+    def _empty_stats(self) -> dict[str, int]:
+        """Create zeroed statistics.
+
+        Returns:
+            Dictionary of statistics.
+        """
+        return {
             "tail_calls_found": 0,
             "functions_optimized": 0,
             "recursive_tail_calls": 0,
+            "tail_calls_to_loops": 0,
         }
 
     def get_info(self) -> PassInfo:
@@ -47,7 +69,7 @@ class TailCallOptimization(ModulePass):
             description="Optimize tail calls into jumps",
             pass_type=PassType.OPTIMIZATION,
             requires=[],
-            preserves=PreservationLevel.CFG,
+            preserves=PreservationLevel.NONE,
         )
 
     def finalize(self) -> None:
@@ -66,137 +88,210 @@ class TailCallOptimization(ModulePass):
         Returns:
             True if the module was modified.
         """
-        modified = False
+        self._modified_functions = []
 
         # Process each function
-        for func_name, function in module.functions.items():
-            if self._optimize_tail_calls_in_function(function, func_name):
-                modified = True
+        for function in module.functions.values():
+            if self._optimize_tail_calls_in_function(function, module):
+                self._modified_functions.append(function)
                 self.stats["functions_optimized"] += 1
 
-        return modified
+        return bool(self._modified_functions)
 
-    def _optimize_tail_calls_in_function(self, function: MIRFunction, func_name: str) -> bool:
+    def modified_functions(self, module: MIRModule) -> list[MIRFunction]:
+        """Get the functions changed by the last run.
+
+        Args:
+            module: The module the pass ran on.
+
+        Returns:
+            The changed functions.
+        """
+        return list(self._modified_functions)
+
+    def _optimize_tail_calls_in_function(self, function: MIRFunction, module: MIRModule) -> bool:
         """Optimize tail calls in a single function.
 
         Args:
             function: The function to optimize.
-            func_name: Name of the function (for recursive call detection).
+            module: The module containing the function.
 
         Returns:
             True if the function was modified.
         """
         modified = False
+        loop_header: BasicBlock | None = None
 
-        # Process each basic block
-        for block in function.cfg.blocks.values():
-            if self._optimize_tail_calls_in_block(block, func_name):
-                modified = True
+        # Blocks may be added while looping
+        for block in list(function.cfg.blocks.values()):
+            index = self._find_tail_call(block, function, module)
+            if index is None:
+                continue
+
+            call = block.instructions[index]
+            assert isinstance(call, Call)
+            call.is_tail_call = True
+            self.stats["tail_calls_found"] += 1
+            modified = True
+
+            if call.func.name != function.name:
+                continue
+            self.stats["recursive_tail_calls"] += 1
+
+            if len(call.args) != len(function.params) or function.cfg.entry_block is None:
+                continue
+            if loop_header is None:
+                loop_header = self._add_loop_preheader(function, call)
+            self._replace_with_jump(block, index, function, loop_header)
+            self.stats["tail_calls_to_loops"] += 1
 
         return modified
 
-    def _optimize_tail_calls_in_block(self, block: BasicBlock, func_name: str) -> bool:
-        """Optimize tail calls in a basic block.
+    def _find_tail_call(self, block: BasicBlock, function: MIRFunction, module: MIRModule) -> int | None:
+        """Find an unmarked call in tail position at the end of a block.
 
         Args:
-            block: The basic block to process.
-            func_name: Name of the containing function.
+            block: The basic block to inspect.
+            function: The function containing the block.
+            module: The module containing the function.
 
         Returns:
-            True if the block was modified.
+            Index of the call in the block, or None if there is none.
         """
-        modified = False
         instructions = block.instructions
+        if not instructions or not isinstance(instructions[-1], Return):
+            return None
+
+        # Walk back over copies that forward the returned value. Copies to
+        # other locals are dead once the function returns, so they are
+        # skipped too; earlier passes such as GVN leave them behind.
+        value = instructions[-1].value
+        index = len(instructions) - 2
+        while index >= 0:
+            inst = instructions[index]
+            if isinstance(inst, Copy):
+                dest = inst.dest
+            elif isinstance(inst, StoreVar):
+                dest = inst.var
+            else:
+                break
+            if self._is_global(dest):
+                break
+            if value is not None and dest == value:
+                value = inst.source
+            index -= 1
+
+        if index < 0:
+            return None
+        call = instructions[index]
+        if not isinstance(call, Call) or call.is_tail_call:
+            return None
+
+        if value is None:
+            # A void return may only become the callee's return if that is void too
+            callee = module.get_function(call.func.name)
+            if call.dest is not None and callee is None:
+                return None
+            if callee is not None and not self._returns_nothing(callee):
+                return None
+            return index
+
+        return index if call.dest is not None and call.dest == value else None
+
+    def _is_global(self, value: MIRValue) -> bool:
+        """Check if a value is a module-level variable.
 
-        # Look for tail call patterns
-        i = 0
-        while i < len(instructions):
-            inst = instructions[i]
-
-            # Pattern 1: Call followed by Return of its result
-            if isinstance(inst, Call) and not inst.is_tail_call:
-                if i + 1 < len(instructions):
-                    next_inst = instructions[i + 1]
-
-                    # Direct return of call result
-                    if isinstance(next_inst, Return) and next_inst.value == inst.dest:
-                        inst.is_tail_call = True
-                        self.stats["tail_calls_found"] += 1
-                        modified = True
-
-                        # Check if it's a recursive call
-                        if hasattr(inst.func, "name") and inst.func.name == func_name:
-                            self.stats["recursive_tail_calls"] += 1
-
-                    # Call result copied to variable, then returned
-                    elif i + 2 < len(instructions) and isinstance(next_inst, Copy):
-                        third_inst = instructions[i + 2]
-                        if (
-                            isinstance(third_inst, Return)
-                            and next_inst.source == inst.dest
-                            and third_inst.value == next_inst.dest
-                        ):
-                            inst.is_tail_call = True
-                            self.stats["tail_calls_found"] += 1
-                            modified = True
-
-                            # Check if it's a recursive call
-                            if hasattr(inst.func, "name") and inst.func.name == func_name:
-                                self.stats["recursive_tail_calls"] += 1
-
-            # Pattern 2: Void call followed by return
-            elif isinstance(inst, Call) and inst.dest is None and not inst.is_tail_call:
-                if i + 1 < len(instructions):
-                    next_inst = instructions[i + 1]
-                    if isinstance(next_inst, Return) and next_inst.value is None:
-                        inst.is_tail_call = True
-                        self.stats["tail_calls_found"] += 1
-                        modified = True
-
-                        # Check if it's a recursive call
-                        if hasattr(inst.func, "name") and inst.func.name == func_name:
-                            self.stats["recursive_tail_calls"] += 1
-
-            i += 1
-
-        return modified
+        Args:
+            value: The value to check.
 
-    def _is_tail_position(self, block: BasicBlock, instruction_index: int) -> bool:
-        """Check if an instruction is in tail position.
+        Returns:
+            True if stores to the value are visible outside the function.
+        """
+        return isinstance(value, ScopedVariable) and value.scope == VariableScope.GLOBAL
 
-        An instruction is in tail position if all paths from it lead
-        directly to a return without any other side effects.
+    def _returns_nothing(self, function: MIRFunction) -> bool:
+        """Check if all returns of a function are void.
 
         Args:
-            block: The basic block containing the instruction.
-            instruction_index: Index of the instruction in the block.
+            function: The function to check.
 
         Returns:
-            True if the instruction is in tail position.
+            True if the function never returns a value.
         """
-        # Simple check: instruction is followed only by a return
-        instructions = block.instructions
+        return all(
+            inst.value is None
+            for block in function.cfg.blocks.values()
+            for inst in block.instructions
+            if isinstance(inst, Return)
+        )
 
-        # Check remaining instructions after this one
-        for i in range(instruction_index + 1, len(instructions)):
-            inst = instructions[i]
+    def _add_loop_preheader(self, function: MIRFunction, call: Call) -> BasicBlock:
+        """Make the function body the target of tail self-calls.
 
-            # Return is ok
-            if isinstance(inst, Return):
-                return True
+        A new entry block jumping to the old one is added, so that the old entry
+        block becomes a loop header and the function entry keeps no predecessors.
 
-            # Copy is ok if it's just moving the result
-            if isinstance(inst, Copy):
-                continue
-
-            # Any other instruction means not in tail position
-            return False
+        Args:
+            function: The function to transform.
+            call: A tail self-call, used for the source location.
 
-        # If we reach end of block without return, check if block
-        # has a single successor that starts with return
-        # (This would require more complex CFG analysis)
+        Returns:
+            The loop header, which is the old entry block.
+        """
+        cfg = function.cfg
+        header = cfg.entry_block
+        assert header is not None
+
+        label = cfg.generate_label("tail_entry_")
+        while label in cfg.blocks:
+            label = cfg.generate_label("tail_entry_")
+        preheader = BasicBlock(label)
+        preheader.add_instruction(Jump(header.label, call.source_location))
+        cfg.add_block(preheader)
+        cfg.connect_blocks(preheader.label, header.label)
+        cfg.set_entry_block(preheader)
+        return header
+
+    def _replace_with_jump(self, block: BasicBlock, index: int, function: MIRFunction, header: BasicBlock) -> None:
+        """Replace a tail self-call and the return after it with a jump.
+
+        The arguments are assigned to the parameters as a parallel copy:
+        arguments reading a parameter that is reassigned are staged in fresh
+        temporaries first.
 
-        return False
+        Args:
+            block: The block ending in the tail call.
+            index: Index of the call in the block.
+            function: The function being transformed.
+            header: The loop header to jump to.
+        """
+        call = block.instructions[index]
+        assert isinstance(call, Call)
+        location = call.source_location
+
+        moves = [
+            (param, arg)
+            for param, arg in zip(function.params, call.args, strict=True)
+            if not (isinstance(arg, Variable) and arg.name == param.name and arg.version == 0)
+        ]
+        assigned = {param.name for param, _ in moves}
+
+        staging: list[MIRInstruction] = []
+        assignments: list[MIRInstruction] = []
+        for param, arg in moves:
+            source = arg
+            if isinstance(arg, Variable) and arg.name in assigned:
+                source = function.new_temp(param.type)
+                staging.append(Copy(source, arg, location))
+            assignments.append(Copy(param, source, location))
+
+        block.instructions = [
+            *block.instructions[:index],
+            *staging,
+            *assignments,
+            Jump(header.label, location),
+        ]
+        function.cfg.connect_blocks(block.label, header.label)
 
     def get_statistics(self) -> dict[str, int]:
         """Get optimization statistics.
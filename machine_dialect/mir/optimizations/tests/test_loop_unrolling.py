@@ -38,7 +38,7 @@ class TestLoopUnrolling:
         assert info.description == "Unroll small loops to reduce overhead"
         assert info.pass_type == PassType.OPTIMIZATION
         assert info.requires == ["loop-analysis", "dominance"]
-        assert info.preserves == PreservationLevel.CFG
+        assert info.preserves == PreservationLevel.NONE
 
     def test_get_loops_in_order(self) -> None:
         """Test ordering loops from innermost to outermost."""
@@ -4,6 +4,8 @@ This module provides the main entry point for optimizing MIR modules
 using the pass management infrastructure.
 """
 
+from typing import Any
+
 from machine_dialect.mir.mir_module import MIRModule
 from machine_dialect.mir.optimization_config import (
     OptimizationConfig,
@@ -11,6 +13,7 @@ from machine_dialect.mir.optimization_config import (
 )
 from machine_dialect.mir.optimizations import register_all_passes
 from machine_dialect.mir.pass_manager import PassManager
+from machine_dialect.mir.reporting.tracing import Tracer
 
 
 def optimize_mir(
@@ -19,6 +22,8 @@ def optimize_mir(
     config: OptimizationConfig | None = None,
     debug: bool = False,
     custom_passes: list[str] | None = None,
+    tracer: Tracer | None = None,
+    pass_options: dict[str, dict[str, Any]] | None = None,
 ) -> tuple[MIRModule, dict[str, dict[str, int]]]:
     """Optimize a MIR module using the optimization framework.
 
@@ -28,6 +33,8 @@ def optimize_mir(
         config: Optional custom optimization configuration.
         debug: Enable debug output.
         custom_passes: Optional list of custom passes to run instead of default pipeline.
+        tracer: Optional tracer to record per-pass timing spans.
+        pass_options: Optional constructor arguments for passes, by pass name.
 
     Returns:
         Tuple of (optimized module, pass statistics).
@@ -39,6 +46,10 @@ def optimize_mir(
     # Create pass manager
     pass_manager = PassManager()
     pass_manager.debug_mode = debug or config.debug_passes
+    if tracer is not None:
+        pass_manager.tracer = tracer
+    if pass_options is not None:
+        pass_manager.pass_options = pass_options
 
     # Register all available passes
     register_all_passes(pass_manager)
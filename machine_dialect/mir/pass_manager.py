@@ -4,7 +4,10 @@ This module implements the pass management infrastructure for scheduling,
 executing, and managing dependencies between passes.
 """
 
+import time
 from collections import defaultdict
+from collections.abc import Callable
+from functools import partial
 from typing import Any
 
 from machine_dialect.mir.mir_function import MIRFunction
@@ -21,6 +24,7 @@ from machine_dialect.mir.optimization_pass import (
     PassType,
     PreservationLevel,
 )
+from machine_dialect.mir.reporting.tracing import Tracer
 
 
 class PassRegistry:
@@ -42,18 +46,19 @@ class PassRegistry:
         self._passes[info.name] = pass_class
         self._pass_info[info.name] = info
 
-    def get_pass(self, name: str) -> Pass | None:
+    def get_pass(self, name: str, **options: Any) -> Pass | None:
         """Get a pass instance by name.
 
         Args:
             name: Pass name.
+            **options: Keyword arguments for the pass constructor.
 
         Returns:
             Pass instance or None.
         """
         pass_class = self._passes.get(name)
         if pass_class:
-            return pass_class()
+            return pass_class(**options)
         return None
 
     def get_info(self, name: str) -> PassInfo | None:
@@ -90,13 +95,32 @@ class PassRegistry:
         return result
 
 
+# Analyses that stay valid when a pass changes a function, by what it preserves
+PRESERVED_ANALYSES: dict[PreservationLevel, frozenset[str]] = {
+    PreservationLevel.NONE: frozenset(),
+    PreservationLevel.DOMINANCE: frozenset({"dominance"}),
+    PreservationLevel.CFG: frozenset({"dominance", "loop-analysis"}),
+}
+
+
 class AnalysisManager:
-    """Manager for analysis passes and their results."""
+    """Manager for analysis passes and their results.
+
+    Results are cached per analysis and per function or module, stamped with
+    the epoch of their target. Changing a function bumps its epoch and the
+    epoch of the modules, and only results stamped with the current epoch are
+    used, so analyses of functions no pass touched are never recomputed.
+    """
 
     def __init__(self) -> None:
         """Initialize the analysis manager."""
         self._analyses: dict[str, AnalysisPass] = {}
         self._dependencies: dict[str, set[str]] = defaultdict(set)
+        # Results by target and analysis, with the target epoch they were computed at
+        self._results: dict[MIRModule | MIRFunction, dict[str, tuple[int, Any]]] = {}
+        self._epochs: dict[MIRModule | MIRFunction, int] = {}
+        # Builds per analysis: count, rebuilds of a result computed before, and time
+        self.stats: dict[str, dict[str, int]] = {}
 
     def register_analysis(self, name: str, analysis: AnalysisPass) -> None:
         """Register an analysis pass.
@@ -106,6 +130,18 @@ class AnalysisManager:
             analysis: Analysis pass instance.
         """
         self._analyses[name] = analysis
+        self._dependencies[name] = set(analysis.get_info().requires)
+
+    def get_epoch(self, target: MIRModule | MIRFunction) -> int:
+        """Get the modification epoch of a function or module.
+
+        Args:
+            target: Module or function.
+
+        Returns:
+            The number of times the target was marked modified.
+        """
+        return self._epochs.get(target, 0)
 
     def get_analysis(
         self,
@@ -129,59 +165,158 @@ class AnalysisManager:
 
         analysis = self._analyses[name]
 
+        build: Callable[[], Any]
         if isinstance(analysis, ModuleAnalysisPass) and isinstance(target, MIRModule):
-            return analysis.get_analysis(target)
+            build = partial(analysis.run_on_module, target)
         elif isinstance(analysis, FunctionAnalysisPass) and isinstance(
             target,
             MIRFunction,
         ):
-            return analysis.get_analysis(target)
+            build = partial(analysis.run_on_function, target)
         else:
             raise TypeError("Incompatible analysis and target types")
 
+        epoch = self.get_epoch(target)
+        results = self._results.setdefault(target, {})
+        cached = results.get(name)
+        if cached is not None and cached[0] == epoch:
+            return cached[1]
+
+        start = time.perf_counter_ns()
+        result = build()
+        stats = self.stats.setdefault(name, {"builds": 0, "rebuilds": 0, "build_time_us": 0})
+        stats["builds"] += 1
+        stats["build_time_us"] += (time.perf_counter_ns() - start) // 1000
+        if cached is not None:
+            stats["rebuilds"] += 1
+        results[name] = (epoch, result)
+        return result
+
+    def get_cached_analysis(self, name: str, target: MIRModule | MIRFunction) -> Any:
+        """Get analysis results only if they are cached.
+
+        Args:
+            name: Analysis name.
+            target: Module or function.
+
+        Returns:
+            Cached results, or None if the analysis is unknown or not computed.
+        """
+        cached = self._results.get(target, {}).get(name)
+        if cached is None or cached[0] != self.get_epoch(target):
+            return None
+        return cached[1]
+
     def invalidate(self, names: list[str] | None = None) -> None:
-        """Invalidate analyses.
+        """Invalidate analyses of all functions and modules.
 
         Args:
-            names: Specific analyses to invalidate, or None for all.
+            names: Specific analyses to invalidate along with the analyses
+                that depend on them, or None for all.
         """
-        if names is None:
-            for analysis in self._analyses.values():
-                analysis.invalidate()
-        else:
-            for name in names:
-                if name in self._analyses:
-                    self._analyses[name].invalidate()
-                    # Invalidate dependent analyses
-                    for dep_name, deps in self._dependencies.items():
-                        if name in deps and dep_name in self._analyses:
-                            self._analyses[dep_name].invalidate()
-
-    def preserve_analyses(self, level: PreservationLevel) -> None:
+        stale = None if names is None else self._with_dependents(set(names))
+        for results in self._results.values():
+            for name, (_, result) in results.items():
+                if stale is None or name in stale:
+                    results[name] = (-1, result)
+
+    def mark_modified(
+        self,
+        function: MIRFunction,
+        level: PreservationLevel = PreservationLevel.NONE,
+        maintained: list[str] | None = None,
+    ) -> None:
+        """Record that a pass changed a function.
+
+        This bumps the epoch of the function and of the modules, which
+        invalidates their cached results except those the pass preserved.
+
+        Args:
+            function: The changed function.
+            level: What the pass preserves.
+            maintained: Analyses the pass kept up to date, which stay valid.
+        """
+        kept = self._surviving(level, set(maintained or []))
+        targets: list[MIRModule | MIRFunction] = [function]
+        targets.extend(target for target in self._results if isinstance(target, MIRModule))
+        for target in targets:
+            epoch = self.get_epoch(target)
+            self._epochs[target] = epoch + 1
+            results = self._results.get(target, {})
+            for name, (stamp, result) in results.items():
+                if stamp == epoch and (kept is None or name in kept):
+                    results[name] = (epoch + 1, result)
+
+    def preserve_analyses(self, level: PreservationLevel, maintained: list[str] | None = None) -> None:
         """Preserve analyses based on preservation level.
 
+        Every function with cached results is treated as changed; passes that
+        know which functions they changed use `mark_modified` instead.
+
         Args:
             level: Preservation level.
+            maintained: Analyses the pass kept up to date, which stay valid.
         """
-        if level == PreservationLevel.NONE:
-            self.invalidate()
-        elif level == PreservationLevel.CFG:
-            # Invalidate analyses that depend on CFG changes
-            to_invalidate = []
-            for name, analysis in self._analyses.items():
-                info = analysis.get_info()
-                if "cfg" not in info.requires:
-                    to_invalidate.append(name)
-            self.invalidate(to_invalidate)
-        elif level == PreservationLevel.DOMINANCE:
-            # Invalidate analyses that depend on dominance
-            to_invalidate = []
-            for name, analysis in self._analyses.items():
-                info = analysis.get_info()
-                if "dominance" not in info.requires:
-                    to_invalidate.append(name)
-            self.invalidate(to_invalidate)
-        # PreservationLevel.ALL preserves everything
+        for target in list(self._results):
+            if isinstance(target, MIRFunction):
+                self.mark_modified(target, level, maintained)
+
+    def _surviving(self, level: PreservationLevel, maintained: set[str]) -> set[str] | None:
+        """Get the analyses that stay valid when a function changes.
+
+        An analysis survives if the preservation level keeps it or the pass
+        maintains it, and everything it depends on survives as well.
+
+        Args:
+            level: What the pass preserves.
+            maintained: Analyses the pass kept up to date.
+
+        Returns:
+            The surviving analyses, or None if all survive.
+        """
+        if level == PreservationLevel.ALL:
+            return None
+        kept = set(PRESERVED_ANALYSES[level]) | maintained
+        changed = True
+        while changed:
+            changed = False
+            for name in list(kept - maintained):
+                if not self._get_dependencies(name) <= kept:
+                    kept.discard(name)
+                    changed = True
+        return kept
+
+    def _with_dependents(self, names: set[str]) -> set[str]:
+        """Add the analyses that depend on the given ones, transitively.
+
+        Args:
+            names: Analysis names.
+
+        Returns:
+            The analyses and their dependents.
+        """
+        result = set(names)
+        changed = True
+        while changed:
+            changed = False
+            for name in self._analyses:
+                if name not in result and self._get_dependencies(name) & result:
+                    result.add(name)
+                    changed = True
+        return result
+
+    def _get_dependencies(self, name: str) -> set[str]:
+        """Get the analyses an analysis requires.
+
+        Args:
+            name: Analysis name.
+
+        Returns:
+            Names of the required analyses.
+        """
+        if name not in self._dependencies and name in self._analyses:
+            self._dependencies[name] = set(self._analyses[name].get_info().requires)
+        return self._dependencies.get(name, set())
 
 
 class PassScheduler:
@@ -270,6 +405,9 @@ class PassManager:
         self.scheduler = PassScheduler(self.registry)
         self.stats: dict[str, dict[str, int]] = {}
         self.debug_mode = False
+        self.tracer = Tracer()
+        # Constructor arguments for passes that take options, by pass name
+        self.pass_options: dict[str, dict[str, Any]] = {}
 
     def register_pass(self, pass_class: type[Pass]) -> None:
         """Register a pass with the manager.
@@ -303,7 +441,7 @@ class PassManager:
 
         modified = False
         for pass_name in scheduled:
-            pass_instance = self.registry.get_pass(pass_name)
+            pass_instance = self.registry.get_pass(pass_name, **self.pass_options.get(pass_name, {}))
             if not pass_instance:
                 print(f"Warning: Pass '{pass_name}' not found")
                 continue
@@ -327,21 +465,28 @@ class PassManager:
                     )
                     # Run analysis to populate cache
                     if isinstance(pass_instance, ModuleAnalysisPass):
-                        pass_instance.run_on_module(module)
+                        with self.tracer.span(pass_name, "analysis"):
+                            self.analysis_manager.get_analysis(pass_name, module)
                     elif isinstance(pass_instance, FunctionAnalysisPass):
                         for function in module.functions.values():
-                            pass_instance.run_on_function(function)
+                            with self.tracer.span(pass_name, "analysis", function=function.name):
+                                self.analysis_manager.get_analysis(pass_name, function)
             else:
-                # Run optimization/utility pass
+                # Run optimization/utility pass, invalidating analyses of the functions it changed
                 if isinstance(pass_instance, ModulePass):
-                    if pass_instance.run_on_module(module):
-                        modified = True
+                    with self.tracer.span(pass_name, "pass"):
+                        if pass_instance.run_on_module(module):
+                            modified = True
+                            for function in pass_instance.modified_functions(module):
+                                self.analysis_manager.mark_modified(function, pass_info.preserves, pass_info.maintains)
                 elif isinstance(pass_instance, FunctionPass):
-                    if pass_instance.run_on_module(module):
-                        modified = True
-
-                # Handle analysis preservation
-                self.analysis_manager.preserve_analyses(pass_info.preserves)
+                    for function in module.functions.values():
+                        # Time each function separately
+                        with self.tracer.span(pass_name, "pass", function=function.name):
+                            function_modified = pass_instance.run_on_function(function)
+                        if function_modified:
+                            modified = True
+                            self.analysis_manager.mark_modified(function, pass_info.preserves, pass_info.maintains)
 
             # Finalize pass
             pass_instance.finalize()
@@ -376,16 +521,27 @@ class PassManager:
         modified = pass_instance.run_on_function(function)
         pass_instance.finalize()
 
+        if modified:
+            info = pass_instance.get_info()
+            self.analysis_manager.mark_modified(function, info.preserves, info.maintains)
+
         return modified
 
     def get_statistics(self) -> dict[str, dict[str, int]]:
         """Get statistics from all passes.
 
+        Analyses also report how often their results were built and rebuilt
+        after invalidation, and the time spent building them.
+
         Returns:
             Dictionary of pass statistics.
         """
-        return self.stats.copy()
+        stats = {name: dict(pass_stats) for name, pass_stats in self.stats.items()}
+        for name, analysis_stats in self.analysis_manager.stats.items():
+            stats.setdefault(name, {}).update(analysis_stats)
+        return stats
 
     def reset_statistics(self) -> None:
         """Reset all statistics."""
         self.stats.clear()
+        self.analysis_manager.stats.clear()
@@ -129,6 +129,49 @@ class ProfileReader:
 
         return merged
 
+    def read_vm_profile(self, vm_profile: dict[str, Any], module_name: str = "default") -> ProfileData:
+        """Convert a profile collected by the Rust VM into profile data.
+
+        The input is the dictionary returned by ``RustVM.get_profile()``.
+        Function call counts and inclusive instruction counts become
+        function profiles; opcode counts, exclusive instruction counts and
+        per-PC hit counts are kept in the metadata.
+
+        Args:
+            vm_profile: Dictionary returned by the VM profiler.
+            module_name: Name of the profiled module.
+
+        Returns:
+            Profile data object.
+        """
+        functions = vm_profile.get("functions", {})
+        profile = ProfileData(
+            module_name=module_name,
+            total_samples=vm_profile.get("total_instructions", 0),
+            metadata={
+                "source": "vm",
+                "opcode_counts": dict(vm_profile.get("opcodes", {})),
+                "exclusive_instructions": {
+                    name: stats.get("exclusive_instructions", 0) for name, stats in functions.items()
+                },
+            },
+        )
+
+        pc_hits = vm_profile.get("pc_hits")
+        if pc_hits is not None:
+            profile.metadata["pc_hits"] = dict(pc_hits)
+
+        for name, stats in functions.items():
+            func_profile = FunctionProfile(
+                name=name,
+                call_count=stats.get("calls", 0),
+                total_cycles=stats.get("inclusive_instructions", 0),
+            )
+            func_profile.update_stats()
+            profile.functions[name] = func_profile
+
+        return profile
+
     def _dict_to_profile(self, data: dict[str, Any]) -> ProfileData:
         """Convert dictionary to profile data.
 
@@ -7,6 +7,7 @@ from machine_dialect.mir.reporting.report_formatter import (
     ReportFormatter,
     TextReportFormatter,
 )
+from machine_dialect.mir.reporting.tracing import Tracer, TraceSpan
 
 __all__ = [
     "HTMLReportFormatter",
@@ -14,4 +15,6 @@ __all__ = [
     "OptimizationReporter",
     "ReportFormatter",
     "TextReportFormatter",
+    "TraceSpan",
+    "Tracer",
 ]
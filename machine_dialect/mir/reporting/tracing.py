@@ -0,0 +1,140 @@
+"""Lightweight tracing of compilation phases and passes.
+
+This module provides a span-based tracer used to time the compilation
+pipeline. Spans can be aggregated into per-phase and per-pass timing
+statistics or exported in the Chrome trace-event format, which can be
+loaded into ``chrome://tracing`` or Perfetto.
+
+A disabled tracer hands out a shared no-op context manager, so leaving the
+instrumentation in place costs one attribute check per span.
+"""
+
+import json
+import time
+from collections.abc import Iterator
+from contextlib import AbstractContextManager, contextmanager, nullcontext
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any
+
+_NULL_SPAN: AbstractContextManager[None] = nullcontext()
+
+
+@dataclass
+class TraceSpan:
+    """A single timed span.
+
+    Attributes:
+        name: Span name (phase or pass name).
+        category: Span category (e.g. "phase", "pass", "analysis").
+        start_ns: Start time in nanoseconds, relative to the tracer origin.
+        duration_ns: Duration in nanoseconds.
+        args: Additional span arguments (e.g. the function name).
+    """
+
+    name: str
+    category: str
+    start_ns: int
+    duration_ns: int = 0
+    args: dict[str, Any] = field(default_factory=dict)
+
+
+class Tracer:
+    """Collects timed spans for a compilation session."""
+
+    def __init__(self, enabled: bool = False) -> None:
+        """Initialize the tracer.
+
+        Args:
+            enabled: Whether spans are recorded.
+        """
+        self.enabled = enabled
+        self.spans: list[TraceSpan] = []
+        self._origin_ns = time.perf_counter_ns()
+
+    def span(self, name: str, category: str = "phase", **args: Any) -> AbstractContextManager[None]:
+        """Time the enclosed block.
+
+        Args:
+            name: Span name.
+            category: Span category.
+            **args: Additional arguments recorded with the span.
+
+        Returns:
+            Context manager timing the block, or a no-op when disabled.
+        """
+        if not self.enabled:
+            return _NULL_SPAN
+        return self._record(name, category, args)
+
+    @contextmanager
+    def _record(self, name: str, category: str, args: dict[str, Any]) -> Iterator[None]:
+        """Record a span around the enclosed block.
+
+        Args:
+            name: Span name.
+            category: Span category.
+            args: Additional span arguments.
+
+        Yields:
+            None.
+        """
+        span = TraceSpan(name=name, category=category, start_ns=time.perf_counter_ns() - self._origin_ns, args=args)
+        self.spans.append(span)
+        try:
+            yield
+        finally:
+            span.duration_ns = time.perf_counter_ns() - self._origin_ns - span.start_ns
+
+    def clear(self) -> None:
+        """Discard all recorded spans."""
+        self.spans.clear()
+        self._origin_ns = time.perf_counter_ns()
+
+    def summary(self) -> dict[str, dict[str, dict[str, Any]]]:
+        """Aggregate spans by category and name.
+
+        Returns:
+            Mapping of category to span name to count, total and max time in
+            milliseconds.
+        """
+        result: dict[str, dict[str, dict[str, Any]]] = {}
+        for span in self.spans:
+            entry = result.setdefault(span.category, {}).setdefault(
+                span.name, {"count": 0, "total_ms": 0.0, "max_ms": 0.0}
+            )
+            duration_ms = span.duration_ns / 1_000_000
+            entry["count"] += 1
+            entry["total_ms"] += duration_ms
+            entry["max_ms"] = max(entry["max_ms"], duration_ms)
+        return result
+
+    def to_chrome_trace(self) -> dict[str, Any]:
+        """Convert the recorded spans to Chrome trace-event format.
+
+        Returns:
+            Trace dictionary with complete ("X") events in microseconds.
+        """
+        events = [
+            {
+                "name": span.name,
+                "cat": span.category,
+                "ph": "X",
+                "ts": span.start_ns / 1000,
+                "dur": span.duration_ns / 1000,
+                "pid": 1,
+                "tid": 1,
+                "args": span.args,
+            }
+            for span in self.spans
+        ]
+        return {"traceEvents": events, "displayTimeUnit": "ms"}
+
+    def write_chrome_trace(self, path: Path | str) -> None:
+        """Write the recorded spans as a Chrome trace JSON file.
+
+        Args:
+            path: Output file path.
+        """
+        with open(path, "w") as f:
+            json.dump(self.to_chrome_trace(), f, indent=2, default=str)
@@ -4,7 +4,7 @@ This module implements SSA construction with dominance frontier calculation
 and phi node insertion for the MIR representation.
 """
 
-from collections import OrderedDict, defaultdict
+from collections import defaultdict
 
 from machine_dialect.mir.basic_block import CFG, BasicBlock
 from machine_dialect.mir.mir_function import MIRFunction
@@ -22,85 +22,136 @@ class DominanceInfo:
             cfg: The control flow graph to analyze.
         """
         self.cfg = cfg
-        self.dominators: dict[BasicBlock, set[BasicBlock]] = {}
         self.immediate_dominators: dict[BasicBlock, BasicBlock | None] = {}
         self.dominance_frontier: dict[BasicBlock, set[BasicBlock]] = {}
         self.dominator_tree_children: dict[BasicBlock, set[BasicBlock]] = defaultdict(set)
+        # Preorder and postorder numbers of the reachable blocks in the dominator tree
+        self._preorder: dict[BasicBlock, int] = {}
+        self._postorder: dict[BasicBlock, int] = {}
+        self._dominators: dict[BasicBlock, set[BasicBlock]] | None = None
 
         self._compute_dominators()
-        self._compute_immediate_dominators()
+        self._number_dominator_tree()
         self._compute_dominance_frontier()
 
+    @property
+    def dominators(self) -> dict[BasicBlock, set[BasicBlock]]:
+        """Get the full set of dominators of each reachable block.
+
+        The sets take quadratic space in the worst case, so they are only
+        built when first asked for; ``dominates`` does not need them.
+
+        Returns:
+            Mapping from each reachable block to the blocks dominating it.
+        """
+        if self._dominators is None:
+            self._dominators = {}
+            # A dominator comes before the blocks it dominates in preorder
+            for block in sorted(self._preorder, key=self._preorder.__getitem__):
+                idom = self.immediate_dominators[block]
+                self._dominators[block] = {block} if idom is None else self._dominators[idom] | {block}
+        return self._dominators
+
     def _compute_dominators(self) -> None:
-        """Compute dominators for all blocks using iterative algorithm."""
+        """Compute immediate dominators with the Cooper-Harvey-Kennedy algorithm.
+
+        Blocks are visited in reverse postorder until the immediate
+        dominators stop changing. Blocks unreachable from the entry have
+        no dominators.
+        """
         entry = self.cfg.entry_block
         if not entry:
             return
 
-        # Initialize dominators
-        blocks = list(self.cfg.blocks.values())
-        self.dominators[entry] = {entry}
+        order = self._reverse_postorder(entry)
+        index = {block: position for position, block in enumerate(order)}
+        idoms: dict[BasicBlock, BasicBlock] = {entry: entry}
 
-        # All other blocks are initially dominated by all blocks
-        for block in blocks:
-            if block != entry:
-                self.dominators[block] = set(blocks)
+        def intersect(first: BasicBlock, second: BasicBlock) -> BasicBlock:
+            while first is not second:
+                while index[first] > index[second]:
+                    first = idoms[first]
+                while index[second] > index[first]:
+                    second = idoms[second]
+            return first
 
-        # Iterate until fixed point
         changed = True
         while changed:
             changed = False
-            for block in blocks:
-                if block == entry:
-                    continue
-
-                # Compute new dominators
-                new_doms = set(blocks)
+            for block in order[1:]:
+                new_idom: BasicBlock | None = None
                 for pred in block.predecessors:
-                    if pred in self.dominators:
-                        new_doms &= self.dominators[pred]
-                new_doms.add(block)
-
-                # Check if changed
-                if new_doms != self.dominators[block]:
-                    self.dominators[block] = new_doms
+                    if pred in idoms:
+                        new_idom = pred if new_idom is None else intersect(pred, new_idom)
+                if new_idom is not None and idoms.get(block) is not new_idom:
+                    idoms[block] = new_idom
                     changed = True
 
-    def _compute_immediate_dominators(self) -> None:
-        """Compute immediate dominators from dominator sets."""
-        for block in self.dominators:
-            # Immediate dominator is the unique dominator that doesn't
-            # dominate any other dominators
-            doms = self.dominators[block] - {block}
-            if not doms:
+        for block in order:
+            if block is entry:
                 self.immediate_dominators[block] = None
-                continue
+            else:
+                idom = idoms[block]
+                self.immediate_dominators[block] = idom
+                self.dominator_tree_children[idom].add(block)
 
-            # Find the immediate dominator
-            idom = None
-            for dom in doms:
-                # Check if dom dominates any other dominator
-                is_immediate = True
-                for other in doms:
-                    if other != dom and dom in self.dominators.get(other, set()):
-                        is_immediate = False
-                        break
-                if is_immediate:
-                    idom = dom
-                    break
+    def _number_dominator_tree(self) -> None:
+        """Number the dominator tree depth-first.
 
-            self.immediate_dominators[block] = idom
-            if idom:
-                self.dominator_tree_children[idom].add(block)
+        A block dominates another exactly when the other is in its subtree,
+        that is, when it is entered before and left after the other.
+        """
+        entry = self.cfg.entry_block
+        if entry is None or entry not in self.immediate_dominators:
+            return
+
+        counter = 0
+        stack = [(entry, iter(self.dominator_tree_children.get(entry, ())))]
+        self._preorder[entry] = counter
+        while stack:
+            block, children = stack[-1]
+            child = next(children, None)
+            counter += 1
+            if child is None:
+                stack.pop()
+                self._postorder[block] = counter
+            else:
+                self._preorder[child] = counter
+                stack.append((child, iter(self.dominator_tree_children.get(child, ()))))
+
+    def _reverse_postorder(self, entry: BasicBlock) -> list[BasicBlock]:
+        """Order the blocks reachable from the entry depth-first.
+
+        Args:
+            entry: The entry block.
+
+        Returns:
+            Reachable blocks in reverse postorder.
+        """
+        postorder: list[BasicBlock] = []
+        visited = {entry}
+        stack = [(entry, iter(entry.successors))]
+        while stack:
+            block, successors = stack[-1]
+            for succ in successors:
+                if succ not in visited:
+                    visited.add(succ)
+                    stack.append((succ, iter(succ.successors)))
+                    break
+            else:
+                stack.pop()
+                postorder.append(block)
+        postorder.reverse()
+        return postorder
 
     def _compute_dominance_frontier(self) -> None:
         """Compute dominance frontier for all blocks."""
         # Initialize empty frontiers
-        for block in self.dominators:
+        for block in self.immediate_dominators:
             self.dominance_frontier[block] = set()
 
         # For each block
-        for block in self.dominators:
+        for block in self.immediate_dominators:
             # Check each successor
             for succ in block.successors:
                 # Walk up dominator tree from block
@@ -119,7 +170,9 @@ class DominanceInfo:
         Returns:
             True if a dominates b.
         """
-        return a in self.dominators.get(b, set())
+        if a not in self._preorder or b not in self._preorder:
+            return False
+        return self._preorder[a] <= self._preorder[b] and self._postorder[b] <= self._postorder[a]
 
     def strictly_dominates(self, a: BasicBlock, b: BasicBlock) -> bool:
         """Check if block a strictly dominates block b.
@@ -135,7 +188,14 @@ class DominanceInfo:
 
 
 class SSAConstructor:
-    """Constructs SSA form for MIR functions."""
+    """Constructs SSA form for MIR functions.
+
+    Phi nodes are pruned: a variable only gets a phi node in a block where
+    it is live on entry. Liveness is only computed for variables read in
+    some block before being assigned there, since no other variable can be
+    live across blocks. Renaming walks the dominator tree with an explicit
+    stack, so deeply nested code does not hit the recursion limit.
+    """
 
     def __init__(self, function: MIRFunction) -> None:
         """Initialize SSA constructor.
@@ -147,9 +207,13 @@ class SSAConstructor:
         self.dominance = DominanceInfo(function.cfg)
         self.variable_definitions: dict[Variable, set[BasicBlock]] = defaultdict(set)
         self.variable_uses: dict[Variable, set[BasicBlock]] = defaultdict(set)
+        # Blocks that read a variable before assigning it
+        self.upward_exposed_uses: dict[Variable, set[BasicBlock]] = defaultdict(set)
         self.phi_nodes: dict[tuple[BasicBlock, Variable], Phi] = {}
         self.variable_stacks: dict[Variable, list[Variable]] = defaultdict(list)
         self.version_counters: dict[str, int] = defaultdict(int)
+        # Inserted phi nodes of each block, with the variable they merge
+        self._block_phis: dict[BasicBlock, list[tuple[Phi, Variable]]] = defaultdict(list)
 
     def construct_ssa(self) -> None:
         """Convert the function to SSA form."""
@@ -160,101 +224,131 @@ class SSAConstructor:
     def _collect_variable_info(self) -> None:
         """Collect information about variable definitions and uses."""
         for block in self.function.cfg.blocks.values():
+            defined: set[Variable] = set()
             for inst in block.instructions:
-                # Check for variable definitions
-                for def_val in inst.get_defs():
-                    if isinstance(def_val, Variable):
-                        self.variable_definitions[def_val].add(block)
-
                 # Check for variable uses
                 for use_val in inst.get_uses():
                     if isinstance(use_val, Variable):
                         self.variable_uses[use_val].add(block)
+                        if use_val not in defined:
+                            self.upward_exposed_uses[use_val].add(block)
+
+                # Check for variable definitions
+                for def_val in inst.get_defs():
+                    if isinstance(def_val, Variable):
+                        self.variable_definitions[def_val].add(block)
+                        defined.add(def_val)
 
     def _insert_phi_nodes(self) -> None:
-        """Insert phi nodes at dominance frontiers."""
-        # For each variable
-        for var in self.variable_definitions:
-            # Get blocks where variable is defined
-            def_blocks = self.variable_definitions[var]
+        """Insert phi nodes at the dominance frontiers where variables are live."""
+        for var, def_blocks in self.variable_definitions.items():
+            # A variable only read after being assigned in the same block
+            # never needs a phi node
+            if var not in self.upward_exposed_uses:
+                continue
+            live_in = self._live_in_blocks(var)
 
-            # Compute iterated dominance frontier
+            # Compute the iterated dominance frontier, stopping where the variable is dead
             worklist = list(def_blocks)
-            phi_blocks = set()
-            processed = set()
-
+            phi_blocks: set[BasicBlock] = set()
             while worklist:
                 block = worklist.pop()
-                if block in processed:
-                    continue
-                processed.add(block)
+                for df_block in self.dominance.dominance_frontier.get(block, ()):
+                    if df_block in phi_blocks or df_block not in live_in:
+                        continue
+                    phi_blocks.add(df_block)
+
+                    # TODO: Review if (0, 0) is the best approach for generated phi nodes' source location
+                    phi = Phi(self._new_version(var), [], (0, 0))
+                    df_block.phi_nodes.append(phi)
+                    self.phi_nodes[(df_block, var)] = phi
+                    self._block_phis[df_block].append((phi, var))
+
+                    # Phi node is also a definition
+                    if df_block not in def_blocks:
+                        worklist.append(df_block)
 
-                # Add phi nodes at dominance frontier
-                for df_block in self.dominance.dominance_frontier.get(block, set()):
-                    if df_block not in phi_blocks:
-                        phi_blocks.add(df_block)
+    def _live_in_blocks(self, var: Variable) -> set[BasicBlock]:
+        """Find the blocks a variable is live on entry to.
 
-                        # Create phi node
-                        phi_var = self._new_version(var)
-                        # TODO: Review if (0, 0) is the best approach for generated phi nodes' source location
-                        phi = Phi(phi_var, [], (0, 0))  # Default source location for generated phi nodes
+        The variable is live on entry to every block that reads it before
+        assigning it, and to every predecessor of a live block that does not
+        assign it.
 
-                        # Insert phi in phi_nodes list
-                        df_block.phi_nodes.append(phi)
-                        self.phi_nodes[(df_block, var)] = phi
+        Args:
+            var: The variable.
 
-                        # Phi node is also a definition
-                        if df_block not in def_blocks:
-                            worklist.append(df_block)
+        Returns:
+            Blocks where the variable is live on entry.
+        """
+        def_blocks = self.variable_definitions[var]
+        live_in: set[BasicBlock] = set()
+        worklist = list(self.upward_exposed_uses[var])
+        while worklist:
+            block = worklist.pop()
+            if block in live_in:
+                continue
+            live_in.add(block)
+            worklist.extend(pred for pred in block.predecessors if pred not in def_blocks and pred not in live_in)
+        return live_in
 
     def _rename_variables(self) -> None:
-        """Rename variables to SSA form."""
+        """Rename variables to SSA form.
+
+        Blocks are renamed in dominator tree preorder. After a block's
+        subtree is done, the versions it pushed are popped again. Blocks
+        unreachable from the entry have no dominators and are renamed as
+        roots of their own.
+        """
         entry = self.function.cfg.entry_block
-        if entry:
-            self._rename_block(entry, set())
+        if not entry:
+            return
+
+        blocks = list(self.function.cfg.blocks.values())
+        order = {block: index for index, block in enumerate(blocks)}
+        roots = [entry] + [block for block in blocks if block not in self.dominance.immediate_dominators]
+        visited: set[BasicBlock] = set()
+        # Blocks to rename, or the variables a renamed block pushed
+        worklist: list[BasicBlock | list[Variable]] = list(reversed(roots))
+        while worklist:
+            item = worklist.pop()
+            if isinstance(item, list):
+                for var in item:
+                    self.variable_stacks[var].pop()
+                continue
+            if item in visited:
+                continue
+            visited.add(item)
+
+            worklist.append(self._rename_block(item))
+            children = self.dominance.dominator_tree_children.get(item, ())
+            worklist.extend(sorted(children, key=lambda block: order.get(block, len(order)), reverse=True))
 
-    def _rename_block(self, block: BasicBlock, visited: set[BasicBlock]) -> None:
-        """Rename variables in a block and its dominated blocks.
+    def _rename_block(self, block: BasicBlock) -> list[Variable]:
+        """Rename variables in a block and fill in its successors' phi nodes.
 
         Args:
             block: The block to process.
-            visited: Set of already visited blocks.
-        """
-        if block in visited:
-            return
-        visited.add(block)
 
-        # Save stack state
-        stack_state: dict[Variable, int] = {}
-        for var in self.variable_stacks:
-            stack_state[var] = len(self.variable_stacks[var])
+        Returns:
+            The variables a new version was pushed for.
+        """
+        pushed: list[Variable] = []
 
         # Process phi nodes first
-        for phi in block.phi_nodes:
-            # Find original variable for this phi
-            for (phi_block, var), stored_phi in self.phi_nodes.items():
-                if phi_block == block and stored_phi == phi:
-                    # Push new version (phi.dest is MIRValue but should be Variable)
-                    if isinstance(phi.dest, Variable):
-                        self.variable_stacks[var].append(phi.dest)
-                    break
+        for phi, var in self._block_phis.get(block, ()):
+            if isinstance(phi.dest, Variable):
+                self.variable_stacks[var].append(phi.dest)
+                pushed.append(var)
 
-        # Rebuild instruction list, preserving LoadConst and other non-Variable instructions
         new_instructions: list[MIRInstruction] = []
-        temp_definitions = OrderedDict()  # Track LoadConst for ordering
-
-        # Rename uses and definitions
         for inst in block.instructions:
             if isinstance(inst, Phi):
                 continue  # Already handled in phi_nodes list
 
-            # Special handling for LoadConst - preserve as-is
+            # LoadConst defines a Temp, not a Variable, so there is nothing to rename
             if isinstance(inst, LoadConst):
-                # LoadConst defines a Temp, not a Variable, so don't rename
-                # Just preserve the instruction
                 new_instructions.append(inst)
-                if hasattr(inst.dest, "name"):
-                    temp_definitions[inst.dest] = inst
                 continue
 
             # Rename uses for Variable-based instructions
@@ -284,35 +378,19 @@ class SSAConstructor:
                         inst.dest = new_var
                     # Push new version
                     self.variable_stacks[def_val].append(new_var)
+                    pushed.append(def_val)
 
             new_instructions.append(inst)
 
-        # Replace the instruction list with the rebuilt one
         block.instructions = new_instructions
 
-        # Update phi nodes in successors
+        # Add incoming values to phi nodes in successors
         for succ in block.successors:
-            # Phi nodes are now in the phi_nodes list, not instructions
-            for phi in succ.phi_nodes:
-                # Find original variable for this phi
-                for (phi_block, var), stored_phi in self.phi_nodes.items():
-                    if phi_block == succ and stored_phi == phi:
-                        # Add incoming value from this block
-                        if self.variable_stacks[var]:
-                            phi.add_incoming(
-                                self.variable_stacks[var][-1],
-                                block.label,
-                            )
-                        break
-
-        # Process dominated blocks
-        for child in self.dominance.dominator_tree_children.get(block, set()):
-            self._rename_block(child, visited)
-
-        # Restore stack state
-        for var, old_size in stack_state.items():
-            while len(self.variable_stacks[var]) > old_size:
-                self.variable_stacks[var].pop()
+            for phi, var in self._block_phis.get(succ, ()):
+                if self.variable_stacks[var]:
+                    phi.add_incoming(self.variable_stacks[var][-1], block.label)
+
+        return pushed
 
     def _new_version(self, var: Variable) -> Variable:
         """Create a new SSA version of a variable.
@@ -0,0 +1,359 @@
+"""SSA destruction for MIR.
+
+This module translates functions out of SSA form before bytecode
+generation. Phi nodes become copies on their incoming edges:
+
+1. Critical edges into blocks with phi nodes are split, so each edge has a
+   block of its own to hold its copies.
+2. Phi destinations and incoming values whose live ranges do not interfere
+   are coalesced into a single name, which removes their copies entirely.
+3. The copies that remain on an edge happen in parallel; they are ordered so
+   no copy overwrites a value another copy still reads, with a temporary
+   breaking each cycle.
+"""
+
+from machine_dialect.mir.analyses.liveness import LivenessInfo
+from machine_dialect.mir.analyses.purity_analysis import is_global_variable
+from machine_dialect.mir.basic_block import BasicBlock
+from machine_dialect.mir.mir_function import MIRFunction
+from machine_dialect.mir.mir_instructions import ConditionalJump, Copy, Jump, LoadConst, MIRInstruction, Phi, StoreVar
+from machine_dialect.mir.mir_values import Constant, MIRValue, ScopedVariable, Temp, Variable
+
+
+def _same_name(first: MIRValue, second: MIRValue) -> bool:
+    """Check if two values are stored in the same place.
+
+    The bytecode generator gives values that compare and hash equal the
+    same register, while parameters and plain variables of the same name
+    are kept apart.
+
+    Args:
+        first: A value.
+        second: Another value.
+
+    Returns:
+        True if the values share a register.
+    """
+    return first is second or (first == second and hash(first) == hash(second))
+
+
+class SSADestructor:
+    """Translates a function out of SSA form.
+
+    Attributes:
+        edges_split: Number of critical edges split.
+        copies_inserted: Number of copies inserted for phi nodes.
+        copies_coalesced: Number of phi copies removed by coalescing.
+    """
+
+    def __init__(self, function: MIRFunction) -> None:
+        """Initialize SSA destructor.
+
+        Args:
+            function: The function to translate.
+        """
+        self.function = function
+        self.edges_split = 0
+        self.copies_inserted = 0
+        self.copies_coalesced = 0
+        self._param_names = {param.name for param in function.params}
+        # Union-find over coalesced values
+        self._parent: dict[MIRValue, MIRValue] = {}
+        self._classes: dict[MIRValue, set[MIRValue]] = {}
+        self._interference: dict[MIRValue, set[MIRValue]] = {}
+
+    def destruct_ssa(self) -> None:
+        """Replace every phi node of the function with copies."""
+        blocks = list(self.function.cfg.blocks.values())
+        for block in blocks:
+            # Phi nodes added directly to the instruction list belong in the header
+            phis = [inst for inst in block.instructions if isinstance(inst, Phi)]
+            if phis:
+                block.phi_nodes.extend(phis)
+                block.instructions = [inst for inst in block.instructions if not isinstance(inst, Phi)]
+
+        phi_blocks = [block for block in blocks if block.phi_nodes]
+        if not phi_blocks:
+            return
+
+        for block in phi_blocks:
+            self._split_critical_edges(block)
+
+        self._coalesce(phi_blocks)
+
+        for block in phi_blocks:
+            self._insert_copies(block)
+            block.phi_nodes = []
+
+        self._rename()
+
+    def _split_critical_edges(self, block: BasicBlock) -> None:
+        """Give each edge into a block with phi nodes a place for its copies.
+
+        Copies go at the end of the predecessor, which only works if the
+        predecessor has no other successor.
+
+        Args:
+            block: Block with phi nodes.
+        """
+        for pred in list(block.predecessors):
+            if not isinstance(pred.get_terminator(), ConditionalJump):
+                continue
+
+            label = f"{pred.label}_to_{block.label}"
+            while label in self.function.cfg.blocks:
+                label = self.function.cfg.generate_label(f"{pred.label}_to_{block.label}_")
+            edge = BasicBlock(label)
+            edge.instructions = [Jump(block.label, (0, 0))]
+            self.function.cfg.add_block(edge)
+
+            terminator = pred.instructions[-1]
+            assert isinstance(terminator, ConditionalJump)
+            if terminator.true_label == block.label:
+                terminator.true_label = label
+            if terminator.false_label == block.label:
+                terminator.false_label = label
+
+            pred.successors[pred.successors.index(block)] = edge
+            block.predecessors[block.predecessors.index(pred)] = edge
+            edge.predecessors.append(pred)
+            edge.successors.append(block)
+
+            for phi in block.phi_nodes:
+                phi.incoming = [(value, label if source == pred.label else source) for value, source in phi.incoming]
+            self.edges_split += 1
+
+    def _is_pinned(self, value: MIRValue) -> bool:
+        """Check if a value must keep its name.
+
+        Parameters arrive in their own registers and globals live outside
+        the function, so other values can be renamed to them but not the
+        other way around.
+
+        Args:
+            value: The value.
+
+        Returns:
+            True if the value cannot be renamed.
+        """
+        if isinstance(value, ScopedVariable) or is_global_variable(value, self.function):
+            return True
+        return isinstance(value, Variable) and value.version == 0 and value.name in self._param_names
+
+    def _find(self, value: MIRValue) -> MIRValue:
+        """Find the representative of a coalesced value.
+
+        Args:
+            value: The value.
+
+        Returns:
+            The name the value is renamed to.
+        """
+        root = value
+        while root in self._parent:
+            root = self._parent[root]
+        while value in self._parent:
+            parent = self._parent[value]
+            self._parent[value] = root
+            value = parent
+        return root
+
+    def _coalesce(self, phi_blocks: list[BasicBlock]) -> None:
+        """Merge phi destinations with incoming values they do not interfere with.
+
+        Args:
+            phi_blocks: Blocks with phi nodes.
+        """
+        candidates: set[MIRValue] = set()
+        for block in phi_blocks:
+            for phi in block.phi_nodes:
+                candidates.add(phi.dest)
+                candidates.update(value for value, _ in phi.incoming if isinstance(value, Temp | Variable))
+        candidates = {value for value in candidates if not is_global_variable(value, self.function)}
+        self._build_interference(candidates)
+
+        for block in phi_blocks:
+            for phi in block.phi_nodes:
+                if phi.dest not in candidates:
+                    continue
+                for value, _ in phi.incoming:
+                    if value in candidates:
+                        self._try_union(phi.dest, value)
+
+    def _build_interference(self, candidates: set[MIRValue]) -> None:
+        """Record which candidates are live at each other's definitions.
+
+        Args:
+            candidates: Values that may be coalesced.
+        """
+        self._interference = {value: set() for value in candidates}
+
+        def interfere(value: MIRValue, live: set[MIRValue], ignore: MIRValue | None = None) -> None:
+            for other in live:
+                if _same_name(other, value) or (ignore is not None and _same_name(other, ignore)):
+                    continue
+                if value in candidates:
+                    self._interference[value].add(other)
+                if other in candidates:
+                    self._interference[other].add(value)
+
+        liveness = LivenessInfo(self.function)
+        entry = self.function.cfg.entry_block
+        # The VM reads a memoized function's parameter registers again on
+        # return to build the cache key, so they stay live throughout
+        held: set[MIRValue] = set(self.function.params) if self.function.memoize else set()
+        for block in self.function.cfg.blocks.values():
+            live = set(liveness.live_out[block]) | held
+            for inst in reversed(block.instructions):
+                uses = [value for value in inst.get_uses() if isinstance(value, Temp | Variable)]
+                # A copy's destination holds the same value as its source
+                source = uses[0] if isinstance(inst, Copy | StoreVar) and uses else None
+                for value in inst.get_defs():
+                    interfere(value, live, source)
+                    live.discard(value)
+                live.update(uses)
+
+            # Phi destinations, and parameters in the entry block, are all
+            # defined together on entry to the block
+            entry_defs: list[MIRValue] = [phi.dest for phi in block.phi_nodes]
+            if block is entry:
+                entry_defs.extend(self.function.params)
+            live_on_entry = set(liveness.live_in[block]) | set(entry_defs) | held
+            for value in entry_defs:
+                interfere(value, live_on_entry)
+
+    def _try_union(self, first: MIRValue, second: MIRValue) -> None:
+        """Coalesce the classes of two values if no members interfere.
+
+        Args:
+            first: A value.
+            second: Another value.
+        """
+        first_root = self._find(first)
+        second_root = self._find(second)
+        if _same_name(first_root, second_root):
+            return
+
+        first_members = self._members(first_root)
+        second_members = self._members(second_root)
+        if any(self._interference[member] & second_members for member in first_members):
+            return
+        first_pinned = [member for member in first_members if self._is_pinned(member)]
+        second_pinned = [member for member in second_members if self._is_pinned(member)]
+        if first_pinned and second_pinned:
+            return
+
+        # Variables can stand in for temporaries, but not the other way around
+        if second_pinned or (
+            not first_pinned and isinstance(second_root, Variable) and not isinstance(first_root, Variable)
+        ):
+            first_root, second_root = second_root, first_root
+        self._parent[second_root] = first_root
+        self._classes[first_root] = first_members | second_members
+        self._classes.pop(second_root, None)
+
+    def _members(self, root: MIRValue) -> set[MIRValue]:
+        """Get the values coalesced with a representative.
+
+        Args:
+            root: The representative.
+
+        Returns:
+            Members of its class.
+        """
+        return self._classes.setdefault(root, {root})
+
+    def _insert_copies(self, block: BasicBlock) -> None:
+        """Insert the copies of a block's phi nodes at the end of its predecessors.
+
+        Args:
+            block: Block with phi nodes.
+        """
+        for pred in block.predecessors:
+            copies: list[tuple[MIRValue, MIRValue]] = []
+            for phi in block.phi_nodes:
+                for value, label in phi.incoming:
+                    if label != pred.label:
+                        continue
+                    dest = self._find(phi.dest)
+                    source = self._find(value) if isinstance(value, Temp | Variable) else value
+                    if _same_name(dest, source):
+                        self.copies_coalesced += 1
+                    else:
+                        copies.append((dest, source))
+                    break
+
+            sequence = self._sequentialize(copies, block.phi_nodes[0].source_location)
+            self.copies_inserted += len(sequence)
+            position = len(pred.instructions) - 1 if pred.is_terminated() else len(pred.instructions)
+            pred.instructions[position:position] = sequence
+
+    def _sequentialize(
+        self, copies: list[tuple[MIRValue, MIRValue]], location: tuple[int, int]
+    ) -> list[MIRInstruction]:
+        """Order parallel copies so none overwrites a value another still reads.
+
+        Args:
+            copies: Parallel (destination, source) pairs with distinct destinations.
+            location: Source location for the copies.
+
+        Returns:
+            Copies to run in order; constants are loaded rather than copied.
+        """
+        pending = list(copies)
+        sequence: list[MIRInstruction] = []
+        while pending:
+            read = [source for _, source in pending if not isinstance(source, Constant)]
+            ready = [copy for copy in pending if not any(_same_name(copy[0], source) for source in read)]
+            if ready:
+                for dest, source in ready:
+                    if isinstance(source, Constant):
+                        sequence.append(LoadConst(dest, source, location))
+                    else:
+                        sequence.append(Copy(dest, source, location))
+                pending = [copy for copy in pending if not any(copy is done for done in ready)]
+                continue
+
+            # Every destination is still read: the copies form cycles
+            dest = pending[0][0]
+            saved = Temp(dest.type)
+            sequence.append(Copy(saved, dest, location))
+            pending = [(target, saved if _same_name(source, dest) else source) for target, source in pending]
+        return sequence
+
+    def _rename(self) -> None:
+        """Rename coalesced values to their representatives."""
+        renames = {value: self._find(value) for value in self._parent}
+        if not renames:
+            return
+
+        for block in self.function.cfg.blocks.values():
+            instructions: list[MIRInstruction] = []
+            for inst in block.instructions:
+                for value in inst.get_uses():
+                    if value in renames:
+                        inst.replace_use(value, renames[value])
+                if isinstance(inst, StoreVar) and inst.var in renames:
+                    new_var = renames[inst.var]
+                    assert isinstance(new_var, Variable)
+                    inst.var = new_var
+                elif hasattr(inst, "dest") and inst.dest in renames:
+                    inst.dest = renames[inst.dest]
+
+                # Copies between coalesced values disappear
+                if isinstance(inst, Copy) and _same_name(inst.dest, inst.source):
+                    continue
+                if isinstance(inst, StoreVar) and _same_name(inst.var, inst.source):
+                    continue
+                instructions.append(inst)
+            block.instructions = instructions
+
+
+def destruct_ssa(function: MIRFunction) -> None:
+    """Translate a MIR function out of SSA form.
+
+    Args:
+        function: The function to translate.
+    """
+    destructor = SSADestructor(function)
+    destructor.destruct_ssa()
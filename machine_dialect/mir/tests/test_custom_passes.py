@@ -42,7 +42,7 @@ def test_custom_passes_override_default() -> None:
     assert "dce" in stats
 
     # These passes would normally run at level 2 but shouldn't with custom passes
-    assert "cse" not in stats  # Common subexpression elimination
+    assert "gvn" not in stats  # Global value numbering
     assert "strength-reduction" not in stats
 
 
@@ -56,8 +56,8 @@ def test_no_custom_passes_uses_default() -> None:
     # At level 2, we should see standard optimizations
     assert "constant-propagation" in stats or "constant-folding" in stats
     assert "dce" in stats
-    # CSE is enabled at level 2
-    assert "cse" in stats
+    # GVN is enabled at level 2
+    assert "gvn" in stats
 
 
 def test_custom_passes_empty_list() -> None:
@@ -162,5 +162,5 @@ def test_custom_passes_with_config() -> None:
 
     # Custom passes should override the config's default pipeline
     assert "constant-propagation" in stats
-    # CSE would normally be in level 2 but shouldn't run with custom passes
-    assert "cse" not in stats
+    # GVN would normally be in level 2 but shouldn't run with custom passes
+    assert "gvn" not in stats
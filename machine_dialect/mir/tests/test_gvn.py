@@ -0,0 +1,222 @@
+"""Tests for global value numbering."""
+
+from machine_dialect.mir.basic_block import BasicBlock
+from machine_dialect.mir.mir_function import MIRFunction
+from machine_dialect.mir.mir_instructions import (
+    ArrayAppend,
+    BinaryOp,
+    ConditionalJump,
+    Copy,
+    Jump,
+    LoadConst,
+    Return,
+    StoreVar,
+    UnaryOp,
+)
+from machine_dialect.mir.mir_module import MIRModule
+from machine_dialect.mir.mir_types import MIRType
+from machine_dialect.mir.mir_values import Constant, ScopedVariable, Temp, Variable, VariableScope
+from machine_dialect.mir.optimizations import register_all_passes
+from machine_dialect.mir.optimizations.gvn import GlobalValueNumbering
+from machine_dialect.mir.pass_manager import PassManager
+
+A = ScopedVariable("a", VariableScope.PARAMETER, MIRType.INT)
+B = ScopedVariable("b", VariableScope.PARAMETER, MIRType.INT)
+
+
+def create_function(*labels: str) -> tuple[MIRFunction, list[BasicBlock]]:
+    """Create a function of parameters `a` and `b` with empty blocks.
+
+    Args:
+        labels: Block labels; the first block is the entry.
+
+    Returns:
+        The function and its blocks.
+    """
+    function = MIRFunction("f", [A, B], MIRType.INT)
+    blocks = [function.cfg.get_or_create_block(label) for label in labels]
+    function.cfg.set_entry_block(blocks[0])
+    return function, blocks
+
+
+def create_diamond() -> tuple[MIRFunction, list[BasicBlock]]:
+    """Create a function whose entry branches to `left` and `right`, which join in `merge`.
+
+    Returns:
+        The function and its blocks: entry, left, right, merge.
+    """
+    function, blocks = create_function("entry", "left", "right", "merge")
+    entry, left, right, merge = blocks
+    function.cfg.connect(entry, left)
+    function.cfg.connect(entry, right)
+    function.cfg.connect(left, merge)
+    function.cfg.connect(right, merge)
+    return function, blocks
+
+
+def test_redundancy_in_dominated_block() -> None:
+    """Test that an expression is reused in every block its definition dominates."""
+    function, (entry, left, right, merge) = create_diamond()
+    t0, t1, t2, t3 = (Temp(MIRType.INT) for _ in range(4))
+    entry.instructions = [
+        BinaryOp(t0, "-", A, B, (1, 1)),
+        ConditionalJump(Constant(True, MIRType.BOOL), "left", (1, 1), "right"),
+    ]
+    left.instructions = [BinaryOp(t1, "-", A, B, (1, 1)), Jump("merge", (1, 1))]
+    right.instructions = [Jump("merge", (1, 1))]
+    merge.instructions = [BinaryOp(t2, "-", A, B, (1, 1)), BinaryOp(t3, "*", t2, t2, (1, 1)), Return((1, 1), t3)]
+    gvn = GlobalValueNumbering()
+
+    assert gvn.run_on_function(function)
+
+    assert str(left.instructions[0]) == str(Copy(t1, t0, (1, 1)))
+    assert str(merge.instructions[0]) == str(Copy(t2, t0, (1, 1)))
+    # Later uses read the first value directly
+    assert str(merge.instructions[1]) == str(BinaryOp(t3, "*", t0, t0, (1, 1)))
+    assert gvn.stats["expressions_eliminated"] == 2
+
+
+def test_siblings_do_not_share_values() -> None:
+    """Test that an expression in one branch is not reused in the other."""
+    function, (entry, left, right, merge) = create_diamond()
+    t0, t1 = Temp(MIRType.INT), Temp(MIRType.INT)
+    entry.instructions = [ConditionalJump(Constant(True, MIRType.BOOL), "left", (1, 1), "right")]
+    left.instructions = [BinaryOp(t0, "+", A, B, (1, 1)), Jump("merge", (1, 1))]
+    right.instructions = [BinaryOp(t1, "+", A, B, (1, 1)), Jump("merge", (1, 1))]
+    merge.instructions = [Return((1, 1), Constant(0, MIRType.INT))]
+
+    assert not GlobalValueNumbering().run_on_function(function)
+
+    assert isinstance(right.instructions[0], BinaryOp)
+
+
+def test_commutative_operands() -> None:
+    """Test that numeric addition and equality match with swapped operands."""
+    function, (entry,) = create_function("entry")
+    t0, t1 = Temp(MIRType.INT), Temp(MIRType.INT)
+    t2, t3 = Temp(MIRType.BOOL), Temp(MIRType.BOOL)
+    entry.instructions = [
+        BinaryOp(t0, "+", A, B, (1, 1)),
+        BinaryOp(t1, "+", B, A, (1, 1)),
+        BinaryOp(t2, "==", A, t0, (1, 1)),
+        BinaryOp(t3, "==", t1, A, (1, 1)),
+        Return((1, 1), t3),
+    ]
+
+    assert GlobalValueNumbering().run_on_function(function)
+
+    assert [type(inst) for inst in entry.instructions[:4]] == [BinaryOp, Copy, BinaryOp, Copy]
+
+
+def test_string_concatenation_is_not_commutative() -> None:
+    """Test that swapped operands of a string `+` are different values."""
+    function, (entry,) = create_function("entry")
+    s = Variable("s", MIRType.STRING)
+    t = Variable("t", MIRType.STRING)
+    function.add_local(s)
+    function.add_local(t)
+    t0, t1 = Temp(MIRType.STRING), Temp(MIRType.STRING)
+    entry.instructions = [
+        StoreVar(s, Constant("x", MIRType.STRING), (1, 1)),
+        StoreVar(t, Constant("y", MIRType.STRING), (1, 1)),
+        BinaryOp(t0, "+", s, t, (1, 1)),
+        BinaryOp(t1, "+", t, s, (1, 1)),
+        Return((1, 1), t1),
+    ]
+
+    assert not GlobalValueNumbering().run_on_function(function)
+
+
+def test_copy_chains_are_folded() -> None:
+    """Test that uses of a chain of copies read the original value."""
+    function, (entry,) = create_function("entry")
+    t0, t1, t2, t3 = (Temp(MIRType.INT) for _ in range(4))
+    entry.instructions = [
+        UnaryOp(t0, "-", A, (1, 1)),
+        Copy(t1, t0, (1, 1)),
+        Copy(t2, t1, (1, 1)),
+        UnaryOp(t3, "-", t2, (1, 1)),
+        Return((1, 1), t3),
+    ]
+    gvn = GlobalValueNumbering()
+
+    assert gvn.run_on_function(function)
+
+    assert str(entry.instructions[2]) == str(Copy(t2, t0, (1, 1)))
+    assert str(entry.instructions[3]) == str(UnaryOp(t3, "-", t0, (1, 1)))
+    assert gvn.stats["uses_rewritten"] == 2
+
+
+def test_reassigned_variables_are_opaque() -> None:
+    """Test that expressions over a variable assigned twice are not reused."""
+    function, (entry,) = create_function("entry")
+    x = Variable("x", MIRType.INT)
+    function.add_local(x)
+    t0, t1 = Temp(MIRType.INT), Temp(MIRType.INT)
+    entry.instructions = [
+        StoreVar(x, A, (1, 1)),
+        BinaryOp(t0, "*", x, Constant(2, MIRType.INT), (1, 1)),
+        StoreVar(x, B, (1, 1)),
+        BinaryOp(t1, "*", x, Constant(2, MIRType.INT), (1, 1)),
+        Return((1, 1), t1),
+    ]
+
+    assert not GlobalValueNumbering().run_on_function(function)
+
+
+def test_global_variables_are_opaque() -> None:
+    """Test that expressions over module-level variables are not reused."""
+    function, (entry,) = create_function("entry")
+    counter = Variable("counter", MIRType.INT)
+    t0, t1 = Temp(MIRType.INT), Temp(MIRType.INT)
+    entry.instructions = [
+        BinaryOp(t0, "+", counter, Constant(1, MIRType.INT), (1, 1)),
+        BinaryOp(t1, "+", counter, Constant(1, MIRType.INT), (1, 1)),
+        Return((1, 1), t1),
+    ]
+
+    assert not GlobalValueNumbering().run_on_function(function)
+
+
+def test_mutated_collections_are_opaque() -> None:
+    """Test that expressions over arrays are not reused when arrays are modified in place."""
+    items = ScopedVariable("items", VariableScope.PARAMETER, MIRType.ARRAY)
+    function = MIRFunction("f", [A, items], MIRType.BOOL)
+    entry = function.cfg.get_or_create_block("entry")
+    function.cfg.set_entry_block(entry)
+    t0, t1 = Temp(MIRType.BOOL), Temp(MIRType.BOOL)
+    c0, c1 = Temp(MIRType.INT), Temp(MIRType.INT)
+    entry.instructions = [
+        BinaryOp(t0, "==", items, A, (1, 1)),
+        ArrayAppend(items, Constant(1, MIRType.INT), (1, 1)),
+        BinaryOp(t1, "==", items, A, (1, 1)),
+        LoadConst(c0, Constant(3, MIRType.INT), (1, 1)),
+        LoadConst(c1, Constant(3, MIRType.INT), (1, 1)),
+        Return((1, 1), t1),
+    ]
+    gvn = GlobalValueNumbering()
+
+    assert gvn.run_on_function(function)
+
+    assert isinstance(entry.instructions[2], BinaryOp)
+    assert isinstance(entry.instructions[4], Copy)
+    assert gvn.stats["expressions_eliminated"] == 1
+
+
+def test_pass_manager_run() -> None:
+    """Test that the pass is registered and reports statistics."""
+    function, (entry,) = create_function("entry")
+    t0, t1 = Temp(MIRType.INT), Temp(MIRType.INT)
+    entry.instructions = [
+        BinaryOp(t0, "*", A, B, (1, 1)),
+        BinaryOp(t1, "*", B, A, (1, 1)),
+        Return((1, 1), t1),
+    ]
+    module = MIRModule("gvn")
+    module.add_function(function)
+    pass_manager = PassManager()
+    register_all_passes(pass_manager)
+
+    assert pass_manager.run_passes(module, ["gvn"], 2)
+
+    assert pass_manager.get_statistics()["gvn"]["expressions_eliminated"] == 1
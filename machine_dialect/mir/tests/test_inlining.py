@@ -433,3 +433,121 @@ class TestFunctionInlining:
         stats = inliner.get_statistics()
         assert stats["inlined"] == 0
         assert stats["call_sites_processed"] == 0
+
+    def test_callees_inlined_bottom_up(self) -> None:
+        """Test that callees are fully inlined before their callers."""
+        module = MIRModule("chain_module")
+        x_var = Variable("x", MIRType.INT)
+
+        # main -> middle -> leaf, with main visited first in definition order
+        for name, callee, temp_id in [("main", "middle", 80), ("middle", "leaf", 81), ("leaf", None, 82)]:
+            func = MIRFunction(name, [Variable("x", MIRType.INT)])
+            entry = func.cfg.get_or_create_block("entry")
+            result = Temp(MIRType.INT, temp_id)
+            if callee is None:
+                entry.instructions = [BinaryOp(result, "+", x_var, Constant(1), (1, 1))]
+            else:
+                entry.instructions = [Call(result, callee, [x_var], (1, 1))]
+            entry.instructions.append(Return((1, 1), result))
+            module.functions[name] = func
+
+        inliner = FunctionInlining()
+        assert inliner.run_on_module(module)
+
+        # leaf is inlined into middle once, and the result into main: leaf is never inlined twice
+        assert inliner.get_statistics()["inlined"] == 2
+        for func in module.functions.values():
+            for block in func.cfg.blocks.values():
+                assert not any(isinstance(inst, Call) for inst in block.instructions)
+
+    def test_mutual_recursion_not_inlined(self) -> None:
+        """Test that calls within a recursive SCC are kept."""
+        module = MIRModule("mutual_module")
+        n_var = Variable("n", MIRType.INT)
+
+        for name, callee, temp_id in [("is_even", "is_odd", 90), ("is_odd", "is_even", 91)]:
+            func = MIRFunction(name, [Variable("n", MIRType.INT)])
+            entry = func.cfg.get_or_create_block("entry")
+            result = Temp(MIRType.INT, temp_id)
+            entry.instructions = [Call(result, callee, [n_var], (1, 1)), Return((1, 1), result)]
+            module.functions[name] = func
+
+        main_func = MIRFunction("main", [])
+        main_entry = main_func.cfg.get_or_create_block("entry")
+        main_result = Temp(MIRType.INT, 92)
+        main_entry.instructions = [Call(main_result, "is_even", [Constant(4)], (1, 1)), Return((1, 1), main_result)]
+        module.functions["main"] = main_func
+
+        inliner = FunctionInlining()
+        inliner.run_on_module(module)
+
+        assert inliner.get_statistics()["recursive_calls"] == 2
+        for name, callee in [("is_even", "is_odd"), ("is_odd", "is_even")]:
+            block = module.functions[name].cfg.blocks["entry"]
+            assert isinstance(block.instructions[0], Call)
+            assert block.instructions[0].func.name == callee
+
+        # The recursion is unrolled into main only up to the depth limit
+        remaining_calls = [
+            inst
+            for block in module.functions["main"].cfg.blocks.values()
+            for inst in block.instructions
+            if isinstance(inst, Call)
+        ]
+        assert len(remaining_calls) == 1
+
+    def test_many_call_sites_in_one_block(self) -> None:
+        """Test that every call site is visited once, without rescanning."""
+        module = create_simple_module()
+        caller_func = MIRFunction("caller", [Variable("n", MIRType.INT)])
+        entry = caller_func.cfg.get_or_create_block("entry")
+        n_var = Variable("n", MIRType.INT)
+        current: MIRValue = n_var
+        for i in range(200):
+            temp = Temp(MIRType.INT, 1000 + i)
+            entry.instructions.append(Call(temp, "add", [current, Constant(i)], (1, 1)))
+            current = temp
+        entry.instructions.append(Return((1, 1), current))
+        module.functions["caller"] = caller_func
+
+        inliner = FunctionInlining()
+        inliner.run_on_module(module)
+
+        stats = inliner.get_statistics()
+        assert stats["call_sites_processed"] == 202
+        assert stats["inlined"] == 202
+        block_labels = list(caller_func.cfg.blocks)
+        assert len(block_labels) == 401
+
+    def test_assigned_parameter_is_copied(self) -> None:
+        """Test that a callee assigning its parameter does not write to the caller's argument."""
+        module = MIRModule("loop_module")
+        n_var = Variable("n", MIRType.INT)
+
+        # decrement(n): n = n - 1; return n (the shape a tail-recursive loop leaves behind)
+        callee = MIRFunction("decrement", [Variable("n", MIRType.INT)])
+        callee_entry = callee.cfg.get_or_create_block("entry")
+        callee.cfg.set_entry_block(callee_entry)
+        step = Temp(MIRType.INT, 95)
+        callee_entry.instructions = [
+            BinaryOp(step, "-", n_var, Constant(1), (1, 1)),
+            Copy(n_var, step, (1, 1)),
+            Return((1, 1), n_var),
+        ]
+        module.functions["decrement"] = callee
+
+        x_var = Variable("x", MIRType.INT)
+        caller = MIRFunction("caller", [Variable("x", MIRType.INT)])
+        caller_entry = caller.cfg.get_or_create_block("entry")
+        caller.cfg.set_entry_block(caller_entry)
+        result = Temp(MIRType.INT, 96)
+        caller_entry.instructions = [Call(result, "decrement", [x_var], (1, 1)), Return((1, 1), result)]
+        module.functions["caller"] = caller
+
+        assert FunctionInlining().run_on_module(module)
+
+        instructions = [inst for block in caller.cfg.blocks.values() for inst in block.instructions]
+        arg_copy = caller_entry.instructions[0]
+        assert isinstance(arg_copy, Copy) and arg_copy.source == x_var
+        assert all(x_var not in inst.get_defs() for inst in instructions)
+        assert any(isinstance(inst, Copy) and inst.dest == arg_copy.dest for inst in instructions[1:])
@@ -0,0 +1,149 @@
+"""Tests for function memoization."""
+
+from machine_dialect.codegen.disassembler import decode_instructions
+from machine_dialect.codegen.register_codegen import RegisterBytecodeGenerator
+from machine_dialect.mir.mir_function import MIRFunction
+from machine_dialect.mir.mir_instructions import BinaryOp, Call, ConditionalJump, MIRInstruction, Print, Return
+from machine_dialect.mir.mir_module import MIRModule
+from machine_dialect.mir.mir_types import MIRType
+from machine_dialect.mir.mir_values import Constant, ScopedVariable, Temp, VariableScope
+from machine_dialect.mir.optimizations import register_all_passes
+from machine_dialect.mir.optimizations.memoization import FunctionMemoization
+from machine_dialect.mir.pass_manager import PassManager
+from machine_dialect.mir.profiling.profile_data import FunctionProfile, ProfileData
+
+
+def create_fib(name: str = "fib", extra: list[MIRInstruction] | None = None) -> MIRFunction:
+    """Create a recursive Fibonacci function.
+
+    Args:
+        name: Function name.
+        extra: Instructions to run before the recursive calls.
+
+    Returns:
+        The function.
+    """
+    n = ScopedVariable("n", VariableScope.PARAMETER, MIRType.INT)
+    function = MIRFunction(name, [n], MIRType.INT)
+    entry = function.cfg.get_or_create_block("entry")
+    base = function.cfg.get_or_create_block("base")
+    recurse = function.cfg.get_or_create_block("recurse")
+    function.cfg.set_entry_block(entry)
+    function.cfg.connect(entry, base)
+    function.cfg.connect(entry, recurse)
+
+    is_small = Temp(MIRType.BOOL)
+    entry.instructions = [
+        BinaryOp(is_small, "<", n, Constant(2, MIRType.INT), (1, 1)),
+        ConditionalJump(is_small, "base", (1, 1), "recurse"),
+    ]
+    base.instructions = [Return((1, 1), n)]
+
+    n1, n2, f1, f2, result = (Temp(MIRType.INT) for _ in range(5))
+    recurse.instructions = list(extra or [])
+    recurse.instructions += [
+        BinaryOp(n1, "-", n, Constant(1, MIRType.INT), (1, 1)),
+        Call(f1, name, [n1], (1, 1)),
+        BinaryOp(n2, "-", n, Constant(2, MIRType.INT), (1, 1)),
+        Call(f2, name, [n2], (1, 1)),
+        BinaryOp(result, "+", f1, f2, (1, 1)),
+        Return((1, 1), result),
+    ]
+    return function
+
+
+def create_module(*functions: MIRFunction) -> MIRModule:
+    """Create a module holding functions.
+
+    Args:
+        functions: The functions.
+
+    Returns:
+        The module.
+    """
+    module = MIRModule("memo")
+    for function in functions:
+        module.add_function(function)
+    return module
+
+
+def test_requested_function_is_memoized() -> None:
+    """Test that a pure function requested by name is memoized."""
+    module = create_module(create_fib(), create_fib("other"))
+    memoization = FunctionMemoization(functions=["fib"])
+
+    assert memoization.run_on_module(module)
+
+    assert module.functions["fib"].memoize
+    assert not module.functions["other"].memoize
+    assert memoization.stats == {"pure_functions": 2, "candidates": 1, "memoized": 1}
+
+
+def test_hot_function_is_memoized() -> None:
+    """Test that functions the profile shows as hot are memoized."""
+    module = create_module(create_fib(), create_fib("cold"))
+    profile = ProfileData(module_name="memo")
+    profile.functions["fib"] = FunctionProfile("fib", call_count=5000)
+    profile.functions["cold"] = FunctionProfile("cold", call_count=3)
+
+    assert FunctionMemoization(profile_data=profile, hot_threshold=1000).run_on_module(module)
+
+    assert module.functions["fib"].memoize
+    assert not module.functions["cold"].memoize
+
+
+def test_impure_function_is_not_memoized() -> None:
+    """Test that a function with side effects is left alone."""
+    module = create_module(create_fib(extra=[Print(Constant("step", MIRType.STRING), (1, 1))]))
+    memoization = FunctionMemoization(functions=["fib"])
+
+    assert not memoization.run_on_module(module)
+
+    assert not module.functions["fib"].memoize
+    assert memoization.stats["candidates"] == 1
+
+
+def test_assigned_parameter_is_not_memoized() -> None:
+    """Test that a function overwriting its parameter is left alone.
+
+    The memo key is read from the parameter registers when the function
+    returns, so they must still hold the arguments.
+    """
+    function = create_fib()
+    n = function.params[0]
+    function.cfg.blocks["recurse"].instructions.insert(0, BinaryOp(n, "-", n, Constant(0, MIRType.INT), (1, 1)))
+    module = create_module(function)
+
+    assert not FunctionMemoization(functions=["fib"]).run_on_module(module)
+
+
+def test_memoized_codegen() -> None:
+    """Test that memoized functions look up on entry and store before each return."""
+    module = create_module(create_fib())
+    module.functions["fib"].memoize = True
+
+    bytecode = RegisterBytecodeGenerator().generate(module)
+
+    chunk = bytecode.chunks[0]
+    instructions = decode_instructions(bytes(chunk.bytecode), chunk.constants)
+    names = [inst.name for inst in instructions]
+    assert names[0] == "MEMO_LOOKUP_R"
+    assert names.count("MEMO_STORE_R") == names.count("RETURN_R") == 2
+    for index, name in enumerate(names):
+        if name == "RETURN_R":
+            assert names[index - 1] == "MEMO_STORE_R"
+            # The stored and returned registers are the same
+            assert instructions[index - 1].operands.endswith(instructions[index].operands)
+
+
+def test_pass_manager_options() -> None:
+    """Test that the pass manager forwards options to the pass."""
+    module = create_module(create_fib())
+    pass_manager = PassManager()
+    register_all_passes(pass_manager)
+    pass_manager.pass_options = {"memoization": {"functions": ["fib"]}}
+
+    assert pass_manager.run_passes(module, ["memoization"], 2)
+
+    assert module.functions["fib"].memoize
+    assert pass_manager.get_statistics()["memoization"]["memoized"] == 1
@@ -348,7 +348,7 @@ class TestPipelineBuilder:
         assert result is builder
         assert "constant-propagation" in builder.passes
         assert "strength-reduction" in builder.passes
-        assert "cse" in builder.passes
+        assert "gvn" in builder.passes
 
     def test_add_loop_passes(self) -> None:
         """Test adding loop optimization passes."""
@@ -399,7 +399,7 @@ class TestPipelineBuilder:
             "inline",
             "constant-propagation",
             "strength-reduction",
-            "cse",
+            "gvn",
             "licm",
             "dce",
             "jump-threading",
@@ -407,7 +407,7 @@ class TestPipelineBuilder:
             "inline",
             "constant-propagation",
             "strength-reduction",
-            "cse",
+            "gvn",
             "licm",
             "dce",
             "jump-threading",
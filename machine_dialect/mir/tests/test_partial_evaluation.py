@@ -0,0 +1,310 @@
+"""Tests for compile-time evaluation of pure calls."""
+
+from machine_dialect.mir.hir_to_mir import lower_to_mir
+from machine_dialect.mir.mir_function import MIRFunction
+from machine_dialect.mir.mir_instructions import (
+    BinaryOp,
+    Call,
+    ConditionalJump,
+    Copy,
+    Jump,
+    LoadConst,
+    MIRInstruction,
+    Phi,
+    Print,
+    Return,
+    StoreVar,
+)
+from machine_dialect.mir.mir_interpreter import MIRInterpreter
+from machine_dialect.mir.mir_module import MIRModule
+from machine_dialect.mir.mir_types import MIRType
+from machine_dialect.mir.mir_values import Constant, ScopedVariable, Temp, Variable, VariableScope
+from machine_dialect.mir.optimizations import register_all_passes
+from machine_dialect.mir.optimizations.partial_evaluation import PartialEvaluation
+from machine_dialect.mir.optimize_mir import optimize_mir
+from machine_dialect.mir.pass_manager import PassManager
+from machine_dialect.parser import Parser
+
+
+def create_fib() -> MIRFunction:
+    """Create a recursive Fibonacci function.
+
+    Returns:
+        The function.
+    """
+    n = ScopedVariable("n", VariableScope.PARAMETER, MIRType.INT)
+    function = MIRFunction("fib", [n], MIRType.INT)
+    entry = function.cfg.get_or_create_block("entry")
+    base = function.cfg.get_or_create_block("base")
+    recurse = function.cfg.get_or_create_block("recurse")
+    function.cfg.set_entry_block(entry)
+    function.cfg.connect(entry, base)
+    function.cfg.connect(entry, recurse)
+
+    is_small = Temp(MIRType.BOOL)
+    entry.instructions = [
+        BinaryOp(is_small, "<", n, Constant(2, MIRType.INT), (1, 1)),
+        ConditionalJump(is_small, "base", (1, 1), "recurse"),
+    ]
+    base.instructions = [Return((1, 1), n)]
+
+    n1, n2, f1, f2, result = (Temp(MIRType.INT) for _ in range(5))
+    recurse.instructions = [
+        BinaryOp(n1, "-", n, Constant(1, MIRType.INT), (1, 1)),
+        Call(f1, "fib", [n1], (1, 1)),
+        BinaryOp(n2, "-", n, Constant(2, MIRType.INT), (1, 1)),
+        Call(f2, "fib", [n2], (1, 1)),
+        BinaryOp(result, "+", f1, f2, (1, 1)),
+        Return((1, 1), result),
+    ]
+    return function
+
+
+def create_unary(name: str, body: list[MIRInstruction]) -> MIRFunction:
+    """Create a function of one parameter `x` with a single block.
+
+    Args:
+        name: Function name.
+        body: Instructions of the block, including the return.
+
+    Returns:
+        The function.
+    """
+    function = MIRFunction(name, [ScopedVariable("x", VariableScope.PARAMETER, MIRType.INT)], MIRType.INT)
+    entry = function.cfg.get_or_create_block("entry")
+    function.cfg.set_entry_block(entry)
+    entry.instructions = body
+    return function
+
+
+def create_module(calls: list[Call], *functions: MIRFunction) -> MIRModule:
+    """Create a module whose main function makes calls.
+
+    Args:
+        calls: Calls made by main.
+        functions: The other functions.
+
+    Returns:
+        The module.
+    """
+    module = MIRModule("partial")
+    main = MIRFunction("__main__")
+    entry = main.cfg.get_or_create_block("entry")
+    main.cfg.set_entry_block(entry)
+    entry.instructions = [*calls, Return((1, 1))]
+    module.add_function(main)
+    for function in functions:
+        module.add_function(function)
+    return module
+
+
+def call(callee: str, *args: object) -> Call:
+    """Create a call with constant arguments.
+
+    Args:
+        callee: Called function.
+        args: Argument values.
+
+    Returns:
+        The call.
+    """
+    return Call(Temp(MIRType.INT), callee, [Constant(arg) for arg in args], (1, 1))
+
+
+def test_pure_call_is_evaluated() -> None:
+    """Test that a pure call with constant arguments becomes a constant."""
+    module = create_module([call("fib", 15)], create_fib())
+    evaluation = PartialEvaluation()
+
+    assert evaluation.run_on_module(module)
+
+    inst = module.functions["__main__"].cfg.blocks["entry"].instructions[0]
+    assert isinstance(inst, LoadConst)
+    assert inst.constant == Constant(610, MIRType.INT)
+    assert evaluation.stats["calls_evaluated"] == 1
+
+
+def test_repeated_calls_are_cached() -> None:
+    """Test that each distinct call is evaluated once."""
+    module = create_module([call("fib", 10), call("fib", 10), call("fib", 11)], create_fib())
+    evaluation = PartialEvaluation()
+
+    assert evaluation.run_on_module(module)
+
+    loads = module.functions["__main__"].cfg.blocks["entry"].instructions[:3]
+    assert [inst.constant.value for inst in loads if isinstance(inst, LoadConst)] == [55, 55, 89]
+    assert evaluation.stats["calls_evaluated"] == 3
+    assert evaluation.stats["cache_hits"] == 1
+
+
+def test_non_constant_arguments_are_skipped() -> None:
+    """Test that calls with variable arguments, and recursive calls inside fib, are kept."""
+    dynamic = Call(Temp(MIRType.INT), "fib", [Variable("count", MIRType.INT)], (1, 1))
+    module = create_module([dynamic], create_fib())
+
+    assert not PartialEvaluation().run_on_module(module)
+
+    assert module.functions["__main__"].cfg.blocks["entry"].instructions[0] is dynamic
+
+
+def test_impure_call_is_skipped() -> None:
+    """Test that calls to functions with side effects are kept."""
+    x = ScopedVariable("x", VariableScope.PARAMETER, MIRType.INT)
+    noisy = create_unary("noisy", [Print(x, (1, 1)), Return((1, 1), x)])
+    module = create_module([call("noisy", 1)], noisy)
+
+    assert not PartialEvaluation().run_on_module(module)
+
+
+def test_budget_exhaustion_gives_up() -> None:
+    """Test that a call running past the step budget is kept."""
+    spin = MIRFunction("spin", [ScopedVariable("x", VariableScope.PARAMETER, MIRType.INT)], MIRType.INT)
+    loop = spin.cfg.get_or_create_block("loop")
+    spin.cfg.set_entry_block(loop)
+    spin.cfg.connect(loop, loop)
+    loop.instructions = [Jump("loop", (1, 1))]
+    module = create_module([call("spin", 1), call("spin", 1)], spin)
+    evaluation = PartialEvaluation(step_budget=100)
+
+    assert not evaluation.run_on_module(module)
+
+    assert evaluation.stats["budget_exhausted"] == 1
+    assert evaluation.stats["cache_hits"] == 1
+    assert all(isinstance(inst, Call) for inst in module.functions["__main__"].cfg.blocks["entry"].instructions[:2])
+
+
+def test_runtime_error_gives_up() -> None:
+    """Test that a call failing at compile time is left to fail at run time."""
+    x = ScopedVariable("x", VariableScope.PARAMETER, MIRType.INT)
+    result = Temp(MIRType.INT)
+    divide = BinaryOp(result, "/", Constant(1, MIRType.INT), x, (1, 1))
+    invert = create_unary("invert", [divide, Return((1, 1), result)])
+    module = create_module([call("invert", 0)], invert)
+    evaluation = PartialEvaluation()
+
+    assert not evaluation.run_on_module(module)
+
+    assert evaluation.stats["failed"] == 1
+
+
+def test_phi_gives_up() -> None:
+    """Test that functions in SSA form are not evaluated."""
+    x = ScopedVariable("x", VariableScope.PARAMETER, MIRType.INT)
+    result = Temp(MIRType.INT)
+    ssa = create_unary("ssa", [Phi(result, [(x, "entry")], (1, 1)), Return((1, 1), result)])
+    module = create_module([call("ssa", 1)], ssa)
+
+    assert not PartialEvaluation().run_on_module(module)
+
+
+def test_pass_manager_run() -> None:
+    """Test that the pass is registered and reports statistics."""
+    module = create_module([call("fib", 5)], create_fib())
+    pass_manager = PassManager()
+    register_all_passes(pass_manager)
+
+    assert pass_manager.run_passes(module, ["partial-evaluation"], 2)
+
+    assert pass_manager.get_statistics()["partial-evaluation"]["calls_evaluated"] == 1
+
+
+def test_negative_division_truncates_like_the_vm() -> None:
+    """Test that integer division and remainder of negative numbers round toward zero."""
+    x = ScopedVariable("x", VariableScope.PARAMETER, MIRType.INT)
+    quotient, remainder = Temp(MIRType.INT), Temp(MIRType.INT)
+    halve = create_unary(
+        "halve", [BinaryOp(quotient, "/", x, Constant(2, MIRType.INT), (1, 1)), Return((1, 1), quotient)]
+    )
+    parity = create_unary(
+        "parity", [BinaryOp(remainder, "%", x, Constant(2, MIRType.INT), (1, 1)), Return((1, 1), remainder)]
+    )
+    module = create_module([call("halve", -7), call("parity", -7), call("parity", 7.5)], halve, parity)
+
+    assert PartialEvaluation().run_on_module(module)
+
+    loads = module.functions["__main__"].cfg.blocks["entry"].instructions[:3]
+    assert [inst.constant.value for inst in loads if isinstance(inst, LoadConst)] == [-3, -1, 1.5]
+
+
+def test_intermediate_overflow_gives_up() -> None:
+    """Test that a call overflowing 64 bits partway is kept even if its result fits."""
+    x = ScopedVariable("x", VariableScope.PARAMETER, MIRType.INT)
+    square, result = Temp(MIRType.INT), Temp(MIRType.INT)
+    body: list[MIRInstruction] = [
+        BinaryOp(square, "*", x, x, (1, 1)),
+        BinaryOp(result, "/", square, x, (1, 1)),
+        Return((1, 1), result),
+    ]
+    module = create_module([call("identity", 2**40), call("identity", -(2**63))], create_unary("identity", body))
+    evaluation = PartialEvaluation()
+
+    assert not evaluation.run_on_module(module)
+
+    assert evaluation.stats["failed"] == 2
+
+
+def test_arguments_loaded_earlier_in_the_block_are_constant() -> None:
+    """Test that arguments copied from constants before the call are evaluated."""
+    count, argument = Variable("count", MIRType.INT), Temp(MIRType.INT)
+    five = Temp(MIRType.INT)
+    module = create_module([], create_fib())
+    entry = module.functions["__main__"].cfg.blocks["entry"]
+    folded = Call(Temp(MIRType.INT), "fib", [argument], (1, 1))
+    kept = Call(Temp(MIRType.INT), "fib", [argument], (1, 1))
+    entry.instructions[:0] = [
+        LoadConst(five, Constant(5, MIRType.INT), (1, 1)),
+        StoreVar(count, five, (1, 1)),
+        Copy(argument, count, (1, 1)),
+        folded,
+        Copy(argument, Variable("other", MIRType.INT), (1, 1)),
+        kept,
+    ]
+
+    assert PartialEvaluation().run_on_module(module)
+
+    assert isinstance(entry.instructions[3], LoadConst)
+    assert entry.instructions[3].constant == Constant(5, MIRType.INT)
+    assert entry.instructions[5] is kept
+
+
+def test_loop_in_callee_matches_unoptimized_execution() -> None:
+    """Test that a call folded at level 2 gives the result of running the program unoptimized."""
+    source = """### **Utility**: `sumdown`
+
+<details>
+<summary>Add up the numbers from n down to one.</summary>
+
+> Define `total` as Whole Number. \\
+> Set `total` to _0_. \\
+> Define `k` as Whole Number. \\
+> Set `k` to `n`.
+> While `k` > _0_:
+> > Set `total` to `total` + `k`. \\
+> > Set `k` to `k` - _1_.
+>
+> Give back `total`.
+
+</details>
+
+#### Inputs:
+
+- `n` **as** Whole Number (required)
+
+#### Outputs:
+
+- `total` **as** Whole Number
+
+Define `result` as Whole Number.
+Set `result` using `sumdown` with _5_.
+Give back `result`.
+"""
+    parser = Parser()
+    program = parser.parse(source)
+    assert not parser.has_errors()
+    unoptimized = MIRInterpreter().interpret_module(lower_to_mir(program.to_hir(), "sumdown"))
+
+    module, stats = optimize_mir(lower_to_mir(program.to_hir(), "sumdown"), 2)
+
+    assert unoptimized == 15
+    assert stats["partial-evaluation"]["calls_evaluated"] == 1
+    assert MIRInterpreter().interpret_module(module) == unoptimized
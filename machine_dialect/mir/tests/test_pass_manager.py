@@ -94,7 +94,9 @@ def test_optimization_pipeline() -> None:
 
     config2 = OptimizationConfig.from_level(2)
     passes2 = OptimizationPipeline.get_passes(config2)
-    assert "cse" in passes2
+    assert "gvn" in passes2
+    assert "tail-call" in passes2
+    assert passes2.index("partial-evaluation") < passes2.index("constant-propagation")
     assert len(passes2) > len(passes1)
 
     config3 = OptimizationConfig.from_level(3)
@@ -292,3 +294,160 @@ def test_full_optimization_pipeline() -> None:
     # Check that we collected statistics
     stats = pm.get_statistics()
     assert len(stats) > 0 if passes else True
+
+
+def test_maintained_use_def_chains_are_not_rebuilt() -> None:
+    """Test that passes maintaining use-def chains leave them valid for later passes."""
+    from machine_dialect.mir.analyses.use_def_chains import UseDefChainsAnalysis
+
+    module = create_test_module()
+    pm = PassManager()
+    register_all_passes(pm)
+
+    pm.run_passes(module, ["use-def-chains", "constant-propagation", "strength-reduction", "dce"])
+
+    stats = pm.get_statistics()["use-def-chains"]
+    assert stats["builds"] == 1
+    assert stats["rebuilds"] == 0
+    func = module.get_function("main")
+    assert func is not None
+    chains = pm.analysis_manager.get_cached_analysis("use-def-chains", func)
+    fresh = UseDefChainsAnalysis().run_on_function(func)
+    assert set(chains.use_def_map) == set(fresh.use_def_map)
+    for value, info in fresh.use_def_map.items():
+        assert chains.get_definition(value) is info.definition
+        assert sorted(map(id, chains.get_uses(value))) == sorted(map(id, info.uses))
+
+
+def test_unmaintained_use_def_chains_are_rebuilt() -> None:
+    """Test that a pass that does not maintain use-def chains causes a rebuild."""
+    module = create_test_module()
+    func = module.get_function("main")
+    assert func is not None
+    # Repeat 2 + 3 for value numbering to replace
+    entry = func.cfg.blocks["entry"]
+    add = entry.instructions[2]
+    assert isinstance(add, BinaryOp)
+    entry.instructions.insert(3, BinaryOp(Temp(MIRType.INT, 5), "+", add.left, add.right, (1, 1)))
+    pm = PassManager()
+    register_all_passes(pm)
+
+    pm.run_passes(module, ["use-def-chains", "gvn", "dce"])
+
+    stats = pm.get_statistics()["use-def-chains"]
+    assert stats["builds"] == 2
+    assert stats["rebuilds"] == 1
+
+
+def create_identity_function(name: str) -> MIRFunction:
+    """Create a function that returns a constant and leaves nothing to optimize.
+
+    Args:
+        name: Function name.
+
+    Returns:
+        The function.
+    """
+    function = MIRFunction(name)
+    entry = BasicBlock("entry")
+    function.cfg.add_block(entry)
+    function.cfg.set_entry_block(entry)
+    entry.add_instruction(Return((1, 1), Constant(0, MIRType.INT)))
+    return function
+
+
+def create_analysis_manager() -> tuple[PassManager, MIRFunction]:
+    """Create a pass manager with dominance, loop and use-def analyses of main cached.
+
+    Returns:
+        The pass manager and the main function.
+    """
+    from machine_dialect.mir.analyses.dominance_analysis import DominanceAnalysis
+    from machine_dialect.mir.analyses.loop_analysis import LoopAnalysis
+    from machine_dialect.mir.analyses.use_def_chains import UseDefChainsAnalysis
+
+    pm = PassManager()
+    pm.analysis_manager.register_analysis("dominance", DominanceAnalysis())
+    pm.analysis_manager.register_analysis("loop-analysis", LoopAnalysis())
+    pm.analysis_manager.register_analysis("use-def-chains", UseDefChainsAnalysis())
+    func = create_test_module().get_function("main")
+    assert func is not None
+    for name in ("dominance", "loop-analysis", "use-def-chains"):
+        pm.analysis_manager.get_analysis(name, func)
+    return pm, func
+
+
+def cached_analyses(pm: PassManager, func: MIRFunction) -> set[str]:
+    """Get the analyses of a function that are cached and valid.
+
+    Args:
+        pm: The pass manager.
+        func: The function.
+
+    Returns:
+        Names of the cached analyses.
+    """
+    names = ("dominance", "loop-analysis", "use-def-chains")
+    return {name for name in names if pm.analysis_manager.get_cached_analysis(name, func) is not None}
+
+
+def test_preservation_levels_keep_cfg_analyses() -> None:
+    """Test that preserving the CFG keeps dominance and loops, and preserving dominance keeps dominance."""
+    from machine_dialect.mir.optimization_pass import PreservationLevel
+
+    pm, func = create_analysis_manager()
+
+    pm.analysis_manager.mark_modified(func, PreservationLevel.CFG)
+    assert cached_analyses(pm, func) == {"dominance", "loop-analysis"}
+
+    pm.analysis_manager.mark_modified(func, PreservationLevel.DOMINANCE)
+    assert cached_analyses(pm, func) == {"dominance"}
+
+    pm.analysis_manager.mark_modified(func, PreservationLevel.ALL)
+    assert cached_analyses(pm, func) == {"dominance"}
+    assert pm.analysis_manager.get_epoch(func) == 3
+
+
+def test_maintained_analyses_survive_changes() -> None:
+    """Test that analyses a pass maintains stay cached but their dependents do not."""
+    from machine_dialect.mir.optimization_pass import PreservationLevel
+
+    pm, func = create_analysis_manager()
+
+    pm.analysis_manager.mark_modified(func, PreservationLevel.NONE, ["use-def-chains", "loop-analysis"])
+
+    # Loop analysis requires dominance, which was not kept
+    assert cached_analyses(pm, func) == {"use-def-chains", "loop-analysis"}
+    pm.analysis_manager.mark_modified(func, PreservationLevel.NONE, ["use-def-chains"])
+    assert cached_analyses(pm, func) == {"use-def-chains"}
+
+
+def test_invalidate_dependent_analyses() -> None:
+    """Test that invalidating an analysis invalidates the analyses requiring it."""
+    pm, func = create_analysis_manager()
+
+    pm.analysis_manager.invalidate(["dominance"])
+
+    assert cached_analyses(pm, func) == {"use-def-chains"}
+    pm.analysis_manager.get_analysis("dominance", func)
+    assert pm.get_statistics()["dominance"]["rebuilds"] == 1
+
+
+def test_untouched_functions_keep_their_analyses() -> None:
+    """Test that a pass changing one function leaves the analyses of the others cached."""
+    module = create_test_module()
+    for name in ("first", "second"):
+        module.add_function(create_identity_function(name))
+    pm = PassManager()
+    register_all_passes(pm)
+
+    pm.run_passes(module, ["dominance", "loop-analysis", "constant-propagation", "dce"])
+    for function in module.functions.values():
+        pm.analysis_manager.get_analysis("dominance", function)
+        pm.analysis_manager.get_analysis("loop-analysis", function)
+
+    stats = pm.get_statistics()
+    # Only main was changed by dead code elimination, which does not preserve the CFG
+    for name in ("dominance", "loop-analysis"):
+        assert stats[name]["builds"] == len(module.functions) + 1
+        assert stats[name]["rebuilds"] == 1
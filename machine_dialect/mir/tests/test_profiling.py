@@ -221,6 +221,30 @@ class TestProfilePersistence:
         finally:
             filepath.unlink()
 
+    def test_read_vm_profile(self) -> None:
+        """Test ingesting a profile dictionary produced by the Rust VM."""
+        vm_profile = {
+            "total_instructions": 500,
+            "opcodes": {0: 200, 7: 150, 25: 150},
+            "functions": {
+                "main": {"calls": 1, "inclusive_instructions": 500, "exclusive_instructions": 50},
+                "fib": {"calls": 150, "inclusive_instructions": 450, "exclusive_instructions": 450},
+            },
+            "pc_hits": {0: 1, 5: 150},
+        }
+
+        profile = ProfileReader().read_vm_profile(vm_profile, module_name="fib")
+
+        assert profile.module_name == "fib"
+        assert profile.total_samples == 500
+        assert profile.functions["fib"].call_count == 150
+        assert profile.functions["fib"].total_cycles == 450
+        assert profile.functions["fib"].avg_cycles == 3.0
+        assert profile.get_hot_functions() == ["fib"]
+        assert profile.metadata["opcode_counts"][25] == 150
+        assert profile.metadata["exclusive_instructions"]["main"] == 50
+        assert profile.metadata["pc_hits"] == {0: 1, 5: 150}
+
     def test_binary_roundtrip(self) -> None:
         """Test binary serialization and deserialization."""
         # Create profile data
@@ -2,6 +2,9 @@
 
 from __future__ import annotations
 
+import sys
+from itertools import pairwise
+
 from machine_dialect.mir.basic_block import CFG, BasicBlock
 from machine_dialect.mir.mir_function import MIRFunction
 from machine_dialect.mir.mir_instructions import (
@@ -123,6 +126,60 @@ class TestDominanceInfo:
         assert len(dom_info.dominance_frontier[entry]) == 0
         assert len(dom_info.dominance_frontier[merge_block]) == 0
 
+    def test_immediate_dominators_with_loop_and_unreachable_block(self) -> None:
+        """Test the dominator tree of a loop, ignoring a block that cannot be reached."""
+        cfg = CFG()
+        entry, header, body, exit_block, dead = (
+            cfg.get_or_create_block(label) for label in ("entry", "header", "body", "exit", "dead")
+        )
+        cfg.set_entry_block(entry)
+        cfg.connect(entry, header)
+        cfg.connect(header, body)
+        cfg.connect(header, exit_block)
+        cfg.connect(body, header)
+        cfg.connect(dead, exit_block)
+
+        dom_info = DominanceInfo(cfg)
+
+        assert dom_info.immediate_dominators == {entry: None, header: entry, body: header, exit_block: header}
+        assert dom_info.dominator_tree_children[header] == {body, exit_block}
+        assert dom_info.dominance_frontier[body] == {header}
+        assert dom_info.dominates(header, exit_block)
+        assert not dom_info.dominates(body, exit_block)
+        assert not dom_info.dominates(dead, exit_block)
+
+    def test_dominates_agrees_with_dominator_sets(self) -> None:
+        """Test that the dominator tree numbering gives the same answers as full dominator sets."""
+        cfg = CFG()
+        labels = ("entry", "header", "left", "right", "merge", "latch", "exit", "dead")
+        entry, header, left, right, merge, latch, exit_block, dead = (
+            cfg.get_or_create_block(label) for label in labels
+        )
+        cfg.set_entry_block(entry)
+        for source, target in [
+            (entry, header),
+            (header, left),
+            (header, right),
+            (left, merge),
+            (right, merge),
+            (merge, latch),
+            (latch, header),
+            (header, exit_block),
+            (dead, merge),
+        ]:
+            cfg.connect(source, target)
+
+        dom_info = DominanceInfo(cfg)
+
+        reachable = [entry, header, left, right, merge, latch, exit_block]
+        assert dom_info.dominators[latch] == {entry, header, merge, latch}
+        assert set(dom_info.dominators) == set(reachable)
+        for first in reachable:
+            for second in reachable:
+                assert dom_info.dominates(first, second) == (first in dom_info.dominators[second])
+        assert not dom_info.dominates(dead, dead)
+        assert not dom_info.strictly_dominates(merge, merge)
+
 
 class TestSSAConstruction:
     """Test SSA construction."""
@@ -431,3 +488,91 @@ class TestSSAConstruction:
         const_values = [inst.constant.value for inst in loadconst_after if hasattr(inst.constant, "value")]
         assert 5 in const_values, "Constant 5 should be preserved"
         assert 1 in const_values, "Constant 1 should be preserved"
+
+    def test_dead_variable_gets_no_phi(self) -> None:
+        """Test that a variable not read after a join gets no phi node there."""
+        func = MIRFunction("test", [], MIRType.INT)
+        entry, then_block, else_block, merge_block = (
+            func.cfg.get_or_create_block(label) for label in ("entry", "then", "else", "merge")
+        )
+        func.cfg.set_entry_block(entry)
+        func.cfg.connect(entry, then_block)
+        func.cfg.connect(entry, else_block)
+        func.cfg.connect(then_block, merge_block)
+        func.cfg.connect(else_block, merge_block)
+
+        x = Variable("x", MIRType.INT)
+        y = Variable("y", MIRType.INT)
+        func.add_local(x)
+        func.add_local(y)
+        entry.add_instruction(ConditionalJump(Constant(True, MIRType.BOOL), "then", (1, 1), "else"))
+        for block, value in ((then_block, 1), (else_block, 2)):
+            block.add_instruction(StoreVar(x, Constant(value, MIRType.INT), (1, 1)))
+            block.add_instruction(StoreVar(y, Constant(value, MIRType.INT), (1, 1)))
+            block.add_instruction(Jump("merge", (1, 1)))
+        # Only y is read after the join, and x is assigned before it is read
+        result = func.new_temp(MIRType.INT)
+        merge_block.add_instruction(StoreVar(x, Constant(3, MIRType.INT), (1, 1)))
+        merge_block.add_instruction(BinaryOp(result, "+", x, y, (1, 1)))
+        merge_block.add_instruction(Return((1, 1), result))
+
+        construct_ssa(func)
+
+        assert [phi.dest.name for phi in merge_block.phi_nodes if isinstance(phi.dest, Variable)] == ["y"]
+
+    def test_loop_scratch_variable_gets_no_phi(self) -> None:
+        """Test that a variable assigned before every read in a loop gets no phi at the header."""
+        func = MIRFunction("test", [], MIRType.EMPTY)
+        entry, header, body, exit_block = (
+            func.cfg.get_or_create_block(label) for label in ("entry", "header", "body", "exit")
+        )
+        func.cfg.set_entry_block(entry)
+        func.cfg.connect(entry, header)
+        func.cfg.connect(header, body)
+        func.cfg.connect(header, exit_block)
+        func.cfg.connect(body, header)
+
+        i = Variable("i", MIRType.INT)
+        scratch = Variable("scratch", MIRType.INT)
+        func.add_local(i)
+        func.add_local(scratch)
+        entry.add_instruction(StoreVar(i, Constant(0, MIRType.INT), (1, 1)))
+        entry.add_instruction(StoreVar(scratch, Constant(0, MIRType.INT), (1, 1)))
+        entry.add_instruction(Jump("header", (1, 1)))
+        cond = func.new_temp(MIRType.BOOL)
+        header.add_instruction(BinaryOp(cond, "<", i, Constant(10, MIRType.INT), (1, 1)))
+        header.add_instruction(ConditionalJump(cond, "body", (1, 1), "exit"))
+        doubled, step = func.new_temp(MIRType.INT), func.new_temp(MIRType.INT)
+        body.add_instruction(BinaryOp(doubled, "*", i, Constant(2, MIRType.INT), (1, 1)))
+        body.add_instruction(StoreVar(scratch, doubled, (1, 1)))
+        body.add_instruction(BinaryOp(step, "+", i, scratch, (1, 1)))
+        body.add_instruction(StoreVar(i, step, (1, 1)))
+        body.add_instruction(Jump("header", (1, 1)))
+        exit_block.add_instruction(Return((1, 1)))
+
+        construct_ssa(func)
+
+        assert [phi.dest.name for phi in header.phi_nodes if isinstance(phi.dest, Variable)] == ["i"]
+
+    def test_deep_cfg_does_not_recurse(self) -> None:
+        """Test that renaming a chain of blocks deeper than the recursion limit succeeds."""
+        func = MIRFunction("test", [], MIRType.INT)
+        x = Variable("x", MIRType.INT)
+        func.add_local(x)
+        blocks = [func.cfg.get_or_create_block(f"block{index}") for index in range(2 * sys.getrecursionlimit())]
+        func.cfg.set_entry_block(blocks[0])
+        for block, next_block in pairwise(blocks):
+            block.add_instruction(StoreVar(x, Constant(1, MIRType.INT), (1, 1)))
+            block.add_instruction(Jump(next_block.label, (1, 1)))
+            func.cfg.connect(block, next_block)
+        result = func.new_temp(MIRType.INT)
+        blocks[-1].add_instruction(Copy(result, x, (1, 1)))
+        blocks[-1].add_instruction(Return((1, 1), result))
+
+        construct_ssa(func)
+
+        last_store = blocks[-2].instructions[0]
+        assert isinstance(last_store, StoreVar)
+        copy = blocks[-1].instructions[0]
+        assert isinstance(copy, Copy) and copy.source == last_store.var
+        assert not any(block.phi_nodes for block in blocks)
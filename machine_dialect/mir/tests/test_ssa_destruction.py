@@ -0,0 +1,213 @@
+"""Tests for translating MIR out of SSA form."""
+
+from machine_dialect.codegen.disassembler import decode_instructions
+from machine_dialect.codegen.register_codegen import RegisterBytecodeGenerator
+from machine_dialect.mir.basic_block import BasicBlock
+from machine_dialect.mir.mir_function import MIRFunction
+from machine_dialect.mir.mir_instructions import (
+    BinaryOp,
+    ConditionalJump,
+    Copy,
+    Jump,
+    LoadConst,
+    Phi,
+    Return,
+    StoreVar,
+)
+from machine_dialect.mir.mir_types import MIRType
+from machine_dialect.mir.mir_values import Constant, ScopedVariable, Temp, Variable, VariableScope
+from machine_dialect.mir.ssa_destruction import SSADestructor
+
+N = ScopedVariable("n", VariableScope.PARAMETER, MIRType.INT)
+
+
+def create_function(*labels: str) -> tuple[MIRFunction, list[BasicBlock]]:
+    """Create a function of parameter `n` with empty blocks.
+
+    Args:
+        labels: Block labels; the first block is the entry.
+
+    Returns:
+        The function and its blocks.
+    """
+    function = MIRFunction("f", [N], MIRType.INT)
+    blocks = [function.cfg.get_or_create_block(label) for label in labels]
+    function.cfg.set_entry_block(blocks[0])
+    return function, blocks
+
+
+def create_counting_loop() -> tuple[MIRFunction, list[BasicBlock], Variable]:
+    """Create `i = 0; while i < n: i = i + 1; return i` in SSA form.
+
+    Returns:
+        The function, its blocks and the phi destination.
+    """
+    function, blocks = create_function("entry", "header", "body", "exit")
+    entry, header, body, exit_block = blocks
+    function.cfg.connect(entry, header)
+    function.cfg.connect(header, body)
+    function.cfg.connect(header, exit_block)
+    function.cfg.connect(body, header)
+
+    i0, i1, i2 = (Variable("i", MIRType.INT, version) for version in range(3))
+    function.add_local(i0)
+    zero, condition, step = Temp(MIRType.INT), Temp(MIRType.BOOL), Temp(MIRType.INT)
+    entry.instructions = [
+        LoadConst(zero, Constant(0, MIRType.INT), (1, 1)),
+        StoreVar(i1, zero, (1, 1)),
+        Jump("header", (1, 1)),
+    ]
+    header.phi_nodes = [Phi(i0, [(i1, "entry"), (i2, "body")], (2, 1))]
+    header.instructions = [BinaryOp(condition, "<", i0, N, (2, 1)), ConditionalJump(condition, "body", (2, 1), "exit")]
+    body.instructions = [
+        BinaryOp(step, "+", i0, Constant(1, MIRType.INT), (3, 1)),
+        StoreVar(i2, step, (3, 1)),
+        Jump("header", (3, 1)),
+    ]
+    exit_block.instructions = [Return((4, 1), i0)]
+    return function, blocks, i0
+
+
+def test_loop_variable_is_coalesced() -> None:
+    """Test that the versions of a loop variable share one name and need no copies."""
+    function, (entry, header, body, _), i0 = create_counting_loop()
+    destructor = SSADestructor(function)
+
+    destructor.destruct_ssa()
+
+    assert not header.phi_nodes
+    assert destructor.copies_inserted == 0
+    assert destructor.copies_coalesced == 2
+    assert isinstance(entry.instructions[1], StoreVar) and entry.instructions[1].var is i0
+    assert isinstance(body.instructions[1], StoreVar) and body.instructions[1].var is i0
+
+
+def test_critical_edge_is_split() -> None:
+    """Test that copies for an edge from a branching block get a block of their own."""
+    function, (entry, left, merge) = create_function("entry", "left", "merge")
+    function.cfg.connect(entry, left)
+    function.cfg.connect(entry, merge)
+    function.cfg.connect(left, merge)
+    x1, x2 = Temp(MIRType.INT), Temp(MIRType.INT)
+    result = Temp(MIRType.INT)
+    entry.instructions = [
+        BinaryOp(x1, "+", N, Constant(1, MIRType.INT), (1, 1)),
+        ConditionalJump(N, "left", (1, 1), "merge"),
+    ]
+    left.instructions = [BinaryOp(x2, "*", N, Constant(2, MIRType.INT), (2, 1)), Jump("merge", (2, 1))]
+    # x1 is still needed after the join, so it cannot share a name with the result
+    merge.phi_nodes = [Phi(result, [(x1, "entry"), (x2, "left")], (3, 1))]
+    merge.instructions = [BinaryOp(Temp(MIRType.INT), "+", result, x1, (3, 1)), Return((3, 1), result)]
+    destructor = SSADestructor(function)
+
+    destructor.destruct_ssa()
+
+    edge = function.cfg.blocks["entry_to_merge"]
+    terminator = entry.instructions[-1]
+    assert isinstance(terminator, ConditionalJump) and terminator.false_label == "entry_to_merge"
+    assert edge.predecessors == [entry] and edge.successors == [merge]
+    assert merge.predecessors == [left, edge] or merge.predecessors == [edge, left]
+    assert [str(inst) for inst in edge.instructions] == [str(Copy(result, x1, (3, 1))), "goto merge"]
+    assert destructor.edges_split == 1
+    assert destructor.copies_inserted == 1
+
+
+def test_swapped_values_use_a_temporary() -> None:
+    """Test that phi nodes exchanging values are sequentialized through a temporary."""
+    function, (entry, header, body, exit_block) = create_function("entry", "header", "body", "exit")
+    function.cfg.connect(entry, header)
+    function.cfg.connect(header, body)
+    function.cfg.connect(header, exit_block)
+    function.cfg.connect(body, header)
+    a, b, condition = Temp(MIRType.INT), Temp(MIRType.INT), Temp(MIRType.BOOL)
+    entry.instructions = [Jump("header", (1, 1))]
+    header.phi_nodes = [
+        Phi(a, [(Constant(1, MIRType.INT), "entry"), (b, "body")], (2, 1)),
+        Phi(b, [(Constant(2, MIRType.INT), "entry"), (a, "body")], (2, 1)),
+    ]
+    header.instructions = [BinaryOp(condition, "<", a, b, (2, 1)), ConditionalJump(condition, "body", (2, 1), "exit")]
+    body.instructions = [Jump("header", (3, 1))]
+    exit_block.instructions = [Return((4, 1), a)]
+
+    SSADestructor(function).destruct_ssa()
+
+    assert [type(inst) for inst in entry.instructions] == [LoadConst, LoadConst, Jump]
+    swap = body.instructions[:-1]
+    assert len(swap) == 3
+    saved = swap[0].get_defs()[0]
+    assert isinstance(saved, Temp) and saved not in (a, b)
+    # The cycle is broken by saving one value first
+    assert str(swap[0]) == f"{saved} = {a}"
+    assert {str(inst) for inst in swap[1:]} == {f"{a} = {b}", f"{b} = {saved}"}
+
+
+def test_codegen_emits_no_phi() -> None:
+    """Test that a function in SSA form compiles to moves instead of PHI_R."""
+    function, _, _ = create_counting_loop()
+
+    chunk = RegisterBytecodeGenerator().generate_function(function)
+
+    names = [inst.name for inst in decode_instructions(bytes(chunk.bytecode), chunk.constants)]
+    assert "PHI_R" not in names
+    assert names.count("MOVE_R") == 2
+
+
+def test_memoized_function_keeps_its_parameters() -> None:
+    """Test that a loop counting down from a parameter does not overwrite it when memoized.
+
+    The VM builds the cache key from the parameter registers on return, so
+    they must still hold the arguments there.
+    """
+    function, (entry, header, body, exit_block) = create_function("entry", "header", "body", "exit")
+    function.cfg.connect(entry, header)
+    function.cfg.connect(header, body)
+    function.cfg.connect(header, exit_block)
+    function.cfg.connect(body, header)
+    k0, k1 = Variable("k", MIRType.INT, 1), Variable("k", MIRType.INT, 2)
+    function.add_local(k0)
+    condition, step = Temp(MIRType.BOOL), Temp(MIRType.INT)
+    entry.instructions = [Jump("header", (1, 1))]
+    header.phi_nodes = [Phi(k0, [(N, "entry"), (k1, "body")], (2, 1))]
+    header.instructions = [
+        BinaryOp(condition, ">", k0, Constant(0, MIRType.INT), (2, 1)),
+        ConditionalJump(condition, "body", (2, 1), "exit"),
+    ]
+    body.instructions = [
+        BinaryOp(step, "-", k0, Constant(1, MIRType.INT), (3, 1)),
+        StoreVar(k1, step, (3, 1)),
+        Jump("header", (3, 1)),
+    ]
+    exit_block.instructions = [Return((4, 1), k0)]
+    function.memoize = True
+
+    SSADestructor(function).destruct_ssa()
+
+    instructions = [inst for block in function.cfg.blocks.values() for inst in block.instructions]
+    assert all(N not in inst.get_defs() for inst in instructions)
+    assert [str(inst) for inst in entry.instructions] == [str(Copy(k0, N, (2, 1))), "goto header"]
+
+
+def test_parameter_is_reused_when_not_memoized() -> None:
+    """Test that without memoization the loop variable takes over the parameter's name."""
+    function, (entry, header, body, _) = create_function("entry", "header", "body", "exit")
+    function.cfg.connect(entry, header)
+    function.cfg.connect(header, body)
+    function.cfg.connect(header, function.cfg.blocks["exit"])
+    function.cfg.connect(body, header)
+    k0, k1 = Variable("k", MIRType.INT, 1), Variable("k", MIRType.INT, 2)
+    step = Temp(MIRType.INT)
+    entry.instructions = [Jump("header", (1, 1))]
+    header.phi_nodes = [Phi(k0, [(N, "entry"), (k1, "body")], (2, 1))]
+    header.instructions = [ConditionalJump(k0, "body", (2, 1), "exit")]
+    body.instructions = [
+        BinaryOp(step, "-", k0, Constant(1, MIRType.INT), (3, 1)),
+        StoreVar(k1, step, (3, 1)),
+        Jump("header", (3, 1)),
+    ]
+    function.cfg.blocks["exit"].instructions = [Return((4, 1), k0)]
+    destructor = SSADestructor(function)
+
+    destructor.destruct_ssa()
+
+    assert destructor.copies_inserted == 0
+    assert isinstance(body.instructions[1], StoreVar) and body.instructions[1].var is N
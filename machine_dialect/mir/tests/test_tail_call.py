@@ -1,12 +1,22 @@
 """Tests for tail call optimization."""
 
+from pathlib import Path
+
+from machine_dialect.codegen.disassembler import decode_instructions
+from machine_dialect.codegen.register_codegen import RegisterBytecodeGenerator
+from machine_dialect.compiler.config import CompilerConfig
+from machine_dialect.compiler.context import CompilationContext
+from machine_dialect.compiler.pipeline import CompilationPipeline
 from machine_dialect.mir.basic_block import BasicBlock
 from machine_dialect.mir.mir_function import MIRFunction
-from machine_dialect.mir.mir_instructions import Call, Copy, Return
+from machine_dialect.mir.mir_instructions import BinaryOp, Call, ConditionalJump, Copy, Jump, Return, StoreVar
+from machine_dialect.mir.mir_interpreter import MIRInterpreter
 from machine_dialect.mir.mir_module import MIRModule
 from machine_dialect.mir.mir_types import MIRType
-from machine_dialect.mir.mir_values import Constant, Temp, Variable
+from machine_dialect.mir.mir_values import Constant, ScopedVariable, Temp, Variable, VariableScope
+from machine_dialect.mir.optimizations import register_all_passes
 from machine_dialect.mir.optimizations.tail_call import TailCallOptimization
+from machine_dialect.mir.pass_manager import PassManager
 
 
 def test_simple_tail_call() -> None:
@@ -234,3 +244,224 @@ def test_already_optimized() -> None:
     assert not modified
     assert call_inst.is_tail_call  # Still marked
     assert optimizer.stats["tail_calls_found"] == 0  # Not counted as new
+
+
+def create_count_down() -> tuple[MIRModule, MIRFunction]:
+    """Create `count down(n, acc)`, which recurses with its arguments swapped.
+
+    Returns:
+        The module and the function.
+    """
+    module = MIRModule("test")
+    n = ScopedVariable("n", VariableScope.PARAMETER, MIRType.INT)
+    acc = ScopedVariable("acc", VariableScope.PARAMETER, MIRType.INT)
+    func = MIRFunction("count down", [n, acc], MIRType.INT)
+    module.add_function(func)
+
+    entry = func.cfg.get_or_create_block("entry")
+    done = func.cfg.get_or_create_block("done")
+    again = func.cfg.get_or_create_block("again")
+    func.cfg.set_entry_block(entry)
+    func.cfg.connect_blocks("entry", "done")
+    func.cfg.connect_blocks("entry", "again")
+
+    cond = func.new_temp(MIRType.BOOL)
+    entry.add_instruction(BinaryOp(cond, "<=", n, Constant(0, MIRType.INT), (1, 1)))
+    entry.add_instruction(ConditionalJump(cond, "done", (1, 1), "again"))
+    done.add_instruction(Return((1, 1), acc))
+
+    # result = count down(acc, n - 1); return result
+    next_n = func.new_temp(MIRType.INT)
+    call_result = func.new_temp(MIRType.INT)
+    returned = func.new_temp(MIRType.INT)
+    result = Variable("result", MIRType.INT)
+    again.add_instruction(BinaryOp(next_n, "-", n, Constant(1, MIRType.INT), (1, 1)))
+    again.add_instruction(Call(call_result, "count down", [acc, next_n], (1, 1)))
+    again.add_instruction(StoreVar(result, call_result, (1, 1)))
+    again.add_instruction(Copy(returned, result, (1, 1)))
+    again.add_instruction(Return((1, 1), returned))
+    return module, func
+
+
+def test_self_tail_call_becomes_loop() -> None:
+    """Test that a tail self-call is replaced by parameter copies and a jump."""
+    module, func = create_count_down()
+    entry = func.cfg.blocks["entry"]
+    again = func.cfg.blocks["again"]
+    call_inst = again.instructions[1]
+
+    optimizer = TailCallOptimization()
+    assert optimizer.run_on_module(module)
+
+    assert isinstance(call_inst, Call) and call_inst.is_tail_call
+    assert optimizer.stats["recursive_tail_calls"] == 1
+    assert optimizer.stats["tail_calls_to_loops"] == 1
+
+    # A new entry block jumps to the old one, which is now the loop header
+    preheader = func.cfg.entry_block
+    assert preheader is not None and preheader is not entry
+    assert [str(inst) for inst in preheader.instructions] == ["goto entry"]
+    assert preheader.successors == [entry]
+
+    # acc is read after n is overwritten, so it is staged in a temporary first
+    n, acc = func.params
+    staged, assign_n, assign_acc, jump = again.instructions[1:]
+    assert isinstance(staged, Copy) and staged.source == acc
+    assert isinstance(assign_n, Copy) and assign_n.dest == n and assign_n.source == staged.dest
+    assert isinstance(assign_acc, Copy) and assign_acc.dest == acc
+    assert isinstance(jump, Jump) and jump.label == "entry"
+    assert again.successors == [entry]
+    assert not any(isinstance(inst, Call) for inst in again.instructions)
+
+
+def test_self_tail_call_loop_codegen() -> None:
+    """Test that the loop form compiles to a backward jump instead of a call."""
+    module, _ = create_count_down()
+    TailCallOptimization().run_on_module(module)
+
+    bytecode = RegisterBytecodeGenerator().generate(module)
+
+    chunk = bytecode.chunks[0]
+    names = [inst.name for inst in decode_instructions(bytes(chunk.bytecode), chunk.constants)]
+    assert "CALL_R" not in names
+    assert "TAIL_CALL_R" not in names
+    assert "JUMP_R" in names
+
+
+def test_tail_call_codegen() -> None:
+    """Test that a marked call to another function is emitted as TAIL_CALL_R."""
+    module = MIRModule("test")
+    func = MIRFunction("wrapper", [Variable("x", MIRType.INT)], MIRType.INT)
+    module.add_function(func)
+    block = func.cfg.get_or_create_block("entry")
+    func.cfg.set_entry_block(block)
+    result = func.new_temp(MIRType.INT)
+    block.add_instruction(Call(result, "helper", [Variable("x", MIRType.INT)], (1, 1)))
+    block.add_instruction(Return((1, 1), result))
+
+    TailCallOptimization().run_on_module(module)
+    bytecode = RegisterBytecodeGenerator().generate(module)
+
+    chunk = bytecode.chunks[0]
+    instructions = decode_instructions(bytes(chunk.bytecode), chunk.constants)
+    tail_call = next(inst for inst in instructions if inst.name == "TAIL_CALL_R")
+    assert tail_call.comment == "tail call helper"
+    assert "CALL_R" not in [inst.name for inst in instructions]
+
+
+def test_dead_copy_before_return() -> None:
+    """Test that a leftover copy of the call result does not hide the tail call."""
+    module = MIRModule("test")
+    func = MIRFunction("wrapper", [Variable("x", MIRType.INT)], MIRType.INT)
+    module.add_function(func)
+    block = func.cfg.get_or_create_block("entry")
+    func.cfg.set_entry_block(block)
+    result, unused = func.new_temp(MIRType.INT), func.new_temp(MIRType.INT)
+    call_inst = Call(result, "helper", [Variable("x", MIRType.INT)], (1, 1))
+    block.add_instruction(call_inst)
+    # GVN rewrites `return unused` to `return result` and leaves the copy
+    block.add_instruction(Copy(unused, result, (1, 1)))
+    block.add_instruction(Return((1, 1), result))
+
+    assert TailCallOptimization().run_on_module(module)
+    assert call_inst.is_tail_call
+
+
+def test_count_down_from_source_runs_as_loop() -> None:
+    """Test that a tail-recursive Utility compiled at level 2 loops instead of calling itself."""
+    source = """### **Utility**: `countdown`
+
+<details>
+<summary>Count down from n to zero.</summary>
+
+> If `n` is less than or equal to _0_:
+> > Give back _0_.
+> Else:
+> > Define `m` as Whole Number. \\
+> > Set `m` to `n` - _1_. \\
+> > Define `next` as Whole Number. \\
+> > Set `next` using `countdown` with `m`. \\
+> > Give back `next`.
+
+</details>
+
+#### Inputs:
+
+- `n` **as** Whole Number (required)
+
+#### Outputs:
+
+- `next` **as** Whole Number
+
+Define `result` as Whole Number.
+Set `result` using `countdown` with _5001_.
+Say `result`.
+"""
+    config = CompilerConfig.from_cli_options(opt_level="2")
+    context = CompilationContext(source_path=Path("countdown.md"), config=config)
+    context.source_content = source
+
+    result = CompilationPipeline(config=config).compile(context)
+
+    assert not result.has_errors(), f"Compilation failed: {result.errors}"
+    assert result.mir_module is not None and result.bytecode_module is not None
+    chunk = next(chunk for chunk in result.bytecode_module.chunks if chunk.name == "countdown")
+    instructions = decode_instructions(bytes(chunk.bytecode), chunk.constants)
+    assert "CALL_R" not in [inst.name for inst in instructions]
+    assert any(inst.target is not None and inst.target <= inst.index for inst in instructions)
+
+    interpreter = MIRInterpreter()
+    interpreter.interpret_module(result.mir_module)
+    assert interpreter.get_output() == ["0"]
+
+
+def test_void_return_after_value_call() -> None:
+    """Test that a void return does not forward the value of a non-void callee."""
+    module = MIRModule("test")
+    helper = MIRFunction("helper", [], MIRType.INT)
+    helper_block = helper.cfg.get_or_create_block("entry")
+    helper.cfg.set_entry_block(helper_block)
+    helper_block.add_instruction(Return((1, 1), Constant(1, MIRType.INT)))
+    module.add_function(helper)
+
+    func = MIRFunction("caller", [])
+    module.add_function(func)
+    block = func.cfg.get_or_create_block("entry")
+    func.cfg.set_entry_block(block)
+    call_inst = Call(func.new_temp(MIRType.INT), "helper", [], (1, 1))
+    block.add_instruction(call_inst)
+    block.add_instruction(Return((1, 1)))
+
+    optimizer = TailCallOptimization()
+
+    assert not optimizer.run_on_module(module)
+    assert not call_inst.is_tail_call
+
+
+def test_store_to_global_is_not_tail_position() -> None:
+    """Test that a call whose result is stored to a global is not a tail call."""
+    module = MIRModule("test")
+    func = MIRFunction("update", [])
+    module.add_function(func)
+    block = func.cfg.get_or_create_block("entry")
+    func.cfg.set_entry_block(block)
+    result = func.new_temp(MIRType.INT)
+    total = ScopedVariable("total", VariableScope.GLOBAL, MIRType.INT)
+    call_inst = Call(result, "helper", [], (1, 1))
+    block.add_instruction(call_inst)
+    block.add_instruction(StoreVar(total, result, (1, 1)))
+    block.add_instruction(Return((1, 1), total))
+
+    assert not TailCallOptimization().run_on_module(module)
+    assert not call_inst.is_tail_call
+
+
+def test_pass_manager_run() -> None:
+    """Test that statistics are kept when the pass manager initializes the pass."""
+    module, _ = create_count_down()
+    pass_manager = PassManager()
+    register_all_passes(pass_manager)
+
+    assert pass_manager.run_passes(module, ["tail-call"], 2)
+
+    assert pass_manager.get_statistics()["tail-call"]["tail_calls_to_loops"] == 1
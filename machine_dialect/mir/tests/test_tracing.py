@@ -0,0 +1,92 @@
+"""Tests for compilation tracing spans."""
+
+import json
+import tempfile
+from pathlib import Path
+
+from machine_dialect.mir.mir_function import MIRFunction
+from machine_dialect.mir.mir_module import MIRModule
+from machine_dialect.mir.optimize_mir import optimize_mir
+from machine_dialect.mir.reporting.tracing import Tracer
+
+
+class TestTracer:
+    """Test the span tracer."""
+
+    def test_disabled_tracer_records_nothing(self) -> None:
+        """Test that a disabled tracer does not record spans."""
+        tracer = Tracer()
+
+        with tracer.span("parsing"):
+            pass
+
+        assert tracer.spans == []
+        assert tracer.summary() == {}
+
+    def test_nested_spans(self) -> None:
+        """Test that nested spans are recorded with their categories."""
+        tracer = Tracer(enabled=True)
+
+        with tracer.span("optimization"):
+            with tracer.span("dce", "pass", function="main"):
+                pass
+            with tracer.span("dce", "pass", function="helper"):
+                pass
+
+        assert [span.name for span in tracer.spans] == ["optimization", "dce", "dce"]
+        outer, inner, _ = tracer.spans
+        assert outer.start_ns <= inner.start_ns
+        assert inner.start_ns + inner.duration_ns <= outer.start_ns + outer.duration_ns
+        assert inner.args == {"function": "main"}
+
+        summary = tracer.summary()
+        assert summary["phase"]["optimization"]["count"] == 1
+        assert summary["pass"]["dce"]["count"] == 2
+        assert summary["pass"]["dce"]["total_ms"] >= summary["pass"]["dce"]["max_ms"]
+
+    def test_span_closed_on_exception(self) -> None:
+        """Test that a span records its duration when the block raises."""
+        tracer = Tracer(enabled=True)
+
+        try:
+            with tracer.span("codegen"):
+                raise ValueError("boom")
+        except ValueError:
+            pass
+
+        assert len(tracer.spans) == 1
+        assert tracer.spans[0].duration_ns >= 0
+
+    def test_chrome_trace_export(self) -> None:
+        """Test Chrome trace-event export."""
+        tracer = Tracer(enabled=True)
+        with tracer.span("parsing"):
+            pass
+
+        with tempfile.TemporaryDirectory() as tmpdir:
+            path = Path(tmpdir) / "trace.json"
+            tracer.write_chrome_trace(path)
+            data = json.loads(path.read_text())
+
+        events = data["traceEvents"]
+        assert len(events) == 1
+        assert events[0]["name"] == "parsing"
+        assert events[0]["cat"] == "phase"
+        assert events[0]["ph"] == "X"
+        assert events[0]["dur"] >= 0
+
+
+class TestPassTracing:
+    """Test tracing integration with the pass manager."""
+
+    def test_function_passes_traced_per_function(self) -> None:
+        """Test that function passes produce one span per function."""
+        module = MIRModule("test")
+        module.add_function(MIRFunction("main"))
+        module.add_function(MIRFunction("helper"))
+
+        tracer = Tracer(enabled=True)
+        optimize_mir(module, custom_passes=["dce"], tracer=tracer)
+
+        dce_spans = [span for span in tracer.spans if span.category == "pass" and span.name == "dce"]
+        assert sorted(span.args["function"] for span in dce_spans) == ["helper", "main"]
@@ -1,15 +1,51 @@
 """Type stubs for machine_dialect_vm module."""
 
-from typing import Any
+from collections.abc import Iterator
+from typing import Any, overload
 
 __version__: str
 
+class ArrayView:
+    """Read-only view of a VM array; elements are converted on access."""
+
+    def __len__(self) -> int: ...
+    @overload
+    def __getitem__(self, index: int) -> Any: ...
+    @overload
+    def __getitem__(self, index: slice) -> ArrayView: ...
+    def __iter__(self) -> Iterator[Any]: ...
+    def to_list(self) -> list[Any]: ...
+    def to_buffer(self) -> memoryview: ...
+
+class DictView:
+    """Read-only view of a VM dictionary; values are converted on access."""
+
+    def __len__(self) -> int: ...
+    def __getitem__(self, key: str) -> Any: ...
+    def __contains__(self, key: str) -> bool: ...
+    def __iter__(self) -> Iterator[str]: ...
+    def get(self, key: str, default: Any = None) -> Any: ...
+    def keys(self) -> list[str]: ...
+    def values(self) -> list[Any]: ...
+    def items(self) -> list[tuple[str, Any]]: ...
+    def to_dict(self) -> dict[str, Any]: ...
+
 class RustVM:
-    """Rust VM for executing Machine Dialect™ bytecode."""
+    """Rust VM for executing Machine Dialect™ bytecode.
+
+    ``load_bytecode`` and ``execute`` release the GIL, so separate instances
+    run in parallel on separate threads. An instance must not be shared
+    between threads while it is running.
+    """
 
     def __init__(self) -> None: ...
     def set_debug(self, enabled: bool) -> None: ...
     def instruction_count(self) -> int: ...
+    def enable_profiling(self, track_pcs: bool = False) -> None: ...
+    def disable_profiling(self) -> None: ...
+    def get_profile(self) -> dict[str, Any] | None: ...
     def load_bytecode(self, path: str) -> None: ...
-    def execute(self) -> Any: ...
+    def execute(self, lazy: bool = False) -> Any: ...
     def reset(self) -> None: ...
+    def set_memo_capacity(self, capacity: int) -> None: ...
+    def get_memo_stats(self, name: str) -> dict[str, int] | None: ...
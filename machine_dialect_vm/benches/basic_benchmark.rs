@@ -25,6 +25,7 @@ fn create_simple_add_module() -> BytecodeModule {
         constants,
         instructions,
         function_table: HashMap::new(),
+        function_registers: HashMap::new(),
         global_names: Vec::new(),
     }
 }
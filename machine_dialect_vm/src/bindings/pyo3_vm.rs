@@ -2,15 +2,27 @@
 //!
 //! This module provides the Python interface to the Rust VM.
 
+use std::collections::HashMap;
 use std::path::PathBuf;
+use std::sync::Arc;
 
 use pyo3::prelude::*;
-use pyo3::exceptions::PyRuntimeError;
+use pyo3::conversion::IntoPyObjectExt;
+use pyo3::exceptions::{PyIndexError, PyKeyError, PyRuntimeError, PyTypeError};
+use pyo3::types::{PyBytes, PyDict, PyList, PyMemoryView, PySlice};
 
+use crate::values::{Value, DictKey};
 use crate::vm::VM;
 use crate::loader::BytecodeLoader;
 
 /// Rust VM exposed to Python
+///
+/// Thread safety: `load_bytecode` and `execute` release the GIL while they
+/// work, so programs on different `RustVM` instances run in parallel on
+/// separate threads. An instance runs one program at a time: calling any
+/// method of an instance while it is executing on another thread raises
+/// `RuntimeError` ("Already borrowed") instead of blocking. Give each thread
+/// its own VM, e.g. through `VMPool`.
 #[pyclass]
 pub struct RustVM {
     vm: VM,
@@ -26,31 +38,63 @@ impl RustVM {
         })
     }
 
-    /// Load bytecode from file
-    pub fn load_bytecode(&mut self, path: String) -> PyResult<()> {
+    /// Load bytecode from file (without holding the GIL)
+    pub fn load_bytecode(&mut self, py: Python<'_>, path: String) -> PyResult<()> {
         let path = PathBuf::from(path);
-        let (module, metadata) = BytecodeLoader::load_module(&path)
-            .map_err(|e| PyRuntimeError::new_err(format!("Failed to load bytecode: {}", e)))?;
-
-        self.vm.load_module(module, metadata)
-            .map_err(|e| PyRuntimeError::new_err(format!("Failed to load module: {}", e)))?;
-
-        Ok(())
+        let vm = &mut self.vm;
+        py.allow_threads(|| {
+            let (module, metadata) = BytecodeLoader::load_module(&path)
+                .map_err(|e| format!("Failed to load bytecode: {}", e))?;
+            vm.load_module(module, metadata)
+                .map_err(|e| format!("Failed to load module: {}", e))
+        })
+        .map_err(PyRuntimeError::new_err)
     }
 
     /// Execute the loaded bytecode
-    pub fn execute(&mut self) -> PyResult<Option<PyObject>> {
-        match self.vm.run() {
-            Ok(Some(value)) => {
-                Python::with_gil(|py| {
-                    Ok(Some(self.value_to_python(py, &value)))
-                })
-            }
+    ///
+    /// With `lazy`, arrays and dictionaries in the result are returned as
+    /// `ArrayView` / `DictView` objects that share the VM's data and convert
+    /// elements only when they are accessed, instead of being deep-copied
+    /// into lists and dicts.
+    ///
+    /// The GIL is released while the program runs and reacquired only to
+    /// convert the result.
+    #[pyo3(signature = (lazy=false))]
+    pub fn execute(&mut self, py: Python<'_>, lazy: bool) -> PyResult<Option<PyObject>> {
+        let vm = &mut self.vm;
+        match py.allow_threads(|| vm.run()) {
+            Ok(Some(value)) => Ok(Some(value_to_python(py, &value, lazy)?)),
             Ok(None) => Ok(None),
             Err(e) => Err(PyRuntimeError::new_err(format!("Runtime error: {}", e))),
         }
     }
 
+    /// Reset registers, globals, the call stack and counters, keeping the
+    /// loaded module and the VM's allocations
+    pub fn reset(&mut self) {
+        self.vm.reset();
+    }
+
+    /// Set the maximum number of results cached per memoized function
+    pub fn set_memo_capacity(&mut self, capacity: usize) {
+        self.vm.set_memo_capacity(capacity);
+    }
+
+    /// Get the memo table counters of a memoized function, or None if it
+    /// has not been called
+    pub fn get_memo_stats(&self, py: Python<'_>, name: &str) -> PyResult<Option<PyObject>> {
+        let Some(table) = self.vm.memo_table(name) else {
+            return Ok(None);
+        };
+        let stats = PyDict::new(py);
+        stats.set_item("entries", table.len())?;
+        stats.set_item("hits", table.hits)?;
+        stats.set_item("misses", table.misses)?;
+        stats.set_item("evictions", table.evictions)?;
+        Ok(Some(stats.unbind().into()))
+    }
+
     /// Set debug mode
     pub fn set_debug(&mut self, debug: bool) {
         self.vm.debug_mode = debug;
@@ -60,39 +104,265 @@ impl RustVM {
     pub fn instruction_count(&self) -> usize {
         self.vm.instruction_count
     }
+
+    /// Enable the execution profiler
+    #[pyo3(signature = (track_pcs=false))]
+    pub fn enable_profiling(&mut self, track_pcs: bool) {
+        self.vm.enable_profiling(track_pcs);
+    }
+
+    /// Disable the execution profiler
+    pub fn disable_profiling(&mut self) {
+        self.vm.disable_profiling();
+    }
+
+    /// Get the collected profile as a dictionary, or None if profiling is disabled
+    pub fn get_profile(&self, py: Python<'_>) -> PyResult<Option<PyObject>> {
+        let Some(profiler) = self.vm.profile() else {
+            return Ok(None);
+        };
+
+        let opcodes = PyDict::new(py);
+        for (opcode, count) in profiler.opcode_counts() {
+            opcodes.set_item(opcode, count)?;
+        }
+
+        let functions = PyDict::new(py);
+        for stats in profiler.functions() {
+            let entry = PyDict::new(py);
+            entry.set_item("calls", stats.calls)?;
+            entry.set_item("inclusive_instructions", stats.inclusive_instructions)?;
+            entry.set_item("exclusive_instructions", stats.exclusive_instructions)?;
+            functions.set_item(&stats.name, entry)?;
+        }
+
+        let profile = PyDict::new(py);
+        profile.set_item("total_instructions", profiler.total_instructions())?;
+        profile.set_item("opcodes", opcodes)?;
+        profile.set_item("functions", functions)?;
+        match profiler.pc_hits() {
+            Some(hits) => {
+                let pc_hits = PyDict::new(py);
+                for (pc, count) in hits {
+                    pc_hits.set_item(pc, count)?;
+                }
+                profile.set_item("pc_hits", pc_hits)?;
+            }
+            None => profile.set_item("pc_hits", py.None())?,
+        }
+
+        Ok(Some(profile.unbind().into()))
+    }
 }
 
-// Helper methods implementation (not exposed to Python)
-impl RustVM {
-    /// Convert a Rust value to Python
-    fn value_to_python(&self, py: Python<'_>, value: &crate::values::Value) -> PyObject {
-        use crate::values::Value;
-        use pyo3::types::{PyList, PyDict};
-        use pyo3::conversion::IntoPyObjectExt;
-
-        match value {
-            Value::Empty => py.None(),
-            Value::Bool(b) => b.into_py_any(py).unwrap(),
-            Value::Int(i) => i.into_py_any(py).unwrap(),
-            Value::Float(f) => f.into_py_any(py).unwrap(),
-            Value::String(s) => s.as_ref().into_py_any(py).unwrap(),
-            Value::URL(u) => u.as_ref().into_py_any(py).unwrap(),
-            Value::Function(f) => format!("function<{}>", f.name).into_py_any(py).unwrap(),
-            Value::Array(arr) => {
-                let items: Vec<PyObject> = arr.iter()
-                    .map(|v| self.value_to_python(py, v))
-                    .collect();
-                let list = PyList::new(py, items).unwrap();
-                list.unbind().into()
+/// Convert a Rust value to Python
+///
+/// Collections are deep-copied into lists and dicts, or wrapped in views
+/// when `lazy` is set.
+fn value_to_python(py: Python<'_>, value: &Value, lazy: bool) -> PyResult<PyObject> {
+    match value {
+        Value::Empty => Ok(py.None()),
+        Value::Bool(b) => b.into_py_any(py),
+        Value::Int(i) => i.into_py_any(py),
+        Value::Float(f) => f.into_py_any(py),
+        Value::String(s) => s.as_str().into_py_any(py),
+        Value::URL(u) => u.as_str().into_py_any(py),
+        Value::Function(f) => format!("function<{}>", f.name).into_py_any(py),
+        Value::Array(items) if lazy => Ok(Py::new(py, ArrayView { items: Arc::clone(items) })?.into_any()),
+        Value::Dict(items) if lazy => Ok(Py::new(py, DictView { items: Arc::clone(items) })?.into_any()),
+        Value::Array(items) => array_to_list(py, items, false),
+        Value::Dict(items) => {
+            let py_dict = PyDict::new(py);
+            for (key, val) in items.iter() {
+                py_dict.set_item(key.as_str(), value_to_python(py, val, false)?)?;
+            }
+            Ok(py_dict.unbind().into())
+        }
+    }
+}
+
+/// Convert array elements into a Python list
+fn array_to_list(py: Python<'_>, items: &[Value], lazy: bool) -> PyResult<PyObject> {
+    let items = items.iter()
+        .map(|v| value_to_python(py, v, lazy))
+        .collect::<PyResult<Vec<_>>>()?;
+    Ok(PyList::new(py, items)?.unbind().into())
+}
+
+/// Read-only sequence view of a VM array
+///
+/// Elements are converted when accessed; nested collections are views too.
+#[pyclass(frozen, sequence, module = "machine_dialect_vm")]
+pub struct ArrayView {
+    items: Arc<Vec<Value>>,
+}
+
+#[pymethods]
+impl ArrayView {
+    fn __len__(&self) -> usize {
+        self.items.len()
+    }
+
+    fn __getitem__(&self, py: Python<'_>, index: &Bound<'_, PyAny>) -> PyResult<PyObject> {
+        if let Ok(slice) = index.downcast::<PySlice>() {
+            let indices = slice.indices(self.items.len() as isize)?;
+            let mut position = indices.start;
+            let mut items = Vec::new();
+            for _ in 0..indices.slicelength {
+                items.push(self.items[position as usize].clone());
+                position += indices.step;
             }
-            Value::Dict(dict) => {
-                let py_dict = PyDict::new(py);
-                for (key, val) in dict.iter() {
-                    py_dict.set_item(key, self.value_to_python(py, val)).unwrap();
+            return Ok(Py::new(py, ArrayView { items: Arc::new(items) })?.into_any());
+        }
+
+        let index: isize = index.extract()?;
+        let len = self.items.len() as isize;
+        let position = if index < 0 { index + len } else { index };
+        if !(0..len).contains(&position) {
+            return Err(PyIndexError::new_err("array index out of range"));
+        }
+        value_to_python(py, &self.items[position as usize], true)
+    }
+
+    fn __iter__(&self) -> ValueIterator {
+        ValueIterator { items: Arc::clone(&self.items), position: 0 }
+    }
+
+    fn __eq__(&self, py: Python<'_>, other: &Bound<'_, PyAny>) -> PyResult<bool> {
+        self.to_list(py)?.bind(py).eq(other)
+    }
+
+    fn __repr__(&self, py: Python<'_>) -> PyResult<String> {
+        Ok(format!("ArrayView({})", self.to_list(py)?.bind(py).repr()?))
+    }
+
+    /// Copy the array into a list (recursively)
+    fn to_list(&self, py: Python<'_>) -> PyResult<PyObject> {
+        array_to_list(py, &self.items, false)
+    }
+
+    /// Export a homogeneous numeric array as a memoryview
+    ///
+    /// Integer arrays use format "q" and float arrays format "d", so the
+    /// result can be passed to `array`, `numpy.asarray` and other buffer
+    /// consumers without creating a Python object per element.
+    fn to_buffer<'py>(&self, py: Python<'py>) -> PyResult<Bound<'py, PyAny>> {
+        let mut bytes = Vec::with_capacity(self.items.len() * 8);
+        let format = match self.items.first() {
+            Some(Value::Float(_)) => "d",
+            _ => "q",
+        };
+        for item in self.items.iter() {
+            match (format, item) {
+                ("q", Value::Int(i)) => bytes.extend_from_slice(&i.to_ne_bytes()),
+                ("d", Value::Float(f)) => bytes.extend_from_slice(&f.to_ne_bytes()),
+                _ => {
+                    return Err(PyTypeError::new_err(
+                        "only arrays of all whole numbers or all floats can be exported as a buffer",
+                    ));
                 }
-                py_dict.unbind().into()
             }
         }
+        let view = PyMemoryView::from(&PyBytes::new(py, &bytes))?;
+        view.call_method1("cast", (format,))
+    }
+}
+
+/// Read-only mapping view of a VM dictionary
+///
+/// Values are converted when accessed; nested collections are views too.
+#[pyclass(frozen, mapping, module = "machine_dialect_vm")]
+pub struct DictView {
+    items: Arc<HashMap<DictKey, Value>>,
+}
+
+impl DictView {
+    fn lookup(&self, key: &str) -> Option<&Value> {
+        self.items.get(key)
+    }
+}
+
+#[pymethods]
+impl DictView {
+    fn __len__(&self) -> usize {
+        self.items.len()
+    }
+
+    fn __getitem__(&self, py: Python<'_>, key: &str) -> PyResult<PyObject> {
+        match self.lookup(key) {
+            Some(value) => value_to_python(py, value, true),
+            None => Err(PyKeyError::new_err(key.to_string())),
+        }
+    }
+
+    fn __contains__(&self, key: &str) -> bool {
+        self.lookup(key).is_some()
+    }
+
+    fn __iter__(&self) -> ValueIterator {
+        let keys = self.items.keys().map(|key| Value::String(Arc::clone(&key.0))).collect();
+        ValueIterator { items: Arc::new(keys), position: 0 }
+    }
+
+    fn __eq__(&self, py: Python<'_>, other: &Bound<'_, PyAny>) -> PyResult<bool> {
+        self.to_dict(py)?.bind(py).eq(other)
+    }
+
+    fn __repr__(&self, py: Python<'_>) -> PyResult<String> {
+        Ok(format!("DictView({})", self.to_dict(py)?.bind(py).repr()?))
+    }
+
+    /// Get a value, or `default` if the key is missing
+    #[pyo3(signature = (key, default=None))]
+    fn get(&self, py: Python<'_>, key: &str, default: Option<PyObject>) -> PyResult<Option<PyObject>> {
+        match self.lookup(key) {
+            Some(value) => Ok(Some(value_to_python(py, value, true)?)),
+            None => Ok(default),
+        }
+    }
+
+    /// List of keys
+    fn keys(&self) -> Vec<String> {
+        self.items.keys().map(|key| key.as_str().to_string()).collect()
+    }
+
+    /// List of values
+    fn values(&self, py: Python<'_>) -> PyResult<Vec<PyObject>> {
+        self.items.values().map(|value| value_to_python(py, value, true)).collect()
+    }
+
+    /// List of (key, value) pairs
+    fn items(&self, py: Python<'_>) -> PyResult<Vec<(String, PyObject)>> {
+        self.items.iter()
+            .map(|(key, value)| Ok((key.as_str().to_string(), value_to_python(py, value, true)?)))
+            .collect()
+    }
+
+    /// Copy the dictionary into a dict (recursively)
+    fn to_dict(&self, py: Python<'_>) -> PyResult<PyObject> {
+        value_to_python(py, &Value::Dict(Arc::clone(&self.items)), false)
+    }
+}
+
+/// Iterator over array elements or dictionary keys
+#[pyclass(module = "machine_dialect_vm")]
+pub struct ValueIterator {
+    items: Arc<Vec<Value>>,
+    position: usize,
+}
+
+#[pymethods]
+impl ValueIterator {
+    fn __iter__(slf: PyRef<'_, Self>) -> PyRef<'_, Self> {
+        slf
+    }
+
+    fn __next__(&mut self, py: Python<'_>) -> PyResult<Option<PyObject>> {
+        let Some(value) = self.items.get(self.position) else {
+            return Ok(None);
+        };
+        self.position += 1;
+        Ok(Some(value_to_python(py, value, true)?))
     }
 }
 
@@ -100,6 +370,8 @@ impl RustVM {
 #[pymodule]
 pub fn machine_dialect_vm(m: &Bound<'_, PyModule>) -> PyResult<()> {
     m.add_class::<RustVM>()?;
+    m.add_class::<ArrayView>()?;
+    m.add_class::<DictView>()?;
     m.add("__version__", crate::VM_VERSION)?;
     Ok(())
 }
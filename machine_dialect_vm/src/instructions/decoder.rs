@@ -2,7 +2,7 @@
 //!
 //! This module decodes bytecode into instructions.
 
-use crate::instructions::{Instruction, AssertType};
+use crate::instructions::{Instruction, AssertType, CompareOp};
 use crate::errors::{RuntimeError, Result};
 
 /// Instruction decoder
@@ -338,9 +338,95 @@ impl InstructionDecoder {
                 Ok(Instruction::DictLenR { dst, dict })
             }
 
+            // Array mutation
+            50 => { // ArrayPushR
+                let array = cursor.read_u8()?;
+                let value = cursor.read_u8()?;
+                Ok(Instruction::ArrayPushR { array, value })
+            }
+            51 => { // ArrayInsertR
+                let array = cursor.read_u8()?;
+                let index = cursor.read_u8()?;
+                let value = cursor.read_u8()?;
+                Ok(Instruction::ArrayInsertR { array, index, value })
+            }
+            52 => { // ArrayRemoveAtR
+                let array = cursor.read_u8()?;
+                let index = cursor.read_u8()?;
+                Ok(Instruction::ArrayRemoveAtR { array, index })
+            }
+            53 => { // ArrayFindR
+                let dst = cursor.read_u8()?;
+                let array = cursor.read_u8()?;
+                let value = cursor.read_u8()?;
+                Ok(Instruction::ArrayFindR { dst, array, value })
+            }
+            54 => { // ArrayClearR
+                let array = cursor.read_u8()?;
+                Ok(Instruction::ArrayClearR { array })
+            }
+
+            // Superinstructions
+            55 => { // CmpJumpR
+                let op = Self::compare_op(cursor.read_u8()?)?;
+                let left = cursor.read_u8()?;
+                let right = cursor.read_u8()?;
+                let offset = cursor.read_i32()?;
+                Ok(Instruction::CmpJumpR { op, left, right, offset })
+            }
+            56 => { // CmpConstR
+                let op = Self::compare_op(cursor.read_u8()?)?;
+                let dst = cursor.read_u8()?;
+                let left = cursor.read_u8()?;
+                let const_idx = cursor.read_u16()?;
+                Ok(Instruction::CmpConstR { op, dst, left, const_idx })
+            }
+            57 => { // CmpConstJumpR
+                let op = Self::compare_op(cursor.read_u8()?)?;
+                let left = cursor.read_u8()?;
+                let const_idx = cursor.read_u16()?;
+                let offset = cursor.read_i32()?;
+                Ok(Instruction::CmpConstJumpR { op, left, const_idx, offset })
+            }
+            58 => { // AddImmR
+                let dst = cursor.read_u8()?;
+                let src = cursor.read_u8()?;
+                let imm = cursor.read_u16()? as i16;
+                Ok(Instruction::AddImmR { dst, src, imm })
+            }
+            59 => { // IncR
+                let reg = cursor.read_u8()?;
+                Ok(Instruction::IncR { reg })
+            }
+            60 => { // TailCallR
+                let func = cursor.read_u8()?;
+                let arg_count = cursor.read_u8()?;
+                let mut args = Vec::with_capacity(arg_count as usize);
+                for _ in 0..arg_count {
+                    args.push(cursor.read_u8()?);
+                }
+                Ok(Instruction::TailCallR { func, args })
+            }
+            61 => { // MemoLookupR
+                let func_idx = cursor.read_u16()?;
+                let arg_count = cursor.read_u8()?;
+                Ok(Instruction::MemoLookupR { func_idx, arg_count })
+            }
+            62 => { // MemoStoreR
+                let func_idx = cursor.read_u16()?;
+                let arg_count = cursor.read_u8()?;
+                let src = cursor.read_u8()?;
+                Ok(Instruction::MemoStoreR { func_idx, arg_count, src })
+            }
+
             _ => Err(RuntimeError::InvalidOpcode(opcode).into()),
         }
     }
+
+    /// Decode the comparison operand of a fused compare instruction
+    fn compare_op(opcode: u8) -> Result<CompareOp> {
+        CompareOp::from_opcode(opcode).ok_or_else(|| RuntimeError::InvalidOpcode(opcode).into())
+    }
 }
 
 /// Cursor for reading bytecode
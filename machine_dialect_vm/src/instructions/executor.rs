@@ -63,6 +63,25 @@ impl InstructionExecutor {
             Instruction::DictValuesR { .. } => 47,
             Instruction::DictClearR { .. } => 48,
             Instruction::DictLenR { .. } => 49,
+
+            // Array mutation
+            Instruction::ArrayPushR { .. } => 50,
+            Instruction::ArrayInsertR { .. } => 51,
+            Instruction::ArrayRemoveAtR { .. } => 52,
+            Instruction::ArrayFindR { .. } => 53,
+            Instruction::ArrayClearR { .. } => 54,
+
+            // Superinstructions
+            Instruction::CmpJumpR { .. } => 55,
+            Instruction::CmpConstR { .. } => 56,
+            Instruction::CmpConstJumpR { .. } => 57,
+            Instruction::AddImmR { .. } => 58,
+            Instruction::IncR { .. } => 59,
+
+            Instruction::TailCallR { .. } => 60,
+
+            Instruction::MemoLookupR { .. } => 61,
+            Instruction::MemoStoreR { .. } => 62,
         }
     }
 }
@@ -6,6 +6,6 @@ mod opcodes;
 mod decoder;
 mod executor;
 
-pub use opcodes::{Instruction, AssertType};
+pub use opcodes::{Instruction, AssertType, CompareOp};
 pub use decoder::InstructionDecoder;
 pub use executor::InstructionExecutor;
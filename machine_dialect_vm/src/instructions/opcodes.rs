@@ -14,6 +14,35 @@ pub enum AssertType {
     Range { min: i64, max: i64 },
 }
 
+/// Comparison performed by the fused compare instructions
+///
+/// Encoded in bytecode as the opcode of the equivalent comparison
+/// instruction (`EqR` = 16 ... `GteR` = 21).
+#[derive(Clone, Copy, Debug, PartialEq)]
+pub enum CompareOp {
+    Eq,
+    Neq,
+    Lt,
+    Gt,
+    Lte,
+    Gte,
+}
+
+impl CompareOp {
+    /// Decode a comparison from its opcode byte
+    pub fn from_opcode(opcode: u8) -> Option<Self> {
+        match opcode {
+            16 => Some(CompareOp::Eq),
+            17 => Some(CompareOp::Neq),
+            18 => Some(CompareOp::Lt),
+            19 => Some(CompareOp::Gt),
+            20 => Some(CompareOp::Lte),
+            21 => Some(CompareOp::Gte),
+            _ => None,
+        }
+    }
+}
+
 /// Register-based instruction set
 #[derive(Clone, Debug)]
 pub enum Instruction {
@@ -140,6 +169,40 @@ pub enum Instruction {
     DictClearR { dict: u8 },
     /// Dictionary length: r[dst] = len(r[dict])
     DictLenR { dst: u8, dict: u8 },
+
+    // Array Mutation
+    /// Array push: r[array].push(r[value])
+    ArrayPushR { array: u8, value: u8 },
+    /// Array insert: r[array].insert(r[index], r[value])
+    ArrayInsertR { array: u8, index: u8, value: u8 },
+    /// Array remove at index: r[array].remove(r[index])
+    ArrayRemoveAtR { array: u8, index: u8 },
+    /// Array find: r[dst] = index of r[value] in r[array], or -1
+    ArrayFindR { dst: u8, array: u8, value: u8 },
+    /// Array clear: r[array].clear()
+    ArrayClearR { array: u8 },
+
+    // Superinstructions
+    /// Compare and jump: if r[left] op r[right] then pc += offset
+    CmpJumpR { op: CompareOp, left: u8, right: u8, offset: i32 },
+    /// Compare with constant: r[dst] = r[left] op constants[idx]
+    CmpConstR { op: CompareOp, dst: u8, left: u8, const_idx: u16 },
+    /// Compare with constant and jump: if r[left] op constants[idx] then pc += offset
+    CmpConstJumpR { op: CompareOp, left: u8, const_idx: u16, offset: i32 },
+    /// Add immediate: r[dst] = r[src] + imm
+    AddImmR { dst: u8, src: u8, imm: i16 },
+    /// Increment: r[reg] = r[reg] + 1
+    IncR { reg: u8 },
+
+    // Tail calls
+    /// Tail call: return call r[func](r[args]), reusing the current frame
+    TailCallR { func: u8, args: Vec<u8> },
+
+    // Memoization
+    /// Return the cached result of the current function for r[0..arg_count], if any
+    MemoLookupR { func_idx: u16, arg_count: u8 },
+    /// Cache r[src] as the result of the current function for r[0..arg_count]
+    MemoStoreR { func_idx: u16, arg_count: u8, src: u8 },
 }
 
 impl Instruction {
@@ -215,6 +278,25 @@ impl Instruction {
             Instruction::DictValuesR { .. } => 3,    // opcode + dst + dict
             Instruction::DictClearR { .. } => 2,     // opcode + dict
             Instruction::DictLenR { .. } => 3,       // opcode + dst + dict
+
+            // Array mutation
+            Instruction::ArrayPushR { .. } => 3,     // opcode + array + value
+            Instruction::ArrayInsertR { .. } => 4,   // opcode + array + index + value
+            Instruction::ArrayRemoveAtR { .. } => 3, // opcode + array + index
+            Instruction::ArrayFindR { .. } => 4,     // opcode + dst + array + value
+            Instruction::ArrayClearR { .. } => 2,    // opcode + array
+
+            // Superinstructions
+            Instruction::CmpJumpR { .. } => 8,       // opcode + op + left + right + offset(i32)
+            Instruction::CmpConstR { .. } => 6,      // opcode + op + dst + left + const_idx(u16)
+            Instruction::CmpConstJumpR { .. } => 9,  // opcode + op + left + const_idx(u16) + offset(i32)
+            Instruction::AddImmR { .. } => 5,        // opcode + dst + src + imm(i16)
+            Instruction::IncR { .. } => 2,           // opcode + reg
+
+            Instruction::TailCallR { args, .. } => 3 + args.len(), // opcode + func + arg_count + args
+
+            Instruction::MemoLookupR { .. } => 4,   // opcode + func_idx(u16) + arg_count
+            Instruction::MemoStoreR { .. } => 5,    // opcode + func_idx(u16) + arg_count + src
         }
     }
 }
@@ -7,10 +7,13 @@ use std::fs;
 use std::collections::HashMap;
 
 use crate::values::ConstantPool;
-use crate::instructions::Instruction;
+use crate::instructions::{Instruction, CompareOp};
 use crate::errors::LoadError;
 use super::metadata::MetadataFile;
 
+/// Header flag: function table entries carry the function's register count
+pub const FLAG_FUNCTION_REGISTERS: u32 = 0x0002;
+
 /// Bytecode module
 #[derive(Clone, Debug)]
 pub struct BytecodeModule {
@@ -26,6 +29,8 @@ pub struct BytecodeModule {
     pub instructions: Vec<Instruction>,
     /// Function table
     pub function_table: HashMap<String, usize>,
+    /// Number of registers each function uses (its register window size)
+    pub function_registers: HashMap<String, usize>,
     /// Global names
     pub global_names: Vec<String>,
 }
@@ -91,7 +96,8 @@ impl BytecodeLoader {
 
         // Read function table
         cursor.seek(function_offset)?;
-        let function_table = Self::parse_functions(&mut cursor)?;
+        let (function_table, function_registers) =
+            Self::parse_functions(&mut cursor, flags & FLAG_FUNCTION_REGISTERS != 0)?;
 
         // Read instructions
         cursor.seek(instruction_offset)?;
@@ -108,6 +114,7 @@ impl BytecodeLoader {
             constants,
             instructions,
             function_table,
+            function_registers,
             global_names,
         })
     }
@@ -147,17 +154,27 @@ impl BytecodeLoader {
     }
 
     /// Parse function table
-    fn parse_functions(cursor: &mut Cursor) -> std::result::Result<HashMap<String, usize>, LoadError> {
+    ///
+    /// Each entry is a name and an instruction offset, followed by a u16
+    /// register count when `with_registers` is set.
+    fn parse_functions(
+        cursor: &mut Cursor,
+        with_registers: bool,
+    ) -> std::result::Result<(HashMap<String, usize>, HashMap<String, usize>), LoadError> {
         let count = cursor.read_u32()? as usize;
         let mut table = HashMap::new();
+        let mut registers = HashMap::new();
 
         for _ in 0..count {
             let name = cursor.read_string()?;
             let offset = cursor.read_u32()? as usize;
+            if with_registers {
+                registers.insert(name.clone(), cursor.read_u16()? as usize);
+            }
             table.insert(name, offset);
         }
 
-        Ok(table)
+        Ok((table, registers))
     }
 
     /// Parse instructions
@@ -449,11 +466,97 @@ impl BytecodeLoader {
                 Ok(Instruction::DictLenR { dst, dict })
             }
 
+            // Array mutation
+            50 => { // ArrayPushR
+                let array = cursor.read_u8()?;
+                let value = cursor.read_u8()?;
+                Ok(Instruction::ArrayPushR { array, value })
+            }
+            51 => { // ArrayInsertR
+                let array = cursor.read_u8()?;
+                let index = cursor.read_u8()?;
+                let value = cursor.read_u8()?;
+                Ok(Instruction::ArrayInsertR { array, index, value })
+            }
+            52 => { // ArrayRemoveAtR
+                let array = cursor.read_u8()?;
+                let index = cursor.read_u8()?;
+                Ok(Instruction::ArrayRemoveAtR { array, index })
+            }
+            53 => { // ArrayFindR
+                let dst = cursor.read_u8()?;
+                let array = cursor.read_u8()?;
+                let value = cursor.read_u8()?;
+                Ok(Instruction::ArrayFindR { dst, array, value })
+            }
+            54 => { // ArrayClearR
+                let array = cursor.read_u8()?;
+                Ok(Instruction::ArrayClearR { array })
+            }
+
+            // Superinstructions
+            55 => { // CmpJumpR
+                let op = Self::compare_op(cursor.read_u8()?)?;
+                let left = cursor.read_u8()?;
+                let right = cursor.read_u8()?;
+                let offset = cursor.read_i32()?;
+                Ok(Instruction::CmpJumpR { op, left, right, offset })
+            }
+            56 => { // CmpConstR
+                let op = Self::compare_op(cursor.read_u8()?)?;
+                let dst = cursor.read_u8()?;
+                let left = cursor.read_u8()?;
+                let const_idx = cursor.read_u16()?;
+                Ok(Instruction::CmpConstR { op, dst, left, const_idx })
+            }
+            57 => { // CmpConstJumpR
+                let op = Self::compare_op(cursor.read_u8()?)?;
+                let left = cursor.read_u8()?;
+                let const_idx = cursor.read_u16()?;
+                let offset = cursor.read_i32()?;
+                Ok(Instruction::CmpConstJumpR { op, left, const_idx, offset })
+            }
+            58 => { // AddImmR
+                let dst = cursor.read_u8()?;
+                let src = cursor.read_u8()?;
+                let imm = cursor.read_u16()? as i16;
+                Ok(Instruction::AddImmR { dst, src, imm })
+            }
+            59 => { // IncR
+                let reg = cursor.read_u8()?;
+                Ok(Instruction::IncR { reg })
+            }
+            60 => { // TailCallR
+                let func = cursor.read_u8()?;
+                let arg_count = cursor.read_u8()?;
+                let mut args = Vec::with_capacity(arg_count as usize);
+                for _ in 0..arg_count {
+                    args.push(cursor.read_u8()?);
+                }
+                Ok(Instruction::TailCallR { func, args })
+            }
+            61 => { // MemoLookupR
+                let func_idx = cursor.read_u16()?;
+                let arg_count = cursor.read_u8()?;
+                Ok(Instruction::MemoLookupR { func_idx, arg_count })
+            }
+            62 => { // MemoStoreR
+                let func_idx = cursor.read_u16()?;
+                let arg_count = cursor.read_u8()?;
+                let src = cursor.read_u8()?;
+                Ok(Instruction::MemoStoreR { func_idx, arg_count, src })
+            }
+
             // For now, return error for unimplemented opcodes
             _ => Err(LoadError::InvalidOpcode(opcode)),
         }
     }
 
+    /// Parse the comparison operand of a fused compare instruction
+    fn compare_op(opcode: u8) -> std::result::Result<CompareOp, LoadError> {
+        CompareOp::from_opcode(opcode).ok_or(LoadError::InvalidOpcode(opcode))
+    }
+
     /// Parse global names
     #[allow(dead_code)]
     fn parse_global_names(cursor: &mut Cursor) -> std::result::Result<Vec<String>, LoadError> {
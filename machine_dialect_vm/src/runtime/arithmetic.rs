@@ -5,6 +5,7 @@
 use std::sync::Arc;
 
 use crate::values::Value;
+use crate::instructions::CompareOp;
 use crate::errors::{RuntimeError, Result};
 
 /// Arithmetic operations implementation
@@ -216,6 +217,18 @@ impl ArithmeticOps {
     pub fn gte(left: &Value, right: &Value) -> Result<bool> {
         Self::lte(right, left)
     }
+
+    /// Apply the comparison of a fused compare instruction
+    pub fn compare(op: CompareOp, left: &Value, right: &Value) -> Result<bool> {
+        match op {
+            CompareOp::Eq => Ok(Self::eq(left, right)),
+            CompareOp::Neq => Ok(Self::neq(left, right)),
+            CompareOp::Lt => Self::lt(left, right),
+            CompareOp::Gt => Self::gt(left, right),
+            CompareOp::Lte => Self::lte(left, right),
+            CompareOp::Gte => Self::gte(left, right),
+        }
+    }
 }
 
 #[cfg(test)]
@@ -15,7 +15,10 @@ impl StringOps {
     pub fn concat(left: &Value, right: &Value) -> Result<Value> {
         match (left, right) {
             (Value::String(a), Value::String(b)) => {
-                Ok(Value::String(Arc::new(format!("{}{}", a, b))))
+                let mut result = String::with_capacity(a.len() + b.len());
+                result.push_str(a);
+                result.push_str(b);
+                Ok(Value::String(Arc::new(result)))
             }
             _ => {
                 // Convert to strings and concatenate
@@ -26,6 +29,19 @@ impl StringOps {
         }
     }
 
+    /// Append a value to a string in place
+    ///
+    /// The buffer is reused when the string is not shared (otherwise it is
+    /// copied once), so building a string with repeated appends takes
+    /// amortized linear time instead of copying the prefix every time.
+    pub fn append(target: &mut Arc<String>, value: &Value) {
+        let buffer = Arc::make_mut(target);
+        match value {
+            Value::String(s) => buffer.push_str(s),
+            _ => buffer.push_str(&value.to_string()),
+        }
+    }
+
     /// Get string length
     pub fn len(value: &Value) -> Result<Value> {
         match value {
@@ -60,6 +76,23 @@ mod tests {
         }
     }
 
+    #[test]
+    fn test_append() {
+        let mut text = Arc::new("hello".to_string());
+        let shared = Arc::clone(&text);
+
+        // A shared string is copied, leaving the other owner untouched
+        StringOps::append(&mut text, &Value::String(Arc::new(" world".to_string())));
+        assert_eq!(text.as_str(), "hello world");
+        assert_eq!(shared.as_str(), "hello");
+
+        // A unique string is extended in place
+        let before = Arc::as_ptr(&text);
+        StringOps::append(&mut text, &Value::Int(42));
+        assert_eq!(text.as_str(), "hello world42");
+        assert_eq!(Arc::as_ptr(&text), before);
+    }
+
     #[test]
     fn test_len() {
         let s = Value::String(Arc::new("hello".to_string()));
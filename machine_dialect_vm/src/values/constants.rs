@@ -2,6 +2,7 @@
 //!
 //! This module handles the constant pool for bytecode modules.
 
+use std::collections::HashMap;
 use std::sync::Arc;
 
 use crate::values::{Value, FunctionRef};
@@ -72,6 +73,23 @@ impl ConstantPool {
         self.constants.len()
     }
 
+    /// Convert every constant to a runtime value
+    ///
+    /// Equal string constants are interned: they share one `Arc`, so the
+    /// values can be compared by pointer and used as dictionary keys without
+    /// copying the text.
+    pub fn to_values(&self) -> Vec<Value> {
+        let mut interned: HashMap<&str, Arc<String>> = HashMap::new();
+        self.constants.iter()
+            .map(|constant| match constant {
+                ConstantValue::String(s) => Value::String(Arc::clone(
+                    interned.entry(s.as_str()).or_insert_with(|| Arc::new(s.clone()))
+                )),
+                _ => constant.to_value(),
+            })
+            .collect()
+    }
+
     /// Check if the pool is empty
     pub fn is_empty(&self) -> bool {
         self.constants.is_empty()
@@ -129,4 +147,25 @@ mod tests {
             _ => panic!("Expected String(hello)"),
         }
     }
+
+    #[test]
+    fn test_to_values_interns_strings() {
+        let mut pool = ConstantPool::new();
+        pool.add_string("key".to_string());
+        pool.add_int(1);
+        pool.add_string("key".to_string());
+        pool.add_string("other".to_string());
+
+        let values = pool.to_values();
+
+        assert_eq!(values[1], Value::Int(1));
+        match (&values[0], &values[2], &values[3]) {
+            (Value::String(a), Value::String(b), Value::String(c)) => {
+                assert!(Arc::ptr_eq(a, b));
+                assert!(!Arc::ptr_eq(a, c));
+                assert_eq!(c.as_str(), "other");
+            }
+            _ => panic!("Expected strings"),
+        }
+    }
 }
@@ -6,6 +6,6 @@ mod value;
 mod types;
 mod constants;
 
-pub use value::{Value, FunctionRef};
+pub use value::{Value, FunctionRef, DictKey};
 pub use types::Type;
 pub use constants::{ConstantPool, ConstantValue};
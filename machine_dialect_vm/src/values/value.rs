@@ -3,6 +3,7 @@
 //! This module defines the Value enum which represents all possible values
 //! in the Machine Dialect™ VM.
 
+use std::borrow::Borrow;
 use std::collections::HashMap;
 use std::fmt;
 use std::sync::Arc;
@@ -21,6 +22,32 @@ pub struct FunctionRef {
     pub name: String,
 }
 
+/// Dictionary key
+///
+/// Keys share the string value they were set with, and lookups borrow
+/// them as `&str`, so neither setting nor looking up a key copies it.
+#[derive(Clone, Debug, PartialEq, Eq, Hash)]
+pub struct DictKey(pub Arc<String>);
+
+impl DictKey {
+    /// Get the key as a string slice
+    pub fn as_str(&self) -> &str {
+        self.0.as_str()
+    }
+}
+
+impl Borrow<str> for DictKey {
+    fn borrow(&self) -> &str {
+        self.0.as_str()
+    }
+}
+
+impl fmt::Display for DictKey {
+    fn fmt(&self, f: &mut fmt::Formatter<'_>) -> fmt::Result {
+        f.write_str(self.as_str())
+    }
+}
+
 /// Value representation using tagged union
 #[derive(Clone, Debug)]
 pub enum Value {
@@ -41,7 +68,7 @@ pub enum Value {
     /// Array value (reference-counted)
     Array(Arc<Vec<Value>>),
     /// Dictionary value (reference-counted)
-    Dict(Arc<HashMap<String, Value>>),
+    Dict(Arc<HashMap<DictKey, Value>>),
 }
 
 impl Value {
@@ -200,6 +227,16 @@ mod tests {
         assert!(Value::String(Arc::new("test".to_string())).is_truthy());
     }
 
+    #[test]
+    fn test_dict_key_lookup_by_str() {
+        let key = Arc::new("name".to_string());
+        let mut items = HashMap::new();
+        items.insert(DictKey(Arc::clone(&key)), Value::Int(1));
+
+        assert_eq!(items.get("name"), Some(&Value::Int(1)));
+        assert!(Arc::ptr_eq(&items.keys().next().unwrap().0, &key));
+    }
+
     #[test]
     fn test_equality() {
         assert_eq!(Value::Int(42), Value::Int(42));
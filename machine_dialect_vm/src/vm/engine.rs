@@ -2,15 +2,37 @@
 //!
 //! This module implements the main VM execution engine.
 
+use std::collections::HashMap;
 use std::sync::Arc;
 
-use crate::values::{Value, Type, ConstantPool};
-use crate::vm::{RegisterFile, VMState};
-use crate::instructions::{Instruction, AssertType};
+use crate::values::{Value, Type, ConstantPool, ConstantValue, DictKey};
+use crate::vm::{RegisterFile, VMState, Profiler, MemoKey, MemoTable, DEFAULT_MEMO_CAPACITY};
+use crate::instructions::{Instruction, AssertType, InstructionExecutor};
 use crate::runtime::{ArithmeticOps, LogicOps, StringOps};
 use crate::errors::{RuntimeError, Result, StackFrame};
 use crate::loader::{BytecodeModule, MetadataFile};
 
+/// Global slot marker for constants that no global instruction names
+const UNRESOLVED_GLOBAL: u32 = u32::MAX;
+
+/// Resolved function entry
+#[derive(Clone, Copy, Debug)]
+struct FunctionEntry {
+    /// Code offset of the first instruction
+    offset: usize,
+    /// Register window size
+    frame_size: usize,
+}
+
+/// Inline cache of a call site's last callee
+#[derive(Clone, Debug)]
+struct CallCache {
+    /// Callee name, kept alive so pointer identity stays meaningful
+    name: Arc<String>,
+    /// Resolved callee
+    entry: FunctionEntry,
+}
+
 /// Virtual Machine
 pub struct VM {
     /// Register file
@@ -19,16 +41,30 @@ pub struct VM {
     pub state: VMState,
     /// Loaded module
     pub module: Option<BytecodeModule>,
-    /// Instructions
-    pub instructions: Vec<Instruction>,
+    /// Instructions, shared so dispatch can borrow them while mutating the VM
+    pub instructions: Arc<[Instruction]>,
     /// Constants
     pub constants: ConstantPool,
+    /// Constants converted to values at load time, with strings interned
+    constant_values: Vec<Value>,
+    /// Global slot for each constant index used as a global name
+    global_slots: Vec<u32>,
+    /// Functions by name, with their register window sizes
+    functions: HashMap<String, FunctionEntry>,
+    /// Per-instruction inline cache for call sites
+    call_caches: Vec<Option<CallCache>>,
+    /// Memo tables of memoized functions, by function name constant
+    memo_tables: HashMap<u16, MemoTable>,
+    /// Maximum number of results cached per function
+    memo_capacity: usize,
     /// Metadata
     pub metadata: Option<MetadataFile>,
     /// Debug mode
     pub debug_mode: bool,
     /// Instruction count (for profiling)
     pub instruction_count: usize,
+    /// Execution profiler (None when profiling is disabled)
+    pub profiler: Option<Profiler>,
 }
 
 impl VM {
@@ -38,25 +74,121 @@ impl VM {
             registers: RegisterFile::new(),
             state: VMState::new(),
             module: None,
-            instructions: Vec::new(),
+            instructions: Arc::from(Vec::new()),
             constants: ConstantPool::new(),
+            constant_values: Vec::new(),
+            global_slots: Vec::new(),
+            functions: HashMap::new(),
+            call_caches: Vec::new(),
+            memo_tables: HashMap::new(),
+            memo_capacity: DEFAULT_MEMO_CAPACITY,
             metadata: None,
             debug_mode: false,
             instruction_count: 0,
+            profiler: None,
         }
     }
 
+    /// Enable the execution profiler
+    ///
+    /// Any previously collected profile is discarded. When `track_pcs` is set,
+    /// per-instruction hit counts are collected in addition to the opcode and
+    /// function counters.
+    pub fn enable_profiling(&mut self, track_pcs: bool) {
+        self.profiler = Some(Profiler::new(track_pcs));
+    }
+
+    /// Disable the execution profiler and discard its data
+    pub fn disable_profiling(&mut self) {
+        self.profiler = None;
+    }
+
+    /// Get the collected profile, if profiling is enabled
+    pub fn profile(&self) -> Option<&Profiler> {
+        self.profiler.as_ref()
+    }
+
+    /// Set the maximum number of results cached per memoized function
+    ///
+    /// Cached results are discarded.
+    pub fn set_memo_capacity(&mut self, capacity: usize) {
+        self.memo_capacity = capacity;
+        self.memo_tables.clear();
+    }
+
+    /// Get the memo table of a memoized function, if it has been called
+    pub fn memo_table(&self, name: &str) -> Option<&MemoTable> {
+        self.memo_tables.iter()
+            .find(|(&idx, _)| matches!(self.constants.get(idx), Some(ConstantValue::String(s)) if s == name))
+            .map(|(_, table)| table)
+    }
+
     /// Load a module and metadata
-    pub fn load_module(&mut self, module: BytecodeModule, metadata: Option<MetadataFile>) -> Result<()> {
-        self.instructions = module.instructions.clone();
-        self.constants = module.constants.clone();
+    ///
+    /// The module's instructions and constants are moved into the VM, so
+    /// `self.module` keeps only the function table and the other metadata.
+    /// Names are resolved here: global names to dense slots and function
+    /// names to code offsets, so execution does not hash strings.
+    pub fn load_module(&mut self, mut module: BytecodeModule, metadata: Option<MetadataFile>) -> Result<()> {
+        self.instructions = Arc::from(std::mem::take(&mut module.instructions));
+        self.constants = std::mem::take(&mut module.constants);
+        self.constant_values = self.constants.to_values();
+
+        self.functions = module.function_table.iter()
+            .map(|(name, &offset)| {
+                // Modules without register counts get a full window
+                let frame_size = module.function_registers
+                    .get(name)
+                    .copied()
+                    .unwrap_or(crate::MAX_REGISTERS);
+                (name.clone(), FunctionEntry { offset, frame_size })
+            })
+            .collect();
+        self.call_caches = vec![None; self.instructions.len()];
+        self.memo_tables.clear();
+
+        self.state.reset();
+        self.state.globals = crate::vm::Globals::new();
+        for name in &module.global_names {
+            self.state.globals.slot(name);
+        }
+        self.resolve_globals();
         self.module = Some(module);
         self.metadata = metadata;
-        self.state.reset();
         self.registers.clear();
         Ok(())
     }
 
+    /// Reset execution state so the loaded module can run again
+    ///
+    /// Registers, globals, the call stack and the instruction and profile
+    /// counters are cleared. The loaded module, its resolved names, call
+    /// caches and memo tables, and every buffer's capacity are kept, so a
+    /// reset VM is cheaper to reuse than a new one. Memoized functions only
+    /// depend on their arguments, so their cached results stay valid.
+    pub fn reset(&mut self) {
+        self.state.reset();
+        self.registers.clear();
+        self.instruction_count = 0;
+        if let Some(profiler) = self.profiler.as_mut() {
+            profiler.reset();
+        }
+    }
+
+    /// Assign a global slot to every constant named by a global load or store
+    fn resolve_globals(&mut self) {
+        self.global_slots = vec![UNRESOLVED_GLOBAL; self.constants.len()];
+        for instruction in self.instructions.iter() {
+            let name_idx = match *instruction {
+                Instruction::LoadGlobalR { name_idx, .. } | Instruction::StoreGlobalR { name_idx, .. } => name_idx,
+                _ => continue,
+            };
+            if let Some(ConstantValue::String(name)) = self.constants.get(name_idx) {
+                self.global_slots[name_idx as usize] = self.state.globals.slot(name) as u32;
+            }
+        }
+    }
+
     /// Run the VM until completion
     pub fn run(&mut self) -> Result<Option<Value>> {
         if self.module.is_none() {
@@ -72,15 +204,33 @@ impl VM {
             // Otherwise, start at PC = 0 (for modules without explicit main)
         }
 
+        if let Some(profiler) = self.profiler.as_mut() {
+            profiler.enter_function("main");
+        }
+
         let mut last_value = None;
 
-        while self.state.is_running() && self.state.pc < self.instructions.len() {
-            let result = self.step()?;
+        // Borrow instructions from a local handle for the whole run
+        let code = Arc::clone(&self.instructions);
+        while self.state.is_running() && self.state.pc < code.len() {
+            let result = match self.dispatch(&code[self.state.pc]) {
+                Ok(result) => result,
+                Err(e) => {
+                    if let Some(profiler) = self.profiler.as_mut() {
+                        profiler.finish();
+                    }
+                    return Err(e);
+                }
+            };
             if let Some(value) = result {
                 last_value = Some(value);
             }
         }
 
+        if let Some(profiler) = self.profiler.as_mut() {
+            profiler.finish();
+        }
+
         Ok(last_value)
     }
 
@@ -91,7 +241,15 @@ impl VM {
             return Ok(None);
         }
 
-        let inst = self.instructions[self.state.pc].clone();
+        let code = Arc::clone(&self.instructions);
+        self.dispatch(&code[self.state.pc])
+    }
+
+    /// Execute the instruction at the program counter
+    fn dispatch(&mut self, inst: &Instruction) -> Result<Option<Value>> {
+        if let Some(profiler) = self.profiler.as_mut() {
+            profiler.record_instruction(self.state.pc, InstructionExecutor::get_opcode(inst));
+        }
         self.state.pc += 1;
         self.instruction_count += 1;
 
@@ -103,13 +261,11 @@ impl VM {
     }
 
     /// Execute an instruction
-    fn execute_instruction(&mut self, inst: Instruction) -> Result<Option<Value>> {
-        match inst {
+    fn execute_instruction(&mut self, inst: &Instruction) -> Result<Option<Value>> {
+        match *inst {
             // Basic Operations
             Instruction::LoadConstR { dst, const_idx } => {
-                let value = self.constants.get(const_idx)
-                    .ok_or(RuntimeError::InvalidConstant(const_idx))?
-                    .to_value();
+                let value = self.constant_value(const_idx)?.clone();
 
                 if self.debug_mode {
                     println!("  LoadConstR: r{} = constants[{}] = {:?}", dst, const_idx, value);
@@ -124,17 +280,15 @@ impl VM {
             }
 
             Instruction::LoadGlobalR { dst, name_idx } => {
-                let name = self.get_string_constant(name_idx)?;
-                let value = self.state.globals.get(&name)
-                    .cloned()
-                    .unwrap_or(Value::Empty);
+                let slot = self.global_slot(name_idx)?;
+                let value = self.state.globals.load(slot);
                 self.registers.set(dst, value);
             }
 
             Instruction::StoreGlobalR { src, name_idx } => {
-                let name = self.get_string_constant(name_idx)?;
+                let slot = self.global_slot(name_idx)?;
                 let value = self.registers.get(src).clone();
-                self.state.globals.insert(name, value);
+                self.state.globals.store(slot, value);
             }
 
             // Type Operations
@@ -159,6 +313,9 @@ impl VM {
 
             // Arithmetic
             Instruction::AddR { dst, left, right } => {
+                if dst == left && self.append_string(dst, right, true) {
+                    return Ok(None);
+                }
                 let lval = self.registers.get(left);
                 let rval = self.registers.get(right);
                 let result = ArithmeticOps::add(lval, rval)?;
@@ -298,103 +455,91 @@ impl VM {
                 }
             }
 
-            Instruction::CallR { func, args, dst } => {
+            Instruction::CallR { func, ref args, dst } => {
                 if self.debug_mode {
                     println!("CallR: func=r{}, dst=r{}, args={:?}", func, dst, args);
                     for (i, &arg_reg) in args.iter().enumerate() {
                         println!("  arg[{}]: r{} = {:?}", i, arg_reg, self.registers.get(arg_reg));
                     }
                 }
-                // Get function entry point
-                let func_value = self.registers.get(func);
-
-                // For now, treat the function register as containing an index into the function table
-                // In the future, this could be a FunctionRef value
-                let func_name = match func_value {
-                    Value::String(name) => name.as_ref().clone(),
-                    Value::Int(idx) => {
-                        // Look up function by index in function table
-                        if let Some(module) = &self.module {
-                            module.function_table.iter()
-                                .find(|(_, &offset)| offset == *idx as usize)
-                                .map(|(name, _)| name.clone())
-                                .unwrap_or_else(|| format!("func_{}", idx))
-                        } else {
-                            return Err(RuntimeError::UndefinedFunction(format!("index {}", idx)));
-                        }
-                    }
-                    _ => {
-                        return Err(RuntimeError::UndefinedFunction("no function specified".to_string()));
-                    }
-                };
+                let func_name = self.callee_name(func)?;
+                let entry = self.resolve_call(self.state.pc - 1, &func_name)?;
 
-                // Look up function in function table
-                if let Some(module) = &self.module {
-                    if let Some(&func_offset) = module.function_table.get(&func_name) {
-                        // Save current state
-                        let saved_pc = self.state.pc;
-                        let saved_fp = self.state.fp;
-
-                        // Create new call frame
-                        let mut frame = crate::vm::CallFrame::new(saved_pc, saved_fp);
-
-                        // Save the destination register for the return value
-                        frame.return_dst = Some(dst);
-
-                        // Save ALL registers that might be used by the called function
-                        // We need to save all registers because recursive calls can use many registers
-                        // TODO: Optimize this by only saving registers actually used by the target function
-                        for i in 0..64 {  // Save up to 64 registers (should be enough for most functions)
-                            frame.saved_registers.push((i as u8, self.registers.get(i as u8).clone()));
-                        }
+                // Create new call frame, remembering the caller's register window
+                let mut frame = crate::vm::CallFrame::new(self.state.pc, self.registers.base());
+                frame.saved_frame_size = self.registers.frame_size();
 
-                        // Then: Copy arguments to parameter registers
-                        for (i, &arg_reg) in args.iter().enumerate() {
-                            if i < 16 {
-                                let value = self.registers.get(arg_reg).clone();
-                                self.registers.set(i as u8, value.clone());
-                                if self.debug_mode {
-                                    println!("  Set r{} = {:?} (from r{})", i, value, arg_reg);
-                                }
-                            }
-                        }
+                // Save the destination register for the return value
+                frame.return_dst = Some(dst);
 
-                        // Push frame
-                        self.state.push_frame(frame)?;
+                // Push frame
+                self.state.push_frame(frame)?;
 
-                        // Jump to function
-                        self.state.pc = func_offset;
-                    } else {
-                        return Err(RuntimeError::UndefinedFunction(func_name));
-                    }
-                } else {
-                    return Err(RuntimeError::ModuleNotLoaded);
+                // Open the callee's register window; arguments land in r0..
+                self.registers.push_window(entry.frame_size, &args);
+                self.state.fp = self.registers.base();
+                if self.debug_mode {
+                    println!("  Window: base={}, size={}", self.registers.base(), self.registers.frame_size());
+                }
+
+                if let Some(profiler) = self.profiler.as_mut() {
+                    profiler.enter_function(&func_name);
                 }
+
+                // Jump to function
+                self.state.pc = entry.offset;
+            }
+
+            Instruction::TailCallR { func, ref args } => {
+                if self.debug_mode {
+                    println!("TailCallR: func=r{}, args={:?}", func, args);
+                }
+                let func_name = self.callee_name(func)?;
+                let entry = self.resolve_call(self.state.pc - 1, &func_name)?;
+
+                // The callee takes over the current frame and register window,
+                // so its return goes straight back to our caller
+                self.registers.replace_window(entry.frame_size, &args);
+
+                if let Some(profiler) = self.profiler.as_mut() {
+                    profiler.exit_function();
+                    profiler.enter_function(&func_name);
+                }
+
+                self.state.pc = entry.offset;
             }
 
             Instruction::ReturnR { src } => {
                 let value = src.map(|r| self.registers.get(r).clone());
+                return Ok(self.return_from_function(value));
+            }
 
-                if let Some(frame) = self.state.pop_frame() {
-                    self.state.pc = frame.return_address;
-                    self.state.fp = frame.saved_fp;
-                    self.registers.restore_registers(&frame.saved_registers);
+            // Memoization
+            Instruction::MemoLookupR { func_idx, arg_count } => {
+                let Some(key) = MemoKey::new((0..arg_count).map(|r| self.registers.get(r))) else {
+                    return Ok(None);
+                };
+                let capacity = self.memo_capacity;
+                let table = self.memo_tables.entry(func_idx).or_insert_with(|| MemoTable::new(capacity));
+                if let Some(value) = table.get(&key) {
+                    return Ok(self.return_from_function(Some(value)));
+                }
+            }
 
-                    // Store return value in the destination register if specified
-                    if let (Some(return_dst), Some(ref ret_val)) = (frame.return_dst, &value) {
-                        self.registers.set(return_dst, ret_val.clone());
-                    }
-                } else {
-                    self.state.halt();
-                    return Ok(value);
+            Instruction::MemoStoreR { func_idx, arg_count, src } => {
+                if let Some(key) = MemoKey::new((0..arg_count).map(|r| self.registers.get(r))) {
+                    let capacity = self.memo_capacity;
+                    self.memo_tables.entry(func_idx)
+                        .or_insert_with(|| MemoTable::new(capacity))
+                        .insert(key, self.registers.get(src));
                 }
             }
 
             // MIR Support
-            Instruction::PhiR { dst, sources } => {
+            Instruction::PhiR { dst, ref sources } => {
                 // Phi resolution based on predecessor block
                 if let Some(predecessor) = self.state.predecessor_block {
-                    for (src_reg, block_id) in sources {
+                    for &(src_reg, block_id) in sources {
                         if block_id == predecessor {
                             let value = self.registers.get(src_reg).clone();
                             self.registers.set(dst, value);
@@ -404,9 +549,9 @@ impl VM {
                 }
             }
 
-            Instruction::AssertR { reg, assert_type, msg_idx } => {
+            Instruction::AssertR { reg, ref assert_type, msg_idx } => {
                 let value = self.registers.get(reg);
-                let assertion_failed = match assert_type {
+                let assertion_failed = match *assert_type {
                     AssertType::True => !value.is_truthy(),
                     AssertType::NonNull => matches!(value, Value::Empty),
                     AssertType::Range { min, max } => {
@@ -433,6 +578,9 @@ impl VM {
 
             // String Operations
             Instruction::ConcatStrR { dst, left, right } => {
+                if dst == left && self.append_string(dst, right, false) {
+                    return Ok(None);
+                }
                 let lval = self.registers.get(left);
                 let rval = self.registers.get(right);
                 let result = StringOps::concat(lval, rval)?;
@@ -505,43 +653,23 @@ impl VM {
             }
 
             Instruction::ArraySetR { array, index, value } => {
-                let array_value = self.registers.get(array);
-                let index_value = self.registers.get(index);
                 let new_value = self.registers.get(value).clone();
-
-                match (array_value, index_value) {
-                    (Value::Array(arr), Value::Int(idx)) => {
-                        if *idx < 0 {
-                            return Err(RuntimeError::IndexOutOfBounds {
-                                index: *idx,
-                                length: arr.len(),
-                            });
-                        }
-                        let idx = *idx as usize;
-                        if idx >= arr.len() {
-                            return Err(RuntimeError::IndexOutOfBounds {
-                                index: idx as i64,
-                                length: arr.len(),
-                            });
-                        }
-
-                        // Create a new array with the updated value (immutable approach)
-                        let mut new_array = (**arr).clone();
-                        new_array[idx] = new_value;
-                        self.registers.set(array, Value::Array(Arc::new(new_array)));
-                    }
-                    (Value::Array(_), _) => {
-                        return Err(RuntimeError::TypeMismatch {
-                            expected: "integer index".to_string(),
-                            found: index_value.type_of().to_string(),
-                        });
-                    }
-                    _ => {
-                        return Err(RuntimeError::TypeMismatch {
-                            expected: "array".to_string(),
-                            found: array_value.type_of().to_string(),
+                if let Value::Array(_) = self.registers.get(array) {
+                    let idx = self.index_operand(index)?;
+                    // Updates in place unless the array is shared
+                    let arr = self.array_mut(array)?;
+                    if idx < 0 || idx as usize >= arr.len() {
+                        return Err(RuntimeError::IndexOutOfBounds {
+                            index: idx,
+                            length: arr.len(),
                         });
                     }
+                    arr[idx as usize] = new_value;
+                } else {
+                    return Err(RuntimeError::TypeMismatch {
+                        expected: "array".to_string(),
+                        found: self.registers.get(array).type_of().to_string(),
+                    });
                 }
             }
 
@@ -572,7 +700,7 @@ impl VM {
 
                 match (dict_value, key_value) {
                     (Value::Dict(d), Value::String(k)) => {
-                        let value = d.get(k.as_ref()).cloned().unwrap_or(Value::Empty);
+                        let value = d.get(k.as_str()).cloned().unwrap_or(Value::Empty);
                         self.registers.set(dst, value);
                     }
                     (Value::Dict(_), _) => {
@@ -596,12 +724,10 @@ impl VM {
                 let new_value = self.registers.get(value).clone();
 
                 match (dict_value, key_value) {
-                    (Value::Dict(d), Value::String(k)) => {
-                        // Clone the Arc and use make_mut for copy-on-write semantics
-                        let mut d_clone = d.clone();
-                        let d_mut = Arc::make_mut(&mut d_clone);
-                        d_mut.insert(k.as_ref().clone(), new_value);
-                        self.registers.set(dict, Value::Dict(d_clone));
+                    (Value::Dict(_), Value::String(k)) => {
+                        // Keys share the string (usually an interned constant)
+                        let k = DictKey(Arc::clone(k));
+                        self.dict_mut(dict)?.insert(k, new_value);
                     }
                     (Value::Dict(_), _) => {
                         return Err(RuntimeError::TypeMismatch {
@@ -623,11 +749,9 @@ impl VM {
                 let key_value = self.registers.get(key);
 
                 match (dict_value, key_value) {
-                    (Value::Dict(d), Value::String(k)) => {
-                        let mut d_clone = d.clone();
-                        let d_mut = Arc::make_mut(&mut d_clone);
-                        d_mut.remove(k.as_ref());
-                        self.registers.set(dict, Value::Dict(d_clone));
+                    (Value::Dict(_), Value::String(k)) => {
+                        let k = Arc::clone(k);
+                        self.dict_mut(dict)?.remove(k.as_str());
                     }
                     (Value::Dict(_), _) => {
                         return Err(RuntimeError::TypeMismatch {
@@ -650,7 +774,7 @@ impl VM {
 
                 match (dict_value, key_value) {
                     (Value::Dict(d), Value::String(k)) => {
-                        let contains = d.contains_key(k.as_ref());
+                        let contains = d.contains_key(k.as_str());
                         self.registers.set(dst, Value::Bool(contains));
                     }
                     (Value::Dict(_), _) => {
@@ -674,7 +798,7 @@ impl VM {
                 match dict_value {
                     Value::Dict(d) => {
                         let keys: Vec<Value> = d.keys()
-                            .map(|k| Value::String(Arc::new(k.clone())))
+                            .map(|k| Value::String(Arc::clone(&k.0)))
                             .collect();
                         self.registers.set(dst, Value::Array(Arc::new(keys)));
                     }
@@ -737,6 +861,102 @@ impl VM {
                 }
             }
 
+            // Array mutation
+            Instruction::ArrayPushR { array, value } => {
+                let new_value = self.registers.get(value).clone();
+                self.array_mut(array)?.push(new_value);
+            }
+
+            Instruction::ArrayInsertR { array, index, value } => {
+                let idx = self.index_operand(index)?;
+                let new_value = self.registers.get(value).clone();
+                let arr = self.array_mut(array)?;
+                // Inserting at the length appends
+                if idx < 0 || idx as usize > arr.len() {
+                    return Err(RuntimeError::IndexOutOfBounds {
+                        index: idx,
+                        length: arr.len(),
+                    });
+                }
+                arr.insert(idx as usize, new_value);
+            }
+
+            Instruction::ArrayRemoveAtR { array, index } => {
+                let idx = self.index_operand(index)?;
+                let arr = self.array_mut(array)?;
+                if idx < 0 || idx as usize >= arr.len() {
+                    return Err(RuntimeError::IndexOutOfBounds {
+                        index: idx,
+                        length: arr.len(),
+                    });
+                }
+                arr.remove(idx as usize);
+            }
+
+            Instruction::ArrayFindR { dst, array, value } => {
+                let array_value = self.registers.get(array);
+                let position = match array_value {
+                    Value::Array(arr) => {
+                        let target = self.registers.get(value);
+                        arr.iter().position(|item| ArithmeticOps::eq(item, target))
+                    }
+                    _ => {
+                        return Err(RuntimeError::TypeMismatch {
+                            expected: "array".to_string(),
+                            found: array_value.type_of().to_string(),
+                        });
+                    }
+                };
+                self.registers.set(dst, Value::Int(position.map_or(-1, |idx| idx as i64)));
+            }
+
+            Instruction::ArrayClearR { array } => {
+                self.array_mut(array)?.clear();
+            }
+
+            // Superinstructions
+            Instruction::CmpJumpR { op, left, right, offset } => {
+                let taken = ArithmeticOps::compare(op, self.registers.get(left), self.registers.get(right))?;
+                if taken {
+                    self.state.predecessor_block = Some(self.state.pc as u16 - 1);
+                    self.state.pc = (self.state.pc as i32 + offset) as usize;
+                }
+            }
+
+            Instruction::CmpConstR { op, dst, left, const_idx } => {
+                let constant = self.constant_value(const_idx)?;
+                let result = ArithmeticOps::compare(op, self.registers.get(left), constant)?;
+                self.registers.set(dst, Value::Bool(result));
+            }
+
+            Instruction::CmpConstJumpR { op, left, const_idx, offset } => {
+                let constant = self.constant_value(const_idx)?;
+                if ArithmeticOps::compare(op, self.registers.get(left), constant)? {
+                    self.state.predecessor_block = Some(self.state.pc as u16 - 1);
+                    self.state.pc = (self.state.pc as i32 + offset) as usize;
+                }
+            }
+
+            Instruction::AddImmR { dst, src, imm } => {
+                let result = match self.registers.get(src) {
+                    Value::Int(value) => Value::Int(
+                        value.checked_add(imm as i64).ok_or(RuntimeError::IntegerOverflow)?
+                    ),
+                    other => ArithmeticOps::add(other, &Value::Int(imm as i64))?,
+                };
+                self.registers.set(dst, result);
+            }
+
+            Instruction::IncR { reg } => {
+                let result = match self.registers.get(reg) {
+                    Value::Int(value) => Value::Int(
+                        value.checked_add(1).ok_or(RuntimeError::IntegerOverflow)?
+                    ),
+                    other => ArithmeticOps::add(other, &Value::Int(1))?,
+                };
+                self.registers.set(reg, result);
+            }
+
             // Debug
             Instruction::DebugPrint { src } => {
                 let value = self.registers.get(src);
@@ -775,10 +995,156 @@ impl VM {
         Ok(None)
     }
 
+    /// Get mutable access to the array in a register.
+    ///
+    /// The array is copied only if it is shared with another value
+    /// (copy-on-write), so mutating an unshared array is in place.
+    fn array_mut(&mut self, reg: u8) -> Result<&mut Vec<Value>> {
+        match self.registers.get_mut(reg) {
+            Value::Array(arr) => Ok(Arc::make_mut(arr)),
+            other => Err(RuntimeError::TypeMismatch {
+                expected: "array".to_string(),
+                found: other.type_of().to_string(),
+            }),
+        }
+    }
+
+    /// Append the string in `right` to the string in `dst`, in place.
+    ///
+    /// Returns false, leaving the registers untouched, when `dst` does not
+    /// hold a string or (for `+`, which only concatenates two strings)
+    /// `right` does not. See `StringOps::append`.
+    fn append_string(&mut self, dst: u8, right: u8, strings_only: bool) -> bool {
+        let suffix = self.registers.get(right).clone();
+        if strings_only && !matches!(suffix, Value::String(_)) {
+            return false;
+        }
+        match self.registers.get_mut(dst) {
+            Value::String(target) => {
+                StringOps::append(target, &suffix);
+                true
+            }
+            _ => false,
+        }
+    }
+
+    /// Get mutable access to the dictionary in a register.
+    ///
+    /// Like `array_mut`, this copies only a shared dictionary.
+    fn dict_mut(&mut self, reg: u8) -> Result<&mut HashMap<DictKey, Value>> {
+        match self.registers.get_mut(reg) {
+            Value::Dict(d) => Ok(Arc::make_mut(d)),
+            other => Err(RuntimeError::TypeMismatch {
+                expected: "dict".to_string(),
+                found: other.type_of().to_string(),
+            }),
+        }
+    }
+
+    /// Read an integer index operand
+    fn index_operand(&self, reg: u8) -> Result<i64> {
+        match self.registers.get(reg) {
+            Value::Int(idx) => Ok(*idx),
+            other => Err(RuntimeError::TypeMismatch {
+                expected: "integer index".to_string(),
+                found: other.type_of().to_string(),
+            }),
+        }
+    }
+
+    /// Get a constant by index as a value
+    fn constant_value(&self, idx: u16) -> Result<&Value> {
+        self.constant_values.get(idx as usize)
+            .ok_or(RuntimeError::InvalidConstant(idx))
+    }
+
+    /// Get the global slot for a name constant
+    ///
+    /// Names are normally resolved by `load_module`; others get a slot on
+    /// first use.
+    fn global_slot(&mut self, name_idx: u16) -> Result<usize> {
+        match self.global_slots.get(name_idx as usize) {
+            Some(&slot) if slot != UNRESOLVED_GLOBAL => Ok(slot as usize),
+            _ => {
+                let name = self.get_string_constant(name_idx)?;
+                Ok(self.state.globals.slot(&name))
+            }
+        }
+    }
+
+    /// Return from the current function to its caller
+    ///
+    /// At top level the VM halts instead, and the value is returned as the
+    /// program's result.
+    fn return_from_function(&mut self, value: Option<Value>) -> Option<Value> {
+        let Some(frame) = self.state.pop_frame() else {
+            self.state.halt();
+            return value;
+        };
+        if let Some(profiler) = self.profiler.as_mut() {
+            profiler.exit_function();
+        }
+        self.state.pc = frame.return_address;
+        self.state.fp = frame.saved_fp;
+        self.registers.pop_window(frame.saved_fp, frame.saved_frame_size);
+
+        // Store return value in the destination register if specified
+        if let (Some(return_dst), Some(ret_val)) = (frame.return_dst, value) {
+            self.registers.set(return_dst, ret_val);
+        }
+        None
+    }
+
+    /// Get the name of the function held in register `func`
+    fn callee_name(&self, func: u8) -> Result<Arc<String>> {
+        // For now, treat the function register as containing an index into the function table
+        // In the future, this could be a FunctionRef value
+        // Share the name with the register instead of copying it on every call
+        let func_name = match self.registers.get(func) {
+            Value::String(name) => Arc::clone(name),
+            Value::Int(idx) => {
+                // Look up function by index in function table
+                if let Some(module) = &self.module {
+                    Arc::new(module.function_table.iter()
+                        .find(|(_, &offset)| offset == *idx as usize)
+                        .map(|(name, _)| name.clone())
+                        .unwrap_or_else(|| format!("func_{}", idx)))
+                } else {
+                    return Err(RuntimeError::UndefinedFunction(format!("index {}", idx)));
+                }
+            }
+            _ => {
+                return Err(RuntimeError::UndefinedFunction("no function specified".to_string()));
+            }
+        };
+
+        if self.module.is_none() {
+            return Err(RuntimeError::ModuleNotLoaded);
+        }
+        Ok(func_name)
+    }
+
+    /// Resolve the callee of the call instruction at `pc`
+    ///
+    /// Each call site caches its last callee. A hit is a pointer comparison
+    /// when the name comes from the constant pool, so repeated calls do not
+    /// hash the function name.
+    fn resolve_call(&mut self, pc: usize, name: &Arc<String>) -> Result<FunctionEntry> {
+        if let Some(Some(cache)) = self.call_caches.get(pc) {
+            if Arc::ptr_eq(&cache.name, name) || cache.name == *name {
+                return Ok(cache.entry);
+            }
+        }
+        let entry = *self.functions.get(name.as_str())
+            .ok_or_else(|| RuntimeError::UndefinedFunction(name.to_string()))?;
+        if let Some(slot) = self.call_caches.get_mut(pc) {
+            *slot = Some(CallCache { name: Arc::clone(name), entry });
+        }
+        Ok(entry)
+    }
+
     /// Get a string constant by index
     fn get_string_constant(&self, idx: u16) -> Result<String> {
-        use crate::values::ConstantValue;
-
         match self.constants.get(idx) {
             Some(ConstantValue::String(s)) => Ok(s.clone()),
             _ => Err(RuntimeError::InvalidConstant(idx)),
@@ -889,6 +1255,7 @@ mod tests {
                 Instruction::ReturnR { src: Some(2) },
             ],
             function_table: HashMap::new(),
+            function_registers: HashMap::new(),
             global_names: vec![],
         };
 
@@ -938,6 +1305,7 @@ mod tests {
                 Instruction::ReturnR { src: Some(0) },
             ],
             function_table: HashMap::new(),
+            function_registers: HashMap::new(),
             global_names: vec![],
         };
 
@@ -957,4 +1325,592 @@ mod tests {
         // The result should still be 100
         assert_eq!(result, Some(Value::Int(100)));
     }
+
+    #[test]
+    fn test_profiler_records_calls() {
+        let mut vm = VM::new();
+
+        let mut module = BytecodeModule {
+            name: "test".to_string(),
+            version: 1,
+            flags: 0,
+            constants: ConstantPool::new(),
+            instructions: vec![
+                Instruction::LoadConstR { dst: 0, const_idx: 0 },
+                Instruction::LoadConstR { dst: 1, const_idx: 1 },
+                Instruction::CallR { func: 1, args: vec![0], dst: 0 },
+                Instruction::ReturnR { src: Some(0) },
+                // identity function (at offset 4)
+                Instruction::ReturnR { src: Some(0) },
+            ],
+            function_table: HashMap::new(),
+            function_registers: HashMap::new(),
+            global_names: vec![],
+        };
+        module.constants.add(ConstantValue::Int(7));
+        module.constants.add(ConstantValue::String("identity".to_string()));
+        module.function_table.insert("identity".to_string(), 4);
+
+        vm.load_module(module, None).unwrap();
+        vm.enable_profiling(true);
+        assert_eq!(vm.run().unwrap(), Some(Value::Int(7)));
+
+        let profile = vm.profile().unwrap();
+        assert_eq!(profile.total_instructions(), 5);
+        assert_eq!(profile.opcode_counts(), vec![(0, 2), (25, 1), (26, 2)]);
+
+        let functions = profile.functions();
+        assert_eq!(functions[0].name, "main");
+        assert_eq!(functions[0].inclusive_instructions, 5);
+        assert_eq!(functions[0].exclusive_instructions, 4);
+        assert_eq!(functions[1].name, "identity");
+        assert_eq!(functions[1].calls, 1);
+        assert_eq!(functions[1].exclusive_instructions, 1);
+        assert_eq!(profile.pc_hits().unwrap().len(), 5);
+    }
+
+    #[test]
+    fn test_array_mutation_instructions() {
+        let mut vm = VM::new();
+
+        let mut module = BytecodeModule {
+            name: "test".to_string(),
+            version: 1,
+            flags: 0,
+            constants: ConstantPool::new(),
+            instructions: vec![
+                Instruction::LoadConstR { dst: 1, const_idx: 0 },
+                Instruction::LoadConstR { dst: 2, const_idx: 1 },
+                Instruction::LoadConstR { dst: 3, const_idx: 2 },
+                Instruction::LoadConstR { dst: 6, const_idx: 3 },
+                Instruction::NewArrayR { dst: 0, size: 6 },
+                Instruction::MoveR { dst: 5, src: 0 },
+                // [1, 2]
+                Instruction::ArrayPushR { array: 0, value: 1 },
+                Instruction::ArrayPushR { array: 0, value: 2 },
+                // [1, 3, 2]
+                Instruction::ArrayInsertR { array: 0, index: 1, value: 3 },
+                Instruction::ArrayFindR { dst: 4, array: 0, value: 2 },
+                // [1, 2]
+                Instruction::ArrayRemoveAtR { array: 0, index: 1 },
+                Instruction::ReturnR { src: Some(0) },
+            ],
+            function_table: HashMap::new(),
+            function_registers: HashMap::new(),
+            global_names: vec![],
+        };
+        module.constants.add(ConstantValue::Int(1));
+        module.constants.add(ConstantValue::Int(2));
+        module.constants.add(ConstantValue::Int(3));
+        module.constants.add(ConstantValue::Int(0));
+
+        vm.load_module(module, None).unwrap();
+        let result = vm.run().unwrap();
+        assert_eq!(
+            result,
+            Some(Value::Array(Arc::new(vec![Value::Int(1), Value::Int(2)])))
+        );
+        assert_eq!(*vm.registers.get(4), Value::Int(2));
+        // The copy taken before the mutations is unchanged
+        assert_eq!(*vm.registers.get(5), Value::Array(Arc::new(vec![])));
+    }
+
+    #[test]
+    fn test_array_argument_is_unshared_after_call() {
+        let mut vm = VM::new();
+
+        let mut module = BytecodeModule {
+            name: "test".to_string(),
+            version: 1,
+            flags: 0,
+            constants: ConstantPool::new(),
+            instructions: vec![
+                Instruction::LoadConstR { dst: 1, const_idx: 0 },
+                Instruction::NewArrayR { dst: 0, size: 1 },
+                Instruction::LoadConstR { dst: 2, const_idx: 1 },
+                Instruction::CallR { func: 2, args: vec![0], dst: 3 },
+                Instruction::Halt,
+                // size: return the length of its argument (at offset 5)
+                Instruction::ArrayLenR { dst: 1, array: 0 },
+                Instruction::ReturnR { src: Some(1) },
+            ],
+            function_table: HashMap::new(),
+            function_registers: HashMap::new(),
+            global_names: vec![],
+        };
+        module.constants.add(ConstantValue::Int(0));
+        module.constants.add(ConstantValue::String("size".to_string()));
+        module.function_table.insert("size".to_string(), 5);
+        module.function_registers.insert("size".to_string(), 2);
+
+        vm.load_module(module, None).unwrap();
+        vm.run().unwrap();
+
+        // The callee's copy of the argument was released on return, so the
+        // caller's next mutation of the array happens in place
+        assert_eq!(*vm.registers.get(3), Value::Int(0));
+        match vm.registers.get(0) {
+            Value::Array(items) => assert_eq!(Arc::strong_count(items), 1),
+            other => panic!("Expected array, got {:?}", other),
+        }
+    }
+
+    #[test]
+    fn test_array_mutation_errors() {
+        let mut vm = VM::new();
+        vm.registers.set(0, Value::Array(Arc::new(vec![Value::Int(1)])));
+        vm.registers.set(1, Value::Int(1));
+        vm.registers.set(2, Value::Int(7));
+        vm.registers.set(3, Value::Int(9));
+
+        // Inserting at the length appends: [1, 7]
+        vm.execute_instruction(&Instruction::ArrayInsertR { array: 0, index: 1, value: 2 }).unwrap();
+        let err = vm.execute_instruction(&Instruction::ArrayRemoveAtR { array: 0, index: 2 });
+        assert!(matches!(err, Err(RuntimeError::IndexOutOfBounds { index: 7, length: 2 })));
+        let err = vm.execute_instruction(&Instruction::ArrayPushR { array: 2, value: 1 });
+        assert!(matches!(err, Err(RuntimeError::TypeMismatch { .. })));
+
+        vm.execute_instruction(&Instruction::ArrayFindR { dst: 4, array: 0, value: 3 }).unwrap();
+        assert_eq!(*vm.registers.get(4), Value::Int(-1));
+        vm.execute_instruction(&Instruction::ArrayClearR { array: 0 }).unwrap();
+        assert_eq!(*vm.registers.get(0), Value::Array(Arc::new(vec![])));
+    }
+
+    #[test]
+    fn test_array_set_copy_on_write() {
+        fn array_ptr(value: &Value) -> *const Vec<Value> {
+            match value {
+                Value::Array(arr) => Arc::as_ptr(arr),
+                other => panic!("expected array, got {:?}", other),
+            }
+        }
+
+        let mut vm = VM::new();
+        vm.registers.set(0, Value::Array(Arc::new(vec![Value::Int(0); 3])));
+        vm.registers.set(1, Value::Int(1));
+        vm.registers.set(2, Value::Int(9));
+
+        // A uniquely owned array is updated in place
+        let before = array_ptr(vm.registers.get(0));
+        vm.execute_instruction(&Instruction::ArraySetR { array: 0, index: 1, value: 2 }).unwrap();
+        assert_eq!(array_ptr(vm.registers.get(0)), before);
+
+        // A shared array is copied once and the other reference is unchanged
+        vm.execute_instruction(&Instruction::MoveR { dst: 3, src: 0 }).unwrap();
+        vm.execute_instruction(&Instruction::ArraySetR { array: 0, index: 1, value: 1 }).unwrap();
+        assert_ne!(array_ptr(vm.registers.get(0)), before);
+        assert_eq!(array_ptr(vm.registers.get(3)), before);
+        assert_eq!(
+            *vm.registers.get(3),
+            Value::Array(Arc::new(vec![Value::Int(0), Value::Int(9), Value::Int(0)]))
+        );
+
+        let err = vm.execute_instruction(&Instruction::ArraySetR { array: 0, index: 2, value: 1 });
+        assert!(matches!(err, Err(RuntimeError::IndexOutOfBounds { index: 9, length: 3 })));
+    }
+
+    #[test]
+    fn test_call_r_register_windows() {
+        let mut vm = VM::new();
+
+        let mut module = BytecodeModule {
+            name: "test".to_string(),
+            version: 1,
+            flags: 0,
+            constants: ConstantPool::new(),
+            instructions: vec![
+                // main: sum(10) + 123, with 123 live across the call
+                Instruction::LoadConstR { dst: 0, const_idx: 0 },
+                Instruction::LoadConstR { dst: 1, const_idx: 1 },
+                Instruction::LoadConstR { dst: 2, const_idx: 2 },
+                Instruction::CallR { func: 1, args: vec![0], dst: 3 },
+                Instruction::AddR { dst: 3, left: 3, right: 2 },
+                Instruction::ReturnR { src: Some(3) },
+                // sum(n) = n <= 0 ? 0 : n + sum(n - 1) (at offset 6)
+                Instruction::LoadConstR { dst: 1, const_idx: 3 },
+                Instruction::LteR { dst: 2, left: 0, right: 1 },
+                Instruction::JumpIfNotR { cond: 2, offset: 1 },
+                Instruction::ReturnR { src: Some(1) },
+                Instruction::LoadConstR { dst: 3, const_idx: 4 },
+                Instruction::SubR { dst: 3, left: 0, right: 3 },
+                Instruction::LoadConstR { dst: 4, const_idx: 1 },
+                Instruction::CallR { func: 4, args: vec![3], dst: 2 },
+                Instruction::AddR { dst: 2, left: 0, right: 2 },
+                Instruction::ReturnR { src: Some(2) },
+            ],
+            function_table: HashMap::new(),
+            function_registers: HashMap::new(),
+            global_names: vec![],
+        };
+        module.constants.add(ConstantValue::Int(10));
+        module.constants.add(ConstantValue::String("sum".to_string()));
+        module.constants.add(ConstantValue::Int(123));
+        module.constants.add(ConstantValue::Int(0));
+        module.constants.add(ConstantValue::Int(1));
+        module.function_table.insert("sum".to_string(), 6);
+        module.function_registers.insert("sum".to_string(), 5);
+
+        vm.load_module(module, None).unwrap();
+        assert_eq!(vm.run().unwrap(), Some(Value::Int(178)));
+
+        // Back in the outermost frame with main's registers intact
+        assert_eq!(vm.registers.base(), 0);
+        assert_eq!(*vm.registers.get(0), Value::Int(10));
+        assert_eq!(*vm.registers.get(2), Value::Int(123));
+    }
+
+    #[test]
+    fn test_globals_resolve_to_slots() {
+        let mut vm = VM::new();
+
+        let mut module = BytecodeModule {
+            name: "test".to_string(),
+            version: 1,
+            flags: 0,
+            constants: ConstantPool::new(),
+            instructions: vec![
+                // total = 5; bump(); return total
+                Instruction::LoadConstR { dst: 0, const_idx: 0 },
+                Instruction::StoreGlobalR { src: 0, name_idx: 1 },
+                Instruction::LoadConstR { dst: 1, const_idx: 2 },
+                Instruction::CallR { func: 1, args: vec![], dst: 2 },
+                Instruction::LoadGlobalR { dst: 3, name_idx: 1 },
+                Instruction::ReturnR { src: Some(3) },
+                // bump: total = total + total (at offset 6)
+                Instruction::LoadGlobalR { dst: 0, name_idx: 1 },
+                Instruction::AddR { dst: 0, left: 0, right: 0 },
+                Instruction::StoreGlobalR { src: 0, name_idx: 1 },
+                Instruction::ReturnR { src: None },
+            ],
+            function_table: HashMap::new(),
+            function_registers: HashMap::new(),
+            global_names: vec!["unused".to_string()],
+        };
+        module.constants.add(ConstantValue::Int(5));
+        module.constants.add(ConstantValue::String("total".to_string()));
+        module.constants.add(ConstantValue::String("bump".to_string()));
+        module.function_table.insert("bump".to_string(), 6);
+
+        vm.load_module(module, None).unwrap();
+        assert_eq!(vm.global_slots, vec![UNRESOLVED_GLOBAL, 1, UNRESOLVED_GLOBAL]);
+        assert_eq!(vm.run().unwrap(), Some(Value::Int(10)));
+        assert_eq!(vm.state.globals.get("total"), Some(&Value::Int(10)));
+        assert_eq!(vm.state.globals.get("unused"), None);
+    }
+
+    #[test]
+    fn test_call_site_cache() {
+        let mut vm = VM::new();
+
+        let mut module = BytecodeModule {
+            name: "test".to_string(),
+            version: 1,
+            flags: 0,
+            constants: ConstantPool::new(),
+            instructions: vec![
+                // One call site, called with "double" and then "negate"
+                Instruction::LoadConstR { dst: 0, const_idx: 0 },
+                Instruction::LoadConstR { dst: 1, const_idx: 1 },
+                Instruction::CallR { func: 1, args: vec![0], dst: 0 },
+                Instruction::LoadConstR { dst: 2, const_idx: 2 },
+                Instruction::EqR { dst: 3, left: 1, right: 2 },
+                Instruction::JumpIfR { cond: 3, offset: 2 },
+                Instruction::MoveR { dst: 1, src: 2 },
+                Instruction::JumpR { offset: -6 },
+                Instruction::ReturnR { src: Some(0) },
+                // double (at offset 9)
+                Instruction::AddR { dst: 0, left: 0, right: 0 },
+                Instruction::ReturnR { src: Some(0) },
+                // negate (at offset 11)
+                Instruction::NegR { dst: 0, src: 0 },
+                Instruction::ReturnR { src: Some(0) },
+            ],
+            function_table: HashMap::new(),
+            function_registers: HashMap::new(),
+            global_names: vec![],
+        };
+        module.constants.add(ConstantValue::Int(21));
+        module.constants.add(ConstantValue::String("double".to_string()));
+        module.constants.add(ConstantValue::String("negate".to_string()));
+        module.function_table.insert("double".to_string(), 9);
+        module.function_table.insert("negate".to_string(), 11);
+        module.function_registers.insert("double".to_string(), 1);
+        module.function_registers.insert("negate".to_string(), 1);
+
+        vm.load_module(module, None).unwrap();
+        assert_eq!(vm.run().unwrap(), Some(Value::Int(-42)));
+
+        // The site was re-resolved for the second callee
+        let cache = vm.call_caches[2].as_ref().unwrap();
+        assert_eq!(cache.name.as_str(), "negate");
+        assert_eq!(cache.entry.offset, 11);
+        assert_eq!(cache.entry.frame_size, 1);
+        assert!(vm.call_caches[0].is_none());
+    }
+
+    #[test]
+    fn test_tail_call_runs_in_constant_stack() {
+        let mut vm = VM::new();
+
+        let mut module = BytecodeModule {
+            name: "test".to_string(),
+            version: 1,
+            flags: 0,
+            constants: ConstantPool::new(),
+            instructions: vec![
+                // count(100000, 0), far deeper than MAX_CALL_DEPTH
+                Instruction::LoadConstR { dst: 0, const_idx: 0 },
+                Instruction::LoadConstR { dst: 1, const_idx: 1 },
+                Instruction::LoadConstR { dst: 2, const_idx: 2 },
+                Instruction::CallR { func: 2, args: vec![0, 1], dst: 3 },
+                Instruction::ReturnR { src: Some(3) },
+                // count(n, acc) (at offset 5): n == 0 ? acc : count(n - 1, acc + 1)
+                Instruction::LoadConstR { dst: 2, const_idx: 1 },
+                Instruction::EqR { dst: 3, left: 0, right: 2 },
+                Instruction::JumpIfR { cond: 3, offset: 5 },
+                Instruction::LoadConstR { dst: 4, const_idx: 3 },
+                Instruction::SubR { dst: 5, left: 0, right: 4 },
+                Instruction::AddR { dst: 6, left: 1, right: 4 },
+                Instruction::LoadConstR { dst: 7, const_idx: 2 },
+                Instruction::TailCallR { func: 7, args: vec![5, 6] },
+                Instruction::ReturnR { src: Some(1) },
+            ],
+            function_table: HashMap::new(),
+            function_registers: HashMap::new(),
+            global_names: vec![],
+        };
+        module.constants.add(ConstantValue::Int(100_000));
+        module.constants.add(ConstantValue::Int(0));
+        module.constants.add(ConstantValue::String("count".to_string()));
+        module.constants.add(ConstantValue::Int(1));
+        module.function_table.insert("count".to_string(), 5);
+        module.function_registers.insert("count".to_string(), 8);
+
+        vm.load_module(module, None).unwrap();
+        assert_eq!(vm.run().unwrap(), Some(Value::Int(100_000)));
+        assert!(vm.state.call_stack.is_empty());
+    }
+
+    /// Module computing fib(n) with a memoized fib
+    fn memoized_fib_module(n: i64) -> BytecodeModule {
+        let mut module = BytecodeModule {
+            name: "test".to_string(),
+            version: 1,
+            flags: 0,
+            constants: ConstantPool::new(),
+            instructions: vec![
+                Instruction::LoadConstR { dst: 0, const_idx: 0 },
+                Instruction::LoadConstR { dst: 1, const_idx: 1 },
+                Instruction::CallR { func: 1, args: vec![0], dst: 2 },
+                Instruction::ReturnR { src: Some(2) },
+                // fib(n) (at offset 4): n < 2 ? n : fib(n - 1) + fib(n - 2)
+                Instruction::MemoLookupR { func_idx: 1, arg_count: 1 },
+                Instruction::LoadConstR { dst: 1, const_idx: 2 },
+                Instruction::LtR { dst: 2, left: 0, right: 1 },
+                Instruction::JumpIfR { cond: 2, offset: 9 },
+                Instruction::LoadConstR { dst: 3, const_idx: 3 },
+                Instruction::SubR { dst: 4, left: 0, right: 3 },
+                Instruction::LoadConstR { dst: 5, const_idx: 1 },
+                Instruction::CallR { func: 5, args: vec![4], dst: 6 },
+                Instruction::SubR { dst: 4, left: 0, right: 1 },
+                Instruction::CallR { func: 5, args: vec![4], dst: 7 },
+                Instruction::AddR { dst: 8, left: 6, right: 7 },
+                Instruction::MemoStoreR { func_idx: 1, arg_count: 1, src: 8 },
+                Instruction::ReturnR { src: Some(8) },
+                Instruction::MemoStoreR { func_idx: 1, arg_count: 1, src: 0 },
+                Instruction::ReturnR { src: Some(0) },
+            ],
+            function_table: HashMap::new(),
+            function_registers: HashMap::new(),
+            global_names: vec![],
+        };
+        module.constants.add(ConstantValue::Int(n));
+        module.constants.add(ConstantValue::String("fib".to_string()));
+        module.constants.add(ConstantValue::Int(2));
+        module.constants.add(ConstantValue::Int(1));
+        module.function_table.insert("fib".to_string(), 4);
+        module.function_registers.insert("fib".to_string(), 9);
+        module
+    }
+
+    #[test]
+    fn test_memoized_function() {
+        let mut vm = VM::new();
+        vm.load_module(memoized_fib_module(60), None).unwrap();
+
+        // Without memoization fib(60) would never finish
+        assert_eq!(vm.run().unwrap(), Some(Value::Int(1_548_008_755_920)));
+        let table = vm.memo_table("fib").unwrap();
+        assert_eq!(table.len(), 61);
+        assert_eq!(table.misses, 61);
+        assert_eq!(table.hits, 58);
+
+        // Cached results survive a reset, so the rerun is a single lookup
+        vm.reset();
+        assert_eq!(vm.run().unwrap(), Some(Value::Int(1_548_008_755_920)));
+        let table = vm.memo_table("fib").unwrap();
+        assert_eq!((table.hits, table.misses), (59, 61));
+    }
+
+    #[test]
+    fn test_memo_table_is_bounded() {
+        let mut vm = VM::new();
+        vm.set_memo_capacity(4);
+        vm.load_module(memoized_fib_module(20), None).unwrap();
+
+        assert_eq!(vm.run().unwrap(), Some(Value::Int(6765)));
+        let table = vm.memo_table("fib").unwrap();
+        assert_eq!(table.len(), 4);
+        assert!(table.evictions > 0);
+
+        // Loading a module discards the cached results
+        vm.load_module(memoized_fib_module(20), None).unwrap();
+        assert!(vm.memo_table("fib").is_none());
+    }
+
+    #[test]
+    fn test_call_undefined_function() {
+        let mut vm = VM::new();
+
+        let mut module = BytecodeModule {
+            name: "test".to_string(),
+            version: 1,
+            flags: 0,
+            constants: ConstantPool::new(),
+            instructions: vec![
+                Instruction::LoadConstR { dst: 0, const_idx: 0 },
+                Instruction::CallR { func: 0, args: vec![], dst: 1 },
+            ],
+            function_table: HashMap::new(),
+            function_registers: HashMap::new(),
+            global_names: vec![],
+        };
+        module.constants.add(ConstantValue::String("missing".to_string()));
+
+        vm.load_module(module, None).unwrap();
+        assert!(matches!(vm.run(), Err(RuntimeError::UndefinedFunction(name)) if name == "missing"));
+    }
+
+    #[test]
+    fn test_string_append_in_place() {
+        let mut vm = VM::new();
+
+        let mut module = BytecodeModule {
+            name: "test".to_string(),
+            version: 1,
+            flags: 0,
+            constants: ConstantPool::new(),
+            instructions: vec![
+                Instruction::LoadConstR { dst: 0, const_idx: 0 },
+                Instruction::LoadConstR { dst: 1, const_idx: 1 },
+                Instruction::AddR { dst: 0, left: 0, right: 1 },
+                Instruction::MoveR { dst: 2, src: 0 },
+                Instruction::AddR { dst: 0, left: 0, right: 1 },
+                Instruction::ConcatStrR { dst: 0, left: 0, right: 0 },
+                Instruction::LoadConstR { dst: 3, const_idx: 2 },
+                Instruction::ConcatStrR { dst: 0, left: 0, right: 3 },
+                Instruction::Halt,
+            ],
+            function_table: HashMap::new(),
+            function_registers: HashMap::new(),
+            global_names: vec![],
+        };
+        module.constants.add(ConstantValue::String("".to_string()));
+        module.constants.add(ConstantValue::String("ab".to_string()));
+        module.constants.add(ConstantValue::Int(7));
+
+        vm.load_module(module, None).unwrap();
+        vm.run().unwrap();
+
+        // Neither the interned constant nor the copy in r2 was modified
+        assert_eq!(*vm.registers.get(0), Value::String(Arc::new("abababab7".to_string())));
+        assert_eq!(*vm.registers.get(2), Value::String(Arc::new("ab".to_string())));
+        assert_eq!(vm.constant_values[0], Value::String(Arc::new("".to_string())));
+    }
+
+    #[test]
+    fn test_dict_keys_share_strings() {
+        let mut vm = VM::new();
+
+        let mut module = BytecodeModule {
+            name: "test".to_string(),
+            version: 1,
+            flags: 0,
+            constants: ConstantPool::new(),
+            instructions: vec![
+                Instruction::DictNewR { dst: 0 },
+                Instruction::LoadConstR { dst: 1, const_idx: 0 },
+                Instruction::LoadConstR { dst: 2, const_idx: 1 },
+                Instruction::DictSetR { dict: 0, key: 1, value: 2 },
+                Instruction::DictKeysR { dst: 3, dict: 0 },
+                Instruction::Halt,
+            ],
+            function_table: HashMap::new(),
+            function_registers: HashMap::new(),
+            global_names: vec![],
+        };
+        module.constants.add(ConstantValue::String("name".to_string()));
+        module.constants.add(ConstantValue::Int(1));
+
+        vm.load_module(module, None).unwrap();
+        vm.run().unwrap();
+
+        match (&vm.constant_values[0], vm.registers.get(3)) {
+            (Value::String(constant), Value::Array(keys)) => match &keys[0] {
+                Value::String(key) => assert!(Arc::ptr_eq(constant, key)),
+                other => panic!("Expected string key, got {:?}", other),
+            },
+            other => panic!("Unexpected values {:?}", other),
+        }
+    }
+
+    #[test]
+    fn test_reset_reruns_module() {
+        let mut vm = VM::new();
+
+        let mut module = BytecodeModule {
+            name: "test".to_string(),
+            version: 1,
+            flags: 0,
+            constants: ConstantPool::new(),
+            instructions: vec![
+                // if not counter: counter = 1; return counter
+                Instruction::LoadGlobalR { dst: 0, name_idx: 0 },
+                Instruction::LoadConstR { dst: 1, const_idx: 1 },
+                Instruction::JumpIfR { cond: 0, offset: 1 },
+                Instruction::StoreGlobalR { src: 1, name_idx: 0 },
+                Instruction::LoadGlobalR { dst: 0, name_idx: 0 },
+                Instruction::ReturnR { src: Some(0) },
+            ],
+            function_table: HashMap::new(),
+            function_registers: HashMap::new(),
+            global_names: vec![],
+        };
+        module.constants.add(ConstantValue::String("counter".to_string()));
+        module.constants.add(ConstantValue::Int(1));
+
+        vm.load_module(module, None).unwrap();
+        vm.enable_profiling(false);
+        assert_eq!(vm.run().unwrap(), Some(Value::Int(1)));
+        assert_eq!(vm.instruction_count, 6);
+
+        vm.reset();
+        assert_eq!(vm.instruction_count, 0);
+        assert_eq!(vm.profile().unwrap().total_instructions(), 0);
+        assert_eq!(vm.state.globals.get("counter"), None);
+        assert_eq!(*vm.registers.get(0), Value::Empty);
+
+        // Same module, same result, same resolved slots
+        assert_eq!(vm.run().unwrap(), Some(Value::Int(1)));
+        assert_eq!(vm.instruction_count, 6);
+        assert_eq!(vm.global_slots[0], 0);
+    }
+
+    #[test]
+    fn test_vm_is_send() {
+        // The Python bindings run the VM with the GIL released
+        fn assert_send<T: Send>() {}
+        assert_send::<VM>();
+        assert_send::<Result<Option<Value>>>();
+    }
 }
@@ -0,0 +1,161 @@
+//! Memo tables for memoized functions
+//!
+//! A memoized function looks up its arguments on entry and records its
+//! result before returning. Only scalar arguments and results are cached:
+//! collections are shared by reference and could change after being cached.
+//! Each table holds at most `capacity` entries and evicts the oldest entry
+//! first, so memory use stays bounded however many distinct arguments a
+//! function sees.
+
+use std::collections::{HashMap, VecDeque};
+use std::sync::Arc;
+
+use crate::values::Value;
+
+/// Default number of results cached per function
+pub const DEFAULT_MEMO_CAPACITY: usize = 4096;
+
+/// Hashable form of a scalar value
+#[derive(Clone, Debug, PartialEq, Eq, Hash)]
+enum MemoArg {
+    Empty,
+    Bool(bool),
+    Int(i64),
+    /// Floats are compared by their bits
+    Float(u64),
+    String(Arc<String>),
+}
+
+impl MemoArg {
+    /// Convert a value, or return None if it cannot be cached
+    fn from_value(value: &Value) -> Option<Self> {
+        match value {
+            Value::Empty => Some(MemoArg::Empty),
+            Value::Bool(b) => Some(MemoArg::Bool(*b)),
+            Value::Int(n) => Some(MemoArg::Int(*n)),
+            Value::Float(f) => Some(MemoArg::Float(f.to_bits())),
+            Value::String(s) => Some(MemoArg::String(Arc::clone(s))),
+            _ => None,
+        }
+    }
+}
+
+/// Arguments of a memoized call
+#[derive(Clone, Debug, PartialEq, Eq, Hash)]
+pub struct MemoKey(Vec<MemoArg>);
+
+impl MemoKey {
+    /// Build a key from call arguments, or return None if any is not a scalar
+    pub fn new<'a>(args: impl IntoIterator<Item = &'a Value>) -> Option<Self> {
+        args.into_iter().map(MemoArg::from_value).collect::<Option<Vec<_>>>().map(MemoKey)
+    }
+}
+
+/// Bounded cache of one function's results
+#[derive(Clone, Debug)]
+pub struct MemoTable {
+    /// Cached results
+    entries: HashMap<MemoKey, Value>,
+    /// Keys in insertion order, oldest first
+    order: VecDeque<MemoKey>,
+    /// Maximum number of entries
+    capacity: usize,
+    /// Lookups that found a result
+    pub hits: u64,
+    /// Lookups that found nothing
+    pub misses: u64,
+    /// Entries dropped to stay within capacity
+    pub evictions: u64,
+}
+
+impl MemoTable {
+    /// Create an empty table
+    pub fn new(capacity: usize) -> Self {
+        Self {
+            entries: HashMap::new(),
+            order: VecDeque::new(),
+            capacity,
+            hits: 0,
+            misses: 0,
+            evictions: 0,
+        }
+    }
+
+    /// Look up a cached result
+    pub fn get(&mut self, key: &MemoKey) -> Option<Value> {
+        match self.entries.get(key) {
+            Some(value) => {
+                self.hits += 1;
+                Some(value.clone())
+            }
+            None => {
+                self.misses += 1;
+                None
+            }
+        }
+    }
+
+    /// Cache a result, evicting the oldest entry if the table is full
+    ///
+    /// Results that are not scalars are ignored.
+    pub fn insert(&mut self, key: MemoKey, value: &Value) {
+        if self.capacity == 0 || MemoArg::from_value(value).is_none() || self.entries.contains_key(&key) {
+            return;
+        }
+        while self.entries.len() >= self.capacity {
+            match self.order.pop_front() {
+                Some(oldest) => {
+                    self.entries.remove(&oldest);
+                    self.evictions += 1;
+                }
+                None => break,
+            }
+        }
+        self.order.push_back(key.clone());
+        self.entries.insert(key, value.clone());
+    }
+
+    /// Number of cached results
+    pub fn len(&self) -> usize {
+        self.entries.len()
+    }
+
+    /// Check if no results are cached
+    pub fn is_empty(&self) -> bool {
+        self.entries.is_empty()
+    }
+}
+
+#[cfg(test)]
+mod tests {
+    use super::*;
+
+    #[test]
+    fn test_only_scalars_are_cached() {
+        let array = Value::Array(Arc::new(vec![Value::Int(1)]));
+        assert!(MemoKey::new([&Value::Int(1), &array]).is_none());
+
+        let mut table = MemoTable::new(4);
+        let key = MemoKey::new([&Value::Int(1)]).unwrap();
+        table.insert(key.clone(), &array);
+        assert!(table.is_empty());
+
+        table.insert(key.clone(), &Value::Float(1.5));
+        assert_eq!(table.get(&key), Some(Value::Float(1.5)));
+        assert_eq!((table.hits, table.misses), (1, 0));
+    }
+
+    #[test]
+    fn test_oldest_entry_is_evicted() {
+        let mut table = MemoTable::new(2);
+        let keys: Vec<MemoKey> = (0..3).map(|n| MemoKey::new([&Value::Int(n)]).unwrap()).collect();
+        for (n, key) in keys.iter().enumerate() {
+            table.insert(key.clone(), &Value::Int(n as i64 * 10));
+        }
+
+        assert_eq!(table.len(), 2);
+        assert_eq!(table.evictions, 1);
+        assert_eq!(table.get(&keys[0]), None);
+        assert_eq!(table.get(&keys[2]), Some(Value::Int(20)));
+    }
+}
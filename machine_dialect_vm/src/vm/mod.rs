@@ -4,9 +4,13 @@
 //! execution engine, and state tracking.
 
 mod engine;
+mod memo;
+mod profiler;
 mod registers;
 mod state;
 
 pub use engine::VM;
+pub use memo::{MemoKey, MemoTable, DEFAULT_MEMO_CAPACITY};
+pub use profiler::{FunctionStats, Profiler};
 pub use registers::{RegisterFile, RegisterMetadata};
-pub use state::{CallFrame, VMState};
+pub use state::{CallFrame, Globals, VMState};
@@ -0,0 +1,210 @@
+//! Execution profiler
+//!
+//! This module implements the opt-in profiler used to collect runtime
+//! statistics for profile-guided optimization. When profiling is disabled the
+//! VM does not allocate a profiler at all, so the only cost on the hot path is
+//! a single `Option` check per instruction.
+
+use std::collections::HashMap;
+
+/// Number of distinct opcodes that can be counted
+const OPCODE_SLOTS: usize = 256;
+
+/// Per-function profile counters
+#[derive(Clone, Debug, Default, PartialEq, Eq)]
+pub struct FunctionStats {
+    /// Function name
+    pub name: String,
+    /// Number of times the function was entered
+    pub calls: u64,
+    /// Instructions executed while the function (or its callees) was active
+    pub inclusive_instructions: u64,
+    /// Instructions executed directly in the function body
+    pub exclusive_instructions: u64,
+}
+
+/// Active profiler frame
+#[derive(Clone, Debug)]
+struct ProfileFrame {
+    /// Index into `Profiler::functions`
+    function: usize,
+    /// Total instruction count when the frame was entered
+    entry_count: u64,
+}
+
+/// Runtime profiler
+#[derive(Clone, Debug)]
+pub struct Profiler {
+    /// Execution count for each opcode
+    opcode_counts: [u64; OPCODE_SLOTS],
+    /// Function statistics, indexed by function id
+    functions: Vec<FunctionStats>,
+    /// Function name to function id
+    function_ids: HashMap<String, usize>,
+    /// Shadow stack of active functions
+    stack: Vec<ProfileFrame>,
+    /// Per-PC hit counts (only when enabled)
+    pc_hits: Option<Vec<u64>>,
+    /// Total instructions observed
+    total_instructions: u64,
+}
+
+impl Profiler {
+    /// Create a new profiler
+    pub fn new(track_pcs: bool) -> Self {
+        Self {
+            opcode_counts: [0; OPCODE_SLOTS],
+            functions: Vec::new(),
+            function_ids: HashMap::new(),
+            stack: Vec::new(),
+            pc_hits: if track_pcs { Some(Vec::new()) } else { None },
+            total_instructions: 0,
+        }
+    }
+
+    /// Whether per-PC hit counts are collected
+    pub fn tracks_pcs(&self) -> bool {
+        self.pc_hits.is_some()
+    }
+
+    /// Clear all counters, keeping the configuration
+    pub fn reset(&mut self) {
+        *self = Self::new(self.tracks_pcs());
+    }
+
+    /// Record the execution of one instruction
+    #[inline]
+    pub fn record_instruction(&mut self, pc: usize, opcode: u8) {
+        self.total_instructions += 1;
+        self.opcode_counts[opcode as usize] += 1;
+
+        if let Some(frame) = self.stack.last() {
+            self.functions[frame.function].exclusive_instructions += 1;
+        }
+
+        if let Some(hits) = self.pc_hits.as_mut() {
+            if pc >= hits.len() {
+                hits.resize(pc + 1, 0);
+            }
+            hits[pc] += 1;
+        }
+    }
+
+    /// Record entry into a function
+    pub fn enter_function(&mut self, name: &str) {
+        let function = match self.function_ids.get(name) {
+            Some(&id) => id,
+            None => {
+                let id = self.functions.len();
+                self.functions.push(FunctionStats {
+                    name: name.to_string(),
+                    ..FunctionStats::default()
+                });
+                self.function_ids.insert(name.to_string(), id);
+                id
+            }
+        };
+
+        self.functions[function].calls += 1;
+        self.stack.push(ProfileFrame {
+            function,
+            entry_count: self.total_instructions,
+        });
+    }
+
+    /// Record exit from the innermost active function
+    pub fn exit_function(&mut self) {
+        if let Some(frame) = self.stack.pop() {
+            // Recursive activations are already covered by the outermost frame
+            if !self.stack.iter().any(|f| f.function == frame.function) {
+                self.functions[frame.function].inclusive_instructions +=
+                    self.total_instructions - frame.entry_count;
+            }
+        }
+    }
+
+    /// Close every frame still open (e.g. on halt or error)
+    pub fn finish(&mut self) {
+        while !self.stack.is_empty() {
+            self.exit_function();
+        }
+    }
+
+    /// Total instructions observed
+    pub fn total_instructions(&self) -> u64 {
+        self.total_instructions
+    }
+
+    /// Non-zero opcode counts as `(opcode, count)` pairs
+    pub fn opcode_counts(&self) -> Vec<(u8, u64)> {
+        self.opcode_counts.iter()
+            .enumerate()
+            .filter(|(_, &count)| count > 0)
+            .map(|(opcode, &count)| (opcode as u8, count))
+            .collect()
+    }
+
+    /// Function statistics in first-call order
+    pub fn functions(&self) -> &[FunctionStats] {
+        &self.functions
+    }
+
+    /// Non-zero per-PC hit counts as `(pc, count)` pairs
+    pub fn pc_hits(&self) -> Option<Vec<(usize, u64)>> {
+        self.pc_hits.as_ref().map(|hits| {
+            hits.iter()
+                .enumerate()
+                .filter(|(_, &count)| count > 0)
+                .map(|(pc, &count)| (pc, count))
+                .collect()
+        })
+    }
+}
+
+#[cfg(test)]
+mod tests {
+    use super::*;
+
+    #[test]
+    fn test_inclusive_and_exclusive_counts() {
+        let mut profiler = Profiler::new(false);
+
+        profiler.enter_function("main");
+        profiler.record_instruction(0, 0);
+        profiler.enter_function("f");
+        profiler.record_instruction(5, 7);
+        profiler.record_instruction(6, 26);
+        profiler.exit_function();
+        profiler.record_instruction(1, 26);
+        profiler.finish();
+
+        let functions = profiler.functions();
+        assert_eq!(functions[0].name, "main");
+        assert_eq!(functions[0].inclusive_instructions, 4);
+        assert_eq!(functions[0].exclusive_instructions, 2);
+        assert_eq!(functions[1].name, "f");
+        assert_eq!(functions[1].calls, 1);
+        assert_eq!(functions[1].inclusive_instructions, 2);
+        assert_eq!(functions[1].exclusive_instructions, 2);
+        assert_eq!(profiler.opcode_counts(), vec![(0, 1), (7, 1), (26, 2)]);
+        assert!(profiler.pc_hits().is_none());
+    }
+
+    #[test]
+    fn test_recursion_is_not_double_counted() {
+        let mut profiler = Profiler::new(true);
+
+        profiler.enter_function("fib");
+        profiler.record_instruction(0, 0);
+        profiler.enter_function("fib");
+        profiler.record_instruction(0, 0);
+        profiler.exit_function();
+        profiler.exit_function();
+
+        let fib = &profiler.functions()[0];
+        assert_eq!(fib.calls, 2);
+        assert_eq!(fib.inclusive_instructions, 2);
+        assert_eq!(fib.exclusive_instructions, 2);
+        assert_eq!(profiler.pc_hits(), Some(vec![(0, 2)]));
+    }
+}
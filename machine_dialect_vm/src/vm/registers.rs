@@ -1,6 +1,8 @@
 //! Register file management
 //!
-//! This module implements the 256-register file used by the VM.
+//! This module implements the register file used by the VM. Registers live on
+//! a single contiguous register stack; each call frame sees a window of up to
+//! 256 registers starting at its base pointer.
 
 use crate::values::{Value, Type};
 use crate::MAX_REGISTERS;
@@ -16,51 +18,54 @@ pub struct RegisterMetadata {
     pub is_loop_invariant: bool,
 }
 
-/// Register file with 256 general-purpose registers
+/// Register file with a sliding window of 256 general-purpose registers
+///
+/// A call opens a new window directly above the caller's frame, so the
+/// caller's registers are preserved without being copied. The stack always
+/// extends at least `MAX_REGISTERS` past the current base, so any `u8`
+/// register number is in bounds.
 #[derive(Debug)]
 pub struct RegisterFile {
     /// Register values
-    registers: [Value; MAX_REGISTERS],
+    registers: Vec<Value>,
     /// Type information for each register
-    register_types: [Type; MAX_REGISTERS],
+    register_types: Vec<Type>,
     /// Metadata for each register
-    register_metadata: [RegisterMetadata; MAX_REGISTERS],
+    register_metadata: Vec<RegisterMetadata>,
+    /// Index of register 0 of the current frame
+    base: usize,
+    /// Number of registers used by the current frame
+    frame_size: usize,
 }
 
 impl RegisterFile {
     /// Create a new register file
     pub fn new() -> Self {
-        const EMPTY_VALUE: Value = Value::Empty;
-        const EMPTY_TYPE: Type = Type::Empty;
-        const EMPTY_META: RegisterMetadata = RegisterMetadata {
-            last_modified: 0,
-            is_constant: false,
-            is_loop_invariant: false,
-        };
-
         Self {
-            registers: [EMPTY_VALUE; MAX_REGISTERS],
-            register_types: [EMPTY_TYPE; MAX_REGISTERS],
-            register_metadata: [EMPTY_META; MAX_REGISTERS],
+            registers: vec![Value::Empty; MAX_REGISTERS],
+            register_types: vec![Type::Empty; MAX_REGISTERS],
+            register_metadata: vec![RegisterMetadata::default(); MAX_REGISTERS],
+            base: 0,
+            frame_size: MAX_REGISTERS,
         }
     }
 
     /// Get a register value
     #[inline]
     pub fn get(&self, reg: u8) -> &Value {
-        &self.registers[reg as usize]
+        &self.registers[self.base + reg as usize]
     }
 
     /// Get a mutable register value
     #[inline]
     pub fn get_mut(&mut self, reg: u8) -> &mut Value {
-        &mut self.registers[reg as usize]
+        &mut self.registers[self.base + reg as usize]
     }
 
     /// Set a register value
     #[inline]
     pub fn set(&mut self, reg: u8, value: Value) {
-        let idx = reg as usize;
+        let idx = self.base + reg as usize;
         let value_type = value.type_of();
         self.registers[idx] = value;
         self.register_types[idx] = value_type;
@@ -69,7 +74,7 @@ impl RegisterFile {
     /// Set a register value with type
     #[inline]
     pub fn set_with_type(&mut self, reg: u8, value: Value, value_type: Type) {
-        let idx = reg as usize;
+        let idx = self.base + reg as usize;
         self.registers[idx] = value;
         self.register_types[idx] = value_type;
     }
@@ -77,41 +82,140 @@ impl RegisterFile {
     /// Get the type of a register
     #[inline]
     pub fn get_type(&self, reg: u8) -> &Type {
-        &self.register_types[reg as usize]
+        &self.register_types[self.base + reg as usize]
     }
 
     /// Set the type of a register
     #[inline]
     pub fn set_type(&mut self, reg: u8, value_type: Type) {
-        self.register_types[reg as usize] = value_type;
+        self.register_types[self.base + reg as usize] = value_type;
     }
 
     /// Get metadata for a register
     #[inline]
     pub fn get_metadata(&self, reg: u8) -> &RegisterMetadata {
-        &self.register_metadata[reg as usize]
+        &self.register_metadata[self.base + reg as usize]
     }
 
     /// Get mutable metadata for a register
     #[inline]
     pub fn get_metadata_mut(&mut self, reg: u8) -> &mut RegisterMetadata {
-        &mut self.register_metadata[reg as usize]
+        &mut self.register_metadata[self.base + reg as usize]
     }
 
-    /// Clear all registers
+    /// Clear all registers and return to the outermost frame
     pub fn clear(&mut self) {
+        self.registers.truncate(MAX_REGISTERS);
+        self.register_types.truncate(MAX_REGISTERS);
+        self.register_metadata.truncate(MAX_REGISTERS);
         for i in 0..MAX_REGISTERS {
             self.registers[i] = Value::Empty;
             self.register_types[i] = Type::Empty;
             self.register_metadata[i] = RegisterMetadata::default();
         }
+        self.base = 0;
+        self.frame_size = MAX_REGISTERS;
+    }
+
+    /// Base pointer of the current frame on the register stack
+    #[inline]
+    pub fn base(&self) -> usize {
+        self.base
+    }
+
+    /// Number of registers used by the current frame
+    #[inline]
+    pub fn frame_size(&self) -> usize {
+        self.frame_size
+    }
+
+    /// Open a register window for a call.
+    ///
+    /// The new window starts right after the current frame. The argument
+    /// registers of the current frame are copied into registers 0.. of the
+    /// new window; no other register is touched, so a call costs O(args).
+    ///
+    /// # Arguments
+    ///
+    /// * `frame_size` - Number of registers used by the callee
+    /// * `args` - Argument registers in the caller's window
+    pub fn push_window(&mut self, frame_size: usize, args: &[u8]) {
+        let new_base = self.base + self.frame_size;
+        let needed = new_base + MAX_REGISTERS;
+        if self.registers.len() < needed {
+            self.registers.resize(needed, Value::Empty);
+            self.register_types.resize(needed, Type::Empty);
+            self.register_metadata.resize(needed, RegisterMetadata::default());
+        }
+
+        for (i, &arg) in args.iter().enumerate() {
+            let src = self.base + arg as usize;
+            self.registers[new_base + i] = self.registers[src].clone();
+            self.register_types[new_base + i] = self.register_types[src].clone();
+        }
+
+        self.base = new_base;
+        self.frame_size = frame_size.max(args.len());
+    }
+
+    /// Reuse the current register window for a tail call.
+    ///
+    /// The argument registers are copied into registers 0.. of the current
+    /// window, which then belongs to the callee. Arguments are read before any
+    /// of them is written, so they may overlap the destination registers.
+    ///
+    /// # Arguments
+    ///
+    /// * `frame_size` - Number of registers used by the callee
+    /// * `args` - Argument registers in the current window
+    pub fn replace_window(&mut self, frame_size: usize, args: &[u8]) {
+        let values: Vec<(Value, Type)> = args
+            .iter()
+            .map(|&arg| {
+                let src = self.base + arg as usize;
+                (self.registers[src].clone(), self.register_types[src].clone())
+            })
+            .collect();
+
+        for (i, (value, value_type)) in values.into_iter().enumerate() {
+            self.registers[self.base + i] = value;
+            self.register_types[self.base + i] = value_type;
+        }
+
+        // Registers past the callee's frame would not be cleared on return
+        let new_size = frame_size.max(args.len());
+        for i in self.base + new_size..self.base + self.frame_size.max(new_size) {
+            self.registers[i] = Value::Empty;
+            self.register_types[i] = Type::Empty;
+        }
+        self.frame_size = new_size;
+    }
+
+    /// Return to the caller's register window.
+    ///
+    /// The callee's registers are cleared, so collections it received or
+    /// built are released now: a collection passed as an argument is again
+    /// uniquely owned by the caller and can still be mutated in place.
+    ///
+    /// # Arguments
+    ///
+    /// * `base` - Caller's base pointer, as returned by `base()` before the call
+    /// * `frame_size` - Caller's frame size, as returned by `frame_size()` before the call
+    pub fn pop_window(&mut self, base: usize, frame_size: usize) {
+        let end = (self.base + self.frame_size).min(self.registers.len());
+        for i in self.base..end {
+            self.registers[i] = Value::Empty;
+            self.register_types[i] = Type::Empty;
+        }
+        self.base = base;
+        self.frame_size = frame_size;
     }
 
     /// Save registers for a function call (caller-save)
     pub fn save_caller_registers(&self, start: u8, end: u8) -> Vec<(u8, Value)> {
         let mut saved = Vec::new();
         for reg in start..=end {
-            let idx = reg as usize;
+            let idx = self.base + reg as usize;
             if !matches!(self.registers[idx], Value::Empty) {
                 saved.push((reg, self.registers[idx].clone()));
             }
@@ -176,4 +280,62 @@ mod tests {
         assert_eq!(regs.get(33), &Value::String(Arc::new("test".to_string())));
         assert_eq!(regs.get(34), &Value::Bool(true));
     }
+
+    #[test]
+    fn test_register_windows() {
+        let mut regs = RegisterFile::new();
+        regs.pop_window(0, 6);
+        regs.set(0, Value::Int(1));
+        regs.set(5, Value::Int(7));
+
+        // Callee window starts after the caller's frame; only arguments are copied
+        regs.push_window(3, &[5]);
+        assert_eq!(regs.base(), 6);
+        assert_eq!(regs.frame_size(), 3);
+        assert_eq!(regs.get(0), &Value::Int(7));
+        assert_eq!(regs.get_type(0), &Type::Int);
+
+        regs.set(0, Value::Int(99));
+        regs.set(255, Value::Bool(true));
+
+        // The caller's registers are untouched
+        regs.pop_window(0, 6);
+        assert_eq!(regs.get(0), &Value::Int(1));
+        assert_eq!(regs.get(5), &Value::Int(7));
+    }
+
+    #[test]
+    fn test_pop_window_releases_callee_registers() {
+        let mut regs = RegisterFile::new();
+        regs.pop_window(0, 2);
+        regs.set(1, Value::Array(Arc::new(vec![Value::Int(1)])));
+
+        regs.push_window(2, &[1]);
+        regs.pop_window(0, 2);
+
+        // The argument copy in the callee's window is gone
+        match regs.get(1) {
+            Value::Array(items) => assert_eq!(Arc::strong_count(items), 1),
+            other => panic!("Expected array, got {:?}", other),
+        }
+        regs.push_window(2, &[]);
+        assert_eq!(regs.get(0), &Value::Empty);
+        assert_eq!(regs.get_type(0), &Type::Empty);
+    }
+
+    #[test]
+    fn test_replace_window() {
+        let mut regs = RegisterFile::new();
+        regs.pop_window(0, 4);
+        regs.push_window(4, &[]);
+        regs.set(0, Value::Int(1));
+        regs.set(1, Value::Int(2));
+
+        // Swapped arguments are read before they are overwritten
+        regs.replace_window(6, &[1, 0]);
+        assert_eq!(regs.base(), 4);
+        assert_eq!(regs.frame_size(), 6);
+        assert_eq!(regs.get(0), &Value::Int(2));
+        assert_eq!(regs.get(1), &Value::Int(1));
+    }
 }
@@ -16,10 +16,10 @@ const MAX_CALL_DEPTH: usize = 1000;
 pub struct CallFrame {
     /// Return address (instruction pointer)
     pub return_address: usize,
-    /// Saved frame pointer
+    /// Saved frame pointer (caller's register window base)
     pub saved_fp: usize,
-    /// Saved registers (register number, value)
-    pub saved_registers: Vec<(u8, Value)>,
+    /// Caller's register window size
+    pub saved_frame_size: usize,
     /// Function being called
     pub function: Option<FunctionRef>,
     /// Local variable name to register mapping
@@ -34,7 +34,7 @@ impl CallFrame {
         Self {
             return_address,
             saved_fp,
-            saved_registers: Vec::new(),
+            saved_frame_size: 0,
             function: None,
             local_symbols: HashMap::new(),
             return_dst: None,
@@ -42,6 +42,76 @@ impl CallFrame {
     }
 }
 
+/// Global variables stored in dense slots
+///
+/// Names are resolved to slot indices once, when a module is loaded, so
+/// global loads and stores in the hot loop index a vector instead of hashing
+/// the variable name. Slots survive `clear`, which only forgets the values.
+#[derive(Debug, Default)]
+pub struct Globals {
+    /// Slot values (None until first stored)
+    values: Vec<Option<Value>>,
+    /// Name to slot mapping
+    slots: HashMap<String, usize>,
+}
+
+impl Globals {
+    /// Create an empty global table
+    pub fn new() -> Self {
+        Self::default()
+    }
+
+    /// Get the slot for a name, allocating one if the name is new
+    pub fn slot(&mut self, name: &str) -> usize {
+        if let Some(&slot) = self.slots.get(name) {
+            return slot;
+        }
+        let slot = self.values.len();
+        self.values.push(None);
+        self.slots.insert(name.to_string(), slot);
+        slot
+    }
+
+    /// Load the value in a slot (Empty if it was never stored)
+    pub fn load(&self, slot: usize) -> Value {
+        match self.values.get(slot) {
+            Some(Some(value)) => value.clone(),
+            _ => Value::Empty,
+        }
+    }
+
+    /// Store a value in a slot
+    pub fn store(&mut self, slot: usize, value: Value) {
+        self.values[slot] = Some(value);
+    }
+
+    /// Get a global by name
+    pub fn get(&self, name: &str) -> Option<&Value> {
+        self.slots.get(name).and_then(|&slot| self.values[slot].as_ref())
+    }
+
+    /// Set a global by name
+    pub fn insert(&mut self, name: String, value: Value) {
+        let slot = self.slot(&name);
+        self.store(slot, value);
+    }
+
+    /// Forget all values, keeping the resolved slots
+    pub fn clear(&mut self) {
+        self.values.iter_mut().for_each(|value| *value = None);
+    }
+
+    /// Number of globals that hold a value
+    pub fn len(&self) -> usize {
+        self.values.iter().filter(|value| value.is_some()).count()
+    }
+
+    /// Whether no global holds a value
+    pub fn is_empty(&self) -> bool {
+        self.len() == 0
+    }
+}
+
 /// VM execution state
 #[derive(Debug)]
 pub struct VMState {
@@ -54,7 +124,7 @@ pub struct VMState {
     /// Call stack
     pub call_stack: Vec<CallFrame>,
     /// Global variables
-    pub globals: HashMap<String, Value>,
+    pub globals: Globals,
     /// Whether the VM is halted
     pub halted: bool,
     /// Current predecessor block (for phi nodes)
@@ -71,7 +141,7 @@ impl VMState {
             sp: 0,
             fp: 0,
             call_stack: Vec::new(),
-            globals: HashMap::new(),
+            globals: Globals::new(),
             halted: false,
             predecessor_block: None,
             scope_stack: Vec::new(),
@@ -185,6 +255,25 @@ mod tests {
         assert_eq!(state.globals.get("y"), Some(&Value::String(Arc::new("test".to_string()))));
     }
 
+    #[test]
+    fn test_global_slots() {
+        let mut state = VMState::new();
+
+        let x = state.globals.slot("x");
+        assert_eq!(state.globals.slot("x"), x);
+        assert_eq!(state.globals.load(x), Value::Empty);
+        assert_eq!(state.globals.get("x"), None);
+
+        state.globals.store(x, Value::Int(7));
+        assert_eq!(state.globals.get("x"), Some(&Value::Int(7)));
+
+        // Reset forgets values but keeps the slot assignment
+        state.reset();
+        assert!(state.globals.is_empty());
+        assert_eq!(state.globals.slot("x"), x);
+        assert_eq!(state.globals.load(x), Value::Empty);
+    }
+
     #[test]
     fn test_scopes() {
         let mut state = VMState::new();
@@ -130,3 +130,106 @@ fn test_invalid_magic() {
     // Clean up
     std::fs::remove_file(mdbc_path).unwrap();
 }
+
+#[test]
+fn test_function_register_counts() {
+    let mut data = Vec::new();
+
+    // Header (28 bytes)
+    data.extend_from_slice(b"MDBC");  // Magic
+    data.extend_from_slice(&1u32.to_le_bytes());  // Version
+    data.extend_from_slice(&3u32.to_le_bytes());  // Flags (little-endian, function registers)
+    data.extend_from_slice(&28u32.to_le_bytes());  // Name offset
+    data.extend_from_slice(&36u32.to_le_bytes());  // Constant offset
+    data.extend_from_slice(&40u32.to_le_bytes());  // Function offset
+    data.extend_from_slice(&55u32.to_le_bytes());  // Instruction offset
+
+    // Module name at offset 28
+    data.extend_from_slice(&4u32.to_le_bytes());
+    data.extend_from_slice(b"test");
+
+    // Constants at offset 36
+    data.extend_from_slice(&0u32.to_le_bytes());
+
+    // Functions at offset 40: "f" at instruction 1 using 4 registers
+    data.extend_from_slice(&1u32.to_le_bytes());
+    data.extend_from_slice(&1u32.to_le_bytes());
+    data.extend_from_slice(b"f");
+    data.extend_from_slice(&1u32.to_le_bytes());
+    data.extend_from_slice(&4u16.to_le_bytes());
+
+    // Instructions at offset 55: two ReturnR without a value
+    data.extend_from_slice(&2u32.to_le_bytes());
+    data.extend_from_slice(&[26, 0, 26, 0]);
+
+    let mut temp_file = NamedTempFile::new().unwrap();
+    temp_file.write_all(&data).unwrap();
+
+    let path = temp_file.path().with_extension("");
+    let mdbc_path = path.with_extension("mdbc");
+    std::fs::rename(temp_file.path(), &mdbc_path).unwrap();
+
+    let (module, _metadata) = BytecodeLoader::load_module(&path).unwrap();
+    assert_eq!(module.function_table.get("f"), Some(&1));
+    assert_eq!(module.function_registers.get("f"), Some(&4));
+    assert_eq!(module.instructions.len(), 2);
+
+    // Clean up
+    std::fs::remove_file(mdbc_path).unwrap();
+}
+
+#[test]
+fn test_superinstruction_execution() {
+    let mut data = Vec::new();
+
+    // Header (28 bytes)
+    data.extend_from_slice(b"MDBC");  // Magic
+    data.extend_from_slice(&1u32.to_le_bytes());  // Version
+    data.extend_from_slice(&1u32.to_le_bytes());  // Flags (little-endian)
+    data.extend_from_slice(&28u32.to_le_bytes());  // Name offset
+    data.extend_from_slice(&36u32.to_le_bytes());  // Constant offset
+    data.extend_from_slice(&49u32.to_le_bytes());  // Function offset
+    data.extend_from_slice(&53u32.to_le_bytes());  // Instruction offset
+
+    // Module name at offset 28
+    data.extend_from_slice(&4u32.to_le_bytes());
+    data.extend_from_slice(b"test");
+
+    // Constants at offset 36: [3]
+    data.extend_from_slice(&1u32.to_le_bytes());
+    data.push(0x01);
+    data.extend_from_slice(&3i64.to_le_bytes());
+
+    // Functions at offset 49
+    data.extend_from_slice(&0u32.to_le_bytes());
+
+    // Instructions at offset 53
+    data.extend_from_slice(&9u32.to_le_bytes());
+    data.extend_from_slice(&[0, 0, 0, 0]);  // 0: LoadConstR r0, #0           r0 = 3
+    data.extend_from_slice(&[59, 0]);  // 1: IncR r0                          r0 = 4
+    data.extend_from_slice(&[58, 0, 0, 0xFE, 0xFF]);  // 2: AddImmR r0, r0, -2  r0 = 2
+    data.extend_from_slice(&[57, 18, 0, 0, 0, 1, 0, 0, 0]);  // 3: if r0 < #0 goto 5
+    data.extend_from_slice(&[26, 0]);  // 4: ReturnR
+    data.extend_from_slice(&[56, 21, 1, 0, 0, 0]);  // 5: CmpConstR r1 = r0 >= #0
+    data.extend_from_slice(&[55, 16, 1, 1, 1, 0, 0, 0]);  // 6: if r1 == r1 goto 8
+    data.extend_from_slice(&[26, 0]);  // 7: ReturnR
+    data.extend_from_slice(&[26, 1, 0]);  // 8: ReturnR r0
+
+    let mut temp_file = NamedTempFile::new().unwrap();
+    temp_file.write_all(&data).unwrap();
+
+    let path = temp_file.path().with_extension("");
+    let mdbc_path = path.with_extension("mdbc");
+    std::fs::rename(temp_file.path(), &mdbc_path).unwrap();
+
+    let mut vm = VM::new();
+    let (module, metadata) = BytecodeLoader::load_module(&path).unwrap();
+    assert_eq!(module.instructions.len(), 9);
+    vm.load_module(module, metadata).unwrap();
+
+    assert_eq!(vm.run().unwrap(), Some(Value::Int(2)));
+    assert_eq!(*vm.registers.get(1), Value::Bool(false));
+
+    // Clean up
+    std::fs::remove_file(mdbc_path).unwrap();
+}
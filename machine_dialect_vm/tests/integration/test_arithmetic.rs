@@ -43,6 +43,7 @@ fn create_arithmetic_module() -> BytecodeModule {
         constants,
         instructions,
         function_table: HashMap::new(),
+        function_registers: HashMap::new(),
         global_names: Vec::new(),
     }
 }
@@ -140,6 +141,7 @@ fn test_negation() {
         constants,
         instructions,
         function_table: HashMap::new(),
+        function_registers: HashMap::new(),
         global_names: Vec::new(),
     };
 
@@ -38,6 +38,7 @@ fn create_if_else_module() -> BytecodeModule {
         constants,
         instructions,
         function_table: HashMap::new(),
+        function_registers: HashMap::new(),
         global_names: Vec::new(),
     }
 }
@@ -73,6 +74,7 @@ fn create_loop_module() -> BytecodeModule {
         constants,
         instructions,
         function_table: HashMap::new(),
+        function_registers: HashMap::new(),
         global_names: Vec::new(),
     }
 }
@@ -118,6 +120,7 @@ fn create_nested_conditions_module() -> BytecodeModule {
         constants,
         instructions,
         function_table: HashMap::new(),
+        function_registers: HashMap::new(),
         global_names: Vec::new(),
     }
 }
@@ -226,6 +229,7 @@ fn test_jump_forward_backward() {
         constants,
         instructions,
         function_table: HashMap::new(),
+        function_registers: HashMap::new(),
         global_names: Vec::new(),
     };
 
@@ -47,6 +47,7 @@ fn test_dict_basic_operations() {
         constants,
         instructions,
         function_table: HashMap::new(),
+        function_registers: HashMap::new(),
         global_names: Vec::new(),
     };
 
@@ -116,6 +117,7 @@ fn test_dict_keys_values() {
         constants,
         instructions,
         function_table: HashMap::new(),
+        function_registers: HashMap::new(),
         global_names: Vec::new(),
     };
 
@@ -200,6 +202,7 @@ fn test_dict_remove_clear() {
         constants,
         instructions,
         function_table: HashMap::new(),
+        function_registers: HashMap::new(),
         global_names: Vec::new(),
     };
 
@@ -33,6 +33,7 @@ fn create_string_concat_module() -> BytecodeModule {
         constants,
         instructions,
         function_table: HashMap::new(),
+        function_registers: HashMap::new(),
         global_names: Vec::new(),
     }
 }
@@ -74,6 +75,7 @@ fn create_string_comparison_module() -> BytecodeModule {
         constants,
         instructions,
         function_table: HashMap::new(),
+        function_registers: HashMap::new(),
         global_names: Vec::new(),
     }
 }
@@ -109,6 +111,7 @@ fn create_string_length_module() -> BytecodeModule {
         constants,
         instructions,
         function_table: HashMap::new(),
+        function_registers: HashMap::new(),
         global_names: Vec::new(),
     }
 }
@@ -147,6 +150,7 @@ fn create_string_slice_module() -> BytecodeModule {
         constants,
         instructions,
         function_table: HashMap::new(),
+        function_registers: HashMap::new(),
         global_names: Vec::new(),
     }
 }
@@ -182,6 +186,7 @@ fn create_mixed_type_operations_module() -> BytecodeModule {
         constants,
         instructions,
         function_table: HashMap::new(),
+        function_registers: HashMap::new(),
         global_names: Vec::new(),
     }
 }
@@ -318,6 +323,7 @@ fn test_empty_string_operations() {
         constants,
         instructions,
         function_table: HashMap::new(),
+        function_registers: HashMap::new(),
         global_names: Vec::new(),
     };
 
@@ -163,3 +163,26 @@ class TestFibonacciE2E:
             assert output_lines == expected_output, (
                 f"Output mismatch at {level}. Expected {expected_output}, got {output_lines}"
             )
+
+    def test_fibonacci_memoized(self) -> None:
+        """Test that a Utility requested with --memoize is compiled with memo instructions."""
+        from machine_dialect.codegen.disassembler import decode_instructions
+
+        config = CompilerConfig.from_cli_options(opt_level="2", memoize=("Fibonacci",))
+        pipeline = CompilationPipeline(config=config)
+        context = CompilationContext(source_path=Path("test_fibonacci.md"), config=config)
+        context.source_content = FIBONACCI_SOURCE
+
+        result = pipeline.compile(context)
+
+        assert not result.has_errors(), f"Compilation failed: {result.errors}"
+        assert result.mir_module is not None and result.bytecode_module is not None
+        assert result.mir_module.functions["Fibonacci"].memoize
+        chunk = next(chunk for chunk in result.bytecode_module.chunks if chunk.name == "Fibonacci")
+        names = [inst.name for inst in decode_instructions(bytes(chunk.bytecode), chunk.constants)]
+        assert names[0] == "MEMO_LOOKUP_R"
+        assert "MEMO_STORE_R" in names
+
+        interpreter = MIRInterpreter()
+        interpreter.interpret_module(result.mir_module)
+        assert interpreter.get_output() == ["Fibonacci of 10 is:", "55"]
@@ -84,6 +84,19 @@ class TestOpcodeCompatibility:
             "DICT_VALUES_R": 47,
             "DICT_CLEAR_R": 48,
             "DICT_LEN_R": 49,
+            "ARRAY_PUSH_R": 50,
+            "ARRAY_INSERT_R": 51,
+            "ARRAY_REMOVE_AT_R": 52,
+            "ARRAY_FIND_R": 53,
+            "ARRAY_CLEAR_R": 54,
+            "CMP_JUMP_R": 55,
+            "CMP_CONST_R": 56,
+            "CMP_CONST_JUMP_R": 57,
+            "ADD_IMM_R": 58,
+            "INC_R": 59,
+            "TAIL_CALL_R": 60,
+            "MEMO_LOOKUP_R": 61,
+            "MEMO_STORE_R": 62,
         }
 
         # First, verify the count matches
@@ -421,6 +434,20 @@ class TestOpcodeCompatibility:
             Opcode.DICT_VALUES_R: lambda: bytecode.extend([Opcode.DICT_VALUES_R, 1, 0]),
             Opcode.DICT_CLEAR_R: lambda: bytecode.extend([Opcode.DICT_CLEAR_R, 0]),
             Opcode.DICT_LEN_R: lambda: bytecode.extend([Opcode.DICT_LEN_R, 1, 0]),
+            # Array mutation
+            Opcode.ARRAY_PUSH_R: lambda: bytecode.extend([Opcode.ARRAY_PUSH_R, 0, 1]),
+            Opcode.ARRAY_INSERT_R: lambda: bytecode.extend([Opcode.ARRAY_INSERT_R, 0, 1, 2]),
+            Opcode.ARRAY_REMOVE_AT_R: lambda: bytecode.extend([Opcode.ARRAY_REMOVE_AT_R, 0, 1]),
+            Opcode.ARRAY_FIND_R: lambda: bytecode.extend([Opcode.ARRAY_FIND_R, 2, 0, 1]),
+            Opcode.ARRAY_CLEAR_R: lambda: bytecode.extend([Opcode.ARRAY_CLEAR_R, 0]),
+            # Superinstructions
+            Opcode.CMP_JUMP_R: lambda: bytecode.extend([Opcode.CMP_JUMP_R, Opcode.LT_R, 0, 1, 0, 0, 0, 0]),
+            Opcode.CMP_CONST_R: lambda: bytecode.extend([Opcode.CMP_CONST_R, Opcode.LT_R, 2, 0, 0, 0]),
+            Opcode.CMP_CONST_JUMP_R: lambda: bytecode.extend(
+                [Opcode.CMP_CONST_JUMP_R, Opcode.LT_R, 0, 0, 0, 0, 0, 0, 0]
+            ),
+            Opcode.ADD_IMM_R: lambda: bytecode.extend([Opcode.ADD_IMM_R, 1, 0, 1, 0]),
+            Opcode.INC_R: lambda: bytecode.extend([Opcode.INC_R, 1]),
             # Debug
             Opcode.DEBUG_PRINT: lambda: bytecode.extend([Opcode.DEBUG_PRINT, 0]),
             Opcode.BREAKPOINT: lambda: bytecode.extend([Opcode.BREAKPOINT]),
@@ -62,3 +62,27 @@ def test_instruction_count() -> None:
     vm = machine_dialect_vm.RustVM()
     count = vm.instruction_count()
     assert count >= 0
+
+
+def test_profiling_toggle() -> None:
+    """Test that the profiler is opt-in and can be enabled and disabled."""
+    try:
+        import machine_dialect_vm
+    except ImportError:
+        pytest.fail("machine_dialect_vm module not available - run './build_vm.sh' to build")
+
+    if not hasattr(machine_dialect_vm, "RustVM"):
+        pytest.fail("RustVM class not available in machine_dialect_vm module")
+
+    vm = machine_dialect_vm.RustVM()
+    assert vm.get_profile() is None
+
+    vm.enable_profiling(track_pcs=True)
+    profile = vm.get_profile()
+    assert profile is not None
+    assert profile["total_instructions"] == 0
+    assert profile["functions"] == {}
+    assert profile["pc_hits"] == {}
+
+    vm.disable_profiling()
+    assert vm.get_profile() is None
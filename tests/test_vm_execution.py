@@ -2,6 +2,11 @@
 
 from __future__ import annotations
 
+from pathlib import Path
+
+from machine_dialect.compiler.config import CompilerConfig
+from machine_dialect.compiler.context import CompilationContext
+from machine_dialect.compiler.pipeline import CompilationPipeline
 from machine_dialect.compiler.vm_runner import VMRunner
 
 
@@ -115,6 +120,24 @@ Give back `nothing`.
         result = runner.execute(source)
         assert result is None
 
+    def test_lazy_collection_result(self) -> None:
+        """Test returning a list as a view over the VM's array."""
+        source = """
+Set `items` to:
+- _1_.
+- _2_.
+- _3_.
+Give back `items`.
+"""
+        runner = VMRunner(debug=False)
+        result = runner.execute(source, lazy=True)
+        assert type(result).__name__ == "ArrayView"
+        assert len(result) == 3
+        assert result[-1] == 3
+        assert list(result[1:]) == [2, 3]
+        assert result == [1, 2, 3]
+        assert result.to_buffer().tolist() == [1, 2, 3]
+
     def test_variable_reassignment(self) -> None:
         """Test variable reassignment."""
         source = """
@@ -126,3 +149,41 @@ Give back `x`.
         runner = VMRunner(debug=False)
         result = runner.execute(source)
         assert result == 25
+
+    def test_inlined_call_with_constant_arguments(self) -> None:
+        """Test a Utility inlined at level 3 into a call with constant arguments."""
+        source = """### **Utility**: `add`
+
+<details>
+<summary>Add two numbers and report the sum.</summary>
+
+> Define `sum` as Whole Number. \\
+> Set `sum` to `a` + `b`. \\
+> Say `sum`. \\
+> Give back `sum`.
+
+</details>
+
+#### Inputs:
+
+- `a` **as** Whole Number (required)
+- `b` **as** Whole Number (required)
+
+#### Outputs:
+
+- `sum` **as** Whole Number
+
+Define `result` as Whole Number.
+Set `result` using `add` with _2_, _3_.
+Give back `result`.
+"""
+        config = CompilerConfig.from_cli_options(opt_level="3")
+        context = CompilationContext(source_path=Path("add.md"), config=config, source_content=source)
+        compiled = CompilationPipeline(config=config).compile(context)
+        assert not compiled.has_errors(), f"Compilation failed: {compiled.errors}"
+        assert compiled.mir_module is not None and compiled.bytecode_module is not None
+        assert "inlined_add_entry" in compiled.mir_module.functions["__main__"].cfg.blocks
+
+        runner = VMRunner(debug=False)
+        result = runner.execute_bytecode(compiled.bytecode_module.serialize())
+        assert result == 5